@@ -79,7 +79,13 @@ class ConfigManager:
                 "auto_play": False,
                 "fps": 60,
                 "physics_precision": "high",
-                "integration_method": "rk4"
+                "integration_method": "rk4",
+                "gravity_solver": "direct",
+                "opening_angle": 0.5,
+                "worker_thread": True,  # 位置計算をワーカースレッドで実行
+                "fixed_step": 1.0 / 60.0,  # 時間を進める固定ステップの実時間 (秒)
+                "max_catch_up_steps": 5,  # 1フレームで追いつくために進める最大ステップ数
+                "ephemeris_file": None    # コンパイル済みの暦のファイル（Noneの場合は使用しない）
             },
             
             # 表示設定
@@ -121,7 +127,8 @@ class ConfigManager:
                 "orbit_resolution": 360,
                 "adaptive_quality": True,
                 "gpu_acceleration": True,
-                "multi_threading": True
+                "multi_threading": True,
+                "worker_count": 0  # 0の場合はCPUコア数
             },
             
             # UI設定
@@ -131,7 +138,8 @@ class ConfigManager:
                 "font_size": 10,
                 "icon_size": 16,
                 "toolbar_visible": True,
-                "status_bar_visible": True
+                "status_bar_visible": True,
+                "time_display_rate": 10  # 時刻表示の更新頻度 (Hz)
             },
             
             # キーボードショートカット
@@ -0,0 +1,297 @@
+"""
+ケプラー運動の配列演算カーネル
+
+多数の軌道要素・時刻をまとめて処理するための
+NumPyベクトル化された計算関数を提供します。
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+from src.domain import kepler_jit
+
+
+# この離心率以上ではハレー法（3次収束）とDanbyの初期値を用いる
+HIGH_ECCENTRICITY_THRESHOLD = 0.8
+
+
+def kepler_initial_guess(mean_anomaly, eccentricity):
+    """
+    ケプラー方程式の初期推定値（コールドスタート）
+    
+    通常は E0 = M、高離心率では Danby の初期値
+    E0 = M + 0.85 * e * sign(sin M) を用います。
+    
+    Args:
+        mean_anomaly: 平均近点角 (rad、スカラーまたは配列)
+        eccentricity: 離心率（ブロードキャスト可能な形状）
+    
+    Returns:
+        離心近点角の初期推定値 (rad)
+    """
+    danby = mean_anomaly + 0.85 * eccentricity * np.sign(np.sin(mean_anomaly))
+    return np.where(eccentricity >= HIGH_ECCENTRICITY_THRESHOLD, danby, mean_anomaly)
+
+
+def kepler_warm_start_guess(mean_anomaly,
+                            eccentricity,
+                            previous_mean_anomaly,
+                            previous_eccentric_anomaly):
+    """
+    前回の解から離心近点角の初期推定値を外挿（ウォームスタート）
+    
+    dE/dM = 1 / (1 - e*cos(E)) による1次の外挿を行います。
+    平均近点角が 2π で折り返した場合も周回分を補正します。
+    
+    Args:
+        mean_anomaly: 今回の平均近点角 (rad)
+        eccentricity: 離心率
+        previous_mean_anomaly: 前回の平均近点角 (rad)
+        previous_eccentric_anomaly: 前回の離心近点角 (rad)
+    
+    Returns:
+        離心近点角の初期推定値 (rad)
+    """
+    # 平均近点角の変化を [-π, π) に折り返す
+    raw_delta = mean_anomaly - previous_mean_anomaly
+    delta_M = (raw_delta + np.pi) % (2 * np.pi) - np.pi
+    
+    guess = previous_eccentric_anomaly + delta_M / (
+        1 - eccentricity * np.cos(previous_eccentric_anomaly)
+    )
+    
+    # 周回分（2πの整数倍）の差を補正
+    return guess + (raw_delta - delta_M)
+
+
+def solve_kepler_equation_scalar(mean_anomaly: float,
+                                 eccentricity: float,
+                                 tolerance: float = 1e-12,
+                                 max_iterations: int = 50,
+                                 initial_guess: Optional[float] = None) -> Tuple[float, int, bool]:
+    """
+    ケプラー方程式 M = E - e*sin(E) を1件解く
+    
+    初期推定値（ウォームスタート）が与えられた場合はそこから反復し、
+    高離心率ではハレー法を用います。最大反復回数以内に収束しない場合は
+    Danby の初期値からハレー法で解き直します。
+    
+    Args:
+        mean_anomaly: 平均近点角 (rad)
+        eccentricity: 離心率
+        tolerance: 収束判定の許容誤差 (rad)
+        max_iterations: 1回の試行あたりの最大反復回数
+        initial_guess: 離心近点角の初期推定値（Noneの場合はコールドスタート）
+    
+    Returns:
+        (離心近点角 (rad), 実行した反復回数の合計, 収束したかどうか)
+    """
+    use_halley = eccentricity >= HIGH_ECCENTRICITY_THRESHOLD
+    if initial_guess is None:
+        initial_guess = float(kepler_initial_guess(mean_anomaly, eccentricity))
+    
+    if kepler_jit.is_jit_enabled():
+        return kepler_jit.solve_kepler_scalar_jit(
+            mean_anomaly, eccentricity, initial_guess,
+            tolerance, max_iterations, HIGH_ECCENTRICITY_THRESHOLD
+        )
+    
+    E, iterations, converged = _iterate_kepler_scalar(
+        mean_anomaly, eccentricity, initial_guess, tolerance, max_iterations, use_halley
+    )
+    if converged:
+        return E, iterations, True
+    
+    # フォールバック: Danbyの初期値からハレー法で解き直す
+    danby_guess = mean_anomaly + 0.85 * eccentricity * np.sign(np.sin(mean_anomaly))
+    E, fallback_iterations, converged = _iterate_kepler_scalar(
+        mean_anomaly, eccentricity, danby_guess, tolerance, max_iterations, True
+    )
+    return E, iterations + fallback_iterations, converged
+
+
+def _iterate_kepler_scalar(mean_anomaly: float,
+                           eccentricity: float,
+                           E: float,
+                           tolerance: float,
+                           max_iterations: int,
+                           use_halley: bool) -> Tuple[float, int, bool]:
+    """ニュートン法またはハレー法による反復（スカラー）"""
+    for iteration in range(1, max_iterations + 1):
+        sin_E = np.sin(E)
+        f = E - eccentricity * sin_E - mean_anomaly
+        f_prime = 1 - eccentricity * np.cos(E)
+        
+        if abs(f_prime) < 1e-15:
+            return E, iteration, False
+        
+        if use_halley:
+            # f'' = e*sin(E)
+            delta_E = f / (f_prime - 0.5 * f * eccentricity * sin_E / f_prime)
+        else:
+            delta_E = f / f_prime
+        E -= delta_E
+        
+        if abs(delta_E) < tolerance:
+            return E, iteration, True
+    
+    return E, max_iterations, False
+
+
+def solve_kepler_equation_array(mean_anomaly: np.ndarray,
+                                eccentricity: np.ndarray,
+                                tolerance: float = 1e-12,
+                                max_iterations: int = 50,
+                                initial_guess: Optional[np.ndarray] = None) -> Tuple[np.ndarray, int]:
+    """
+    ケプラー方程式 M = E - e*sin(E) を配列全体で一括して解く
+    
+    未収束の要素のみを更新するマスク付き反復（高離心率の要素はハレー法、
+    それ以外はニュートン法）と、未収束時のDanby初期値からのやり直しを
+    用いるため、各要素はスカラー版のソルバーと同じ反復列を辿ります。
+    
+    Args:
+        mean_anomaly: 平均近点角 (rad)
+        eccentricity: 離心率（mean_anomalyにブロードキャスト可能な形状）
+        tolerance: 収束判定の許容誤差 (rad)
+        max_iterations: 最大反復回数
+        initial_guess: 離心近点角の初期推定値（Noneの場合はコールドスタート）
+    
+    Returns:
+        (離心近点角 (rad, mean_anomalyと同じ形状), 実行した反復回数)
+    """
+    mean_anomaly = np.asarray(mean_anomaly, dtype=np.float64)
+    shape = mean_anomaly.shape
+    
+    M = mean_anomaly.ravel()
+    e = np.broadcast_to(np.asarray(eccentricity, dtype=np.float64), shape).ravel()
+    
+    # 初期推定値
+    if initial_guess is None:
+        E = kepler_initial_guess(M, e).astype(np.float64)
+    else:
+        E = np.array(np.broadcast_to(initial_guess, shape), dtype=np.float64).ravel()
+    
+    if kepler_jit.is_jit_enabled():
+        E, iterations = kepler_jit.solve_kepler_rows_jit(
+            M, e, E, tolerance, max_iterations, HIGH_ECCENTRICITY_THRESHOLD
+        )
+        return E.reshape(shape), iterations
+    
+    use_halley = e >= HIGH_ECCENTRICITY_THRESHOLD
+    
+    iterations, active = _iterate_kepler_array(
+        M, e, E, np.arange(E.size), use_halley, tolerance, max_iterations
+    )
+    
+    # フォールバック: 未収束の要素をDanbyの初期値からハレー法で解き直す
+    if active.size > 0:
+        M_active = M[active]
+        E[active] = M_active + 0.85 * e[active] * np.sign(np.sin(M_active))
+        fallback_iterations, _ = _iterate_kepler_array(
+            M, e, E, active, np.ones(E.size, dtype=bool), tolerance, max_iterations
+        )
+        iterations += fallback_iterations
+    
+    return E.reshape(shape), iterations
+
+
+def _iterate_kepler_array(M: np.ndarray,
+                          e: np.ndarray,
+                          E: np.ndarray,
+                          active: np.ndarray,
+                          use_halley: np.ndarray,
+                          tolerance: float,
+                          max_iterations: int) -> Tuple[int, np.ndarray]:
+    """
+    マスク付きのニュートン法・ハレー法による反復（Eをその場で更新）
+    
+    Returns:
+        (実行した反復回数, 未収束要素のインデックス)
+    """
+    iterations = 0
+    
+    while active.size > 0 and iterations < max_iterations:
+        E_active = E[active]
+        e_active = e[active]
+        
+        sin_E = np.sin(E_active)
+        f = E_active - e_active * sin_E - M[active]
+        f_prime = 1 - e_active * np.cos(E_active)
+        
+        delta_E = np.where(
+            use_halley[active],
+            f / (f_prime - 0.5 * f * e_active * sin_E / f_prime),
+            f / f_prime
+        )
+        E[active] = E_active - delta_E
+        iterations += 1
+        
+        # 収束した要素を除外
+        active = active[np.abs(delta_E) >= tolerance]
+    
+    return iterations, active
+
+
+def true_anomaly_array(eccentric_anomaly: np.ndarray,
+                       eccentricity: np.ndarray) -> np.ndarray:
+    """
+    離心近点角から真近点角を一括計算
+    
+    Args:
+        eccentric_anomaly: 離心近点角 (rad)
+        eccentricity: 離心率（ブロードキャスト可能な形状）
+    
+    Returns:
+        真近点角 (rad)
+    """
+    cos_E = np.cos(eccentric_anomaly)
+    sin_E = np.sin(eccentric_anomaly)
+    
+    denominator = 1 - eccentricity * cos_E
+    cos_nu = (cos_E - eccentricity) / denominator
+    sin_nu = (np.sqrt(1 - eccentricity**2) * sin_E) / denominator
+    
+    return np.arctan2(sin_nu, cos_nu)
+
+
+def perifocal_rotation_matrix(inclination: np.ndarray,
+                              longitude_of_ascending_node: np.ndarray,
+                              argument_of_perihelion: np.ndarray) -> np.ndarray:
+    """
+    軌道面座標から太陽中心座標系への回転行列を計算
+    
+    Args:
+        inclination: 軌道傾斜角 (度)
+        longitude_of_ascending_node: 昇交点黄経 (度)
+        argument_of_perihelion: 近日点引数 (度)
+    
+    Returns:
+        回転行列 (入力形状 + (3, 3))
+    """
+    i = np.radians(inclination)
+    omega = np.radians(longitude_of_ascending_node)
+    w = np.radians(argument_of_perihelion)
+    
+    cos_omega = np.cos(omega)
+    sin_omega = np.sin(omega)
+    cos_i = np.cos(i)
+    sin_i = np.sin(i)
+    cos_w = np.cos(w)
+    sin_w = np.sin(w)
+    
+    shape = np.broadcast(cos_omega, cos_i, cos_w).shape
+    rotation = np.empty(shape + (3, 3), dtype=np.float64)
+    
+    rotation[..., 0, 0] = cos_omega * cos_w - sin_omega * sin_w * cos_i
+    rotation[..., 0, 1] = -cos_omega * sin_w - sin_omega * cos_w * cos_i
+    rotation[..., 0, 2] = sin_omega * sin_i
+    
+    rotation[..., 1, 0] = sin_omega * cos_w + cos_omega * sin_w * cos_i
+    rotation[..., 1, 1] = -sin_omega * sin_w + cos_omega * cos_w * cos_i
+    rotation[..., 1, 2] = -cos_omega * sin_i
+    
+    rotation[..., 2, 0] = sin_w * sin_i
+    rotation[..., 2, 1] = cos_w * sin_i
+    rotation[..., 2, 2] = cos_i
+    
+    return rotation
\ No newline at end of file
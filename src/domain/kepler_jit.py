@@ -0,0 +1,346 @@
+"""
+ケプラー運動カーネルのJITコンパイル版（オプション）
+
+numbaが利用可能な場合に、ケプラー方程式の求解・真近点角・
+太陽中心座標系への変換をJITコンパイルしたカーネルを提供します。
+コンパイル結果はディスクにキャッシュされ、2回目以降の起動では
+再コンパイルを行いません。numbaが無い場合はNumPy実装が使われます。
+"""
+
+import math
+import logging
+import numpy as np
+from typing import Tuple
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    NUMBA_AVAILABLE = False
+
+
+logger = logging.getLogger(__name__)
+
+# バックエンドの状態（configure_jit_backendで変更）
+_jit_enabled = False
+_jit_parallel = False
+
+
+def configure_jit_backend(enabled: bool, parallel: bool = False) -> bool:
+    """
+    JITバックエンドの有効・無効を設定
+    
+    Args:
+        enabled: JITカーネルを使用するかどうか
+        parallel: 配列カーネルをマルチスレッドで実行するかどうか
+    
+    Returns:
+        JITバックエンドが実際に有効になったかどうか
+        （numbaが無い場合は常にFalse）
+    """
+    global _jit_enabled, _jit_parallel
+    
+    if enabled and not NUMBA_AVAILABLE:
+        logger.info("numbaが見つからないため、NumPy実装を使用します")
+    
+    _jit_enabled = bool(enabled) and NUMBA_AVAILABLE
+    _jit_parallel = bool(parallel)
+    return _jit_enabled
+
+
+def configure_jit_backend_from_config(config_manager) -> bool:
+    """
+    設定からJITバックエンドを構成
+    
+    performance.gpu_acceleration でJITカーネルを、
+    performance.multi_threading で配列カーネルの並列実行を有効にします。
+    
+    Args:
+        config_manager: 設定管理オブジェクト
+    
+    Returns:
+        JITバックエンドが実際に有効になったかどうか
+    """
+    return configure_jit_backend(
+        enabled=config_manager.get("performance.gpu_acceleration", False),
+        parallel=config_manager.get("performance.multi_threading", False)
+    )
+
+
+def is_jit_enabled() -> bool:
+    """JITバックエンドが有効かどうか"""
+    return _jit_enabled
+
+
+def _iterate_kepler_kernel(mean_anomaly, eccentricity, E, tolerance, max_iterations, use_halley):
+    """ニュートン法またはハレー法による反復（kepler._iterate_kepler_scalarと同一）"""
+    for iteration in range(1, max_iterations + 1):
+        sin_E = math.sin(E)
+        f = E - eccentricity * sin_E - mean_anomaly
+        f_prime = 1.0 - eccentricity * math.cos(E)
+        
+        if abs(f_prime) < 1e-15:
+            return E, iteration, False
+        
+        if use_halley:
+            delta_E = f / (f_prime - 0.5 * f * eccentricity * sin_E / f_prime)
+        else:
+            delta_E = f / f_prime
+        E -= delta_E
+        
+        if abs(delta_E) < tolerance:
+            return E, iteration, True
+    
+    return E, max_iterations, False
+
+
+def _solve_kepler_kernel(mean_anomaly, eccentricity, initial_guess,
+                         tolerance, max_iterations, halley_threshold):
+    """ケプラー方程式の求解（kepler.solve_kepler_equation_scalarと同一の手順）"""
+    use_halley = eccentricity >= halley_threshold
+    E, iterations, converged = _iterate_kepler_kernel(
+        mean_anomaly, eccentricity, initial_guess, tolerance, max_iterations, use_halley
+    )
+    if converged:
+        return E, iterations, True
+    
+    # フォールバック: Danbyの初期値からハレー法で解き直す
+    sin_M = math.sin(mean_anomaly)
+    sign = 1.0 if sin_M > 0.0 else (-1.0 if sin_M < 0.0 else 0.0)
+    E, fallback_iterations, converged = _iterate_kepler_kernel(
+        mean_anomaly, eccentricity, mean_anomaly + 0.85 * eccentricity * sign,
+        tolerance, max_iterations, True
+    )
+    return E, iterations + fallback_iterations, converged
+
+
+def _solve_kepler_rows_body(mean_anomaly, eccentricity, initial_guess, tolerance,
+                            max_iterations, halley_threshold, out_E, out_iterations, i):
+    """1行分のケプラー方程式の求解"""
+    E, iterations, _ = _solve_kepler_kernel(
+        mean_anomaly[i], eccentricity[i], initial_guess[i],
+        tolerance, max_iterations, halley_threshold
+    )
+    out_E[i] = E
+    out_iterations[i] = iterations
+
+
+def _propagate_rows_body(julian_date, a_km, eccentricity, mean_anomaly_at_epoch, mean_motion,
+                         epoch, rotation, last_mean_anomaly, last_eccentric_anomaly,
+                         has_solution, tolerance, max_iterations, halley_threshold,
+                         out_positions, out_iterations, i):
+    """1行分の伝播（平均近点角・ケプラー方程式・真近点角・座標変換）"""
+    e = eccentricity[i]
+    
+    # 平均近点角
+    two_pi = 2.0 * math.pi
+    M = (math.radians(mean_anomaly_at_epoch[i]) + mean_motion[i] * (julian_date - epoch[i])) % two_pi
+    
+    # 初期推定値（kepler.kepler_warm_start_guess / kepler_initial_guess と同一）
+    if has_solution[i]:
+        previous_E = last_eccentric_anomaly[i]
+        raw_delta = M - last_mean_anomaly[i]
+        delta_M = (raw_delta + math.pi) % two_pi - math.pi
+        initial_guess = (previous_E + delta_M / (1.0 - e * math.cos(previous_E)) +
+                         (raw_delta - delta_M))
+    elif e >= halley_threshold:
+        sin_M = math.sin(M)
+        sign = 1.0 if sin_M > 0.0 else (-1.0 if sin_M < 0.0 else 0.0)
+        initial_guess = M + 0.85 * e * sign
+    else:
+        initial_guess = M
+    
+    E, iterations, _ = _solve_kepler_kernel(
+        M, e, initial_guess, tolerance, max_iterations, halley_threshold
+    )
+    last_mean_anomaly[i] = M
+    last_eccentric_anomaly[i] = E
+    has_solution[i] = True
+    out_iterations[i] = iterations
+    
+    # 真近点角
+    cos_E = math.cos(E)
+    sin_E = math.sin(E)
+    denominator = 1.0 - e * cos_E
+    cos_nu = (cos_E - e) / denominator
+    sin_nu = math.sqrt(1.0 - e * e) * sin_E / denominator
+    
+    # 軌道面での位置と太陽中心座標系への変換
+    orbital_radius = a_km[i] * (1.0 - e * e) / (1.0 + e * cos_nu)
+    x_orb = orbital_radius * cos_nu
+    y_orb = orbital_radius * sin_nu
+    for axis in range(3):
+        out_positions[i, axis] = rotation[i, axis, 0] * x_orb + rotation[i, axis, 1] * y_orb
+
+
+def _solve_kepler_rows_serial(mean_anomaly, eccentricity, initial_guess, tolerance,
+                              max_iterations, halley_threshold, out_E, out_iterations):
+    """全行のケプラー方程式の求解（逐次）"""
+    for i in range(mean_anomaly.shape[0]):
+        _solve_kepler_rows_body(mean_anomaly, eccentricity, initial_guess, tolerance,
+                                max_iterations, halley_threshold, out_E, out_iterations, i)
+
+
+def _solve_kepler_rows_parallel(mean_anomaly, eccentricity, initial_guess, tolerance,
+                                max_iterations, halley_threshold, out_E, out_iterations):
+    """全行のケプラー方程式の求解（並列）"""
+    for i in numba.prange(mean_anomaly.shape[0]):
+        _solve_kepler_rows_body(mean_anomaly, eccentricity, initial_guess, tolerance,
+                                max_iterations, halley_threshold, out_E, out_iterations, i)
+
+
+def _propagate_rows_serial(julian_date, a_km, eccentricity, mean_anomaly_at_epoch, mean_motion,
+                           epoch, rotation, last_mean_anomaly, last_eccentric_anomaly,
+                           has_solution, tolerance, max_iterations, halley_threshold,
+                           out_positions, out_iterations):
+    """全行の伝播（逐次）"""
+    for i in range(a_km.shape[0]):
+        _propagate_rows_body(julian_date, a_km, eccentricity, mean_anomaly_at_epoch, mean_motion,
+                             epoch, rotation, last_mean_anomaly, last_eccentric_anomaly,
+                             has_solution, tolerance, max_iterations, halley_threshold,
+                             out_positions, out_iterations, i)
+
+
+def _propagate_rows_parallel(julian_date, a_km, eccentricity, mean_anomaly_at_epoch, mean_motion,
+                             epoch, rotation, last_mean_anomaly, last_eccentric_anomaly,
+                             has_solution, tolerance, max_iterations, halley_threshold,
+                             out_positions, out_iterations):
+    """全行の伝播（並列）"""
+    for i in numba.prange(a_km.shape[0]):
+        _propagate_rows_body(julian_date, a_km, eccentricity, mean_anomaly_at_epoch, mean_motion,
+                             epoch, rotation, last_mean_anomaly, last_eccentric_anomaly,
+                             has_solution, tolerance, max_iterations, halley_threshold,
+                             out_positions, out_iterations, i)
+
+
+if NUMBA_AVAILABLE:
+    # error_model='numpy': ゼロ除算チェックを省略（NumPy実装と同じ挙動）
+    
+    # 内部カーネル（呼び出し側にインライン展開される）
+    _iterate_kepler_kernel = numba.njit(cache=True, error_model='numpy')(_iterate_kepler_kernel)
+    _solve_kepler_kernel = numba.njit(cache=True, error_model='numpy')(_solve_kepler_kernel)
+    _solve_kepler_rows_body = numba.njit(cache=True, error_model='numpy')(_solve_kepler_rows_body)
+    _propagate_rows_body = numba.njit(cache=True, error_model='numpy')(_propagate_rows_body)
+    
+    # 配列カーネル（逐次版・並列版）
+    _solve_kepler_rows_serial = numba.njit(cache=True, error_model='numpy')(_solve_kepler_rows_serial)
+    _solve_kepler_rows_parallel = numba.njit(cache=True, parallel=True, error_model='numpy')(_solve_kepler_rows_parallel)
+    _propagate_rows_serial = numba.njit(cache=True, error_model='numpy')(_propagate_rows_serial)
+    _propagate_rows_parallel = numba.njit(cache=True, parallel=True, error_model='numpy')(_propagate_rows_parallel)
+
+
+def solve_kepler_scalar_jit(mean_anomaly: float,
+                            eccentricity: float,
+                            initial_guess: float,
+                            tolerance: float,
+                            max_iterations: int,
+                            halley_threshold: float) -> Tuple[float, int, bool]:
+    """
+    ケプラー方程式を1件解く（JIT版）
+    
+    Args:
+        mean_anomaly: 平均近点角 (rad)
+        eccentricity: 離心率
+        initial_guess: 離心近点角の初期推定値 (rad)
+        tolerance: 収束判定の許容誤差 (rad)
+        max_iterations: 1回の試行あたりの最大反復回数
+        halley_threshold: ハレー法を用いる離心率の下限
+    
+    Returns:
+        (離心近点角 (rad), 実行した反復回数の合計, 収束したかどうか)
+    """
+    return _solve_kepler_kernel(
+        float(mean_anomaly), float(eccentricity), float(initial_guess),
+        float(tolerance), int(max_iterations), float(halley_threshold)
+    )
+
+
+def solve_kepler_rows_jit(mean_anomaly: np.ndarray,
+                          eccentricity: np.ndarray,
+                          initial_guess: np.ndarray,
+                          tolerance: float,
+                          max_iterations: int,
+                          halley_threshold: float) -> Tuple[np.ndarray, int]:
+    """
+    1次元配列のケプラー方程式を一括して解く（JIT版）
+    
+    Args:
+        mean_anomaly: 平均近点角 (rad, 形状 (N,))
+        eccentricity: 離心率 (N,)
+        initial_guess: 離心近点角の初期推定値 (N,)
+        tolerance: 収束判定の許容誤差 (rad)
+        max_iterations: 最大反復回数
+        halley_threshold: ハレー法を用いる離心率の下限
+    
+    Returns:
+        (離心近点角 (N,), 最大反復回数)
+    """
+    n = mean_anomaly.shape[0]
+    out_E = np.empty(n, dtype=np.float64)
+    out_iterations = np.zeros(n, dtype=np.int64)
+    
+    kernel = _solve_kepler_rows_parallel if _jit_parallel else _solve_kepler_rows_serial
+    kernel(
+        np.ascontiguousarray(mean_anomaly, dtype=np.float64),
+        np.ascontiguousarray(eccentricity, dtype=np.float64),
+        np.ascontiguousarray(initial_guess, dtype=np.float64),
+        float(tolerance), int(max_iterations), float(halley_threshold),
+        out_E, out_iterations
+    )
+    
+    return out_E, int(out_iterations.max()) if n > 0 else 0
+
+
+def propagate_rows_jit(julian_date: float,
+                       a_km: np.ndarray,
+                       eccentricity: np.ndarray,
+                       mean_anomaly_at_epoch: np.ndarray,
+                       mean_motion: np.ndarray,
+                       epoch: np.ndarray,
+                       rotation: np.ndarray,
+                       last_mean_anomaly: np.ndarray,
+                       last_eccentric_anomaly: np.ndarray,
+                       has_solution: np.ndarray,
+                       tolerance: float,
+                       max_iterations: int,
+                       halley_threshold: float,
+                       out_positions: np.ndarray) -> int:
+    """
+    軌道要素の列から指定時刻の位置を一括計算（JIT版）
+    
+    平均近点角の計算からウォームスタート、ケプラー方程式、
+    座標変換までを1回のループで行います。配列引数はすべて
+    C連続である必要があり、ウォームスタート用の配列は上書きされます。
+    
+    Args:
+        julian_date: ユリウス日
+        a_km: 軌道長半径 (km, 形状 (N,))
+        eccentricity: 離心率 (N,)
+        mean_anomaly_at_epoch: 元期平均近点角 (度, (N,))
+        mean_motion: 平均運動 (rad/day, (N,))
+        epoch: 元期 (N,)
+        rotation: 軌道面から太陽中心座標系への回転行列 (N, 3, 3)
+        last_mean_anomaly: 前回の平均近点角 (N,)
+        last_eccentric_anomaly: 前回の離心近点角 (N,)
+        has_solution: 前回の解があるかどうか (N,)
+        tolerance: 収束判定の許容誤差 (rad)
+        max_iterations: 最大反復回数
+        halley_threshold: ハレー法を用いる離心率の下限
+        out_positions: 位置の出力先 (N, 3)
+    
+    Returns:
+        最大反復回数
+    """
+    n = a_km.shape[0]
+    out_iterations = np.zeros(n, dtype=np.int64)
+    
+    kernel = _propagate_rows_parallel if _jit_parallel else _propagate_rows_serial
+    kernel(
+        float(julian_date), a_km, eccentricity, mean_anomaly_at_epoch, mean_motion,
+        epoch, rotation, last_mean_anomaly, last_eccentric_anomaly, has_solution,
+        float(tolerance), int(max_iterations), float(halley_threshold),
+        out_positions, out_iterations
+    )
+    
+    return int(out_iterations.max()) if n > 0 else 0
\ No newline at end of file
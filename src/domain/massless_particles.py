@@ -0,0 +1,240 @@
+"""
+質量ゼロの試験粒子群クラスの実装
+
+小惑星帯などの質量を無視できる多数の小天体の状態を、
+固定長のチャンクに分けた連続配列で保持します。
+試験粒子は重力源にならず、質量を持つ天体からの重力のみを受けます。
+"""
+
+import numpy as np
+from typing import Iterator, List, Optional, Tuple
+
+
+class ParticleChunk:
+    """
+    試験粒子のチャンク
+    
+    位置・速度・加速度を (capacity, 3) の連続したfloat64配列で保持します。
+    先頭の count 行が有効です。
+    """
+    
+    def __init__(self, capacity: int):
+        """
+        チャンクの初期化
+        
+        Args:
+            capacity: チャンクの行数
+        """
+        self.count = 0
+        self._positions = np.zeros((capacity, 3), dtype=np.float64)      # km
+        self._velocities = np.zeros((capacity, 3), dtype=np.float64)     # km/s
+        self._accelerations = np.zeros((capacity, 3), dtype=np.float64)  # km/s²
+        self._ids = np.zeros(capacity, dtype=np.int64)
+    
+    @property
+    def capacity(self) -> int:
+        """チャンクの行数"""
+        return self._positions.shape[0]
+    
+    @property
+    def positions(self) -> np.ndarray:
+        """有効な行の位置配列 (count, 3) (km) のビュー"""
+        return self._positions[:self.count]
+    
+    @property
+    def velocities(self) -> np.ndarray:
+        """有効な行の速度配列 (count, 3) (km/s) のビュー"""
+        return self._velocities[:self.count]
+    
+    @property
+    def accelerations(self) -> np.ndarray:
+        """有効な行の加速度配列 (count, 3) (km/s²) のビュー"""
+        return self._accelerations[:self.count]
+    
+    @property
+    def ids(self) -> np.ndarray:
+        """有効な行の粒子IDのビュー"""
+        return self._ids[:self.count]
+
+
+class MasslessParticleSet:
+    """
+    質量ゼロの試験粒子群
+    
+    粒子を CHUNK_SIZE 行ごとのチャンクに格納します。粒子を追加しても
+    既存のチャンクは再確保されないため、チャンクの配列ビューは
+    粒子群が存在する限り有効です。
+    """
+    
+    # 1チャンクあたりの粒子数
+    CHUNK_SIZE = 65536
+    
+    def __init__(self, chunk_size: Optional[int] = None):
+        """
+        試験粒子群の初期化
+        
+        Args:
+            chunk_size: 1チャンクあたりの粒子数、Noneの場合は CHUNK_SIZE
+        
+        Raises:
+            ValueError: チャンクサイズが1未満の場合
+        """
+        chunk_size = self.CHUNK_SIZE if chunk_size is None else chunk_size
+        if chunk_size < 1:
+            raise ValueError(f"チャンクサイズは1以上である必要があります: {chunk_size}")
+        
+        self.chunk_size = chunk_size
+        self._chunks: List[ParticleChunk] = []
+        self._size = 0
+        self._next_id = 0
+        
+        # 加速度を計算したときの重力源の (位置, 質量)（次ステップでの再利用判定用）
+        self.acceleration_source: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    
+    def add_particles(self, positions: np.ndarray, velocities: np.ndarray) -> np.ndarray:
+        """
+        試験粒子を追加
+        
+        Args:
+            positions: 位置配列 (N, 3) (km)
+            velocities: 速度配列 (N, 3) (km/s)
+        
+        Returns:
+            追加した粒子のID配列 (N,)
+        
+        Raises:
+            ValueError: 配列の形状が不正な場合
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        velocities = np.asarray(velocities, dtype=np.float64).reshape(-1, 3)
+        if positions.shape != velocities.shape:
+            raise ValueError(
+                f"位置と速度の形状が一致しません: {positions.shape} != {velocities.shape}"
+            )
+        
+        count = positions.shape[0]
+        ids = np.arange(self._next_id, self._next_id + count, dtype=np.int64)
+        self._next_id += count
+        
+        # 末尾のチャンクの空きから順に詰める
+        written = 0
+        while written < count:
+            if not self._chunks or self._chunks[-1].count == self._chunks[-1].capacity:
+                self._chunks.append(ParticleChunk(self.chunk_size))
+            chunk = self._chunks[-1]
+            take = min(chunk.capacity - chunk.count, count - written)
+            rows = slice(chunk.count, chunk.count + take)
+            chunk._positions[rows] = positions[written:written + take]
+            chunk._velocities[rows] = velocities[written:written + take]
+            chunk._ids[rows] = ids[written:written + take]
+            chunk.count += take
+            written += take
+        
+        self._size += count
+        self.acceleration_source = None
+        return ids
+    
+    def chunks(self) -> Iterator[ParticleChunk]:
+        """粒子を含むチャンクを順に返す"""
+        return (chunk for chunk in self._chunks if chunk.count)
+    
+    def get_positions(self) -> np.ndarray:
+        """
+        全粒子の位置を取得
+        
+        Returns:
+            位置配列 (N, 3) (km) のコピー
+        """
+        if not self._size:
+            return np.empty((0, 3), dtype=np.float64)
+        return np.concatenate([chunk.positions for chunk in self.chunks()])
+    
+    def get_velocities(self) -> np.ndarray:
+        """
+        全粒子の速度を取得
+        
+        Returns:
+            速度配列 (N, 3) (km/s) のコピー
+        """
+        if not self._size:
+            return np.empty((0, 3), dtype=np.float64)
+        return np.concatenate([chunk.velocities for chunk in self.chunks()])
+    
+    def get_ids(self) -> np.ndarray:
+        """
+        全粒子のIDを取得
+        
+        Returns:
+            ID配列 (N,) のコピー
+        """
+        if not self._size:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([chunk.ids for chunk in self.chunks()])
+    
+    def get_accelerations(self) -> np.ndarray:
+        """
+        全粒子の直近の加速度を取得
+        
+        Returns:
+            加速度配列 (N, 3) (km/s²) のコピー
+        """
+        if not self._size:
+            return np.empty((0, 3), dtype=np.float64)
+        return np.concatenate([chunk.accelerations for chunk in self.chunks()])
+    
+    def restore(self, 
+                positions: np.ndarray, 
+                velocities: np.ndarray, 
+                ids: np.ndarray, 
+                accelerations: Optional[np.ndarray] = None, 
+                next_id: Optional[int] = None) -> None:
+        """
+        保存した状態から粒子を復元（既存の粒子は削除）
+        
+        Args:
+            positions: 位置配列 (N, 3) (km)
+            velocities: 速度配列 (N, 3) (km/s)
+            ids: 粒子のID配列 (N,)
+            accelerations: 加速度配列 (N, 3) (km/s²)、Noneの場合はゼロ
+            next_id: 次に割り当てるID、Noneの場合は最大ID + 1
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        self.clear()
+        self._next_id = 0
+        self.add_particles(positions, velocities)
+        
+        offset = 0
+        for chunk in self.chunks():
+            rows = slice(offset, offset + chunk.count)
+            chunk.ids[:] = ids[rows]
+            if accelerations is not None:
+                chunk.accelerations[:] = accelerations[rows]
+            offset += chunk.count
+        
+        if next_id is None:
+            next_id = int(ids.max()) + 1 if ids.size else 0
+        self._next_id = next_id
+    
+    def clear(self) -> None:
+        """全粒子を削除"""
+        self._chunks.clear()
+        self._size = 0
+        self.acceleration_source = None
+    
+    @property
+    def chunk_count(self) -> int:
+        """チャンク数"""
+        return len(self._chunks)
+    
+    @property
+    def next_id(self) -> int:
+        """次に追加する粒子に割り当てるID"""
+        return self._next_id
+    
+    def __len__(self) -> int:
+        """粒子数を返す"""
+        return self._size
+    
+    def __str__(self) -> str:
+        """文字列表現"""
+        return f"試験粒子群 ({self._size}個, {len(self._chunks)}チャンク)"
\ No newline at end of file
@@ -8,6 +8,7 @@
 import numpy as np
 from typing import Dict, Any
 from dataclasses import dataclass
+from src.domain.kepler import perifocal_rotation_matrix
 
 
 @dataclass
@@ -17,6 +18,8 @@ class OrbitalElements:
     
     ケプラー軌道の6つの軌道要素を保持し、
     軌道の形状と向きを完全に定義します。
+    回転行列・平均運動・半直弦などの派生量は初回参照時に計算して保持し、
+    フィールドへの代入時に破棄します。
     """
     
     semi_major_axis: float          # 軌道長半径 (AU)
@@ -32,6 +35,52 @@ class OrbitalElements:
         self._validate_parameters()
         self._normalize_angles()
     
+    def __setattr__(self, name: str, value: Any) -> None:
+        """フィールド代入時に派生量キャッシュを無効化し、リビジョンを進める"""
+        object.__setattr__(self, name, value)
+        if not name.startswith('_'):
+            self.__dict__['_derived'] = {}
+            self.__dict__['_revision'] = self.__dict__.get('_revision', 0) + 1
+    
+    @property
+    def revision(self) -> int:
+        """フィールドが代入されるたびに増加するリビジョン番号"""
+        return self._revision
+    
+    @property
+    def rotation_matrix(self) -> np.ndarray:
+        """
+        軌道面座標から太陽中心座標系への回転行列 (3×3、読み取り専用)
+        """
+        matrix = self._derived.get('rotation_matrix')
+        if matrix is None:
+            matrix = perifocal_rotation_matrix(
+                self.inclination,
+                self.longitude_of_ascending_node,
+                self.argument_of_perihelion
+            )
+            matrix.flags.writeable = False
+            self._derived['rotation_matrix'] = matrix
+        return matrix
+    
+    @property
+    def mean_motion(self) -> float:
+        """平均運動 (rad/day)"""
+        mean_motion = self._derived.get('mean_motion')
+        if mean_motion is None:
+            mean_motion = 2 * np.pi / self.get_orbital_period()
+            self._derived['mean_motion'] = mean_motion
+        return mean_motion
+    
+    @property
+    def semi_latus_rectum(self) -> float:
+        """半直弦 p = a(1 - e²) (AU)"""
+        semi_latus_rectum = self._derived.get('semi_latus_rectum')
+        if semi_latus_rectum is None:
+            semi_latus_rectum = self.semi_major_axis * (1 - self.eccentricity**2)
+            self._derived['semi_latus_rectum'] = semi_latus_rectum
+        return semi_latus_rectum
+    
     def _validate_parameters(self) -> None:
         """軌道要素の妥当性を検証"""
         if self.semi_major_axis <= 0:
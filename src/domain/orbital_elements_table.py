@@ -0,0 +1,354 @@
+"""
+軌道要素テーブルクラスの実装
+
+多数の天体の軌道要素を列指向（Structure of Arrays）の
+NumPy配列で保持し、全天体の位置を一括で計算します。
+"""
+
+import numpy as np
+from typing import Iterable, List, Tuple
+from src.domain.orbital_elements import OrbitalElements
+from src.domain import kepler_jit
+from src.domain.kepler import (
+    solve_kepler_equation_array, true_anomaly_array,
+    kepler_initial_guess, kepler_warm_start_guess, HIGH_ECCENTRICITY_THRESHOLD
+)
+
+
+class OrbitalElementsTable:
+    """
+    軌道要素テーブル
+    
+    a, e, i, Ω, ω, M0, epoch を連続したfloat64の列として保持し、
+    全行の位置を連続した (N, 3) 配列に一括計算します。
+    Planet.update_position と同じ計算式（太陽重力パラメータ基準）を使用します。
+    """
+    
+    COLUMNS: Tuple[str, ...] = (
+        'semi_major_axis',
+        'eccentricity',
+        'inclination',
+        'longitude_of_ascending_node',
+        'argument_of_perihelion',
+        'mean_anomaly_at_epoch',
+        'epoch'
+    )
+    
+    # 天文単位をkmに変換する係数
+    AU_TO_KM = 149597870.7
+    
+    # ケプラー方程式の数値解法設定（Planetと同一）
+    KEPLER_TOLERANCE = 1e-12
+    KEPLER_MAX_ITERATIONS = 10
+    
+    def __init__(self, capacity: int = 16):
+        """
+        軌道要素テーブルの初期化
+        
+        Args:
+            capacity: 初期確保する行数
+        """
+        self._size = 0
+        self._capacity = 0
+        
+        # 再確保のたびに増加（位置ビューの再バインド判定用）
+        self.buffer_generation = 0
+        
+        # 軌道要素を書き換えるたびに増加（計算済み位置の再利用判定用）
+        self.version = 0
+        
+        # 各行に書き込んだ軌道要素オブジェクトとそのリビジョン（変更の検出用）
+        self._row_elements: List[OrbitalElements] = []
+        self._row_revisions: List[int] = []
+        
+        self._columns = {name: np.empty(0, dtype=np.float64) for name in self.COLUMNS}
+        self._mean_motion = np.empty(0, dtype=np.float64)      # rad/day
+        self._rotation = np.empty((0, 3, 3), dtype=np.float64)
+        self._positions = np.empty((0, 3), dtype=np.float64)   # km
+        
+        # ケプラー方程式のウォームスタート用の前回解
+        self._last_mean_anomaly = np.empty(0, dtype=np.float64)
+        self._last_eccentric_anomaly = np.empty(0, dtype=np.float64)
+        self._has_solution = np.empty(0, dtype=bool)
+        
+        # 反復回数の統計
+        self.last_kepler_iterations = 0
+        self.kepler_iteration_total = 0
+        
+        self._reserve(max(1, capacity))
+    
+    @classmethod
+    def from_elements(cls, elements_list: Iterable[OrbitalElements]) -> 'OrbitalElementsTable':
+        """
+        軌道要素のリストからテーブルを作成
+        
+        Args:
+            elements_list: 軌道要素のイテラブル
+        
+        Returns:
+            軌道要素テーブル
+        """
+        elements_list = list(elements_list)
+        table = cls(capacity=max(1, len(elements_list)))
+        for elements in elements_list:
+            table.append(elements)
+        return table
+    
+    def _reserve(self, capacity: int) -> None:
+        """
+        指定行数以上の領域を確保（既存データはコピー）
+        
+        Args:
+            capacity: 必要な行数
+        """
+        if capacity <= self._capacity:
+            return
+        
+        n = self._size
+        for name, column in self._columns.items():
+            new_column = np.zeros(capacity, dtype=np.float64)
+            new_column[:n] = column[:n]
+            self._columns[name] = new_column
+        
+        new_mean_motion = np.zeros(capacity, dtype=np.float64)
+        new_mean_motion[:n] = self._mean_motion[:n]
+        self._mean_motion = new_mean_motion
+        
+        new_rotation = np.zeros((capacity, 3, 3), dtype=np.float64)
+        new_rotation[:n] = self._rotation[:n]
+        self._rotation = new_rotation
+        
+        new_positions = np.zeros((capacity, 3), dtype=np.float64)
+        new_positions[:n] = self._positions[:n]
+        self._positions = new_positions
+        
+        new_last_mean_anomaly = np.zeros(capacity, dtype=np.float64)
+        new_last_mean_anomaly[:n] = self._last_mean_anomaly[:n]
+        self._last_mean_anomaly = new_last_mean_anomaly
+        
+        new_last_eccentric_anomaly = np.zeros(capacity, dtype=np.float64)
+        new_last_eccentric_anomaly[:n] = self._last_eccentric_anomaly[:n]
+        self._last_eccentric_anomaly = new_last_eccentric_anomaly
+        
+        new_has_solution = np.zeros(capacity, dtype=bool)
+        new_has_solution[:n] = self._has_solution[:n]
+        self._has_solution = new_has_solution
+        
+        self._capacity = capacity
+        self.buffer_generation += 1
+    
+    def append(self, elements: OrbitalElements) -> int:
+        """
+        軌道要素を1行追加
+        
+        Args:
+            elements: 追加する軌道要素
+        
+        Returns:
+            追加した行のインデックス
+        """
+        if self._size >= self._capacity:
+            self._reserve(self._capacity * 2)
+        
+        row = self._size
+        self._write_row(row, elements)
+        self._size += 1
+        return row
+    
+    def update_row(self, row: int, elements: OrbitalElements) -> None:
+        """
+        指定行の軌道要素を置き換え
+        
+        Args:
+            row: 行インデックス
+            elements: 新しい軌道要素
+        """
+        if not (0 <= row < self._size):
+            raise IndexError(f"行インデックスが範囲外です: {row}")
+        self._write_row(row, elements)
+    
+    def _write_row(self, row: int, elements: OrbitalElements) -> None:
+        """軌道要素と派生量（平均運動・回転行列）を指定行に書き込み"""
+        for name in self.COLUMNS:
+            self._columns[name][row] = getattr(elements, name)
+        
+        self._mean_motion[row] = elements.mean_motion
+        self._rotation[row] = elements.rotation_matrix
+        self._has_solution[row] = False
+        
+        if row == len(self._row_elements):
+            self._row_elements.append(elements)
+            self._row_revisions.append(elements.revision)
+        else:
+            self._row_elements[row] = elements
+            self._row_revisions[row] = elements.revision
+        self.version += 1
+    
+    def sync_rows(self, elements_list: Iterable[OrbitalElements]) -> int:
+        """
+        各行の軌道要素が差し替え・変更されていれば書き込み直す
+        
+        書き込んだ時点のオブジェクトとリビジョンを比較し、異なる行のみ
+        update_row() で書き込みます。
+        
+        Args:
+            elements_list: 行順の現在の軌道要素
+        
+        Returns:
+            書き込み直した行数
+        """
+        updated = 0
+        for row, elements in enumerate(elements_list):
+            if (elements is not self._row_elements[row] or
+                    elements.revision != self._row_revisions[row]):
+                self.update_row(row, elements)
+                updated += 1
+        return updated
+    
+    def clear(self) -> None:
+        """全行を削除（確保済み領域は保持）"""
+        self._size = 0
+        self._row_elements.clear()
+        self._row_revisions.clear()
+        self.version += 1
+    
+    def column(self, name: str) -> np.ndarray:
+        """
+        列のビューを取得
+        
+        Args:
+            name: 列名（COLUMNSのいずれか）
+        
+        Returns:
+            長さNの連続したfloat64配列（ビュー）
+        """
+        if name not in self._columns:
+            raise KeyError(f"不明な列名です: {name}")
+        return self._columns[name][:self._size]
+    
+    def get_elements(self, row: int) -> OrbitalElements:
+        """
+        指定行の軌道要素オブジェクトを作成
+        
+        Args:
+            row: 行インデックス
+        
+        Returns:
+            軌道要素
+        """
+        if not (0 <= row < self._size):
+            raise IndexError(f"行インデックスが範囲外です: {row}")
+        return OrbitalElements(**{name: float(self._columns[name][row]) for name in self.COLUMNS})
+    
+    def as_array(self) -> np.ndarray:
+        """
+        (N, 7) 配列としてコピーを取得（列順はCOLUMNS）
+        
+        Returns:
+            軌道要素配列
+        """
+        return np.column_stack([self.column(name) for name in self.COLUMNS])
+    
+    @property
+    def positions(self) -> np.ndarray:
+        """全行の位置配列 (N, 3) のビュー (km)"""
+        return self._positions[:self._size]
+    
+    def position_view(self, row: int) -> np.ndarray:
+        """
+        指定行の位置ベクトルのビューを取得
+        
+        Args:
+            row: 行インデックス
+        
+        Returns:
+            形状 (3,) のビュー (km)
+        """
+        if not (0 <= row < self._size):
+            raise IndexError(f"行インデックスが範囲外です: {row}")
+        return self._positions[row]
+    
+    def compute_positions(self, julian_date: float) -> np.ndarray:
+        """
+        全行の位置を一括計算して位置配列を更新
+        
+        Args:
+            julian_date: ユリウス日
+        
+        Returns:
+            更新された位置配列 (N, 3) のビュー (km)
+        """
+        n = self._size
+        if n == 0:
+            return self.positions
+        
+        a = self._columns['semi_major_axis'][:n]
+        e = self._columns['eccentricity'][:n]
+        mean_anomaly_at_epoch = self._columns['mean_anomaly_at_epoch'][:n]
+        epoch = self._columns['epoch'][:n]
+        rotation = self._rotation[:n]
+        positions = self._positions[:n]
+        has_solution = self._has_solution[:n]
+        
+        if kepler_jit.is_jit_enabled():
+            # 平均近点角から座標変換までをJITカーネルで一括実行
+            iterations = kepler_jit.propagate_rows_jit(
+                julian_date, a * self.AU_TO_KM, e, mean_anomaly_at_epoch,
+                self._mean_motion[:n], epoch, rotation,
+                self._last_mean_anomaly[:n], self._last_eccentric_anomaly[:n], has_solution,
+                self.KEPLER_TOLERANCE, self.KEPLER_MAX_ITERATIONS,
+                HIGH_ECCENTRICITY_THRESHOLD, positions
+            )
+            self.last_kepler_iterations = iterations
+            self.kepler_iteration_total += iterations
+            return positions
+        
+        # 平均近点角の計算
+        time_since_epoch = julian_date - epoch
+        mean_anomaly = (
+            np.radians(mean_anomaly_at_epoch) +
+            self._mean_motion[:n] * time_since_epoch
+        ) % (2 * np.pi)
+        
+        # 離心近点角の計算（前回の解がある行はウォームスタート）
+        initial_guess = kepler_initial_guess(mean_anomaly, e)
+        if has_solution.any():
+            warm_guess = kepler_warm_start_guess(
+                mean_anomaly, e,
+                self._last_mean_anomaly[:n], self._last_eccentric_anomaly[:n]
+            )
+            initial_guess = np.where(has_solution, warm_guess, initial_guess)
+        
+        eccentric_anomaly, iterations = solve_kepler_equation_array(
+            mean_anomaly, e, self.KEPLER_TOLERANCE, self.KEPLER_MAX_ITERATIONS,
+            initial_guess
+        )
+        
+        # 真近点角の計算
+        true_anomaly = true_anomaly_array(eccentric_anomaly, e)
+        cos_nu = np.cos(true_anomaly)
+        
+        # 軌道面での位置 (km)
+        orbital_radius = a * self.AU_TO_KM * (1 - e**2) / (1 + e * cos_nu)
+        x_orb = orbital_radius * cos_nu
+        y_orb = orbital_radius * np.sin(true_anomaly)
+        
+        # 太陽中心座標系への変換（回転行列の第1・第2列）
+        np.multiply(rotation[:, :, 0], x_orb[:, np.newaxis], out=positions)
+        positions += rotation[:, :, 1] * y_orb[:, np.newaxis]
+        
+        self._last_mean_anomaly[:n] = mean_anomaly
+        self._last_eccentric_anomaly[:n] = eccentric_anomaly
+        has_solution[:] = True
+        self.last_kepler_iterations = iterations
+        self.kepler_iteration_total += iterations
+        
+        return positions
+    
+    def __len__(self) -> int:
+        """行数を返す"""
+        return self._size
+    
+    def __str__(self) -> str:
+        """文字列表現"""
+        return f"OrbitalElementsTable ({self._size}行, 確保済み: {self._capacity}行)"
\ No newline at end of file
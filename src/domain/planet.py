@@ -9,6 +9,7 @@ import numpy as np
 from typing import Dict, Any, Optional, Tuple
 from src.domain.celestial_body import CelestialBody
 from src.domain.orbital_elements import OrbitalElements
+from src.domain.kepler import kepler_warm_start_guess, solve_kepler_equation_scalar
 
 
 class Planet(CelestialBody):
@@ -55,6 +56,50 @@ class Planet(CelestialBody):
         
         # 現在のユリウス日を追跡
         self.current_julian_date = orbital_elements.epoch
+        
+        # ケプラー方程式のウォームスタート用の前回解
+        # (軌道要素のid, 改訂番号, 平均近点角, 離心近点角)
+        self._kepler_state: Optional[Tuple[int, int, float, float]] = None
+        self.last_kepler_iterations = 0
+        self.kepler_iteration_total = 0
+    
+    @property
+    def position(self) -> np.ndarray:
+        """位置ベクトル (km)"""
+        return self._position
+    
+    @position.setter
+    def position(self, value: np.ndarray) -> None:
+        """
+        位置ベクトルを設定
+        
+        軌道要素テーブルの位置配列にバインドされている場合は、
+        ビューを保ったまま値をコピーします。
+        """
+        if getattr(self, '_position_is_view', False):
+            self._position[...] = value
+        else:
+            self._position = value
+    
+    def bind_position_buffer(self, buffer: np.ndarray) -> None:
+        """
+        位置ベクトルを外部の配列（ビュー）にバインド
+        
+        現在の位置をバッファへコピーし、以後の位置更新は
+        バッファ上で直接行われます。
+        
+        Args:
+            buffer: 形状 (3,) のfloat64配列ビュー
+        """
+        buffer[...] = self._position
+        self._position = buffer
+        self._position_is_view = True
+    
+    def unbind_position_buffer(self) -> None:
+        """位置ベクトルのバインドを解除し、独立した配列に戻す"""
+        if getattr(self, '_position_is_view', False):
+            self._position = self._position.copy()
+            self._position_is_view = False
     
     def update_position(self, julian_date: float) -> None:
         """
@@ -72,7 +117,7 @@ class Planet(CelestialBody):
         time_since_epoch = julian_date - self.orbital_elements.epoch
         
         # 平均近点角の計算
-        mean_motion = 2 * np.pi / self.orbital_elements.get_orbital_period()
+        mean_motion = self.orbital_elements.mean_motion
         mean_anomaly = (
             np.radians(self.orbital_elements.mean_anomaly_at_epoch) +
             mean_motion * time_since_epoch
@@ -105,7 +150,9 @@ class Planet(CelestialBody):
         """
         ケプラー方程式を数値的に解く
         
-        M = E - e*sin(E) を E について解く
+        M = E - e*sin(E) を E について解きます。
+        同じ軌道要素での前回の解がある場合はそこから外挿した値を
+        初期推定値とし、反復回数を last_kepler_iterations に記録します。
         
         Args:
             mean_anomaly: 平均近点角 (ラジアン)
@@ -114,20 +161,22 @@ class Planet(CelestialBody):
         Returns:
             離心近点角 (ラジアン)
         """
-        # 初期推定値
-        E = mean_anomaly
+        elements = self.orbital_elements
+        state = self._kepler_state
         
-        # ニュートン・ラフソン法
-        for _ in range(10):  # 最大10回の反復
-            f = E - eccentricity * np.sin(E) - mean_anomaly
-            f_prime = 1 - eccentricity * np.cos(E)
-            
-            delta_E = f / f_prime
-            E -= delta_E
-            
-            # 収束判定
-            if abs(delta_E) < 1e-12:
-                break
+        initial_guess = None
+        if state is not None and state[0] == id(elements) and state[1] == elements.revision:
+            initial_guess = kepler_warm_start_guess(
+                mean_anomaly, eccentricity, state[2], state[3]
+            )
+        
+        E, iterations, _ = solve_kepler_equation_scalar(
+            mean_anomaly, eccentricity, 1e-12, 10, initial_guess
+        )
+        
+        self._kepler_state = (id(elements), elements.revision, mean_anomaly, E)
+        self.last_kepler_iterations = iterations
+        self.kepler_iteration_total += iterations
         
         return E
     
@@ -161,10 +210,10 @@ class Planet(CelestialBody):
         Returns:
             軌道半径 (km)
         """
-        a = orbital_elements.semi_major_axis * self.AU_TO_KM
+        p = orbital_elements.semi_latus_rectum * self.AU_TO_KM
         e = orbital_elements.eccentricity
         
-        return a * (1 - e**2) / (1 + e * np.cos(true_anomaly))
+        return p / (1 + e * np.cos(true_anomaly))
     
     def _calculate_orbital_position(self, true_anomaly: float, orbital_radius: float) -> np.ndarray:
         """
@@ -193,42 +242,13 @@ class Planet(CelestialBody):
         Returns:
             太陽中心座標系での位置ベクトル (km)
         """
-        # 角度をラジアンに変換
-        i = np.radians(orbital_elements.inclination)
-        omega = np.radians(orbital_elements.longitude_of_ascending_node)
-        w = np.radians(orbital_elements.argument_of_perihelion)
-        
-        # 回転行列の計算
-        cos_omega = np.cos(omega)
-        sin_omega = np.sin(omega)
-        cos_i = np.cos(i)
-        sin_i = np.sin(i)
-        cos_w = np.cos(w)
-        sin_w = np.sin(w)
-        
-        # 3次元回転行列
-        R11 = cos_omega * cos_w - sin_omega * sin_w * cos_i
-        R12 = -cos_omega * sin_w - sin_omega * cos_w * cos_i
-        R13 = sin_omega * sin_i
-        
-        R21 = sin_omega * cos_w + cos_omega * sin_w * cos_i
-        R22 = -sin_omega * sin_w + cos_omega * cos_w * cos_i
-        R23 = -cos_omega * sin_i
-        
-        R31 = sin_w * sin_i
-        R32 = cos_w * sin_i
-        R33 = cos_i
-        
-        # 軌道面座標を3次元に拡張
-        x_orb, y_orb = orbital_position
-        z_orb = 0.0
+        # 軌道要素にキャッシュされた回転行列を使用
+        rotation = orbital_elements.rotation_matrix
         
-        # 座標変換
-        x = R11 * x_orb + R12 * y_orb + R13 * z_orb
-        y = R21 * x_orb + R22 * y_orb + R23 * z_orb
-        z = R31 * x_orb + R32 * y_orb + R33 * z_orb
+        # 軌道面座標（z=0）なので第1・第2列のみ寄与
+        x_orb, y_orb = orbital_position
         
-        return np.array([x, y, z])
+        return rotation[:, 0] * x_orb + rotation[:, 1] * y_orb
     
     def _calculate_rotation_angle(self) -> float:
         """
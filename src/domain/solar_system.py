@@ -6,10 +6,15 @@
 """
 
 import numpy as np
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from src.domain.celestial_body import CelestialBody
 from src.domain.sun import Sun
 from src.domain.planet import Planet
+from src.domain.orbital_elements_table import OrbitalElementsTable
+from src.domain.massless_particles import MasslessParticleSet
+from src.domain.system_diagnostics import (
+    pack_bodies, total_energy_array, angular_momentum_array, center_of_mass_array
+)
 
 
 class SolarSystem:
@@ -25,6 +30,22 @@ class SolarSystem:
         self.sun: Optional[Sun] = None
         self.planets: Dict[str, Planet] = {}
         self.current_date: float = 0.0  # ユリウス日
+        
+        # 惑星の軌道要素テーブル（行順は _table_planets と一致）
+        self.elements_table = OrbitalElementsTable()
+        self._table_planets: List[Planet] = []
+        
+        # 質量ゼロの試験粒子（小惑星帯など。重力源にならない）
+        self.test_particles = MasslessParticleSet()
+        
+        # 最後に位置を計算した (ユリウス日, 軌道要素テーブル, テーブルの版)
+        # 惑星の軌道要素のリビジョンの変更は、行の書き込み直しで版に反映される
+        self._computed_state: Optional[Tuple[float, OrbitalElementsTable, int]] = None
+        self.skipped_update_count = 0
+        
+        # コンパイル済みの暦（ChebyshevEphemeris）と、設定時の (軌道要素テーブル, テーブルの版)
+        self.ephemeris: Optional[Any] = None
+        self._ephemeris_state: Optional[Tuple[OrbitalElementsTable, int]] = None
     
     def add_celestial_body(self, body: CelestialBody) -> None:
         """
@@ -42,8 +63,69 @@ class SolarSystem:
             if body.name in self.planets:
                 raise ValueError(f"惑星 '{body.name}' は既に存在します")
             self.planets[body.name] = body
+            self._append_to_elements_table(body)
         else:
             raise TypeError("太陽系に追加できるのは Sun または Planet のみです")
+        self.invalidate_positions()
+    
+    def _append_to_elements_table(self, planet: Planet) -> None:
+        """
+        惑星を軌道要素テーブルに追加し、位置をテーブルのビューにバインド
+        
+        Args:
+            planet: 追加する惑星
+        """
+        generation = self.elements_table.buffer_generation
+        row = self.elements_table.append(planet.orbital_elements)
+        self._table_planets.append(planet)
+        
+        if self.elements_table.buffer_generation != generation:
+            # 領域が再確保された場合は全惑星のビューを張り直す
+            self._bind_position_views()
+        else:
+            planet.bind_position_buffer(self.elements_table.position_view(row))
+    
+    def _bind_position_views(self) -> None:
+        """全惑星の位置をテーブルの位置配列のビューにバインド"""
+        for row, planet in enumerate(self._table_planets):
+            planet.unbind_position_buffer()
+            planet.bind_position_buffer(self.elements_table.position_view(row))
+    
+    def rebuild_elements_table(self) -> None:
+        """
+        現在の惑星群から軌道要素テーブルを再構築
+        
+        planets 辞書を直接変更した場合や、惑星の軌道要素を
+        差し替えた場合に呼び出します。
+        """
+        for planet in self._table_planets:
+            planet.unbind_position_buffer()
+        
+        self.invalidate_positions()
+        self.elements_table = OrbitalElementsTable(capacity=max(1, len(self.planets)))
+        self._table_planets = []
+        for planet in self.planets.values():
+            self.elements_table.append(planet.orbital_elements)
+            self._table_planets.append(planet)
+        
+        self._bind_position_views()
+    
+    def add_test_particles(self, positions: np.ndarray, velocities: np.ndarray) -> np.ndarray:
+        """
+        質量ゼロの試験粒子を追加
+        
+        Args:
+            positions: 位置配列 (N, 3) (km)
+            velocities: 速度配列 (N, 3) (km/s)
+        
+        Returns:
+            追加した粒子のID配列 (N,)
+        """
+        return self.test_particles.add_particles(positions, velocities)
+    
+    def get_test_particle_count(self) -> int:
+        """試験粒子数を取得"""
+        return len(self.test_particles)
     
     def get_planet_by_name(self, name: str) -> Optional[Planet]:
         """
@@ -61,18 +143,114 @@ class SolarSystem:
         """
         全天体の位置を更新
         
+        同じユリウス日・同じ軌道要素で計算済みの場合は何もしません
+        （skipped_update_count に数えます）。
+        
         Args:
             julian_date: ユリウス日
         """
+        # 惑星群がテーブルと一致しない場合は再構築
+        if self.planets and len(self._table_planets) != len(self.planets):
+            self.rebuild_elements_table()
+        else:
+            self._sync_elements_table()
+        
+        # 軌道要素の変更は書き込み直した行でテーブルの版に反映される
+        state = (julian_date, self.elements_table, self.elements_table.version)
+        if self._computed_state == state:
+            self.skipped_update_count += 1
+            return
+        
         self.current_date = julian_date
         
         # 太陽の位置更新（原点に固定）
         if self.sun:
             self.sun.update_position(julian_date)
         
-        # 全惑星の位置更新
-        for planet in self.planets.values():
-            planet.update_position(julian_date)
+        if self.planets:
+            # 全惑星の位置を一括計算（各惑星の位置はテーブルのビュー）
+            if not self._positions_from_ephemeris(julian_date):
+                self.elements_table.compute_positions(julian_date)
+            
+            for planet in self._table_planets:
+                planet.current_julian_date = julian_date
+        
+        self._computed_state = state
+    
+    def attach_ephemeris(self, ephemeris: Optional[Any]) -> None:
+        """
+        コンパイル済みの暦を設定
+        
+        暦の範囲内の時刻では、惑星の位置を軌道要素からではなく暦の多項式の
+        評価で求めます。設定後に惑星の追加や軌道要素の変更でテーブルが
+        変わった場合は、暦を使わず軌道要素から計算します。
+        
+        Args:
+            ephemeris: ChebyshevEphemeris（body_names・covers・evaluate を持つもの）、
+                Noneの場合は解除
+        """
+        if self.planets and len(self._table_planets) != len(self.planets):
+            self.rebuild_elements_table()
+        
+        self.invalidate_positions()
+        self.ephemeris = ephemeris
+        self._ephemeris_state = None if ephemeris is None else (self.elements_table, self.elements_table.version)
+    
+    def _positions_from_ephemeris(self, julian_date: float) -> bool:
+        """
+        暦で惑星の位置をテーブルに書き込む
+        
+        Returns:
+            暦で位置を求めた場合True（暦が無い・範囲外・古い・天体が足りない場合はFalse）
+        """
+        ephemeris = self.ephemeris
+        if ephemeris is None or not ephemeris.covers(julian_date):
+            return False
+        if self._ephemeris_state != (self.elements_table, self.elements_table.version):
+            return False
+        
+        names = [planet.name for planet in self._table_planets]
+        if not set(names) <= set(ephemeris.body_names):
+            return False
+        
+        positions, _ = ephemeris.evaluate(julian_date, names)
+        self.elements_table.positions[:] = positions[:, 0]
+        return True
+    
+    def invalidate_positions(self) -> None:
+        """
+        計算済みの位置を無効化
+        
+        軌道要素を書き換えた場合や、天体の位置を外部から設定した場合に
+        呼び出すと、次の update_all_positions で必ず再計算します。
+        書き換え・差し替えられた軌道要素はこの時点でテーブルに書き込み直します。
+        """
+        self._computed_state = None
+        self._sync_elements_table()
+    
+    def mark_positions_computed(self, julian_date: float) -> None:
+        """
+        天体の現在の位置を指定したユリウス日で計算済みとして扱う
+        
+        N体計算の結果など、軌道要素以外で求めた位置を天体に設定した場合に
+        呼び出すと、同じユリウス日の update_all_positions で軌道要素による
+        位置に上書きされません。
+        
+        Args:
+            julian_date: 位置を設定したユリウス日
+        """
+        self._sync_elements_table()
+        self.current_date = julian_date
+        self._computed_state = (julian_date, self.elements_table, self.elements_table.version)
+    
+    def _sync_elements_table(self) -> int:
+        """
+        軌道要素を書き換え・差し替えた惑星のテーブルの行を書き込み直す
+        
+        Returns:
+            書き込み直した行数
+        """
+        return self.elements_table.sync_rows(planet.orbital_elements for planet in self._table_planets)
     
     def get_all_bodies(self) -> List[CelestialBody]:
         """
@@ -114,7 +292,10 @@ class SolarSystem:
             }
         
         # 全惑星の位置から境界を計算
-        positions = np.array([planet.position for planet in self.planets.values()])
+        if len(self._table_planets) == len(self.planets):
+            positions = self.elements_table.positions
+        else:
+            positions = np.array([planet.position for planet in self.planets.values()])
         
         return {
             'min_x': float(np.min(positions[:, 0])),
@@ -132,23 +313,8 @@ class SolarSystem:
         Returns:
             質量中心の位置ベクトル (km)
         """
-        total_mass = 0.0
-        weighted_position = np.zeros(3)
-        
-        # 太陽の寄与
-        if self.sun:
-            total_mass += self.sun.mass
-            weighted_position += self.sun.mass * self.sun.position
-        
-        # 惑星の寄与
-        for planet in self.planets.values():
-            total_mass += planet.mass
-            weighted_position += planet.mass * planet.position
-        
-        if total_mass == 0:
-            return np.zeros(3)
-        
-        return weighted_position / total_mass
+        positions, _, masses = pack_bodies(self.get_all_bodies())
+        return center_of_mass_array(positions, masses)
     
     def get_total_energy(self) -> float:
         """
@@ -157,26 +323,8 @@ class SolarSystem:
         Returns:
             全エネルギー (J)
         """
-        total_kinetic = 0.0
-        total_potential = 0.0
-        
-        bodies = self.get_all_bodies()
-        
-        # 運動エネルギーの計算
-        for body in bodies:
-            total_kinetic += body.get_kinetic_energy()
-        
-        # ポテンシャルエネルギーの計算
-        G = 6.67430e-11  # 重力定数
-        
-        for i, body1 in enumerate(bodies):
-            for body2 in bodies[i+1:]:
-                r = body1.distance_to(body2) * 1000  # km -> m
-                if r > 0:
-                    potential_energy = -G * body1.mass * body2.mass / r
-                    total_potential += potential_energy
-        
-        return total_kinetic + total_potential
+        positions, velocities, masses = pack_bodies(self.get_all_bodies())
+        return total_energy_array(positions, velocities, masses)
     
     def get_angular_momentum(self) -> np.ndarray:
         """
@@ -185,20 +333,8 @@ class SolarSystem:
         Returns:
             角運動量ベクトル (kg⋅m²/s)
         """
-        total_angular_momentum = np.zeros(3)
-        
-        bodies = self.get_all_bodies()
-        
-        for body in bodies:
-            # 位置と運動量ベクトル
-            r = body.position * 1000  # km -> m
-            p = body.get_momentum()
-            
-            # 角運動量 L = r × p
-            angular_momentum = np.cross(r, p)
-            total_angular_momentum += angular_momentum
-        
-        return total_angular_momentum
+        positions, velocities, masses = pack_bodies(self.get_all_bodies())
+        return angular_momentum_array(positions, velocities, masses)
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -238,7 +374,7 @@ class SolarSystem:
         # 惑星の復元
         for planet_data in data.get('planets', []):
             planet = Planet.from_dict(planet_data)
-            solar_system.planets[planet.name] = planet
+            solar_system.add_celestial_body(planet)
         
         return solar_system
     
@@ -255,6 +391,13 @@ class SolarSystem:
         self.sun = None
         self.planets.clear()
         self.current_date = 0.0
+        self.invalidate_positions()
+        
+        for planet in self._table_planets:
+            planet.unbind_position_buffer()
+        self.elements_table.clear()
+        self._table_planets.clear()
+        self.test_particles.clear()
     
     def __len__(self) -> int:
         """天体数を返す"""
@@ -0,0 +1,195 @@
+"""
+多体系の保存量の一括計算
+
+位置 (km)・速度 (km/s)・質量 (kg) の配列から、全エネルギー、
+運動量、角運動量、質量中心を天体ごとのループなしに計算します。
+戻り値はSI単位（J, kg⋅m/s, kg⋅m²/s）で、CelestialBody の各メソッドと一致します。
+"""
+
+import numpy as np
+from typing import Tuple
+
+
+# 重力定数 (m³ kg⁻¹ s⁻²)
+GRAVITATIONAL_CONSTANT = 6.67430e-11
+
+# ポテンシャルエネルギー計算で一度に扱う天体の組の最大数
+POTENTIAL_BLOCK_PAIRS = 1 << 20
+
+
+def kinetic_energy_array(velocities: np.ndarray, masses: np.ndarray) -> float:
+    """
+    全運動エネルギーを計算
+    
+    Args:
+        velocities: 速度配列 (N, 3) (km/s)
+        masses: 質量配列 (N,) (kg)
+    
+    Returns:
+        運動エネルギー (J)
+    """
+    velocities = np.asarray(velocities, dtype=np.float64) * 1000  # km/s -> m/s
+    return float(0.5 * np.dot(masses, np.einsum('ij,ij->i', velocities, velocities)))
+
+
+def potential_energy_array(positions: np.ndarray,
+                           masses: np.ndarray,
+                           gravitational_constant: float = GRAVITATIONAL_CONSTANT) -> float:
+    """
+    全重力ポテンシャルエネルギーを計算（距離がゼロの組は除外）
+    
+    Args:
+        positions: 位置配列 (N, 3) (km)
+        masses: 質量配列 (N,) (kg)
+        gravitational_constant: 重力定数 (m³ kg⁻¹ s⁻²)
+    
+    Returns:
+        ポテンシャルエネルギー (J)
+    """
+    positions = np.asarray(positions, dtype=np.float64) * 1000  # km -> m
+    masses = np.asarray(masses, dtype=np.float64)
+    n = positions.shape[0]
+    
+    total = 0.0
+    block_size = max(1, POTENTIAL_BLOCK_PAIRS // max(n, 1))
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        
+        # 各行 i について j > i の組のみを数える
+        displacement = positions[np.newaxis, :, :] - positions[start:stop, np.newaxis, :]
+        distance = np.sqrt(np.einsum('ijk,ijk->ij', displacement, displacement))
+        upper = np.arange(n)[np.newaxis, :] > np.arange(start, stop)[:, np.newaxis]
+        valid = upper & (distance > 0)
+        
+        inverse_distance = np.divide(1.0, distance, out=np.zeros_like(distance), where=valid)
+        total -= float(masses[start:stop] @ inverse_distance @ masses)
+    
+    return gravitational_constant * total
+
+
+def total_energy_array(positions: np.ndarray,
+                       velocities: np.ndarray,
+                       masses: np.ndarray,
+                       gravitational_constant: float = GRAVITATIONAL_CONSTANT) -> float:
+    """
+    全エネルギー（運動エネルギー + ポテンシャルエネルギー）を計算
+    
+    Args:
+        positions: 位置配列 (N, 3) (km)
+        velocities: 速度配列 (N, 3) (km/s)
+        masses: 質量配列 (N,) (kg)
+        gravitational_constant: 重力定数 (m³ kg⁻¹ s⁻²)
+    
+    Returns:
+        全エネルギー (J)
+    """
+    return (kinetic_energy_array(velocities, masses) +
+            potential_energy_array(positions, masses, gravitational_constant))
+
+
+def total_energy_ensemble(positions: np.ndarray,
+                          velocities: np.ndarray,
+                          masses: np.ndarray,
+                          gravitational_constant: float = GRAVITATIONAL_CONSTANT) -> np.ndarray:
+    """
+    アンサンブルの各メンバーの全エネルギーを計算
+    
+    Args:
+        positions: 位置配列 (M, N, 3) (km)
+        velocities: 速度配列 (M, N, 3) (km/s)
+        masses: 質量配列 (N,) または (M, N) (kg)
+        gravitational_constant: 重力定数 (m³ kg⁻¹ s⁻²)
+    
+    Returns:
+        全エネルギーの配列 (M,) (J)
+    """
+    positions = np.asarray(positions, dtype=np.float64) * 1000     # km -> m
+    velocities = np.asarray(velocities, dtype=np.float64) * 1000   # km/s -> m/s
+    m, n = positions.shape[:2]
+    masses = np.broadcast_to(np.asarray(masses, dtype=np.float64), (m, n))
+    
+    energies = 0.5 * np.einsum('bi,bij,bij->b', masses, velocities, velocities)
+    
+    upper = np.triu(np.ones((n, n), dtype=bool), k=1)
+    block_size = max(1, POTENTIAL_BLOCK_PAIRS // max(n * n, 1))
+    for start in range(0, m, block_size):
+        stop = min(start + block_size, m)
+        displacement = positions[start:stop, np.newaxis, :, :] - positions[start:stop, :, np.newaxis, :]
+        distance = np.sqrt(np.einsum('bijk,bijk->bij', displacement, displacement))
+        valid = upper & (distance > 0)
+        inverse_distance = np.divide(1.0, distance, out=np.zeros_like(distance), where=valid)
+        energies[start:stop] -= gravitational_constant * np.einsum(
+            'bi,bij,bj->b', masses[start:stop], inverse_distance, masses[start:stop]
+        )
+    
+    return energies
+
+
+def linear_momentum_array(velocities: np.ndarray, masses: np.ndarray) -> np.ndarray:
+    """
+    全運動量を計算
+    
+    Args:
+        velocities: 速度配列 (N, 3) (km/s)
+        masses: 質量配列 (N,) (kg)
+    
+    Returns:
+        運動量ベクトル (kg⋅m/s)
+    """
+    return np.asarray(masses, dtype=np.float64) @ (np.asarray(velocities, dtype=np.float64) * 1000)
+
+
+def angular_momentum_array(positions: np.ndarray,
+                           velocities: np.ndarray,
+                           masses: np.ndarray) -> np.ndarray:
+    """
+    原点まわりの全角運動量を計算
+    
+    Args:
+        positions: 位置配列 (N, 3) (km)
+        velocities: 速度配列 (N, 3) (km/s)
+        masses: 質量配列 (N,) (kg)
+    
+    Returns:
+        角運動量ベクトル (kg⋅m²/s)
+    """
+    positions = np.asarray(positions, dtype=np.float64) * 1000     # km -> m
+    velocities = np.asarray(velocities, dtype=np.float64) * 1000   # km/s -> m/s
+    return np.asarray(masses, dtype=np.float64) @ np.cross(positions, velocities)
+
+
+def center_of_mass_array(positions: np.ndarray, masses: np.ndarray) -> np.ndarray:
+    """
+    質量中心を計算
+    
+    Args:
+        positions: 位置配列 (N, 3) (km)
+        masses: 質量配列 (N,) (kg)
+    
+    Returns:
+        質量中心の位置ベクトル (km)、総質量がゼロの場合は原点
+    """
+    masses = np.asarray(masses, dtype=np.float64)
+    total_mass = masses.sum()
+    if total_mass == 0:
+        return np.zeros(3)
+    return masses @ np.asarray(positions, dtype=np.float64) / total_mass
+
+
+def pack_bodies(bodies) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    天体のリストを状態配列にまとめる
+    
+    Args:
+        bodies: 天体のイテラブル
+    
+    Returns:
+        (位置配列 (N, 3) (km), 速度配列 (N, 3) (km/s), 質量配列 (N,) (kg))
+    """
+    bodies = list(bodies)
+    if not bodies:
+        return np.empty((0, 3)), np.empty((0, 3)), np.empty(0)
+    positions = np.array([body.position for body in bodies], dtype=np.float64)
+    velocities = np.array([body.velocity for body in bodies], dtype=np.float64)
+    masses = np.array([body.mass for body in bodies], dtype=np.float64)
+    return positions, velocities, masses
\ No newline at end of file
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AstroSim ヘッドレス実行
+
+GUI（PyQt6・Vispy）を一切インポートせずに太陽系を時間発展させ、
+軌道をファイルに逐次書き出します。ディスプレイのない計算ノードでの
+バッチ実行用のエントリーポイントです。
+
+使用法:
+    python -m src.headless --days 3650 --step 1 --output runs/kepler
+    python -m src.headless --mode nbody --days 36500 --step 0.25 --output runs/nbody \\
+        --checkpoint-interval 10000
+    python -m src.headless --mode nbody --days 36500 --step 0.25 --output runs/nbody --resume
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+import numpy as np
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from src.data.data_loader import DataLoader
+from src.data.config_manager import ConfigManager
+from src.domain.solar_system import SolarSystem
+from src.domain.system_diagnostics import pack_bodies
+from src.simulation.time_manager import TimeManager
+from src.simulation.physics_engine import PhysicsEngine
+from src.simulation.orbit_calculator import OrbitCalculator
+from src.simulation.checkpoint import AutoCheckpointer, find_latest_checkpoint, load_checkpoint
+
+
+# 実行モード（kepler: 軌道要素による解析解、nbody: 物理エンジンによる数値積分）
+RUN_MODES = ("kepler", "nbody")
+
+# J2000.0 エポック（ユリウス日）
+J2000_EPOCH = 2451545.0
+
+# 1日の秒数
+SECONDS_PER_DAY = 86400.0
+
+
+class TrajectoryWriter:
+    """
+    軌道の逐次書き出し
+    
+    出力ディレクトリに positions.npy (F, N, 3)、velocities.npy (F, N, 3)、
+    julian_dates.npy (F,) をメモリマップで確保し、フレームごとに書き込みます。
+    天体名と実行条件は metadata.json に保存します。
+    """
+    
+    # この数のフレームを書き込むごとにディスクへ反映
+    FLUSH_INTERVAL = 100
+    
+    def __init__(self,
+                 output_dir: Path,
+                 names: List[str],
+                 frame_count: int,
+                 metadata: Optional[dict] = None,
+                 resume: bool = False):
+        """
+        書き出しの初期化
+        
+        Args:
+            output_dir: 出力ディレクトリ
+            names: 天体名のリスト
+            frame_count: 書き出すフレーム数
+            metadata: metadata.json に追加で保存する情報
+            resume: 既存の出力に続けて書き込むかどうか
+        
+        Raises:
+            ValueError: 再開時に既存の出力の形状が一致しない場合
+        """
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.names = list(names)
+        self.frame_count = frame_count
+        shape = (frame_count, len(self.names), 3)
+        
+        paths = [self.output_dir / name for name in ("positions.npy", "velocities.npy", "julian_dates.npy")]
+        if resume and all(path.exists() for path in paths):
+            self.positions = np.load(paths[0], mmap_mode='r+')
+            self.velocities = np.load(paths[1], mmap_mode='r+')
+            self.julian_dates = np.load(paths[2], mmap_mode='r+')
+            if self.positions.shape != shape:
+                raise ValueError(f"既存の出力の形状が一致しません: {self.positions.shape} != {shape}")
+        else:
+            open_memmap = np.lib.format.open_memmap
+            self.positions = open_memmap(paths[0], mode='w+', dtype=np.float64, shape=shape)
+            self.velocities = open_memmap(paths[1], mode='w+', dtype=np.float64, shape=shape)
+            self.julian_dates = open_memmap(paths[2], mode='w+', dtype=np.float64, shape=(frame_count,))
+        
+        info = {'names': self.names, 'frame_count': frame_count}
+        info.update(metadata or {})
+        with open(self.output_dir / "metadata.json", 'w', encoding='utf-8') as f:
+            json.dump(info, f, ensure_ascii=False, indent=2)
+        
+        self.frames_written = 0
+    
+    def write(self, frame: int, julian_date: float, positions: np.ndarray, velocities: np.ndarray) -> None:
+        """
+        1フレームを書き込み
+        
+        Args:
+            frame: フレーム番号
+            julian_date: ユリウス日
+            positions: 位置配列 (N, 3) (km)
+            velocities: 速度配列 (N, 3) (km/s)
+        """
+        self.positions[frame] = positions
+        self.velocities[frame] = velocities
+        self.julian_dates[frame] = julian_date
+        self.frames_written += 1
+        if self.frames_written % self.FLUSH_INTERVAL == 0:
+            self.flush()
+    
+    def flush(self) -> None:
+        """書き込んだフレームをディスクへ反映"""
+        for array in (self.positions, self.velocities, self.julian_dates):
+            array.flush()
+    
+    def close(self) -> None:
+        """ディスクへ反映してメモリマップを解放"""
+        self.flush()
+        del self.positions, self.velocities, self.julian_dates
+
+
+class HeadlessRunner:
+    """
+    ヘッドレスのシミュレーション実行
+    
+    DataLoader で太陽系と設定を読み込み、TimeManager で時刻を進めながら
+    軌道要素（kepler）または PhysicsEngine（nbody）で状態を更新し、
+    output_interval ステップごとに TrajectoryWriter へ書き出します。
+    """
+    
+    def __init__(self,
+                 output_dir: Path,
+                 days: float,
+                 step_days: float = 1.0,
+                 mode: str = "kepler",
+                 output_interval: int = 1,
+                 start_julian_date: float = J2000_EPOCH,
+                 config_path: Optional[Path] = None,
+                 data_path: Optional[Path] = None,
+                 checkpoint_interval: Optional[int] = None,
+                 resume: bool = False):
+        """
+        実行の初期化
+        
+        Args:
+            output_dir: 出力ディレクトリ
+            days: シミュレーションする日数
+            step_days: 時間ステップ (日)
+            mode: 実行モード ("kepler", "nbody")
+            output_interval: 書き出すステップ間隔
+            start_julian_date: 開始ユリウス日
+            config_path: 設定ファイルのパス、Noneの場合は既定の設定
+            data_path: データディレクトリ、Noneの場合は既定のディレクトリ
+            checkpoint_interval: チェックポイントを保存するステップ間隔（nbodyのみ）
+            resume: 最新のチェックポイントから再開するかどうか（nbodyのみ）
+        
+        Raises:
+            ValueError: パラメータが不正な場合
+        """
+        if mode not in RUN_MODES:
+            raise ValueError(f"無効な実行モードです: {mode}. 有効な値: {list(RUN_MODES)}")
+        if step_days <= 0 or days < 0:
+            raise ValueError(f"日数と時間ステップが不正です: days={days}, step={step_days}")
+        if output_interval < 1:
+            raise ValueError(f"書き出し間隔は1以上である必要があります: {output_interval}")
+        
+        self.output_dir = Path(output_dir)
+        self.days = days
+        self.step_days = step_days
+        self.mode = mode
+        self.output_interval = output_interval
+        self.start_julian_date = start_julian_date
+        self.config_path = config_path
+        self.data_path = data_path
+        self.checkpoint_interval = checkpoint_interval
+        self.resume = resume
+        
+        self.step_count = int(round(days / step_days))
+        self.frame_count = self.step_count // output_interval + 1
+        
+        self.logger = logging.getLogger('AstroSim.headless')
+        self.data_loader: Optional[DataLoader] = None
+        self.config_manager: Optional[ConfigManager] = None
+        self.solar_system: Optional[SolarSystem] = None
+        self.time_manager: Optional[TimeManager] = None
+        self.physics_engine: Optional[PhysicsEngine] = None
+        self.orbit_calculator = OrbitCalculator()
+    
+    def setup(self) -> None:
+        """太陽系・時間管理・物理エンジンを構築（惑星は開始時刻の軌道要素の位置・速度）"""
+        self.data_loader = DataLoader(self.data_path) if self.data_path else DataLoader()
+        self.config_manager = self.data_loader.load_config(self.config_path)
+        self.solar_system = self.data_loader.load_default_solar_system()
+        
+        self.time_manager = TimeManager()
+        self.time_manager.current_julian_date = self.start_julian_date
+        self.solar_system.update_all_positions(self.start_julian_date)
+        self._update_kepler_velocities(self.start_julian_date)
+        
+        self.physics_engine = PhysicsEngine()
+        self.physics_engine.set_integration_method(
+            self.config_manager.get("simulation.integration_method", "rk4")
+        )
+        self.physics_engine.set_gravity_solver(
+            self.config_manager.get("simulation.gravity_solver", "direct"),
+            opening_angle=self.config_manager.get("simulation.opening_angle", 0.5)
+        )
+        self.physics_engine.configure_parallel_from_config(self.config_manager)
+    
+    def run(self) -> int:
+        """
+        シミュレーションを実行
+        
+        Returns:
+            書き出したフレーム数
+        """
+        if self.solar_system is None:
+            self.setup()
+        
+        started = time.perf_counter()
+        try:
+            if self.mode == "kepler":
+                frames = self._run_kepler()
+            else:
+                frames = self._run_nbody()
+        finally:
+            self.physics_engine.shutdown_parallel()
+        
+        self.logger.info(f"{self.step_count}ステップ完了 ({frames}フレーム, "
+                         f"{time.perf_counter() - started:.2f}秒)")
+        return frames
+    
+    def _metadata(self) -> dict:
+        """metadata.json に保存する実行条件"""
+        return {
+            'mode': self.mode,
+            'start_julian_date': self.start_julian_date,
+            'step_days': self.step_days,
+            'output_interval': self.output_interval,
+            'integration_method': self.physics_engine.integration_method
+        }
+    
+    def _update_kepler_velocities(self, julian_date: float) -> None:
+        """
+        惑星の速度を軌道要素による太陽中心の速度に設定
+        
+        update_all_positions は位置のみを更新するため、N体計算の初期状態と
+        軌道要素モードの書き出しでは速度をここで設定します。
+        
+        Args:
+            julian_date: ユリウス日
+        """
+        planets = self.solar_system.get_planets_list()
+        if not planets:
+            return
+        _, velocities = self.orbit_calculator.calculate_positions_batch(
+            [planet.orbital_elements for planet in planets], julian_date
+        )
+        for planet, velocity in zip(planets, velocities[:, 0]):
+            planet.velocity = velocity
+    
+    def _run_kepler(self) -> int:
+        """軌道要素による解析解で時刻を進めて書き出し"""
+        bodies = self.solar_system.get_all_bodies()
+        writer = TrajectoryWriter(self.output_dir, [body.name for body in bodies],
+                                  self.frame_count, self._metadata())
+        try:
+            positions, velocities, _ = pack_bodies(bodies)
+            writer.write(0, self.time_manager.current_julian_date, positions, velocities)
+            
+            for step in range(1, self.step_count + 1):
+                self.time_manager.advance_by_days(self.step_days)
+                if step % self.output_interval:
+                    continue
+                self.solar_system.update_all_positions(self.time_manager.current_julian_date)
+                self._update_kepler_velocities(self.time_manager.current_julian_date)
+                positions, velocities, _ = pack_bodies(bodies)
+                writer.write(step // self.output_interval, self.time_manager.current_julian_date,
+                             positions, velocities)
+        finally:
+            writer.close()
+        return writer.frames_written
+    
+    def _run_nbody(self) -> int:
+        """物理エンジンの数値積分で時刻を進めて書き出し（チェックポイント対応）"""
+        bodies = self.solar_system.get_all_bodies()
+        names = [body.name for body in bodies]
+        positions, velocities, masses = pack_bodies(bodies)
+        checkpoint_dir = self.output_dir / "checkpoints"
+        
+        first_step = 0
+        latest = find_latest_checkpoint(checkpoint_dir) if self.resume else None
+        if latest is not None:
+            checkpoint = load_checkpoint(latest)
+            checkpoint.restore_engine(self.physics_engine)
+            positions, velocities, masses = checkpoint.positions, checkpoint.velocities, checkpoint.masses
+            self.time_manager.current_julian_date = checkpoint.julian_date
+            first_step = checkpoint.step
+            self.logger.info(f"チェックポイントから再開します: {latest} (ステップ {first_step})")
+        
+        checkpointer = None
+        if self.checkpoint_interval:
+            checkpointer = AutoCheckpointer(checkpoint_dir, self.physics_engine,
+                                            interval_steps=self.checkpoint_interval)
+        
+        writer = TrajectoryWriter(self.output_dir, names, self.frame_count, self._metadata(),
+                                  resume=latest is not None)
+        try:
+            if first_step == 0:
+                writer.write(0, self.time_manager.current_julian_date, positions, velocities)
+            
+            dt = self.step_days * SECONDS_PER_DAY
+            for step in range(first_step + 1, self.step_count + 1):
+                positions, velocities = self.physics_engine.integrate_arrays(
+                    positions, velocities, masses, dt
+                )
+                self.time_manager.advance_by_seconds(dt)
+                julian_date = self.time_manager.current_julian_date
+                
+                if step % self.output_interval == 0:
+                    writer.write(step // self.output_interval, julian_date, positions, velocities)
+                if checkpointer is not None:
+                    checkpointer.maybe_save(step, positions, velocities, masses, julian_date, names)
+        finally:
+            writer.close()
+        
+        for i, body in enumerate(bodies):
+            body.position = positions[i]
+            body.velocity = velocities[i]
+        self.solar_system.current_date = self.time_manager.current_julian_date
+        return writer.frames_written
+
+
+def _parse_arguments(argv: Optional[Sequence[str]]) -> argparse.Namespace:
+    """コマンドライン引数の解析"""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.headless",
+        description="AstroSim - GUIなしで太陽系をシミュレーションし軌道をファイルに書き出します"
+    )
+    parser.add_argument("--output", type=Path, required=True, help="出力ディレクトリ")
+    parser.add_argument("--days", type=float, default=365.0, help="シミュレーションする日数")
+    parser.add_argument("--step", type=float, default=1.0, help="時間ステップ (日)")
+    parser.add_argument("--mode", choices=RUN_MODES, default="kepler", help="実行モード")
+    parser.add_argument("--output-interval", type=int, default=1, help="書き出すステップ間隔")
+    parser.add_argument("--start-jd", type=float, default=J2000_EPOCH, help="開始ユリウス日")
+    parser.add_argument("--config", type=Path, default=None, help="設定ファイルのパス")
+    parser.add_argument("--data", type=Path, default=None, help="データディレクトリ")
+    parser.add_argument("--checkpoint-interval", type=int, default=None,
+                        help="チェックポイントを保存するステップ間隔 (nbodyのみ)")
+    parser.add_argument("--resume", action="store_true",
+                        help="最新のチェックポイントから再開 (nbodyのみ)")
+    parser.add_argument("--verbose", action="store_true", help="進行状況を表示")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    ヘッドレス実行のエントリーポイント
+    
+    Args:
+        argv: コマンドライン引数、Noneの場合は sys.argv
+    
+    Returns:
+        終了コード
+    """
+    args = _parse_arguments(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    try:
+        runner = HeadlessRunner(
+            output_dir=args.output,
+            days=args.days,
+            step_days=args.step,
+            mode=args.mode,
+            output_interval=args.output_interval,
+            start_julian_date=args.start_jd,
+            config_path=args.config,
+            data_path=args.data,
+            checkpoint_interval=args.checkpoint_interval,
+            resume=args.resume
+        )
+        runner.run()
+    except KeyboardInterrupt:
+        print("中断されました。")
+        return 130
+    except Exception as e:
+        print(f"ヘッドレス実行エラー: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
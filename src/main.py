@@ -70,9 +70,12 @@ try:
     from src.data.config_manager import ConfigManager
     from src.simulation.time_manager import TimeManager
     from src.simulation.physics_engine import PhysicsEngine
+    from src.simulation.simulation_worker import SimulationWorker
+    from src.simulation.ephemeris_cache import ChebyshevEphemeris
     from src.ui.main_window import MainWindow
     from src.visualization.renderer_3d import Renderer3D
     from src.domain.solar_system import SolarSystem
+    from src.domain.kepler_jit import configure_jit_backend_from_config
 except ImportError as e:
     print(f"モジュールインポートエラー: {e}")
     print("プロジェクト構造を確認してください。")
@@ -105,6 +108,11 @@ class AstroSimApplication:
         self.is_running = False
         self.simulation_timer: Optional[QTimer] = None
         
+        # 位置計算のワーカー（スレッドが無効の場合はタイマーから同期的に step() を呼ぶ）
+        self.simulation_worker: Optional[SimulationWorker] = None
+        self.worker_thread_enabled = True
+        self._last_render_key: Optional[tuple] = None   # 最後に描画した (通し番号, ユリウス日)
+        
         # ロギング設定
         self.logger = self._setup_logging()
         
@@ -261,8 +269,32 @@ class AstroSimApplication:
             # J2000.0エポックに設定
             self.time_manager.current_julian_date = 2451545.0
             
+            # 軌道計算カーネルのJITバックエンド（numbaが無い場合はNumPy実装）
+            if configure_jit_backend_from_config(self.config_manager):
+                self.logger.info("JITバックエンドを有効化しました")
+            
             # 物理エンジンの初期化
             self.physics_engine = PhysicsEngine()
+            self.physics_engine.set_integration_method(
+                self.config_manager.get("simulation.integration_method", "rk4")
+            )
+            self.physics_engine.set_gravity_solver(
+                self.config_manager.get("simulation.gravity_solver", "direct"),
+                opening_angle=self.config_manager.get("simulation.opening_angle", 0.5)
+            )
+            workers = self.physics_engine.configure_parallel_from_config(self.config_manager)
+            if workers:
+                self.logger.info(f"加速度計算のプロセス並列化を有効化しました ({workers}ワーカー)")
+            
+            # コンパイル済みの暦（範囲内の時刻は多項式の評価で位置を求める）
+            ephemeris_file = self.config_manager.get("simulation.ephemeris_file", None)
+            if ephemeris_file:
+                try:
+                    ephemeris = ChebyshevEphemeris.load(ephemeris_file)
+                    self.solar_system.attach_ephemeris(ephemeris)
+                    self.logger.info(f"暦を読み込みました: {ephemeris}")
+                except (OSError, ValueError) as e:
+                    self.logger.warning(f"暦の読み込みに失敗しました（軌道要素から計算します）: {e}")
             
             # 初期位置の計算
             self.solar_system.update_all_positions(self.time_manager.current_julian_date)
@@ -316,8 +348,25 @@ class AstroSimApplication:
             fps = self.config_manager.get("simulation.fps", 60)
             self.simulation_timer.setInterval(1000 // fps)
             
-            # 時間管理コールバックの設定
-            self.time_manager.add_time_change_callback(self._on_time_changed)
+            # 時間は描画の間隔ではなく、実経過時間を固定ステップ単位で進める
+            self.time_manager.configure_fixed_step(
+                self.config_manager.get("simulation.fixed_step", 1.0 / 60.0),
+                self.config_manager.get("simulation.max_catch_up_steps", 5)
+            )
+            
+            # 時間の進行と位置計算はワーカーで行い、タイマーは毎回補間した位置を描画
+            # （ワーカースレッドが無効の場合はタイマーから同期的に1ステップずつ進める）
+            self.worker_thread_enabled = self.config_manager.get("simulation.worker_thread", True)
+            self.simulation_worker = SimulationWorker(
+                self.solar_system, self.time_manager, interval=1.0 / fps
+            )
+            self.main_window.simulation_worker = self.simulation_worker
+            
+            # 時間管理コールバックの設定（時刻表示は描画タイマーから間引いて更新）
+            display_rate = self.config_manager.get("ui.time_display_rate", 10)
+            self.time_manager.add_time_change_callback(
+                self._on_time_changed, min_interval=1.0 / display_rate, deferred=True
+            )
             
             self.logger.info("システム統合完了")
             return True
@@ -355,19 +404,22 @@ class AstroSimApplication:
     def _update_simulation(self) -> None:
         """シミュレーション更新（タイマーコールバック）"""
         try:
-            if not self.time_manager.is_paused:
-                # 実時間での経過時間を計算（秒）
-                dt = self.simulation_timer.interval() / 1000.0
-                
-                # 時間を進める
-                self.time_manager.update(dt)
-                
-                # 太陽系の位置を更新
-                self.solar_system.update_all_positions(self.time_manager.current_julian_date)
-                
-                # 3D表示を更新
-                if self.main_window:
-                    self.main_window.update_3d_view()
+            worker = self.simulation_worker
+            if not worker.is_running:
+                # ワーカースレッドなし: 実経過時間で固定ステップを進め、変化があれば公開
+                worker.step()
+            
+            # 公開済みの最新の状態を、描画時点の補間したユリウス日で毎回描画（ロック不要）
+            snapshot = worker.buffer.latest
+            if snapshot is not None and self.main_window:
+                render_julian_date = self.time_manager.render_julian_date()
+                render_key = (snapshot.sequence, render_julian_date)
+                if render_key != self._last_render_key:
+                    self._last_render_key = render_key
+                    self.main_window.update_3d_view(snapshot, render_julian_date)
+            
+            # 保留中の時間変更通知（時刻表示など）を配信
+            self.time_manager.flush_time_notifications()
                     
         except Exception as e:
             self.logger.error(f"シミュレーション更新エラー: {e}")
@@ -385,6 +437,8 @@ class AstroSimApplication:
     def start_simulation(self) -> None:
         """シミュレーション開始"""
         if self.simulation_timer and not self.simulation_timer.isActive():
+            if self.simulation_worker and self.worker_thread_enabled:
+                self.simulation_worker.start()
             self.simulation_timer.start()
             self.is_running = True
             self.logger.info("シミュレーション開始")
@@ -405,6 +459,8 @@ class AstroSimApplication:
         """シミュレーション停止"""
         if self.simulation_timer and self.simulation_timer.isActive():
             self.simulation_timer.stop()
+            if self.simulation_worker:
+                self.simulation_worker.stop()
             self.is_running = False
             self.logger.info("シミュレーション停止")
     
@@ -458,6 +514,10 @@ class AstroSimApplication:
             # シミュレーション停止
             self.stop_simulation()
             
+            # 加速度計算ワーカーの終了
+            if self.physics_engine:
+                self.physics_engine.shutdown_parallel()
+            
             # 設定の保存
             if self.config_manager and self.main_window:
                 self._save_window_settings()
@@ -519,6 +579,7 @@ def main() -> int:
             print("オプション:")
             print("  -h, --help     このヘルプを表示")
             print("  --version      バージョン情報を表示")
+            print("GUIなしで実行する場合: python -m src.headless --help")
             return 0
         
         if "--version" in sys.argv:
@@ -0,0 +1,323 @@
+"""
+適応刻み幅積分器の実装
+
+埋め込み型ルンゲ・クッタ法（Dormand–Prince 5(4)）により、
+局所誤差の許容値から時間ステップを自動で選択してN体系を積分します。
+受理したステップごとに密出力（連続補間）の係数を保持し、
+追加の加速度計算なしに任意時刻の位置・速度を求められます。
+"""
+
+import bisect
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+
+# Dormand–Prince 5(4) 係数（自励系のため節点 c_i は不要）
+# 第7段の係数は5次解の重みと一致する（FSAL）
+_A = (
+    (),
+    (1/5,),
+    (3/40, 9/40),
+    (44/45, -56/15, 32/9),
+    (19372/6561, -25360/2187, 64448/6561, -212/729),
+    (9017/3168, -355/33, 46732/5247, 49/176, -5103/18656),
+    (35/384, 0.0, 500/1113, 125/192, -2187/6784, 11/84),
+)
+# 5次解と4次解の差（誤差推定）の係数
+_E = np.array([71/57600, 0.0, -71/16695, 71/1920, -17253/339200, 22/525, -1/40])
+# 密出力の係数
+_D = np.array([-12715105075/11282082432, 0.0, 87487479700/32700410799,
+               -10690763975/1880347072, 701980252875/199316789632,
+               -1453857185/822651844, 69997945/29380423])
+
+
+@dataclass
+class DenseOutputStep:
+    """受理された1ステップ分の密出力"""
+    t_start: float             # ステップ開始時刻 (秒)
+    t_end: float               # ステップ終了時刻 (秒)
+    coefficients: np.ndarray   # 補間係数 (5, 状態ベクトル長)
+    
+    def evaluate(self, t: float) -> np.ndarray:
+        """
+        ステップ内の時刻の状態ベクトルを補間
+        
+        Args:
+            t: 時刻 (秒)
+        
+        Returns:
+            状態ベクトル（位置・速度を連結したもの）
+        """
+        h = self.t_end - self.t_start
+        theta = (t - self.t_start) / h if h != 0 else 0.0
+        theta1 = 1.0 - theta
+        r1, r2, r3, r4, r5 = self.coefficients
+        return r1 + theta * (r2 + theta1 * (r3 + theta * (r4 + theta1 * r5)))
+
+
+class DenseOutput:
+    """
+    積分区間全体の密出力
+    
+    受理したステップの補間係数を時刻順に保持し、
+    区間内の任意時刻の位置・速度を返します。
+    """
+    
+    def __init__(self, body_count: int, direction: float = 1.0):
+        """
+        密出力の初期化
+        
+        Args:
+            body_count: 天体数
+            direction: 積分の向き（1.0: 未来向き、-1.0: 過去向き）
+        """
+        self.body_count = body_count
+        self.direction = direction
+        self.steps: List[DenseOutputStep] = []
+        self._step_ends: List[float] = []  # direction を掛けた終了時刻（昇順）
+    
+    @property
+    def t_start(self) -> float:
+        """補間可能な区間の開始時刻 (秒)"""
+        return self.steps[0].t_start if self.steps else 0.0
+    
+    @property
+    def t_end(self) -> float:
+        """補間可能な区間の終了時刻 (秒)"""
+        return self.steps[-1].t_end if self.steps else 0.0
+    
+    def append(self, step: DenseOutputStep) -> None:
+        """ステップを追加（時刻順）"""
+        self.steps.append(step)
+        self._step_ends.append(self.direction * step.t_end)
+    
+    def evaluate(self, t: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        指定時刻の位置と速度を補間
+        
+        Args:
+            t: 積分開始からの時刻 (秒)
+        
+        Returns:
+            (位置配列 (N, 3) (km), 速度配列 (N, 3) (km/s))
+        
+        Raises:
+            ValueError: 補間可能な区間の外の時刻の場合
+        """
+        if (not self.steps or
+                not (min(self.t_start, self.t_end) <= t <= max(self.t_start, self.t_end))):
+            raise ValueError(
+                f"密出力の範囲外の時刻です: {t} (範囲: {self.t_start} - {self.t_end})"
+            )
+        
+        index = min(bisect.bisect_left(self._step_ends, self.direction * t), len(self.steps) - 1)
+        state = self.steps[index].evaluate(t)
+        
+        n = self.body_count * 3
+        return state[:n].reshape(-1, 3), state[n:].reshape(-1, 3)
+    
+    def __len__(self) -> int:
+        """ステップ数を返す"""
+        return len(self.steps)
+
+
+class DormandPrinceIntegrator:
+    """
+    Dormand–Prince 5(4) 適応刻み幅積分器
+    
+    位置・速度の許容誤差から各ステップの刻み幅を選択します。
+    FSAL（最終段の再利用）により、受理したステップあたりの
+    加速度計算は6回です。
+    """
+    
+    # 刻み幅の変更倍率の範囲と安全係数
+    SAFETY_FACTOR = 0.9
+    MIN_STEP_SCALE = 0.2
+    MAX_STEP_SCALE = 10.0
+    
+    def __init__(self,
+                 physics_engine,
+                 relative_tolerance: float = 1e-10,
+                 position_tolerance: float = 1e-3,
+                 velocity_tolerance: float = 1e-9,
+                 max_step: Optional[float] = None,
+                 min_step: float = 1e-6):
+        """
+        積分器の初期化
+        
+        Args:
+            physics_engine: 加速度計算に用いる物理エンジン
+            relative_tolerance: 相対許容誤差
+            position_tolerance: 位置の絶対許容誤差 (km)
+            velocity_tolerance: 速度の絶対許容誤差 (km/s)
+            max_step: 最大刻み幅 (秒)、Noneの場合は制限なし
+            min_step: 最小刻み幅 (秒)
+        """
+        self.physics_engine = physics_engine
+        self.relative_tolerance = relative_tolerance
+        self.position_tolerance = position_tolerance
+        self.velocity_tolerance = velocity_tolerance
+        self.max_step = max_step
+        self.min_step = min_step
+        
+        # 次回の積分で使う刻み幅（前回の積分から引き継ぐ）
+        self.step_size: Optional[float] = None
+        
+        # 統計
+        self.accepted_steps = 0
+        self.rejected_steps = 0
+        self.force_evaluations = 0
+    
+    def integrate(self,
+                  positions: np.ndarray,
+                  velocities: np.ndarray,
+                  masses: np.ndarray,
+                  duration: float,
+                  dense_output: bool = False) -> Tuple[np.ndarray, np.ndarray, Optional[DenseOutput]]:
+        """
+        指定時間だけ積分
+        
+        Args:
+            positions: 位置配列 (N, 3) (km)
+            velocities: 速度配列 (N, 3) (km/s)
+            masses: 質量配列 (N,) (kg)
+            duration: 積分時間 (秒、負の場合は過去向き)
+            dense_output: 密出力を作成するかどうか
+        
+        Returns:
+            (新しい位置配列 (km), 新しい速度配列 (km/s), 密出力またはNone)
+        
+        Raises:
+            ValueError: 刻み幅が最小値を下回った場合
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        velocities = np.asarray(velocities, dtype=np.float64)
+        masses = np.asarray(masses, dtype=np.float64)
+        n = positions.size
+        
+        direction = 1.0 if duration >= 0 else -1.0
+        dense = DenseOutput(positions.shape[0], direction) if dense_output else None
+        if duration == 0 or positions.shape[0] == 0:
+            return positions.copy(), velocities.copy(), dense
+        
+        def derivative(state: np.ndarray) -> np.ndarray:
+            self.force_evaluations += 1
+            accelerations = self.physics_engine.calculate_accelerations(
+                state[:n].reshape(-1, 3), masses
+            )
+            return np.concatenate((state[n:], accelerations.ravel()))
+        
+        # 状態ベクトルごとの絶対許容誤差
+        absolute_tolerance = np.concatenate((
+            np.full(n, self.position_tolerance), np.full(n, self.velocity_tolerance)
+        ))
+        
+        y = np.concatenate((positions.ravel(), velocities.ravel()))
+        k1 = derivative(y)
+        
+        # 刻み幅（前回の積分から引き継ぐ）
+        h = self.step_size
+        if h is None:
+            h = self._initial_step(y, k1, absolute_tolerance)
+        if self.max_step is not None:
+            h = min(h, self.max_step)
+        
+        t = 0.0
+        end = abs(duration)
+        stages = np.empty((7, y.size), dtype=np.float64)
+        
+        while t < end:
+            # 終了時刻に合わせて切り詰めた刻み幅は次のステップに引き継がない
+            step = min(h, end - t)
+            truncated = step < h
+            signed_h = direction * step
+            
+            # 各段の計算（第7段の評価点が5次解 y_new）
+            stages[0] = k1
+            for stage in range(1, 7):
+                increment = sum(
+                    coefficient * stages[j]
+                    for j, coefficient in enumerate(_A[stage]) if coefficient != 0.0
+                )
+                y_new = y + signed_h * increment
+                stages[stage] = derivative(y_new)
+            
+            # 誤差推定（RMSノルム）
+            error = signed_h * (_E @ stages)
+            scale = absolute_tolerance + self.relative_tolerance * np.maximum(np.abs(y), np.abs(y_new))
+            error_norm = np.sqrt(np.mean((error / scale) ** 2))
+            
+            if error_norm <= 1.0:
+                if dense is not None:
+                    dense.append(self._dense_step(
+                        direction * t, direction * (t + step), y, y_new, stages, signed_h
+                    ))
+                t += step
+                y = y_new
+                k1 = stages[6].copy()  # FSAL
+                self.accepted_steps += 1
+                
+                # 次の刻み幅
+                scale_factor = self.MAX_STEP_SCALE if error_norm == 0 else min(
+                    self.MAX_STEP_SCALE, self.SAFETY_FACTOR * error_norm ** -0.2
+                )
+                if not truncated or step * scale_factor < h:
+                    h = step * scale_factor
+            else:
+                self.rejected_steps += 1
+                h = step * max(self.MIN_STEP_SCALE, self.SAFETY_FACTOR * error_norm ** -0.2)
+                if h < self.min_step:
+                    raise ValueError(f"刻み幅が最小値 {self.min_step} 秒を下回りました")
+            
+            if self.max_step is not None:
+                h = min(h, self.max_step)
+        
+        self.step_size = h
+        return y[:n].reshape(-1, 3).copy(), y[n:].reshape(-1, 3).copy(), dense
+    
+    def _initial_step(self, y: np.ndarray, dy: np.ndarray, absolute_tolerance: np.ndarray) -> float:
+        """初期刻み幅の推定（Hairer の方法の簡略版）"""
+        scale = absolute_tolerance + self.relative_tolerance * np.abs(y)
+        d0 = np.sqrt(np.mean((y / scale) ** 2))
+        d1 = np.sqrt(np.mean((dy / scale) ** 2))
+        if d0 < 1e-5 or d1 < 1e-5:
+            return 1e-6
+        return 0.01 * d0 / d1
+    
+    @staticmethod
+    def _dense_step(t_start: float,
+                    t_end: float,
+                    y0: np.ndarray,
+                    y1: np.ndarray,
+                    stages: np.ndarray,
+                    h: float) -> DenseOutputStep:
+        """受理したステップの密出力係数を計算"""
+        difference = y1 - y0
+        b_spline = h * stages[0] - difference
+        coefficients = np.empty((5, y0.size), dtype=np.float64)
+        coefficients[0] = y0
+        coefficients[1] = difference
+        coefficients[2] = b_spline
+        coefficients[3] = difference - h * stages[6] - b_spline
+        coefficients[4] = h * (_D @ stages)
+        return DenseOutputStep(t_start, t_end, coefficients)
+    
+    def get_stats(self) -> dict:
+        """
+        積分統計を取得
+        
+        Returns:
+            受理・棄却ステップ数、加速度計算回数、現在の刻み幅の辞書
+        """
+        return {
+            'accepted_steps': self.accepted_steps,
+            'rejected_steps': self.rejected_steps,
+            'force_evaluations': self.force_evaluations,
+            'step_size': self.step_size
+        }
+    
+    def __str__(self) -> str:
+        """文字列表現"""
+        return (f"DormandPrinceIntegrator (相対許容誤差: {self.relative_tolerance}, "
+                f"刻み幅: {self.step_size})")
\ No newline at end of file
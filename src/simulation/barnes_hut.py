@@ -0,0 +1,462 @@
+"""
+Barnes–Hut 八分木による重力計算
+
+粒子をモートン順に並べて八分木を構築し、十分遠いノードを
+質量中心の単極子で近似することで、重力加速度を O(N log N) で
+計算します。木の走査と力の評価はリーフバケット単位で
+ベクトル化しています。
+"""
+
+import numpy as np
+from typing import Optional, Tuple
+
+
+# モートン符号の1軸あたりのビット数（3軸で63ビット）
+_MORTON_BITS = 21
+
+
+def _spread_bits(values: np.ndarray) -> np.ndarray:
+    """21ビット整数の各ビットの間に2ビットの隙間を入れる"""
+    x = values.astype(np.uint64) & np.uint64(0x1FFFFF)
+    x = (x | (x << np.uint64(32))) & np.uint64(0x1F00000000FFFF)
+    x = (x | (x << np.uint64(16))) & np.uint64(0x1F0000FF0000FF)
+    x = (x | (x << np.uint64(8))) & np.uint64(0x100F00F00F00F00F)
+    x = (x | (x << np.uint64(4))) & np.uint64(0x10C30C30C30C30C3)
+    x = (x | (x << np.uint64(2))) & np.uint64(0x1249249249249249)
+    return x
+
+
+class BarnesHutTree:
+    """
+    Barnes–Hut 八分木重力ソルバー
+    
+    ノードの一辺 s とリーフバケットまでの距離 d が s < θd を満たし、ノードの
+    粒子の境界箱がバケットと重ならない場合にノードを単極子で近似し、
+    それ以外は子ノードを開きます。
+    開いたリーフ同士は粒子間の直接和で計算します。
+    
+    前ステップの粒子順序と境界立方体を保持し、粒子の移動が小さい場合は
+    ほぼ整列済みの並べ替えとして木を再構築します。
+    """
+    
+    # 一度に展開する相互作用（ターゲット粒子とソースの組）の数の上限
+    BLOCK_PAIRS = 1 << 20
+    
+    def __init__(self, opening_angle: float = 0.5, leaf_size: int = 16):
+        """
+        八分木ソルバーの初期化
+        
+        Args:
+            opening_angle: 開口角 θ（0の場合は直接和と同じ結果）
+            leaf_size: リーフバケットの最大粒子数
+        
+        Raises:
+            ValueError: 開口角が負、またはリーフサイズが1未満の場合
+        """
+        if opening_angle < 0:
+            raise ValueError(f"開口角は0以上である必要があります: {opening_angle}")
+        if leaf_size < 1:
+            raise ValueError(f"リーフサイズは1以上である必要があります: {leaf_size}")
+        
+        self.opening_angle = opening_angle
+        self.leaf_size = leaf_size
+        
+        # 前回の構築結果（差分再構築用）
+        self._order: Optional[np.ndarray] = None
+        self._cube_origin: Optional[np.ndarray] = None
+        self._cube_size: float = 0.0
+        
+        # 統計
+        self.build_count = 0
+        self.incremental_builds = 0
+        self.node_count = 0
+        self.leaf_count = 0
+        self.multipole_interactions = 0
+        self.direct_interactions = 0
+    
+    def calculate_accelerations(self,
+                              positions: np.ndarray,
+                              gm: np.ndarray,
+                              softening_length: float = 0.0) -> np.ndarray:
+        """
+        重力加速度を計算
+        
+        Args:
+            positions: 位置配列 (N, 3) (km)
+            gm: 重力定数と質量の積の配列 (N,) (km³/s²)
+            softening_length: 軟化長 ε (km)
+        
+        Returns:
+            加速度配列 (N, 3) (km/s²)
+        
+        Raises:
+            ValueError: 軟化なしで距離がゼロの粒子の組がある場合
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        gm = np.asarray(gm, dtype=np.float64)
+        n = positions.shape[0]
+        if n < 2:
+            return np.zeros((n, 3), dtype=np.float64)
+        
+        self._build(positions)
+        sorted_positions = positions[self._order]
+        sorted_gm = gm[self._order]
+        self._compute_moments(sorted_positions, sorted_gm)
+        
+        multipole_pairs, direct_pairs = self._walk(sorted_positions)
+        self.multipole_interactions = int(np.sum(self._leaf_count_of[multipole_pairs[0]]))
+        self.direct_interactions = int(np.sum(
+            self._leaf_count_of[direct_pairs[0]] * self._leaf_count_of[direct_pairs[1]]
+        ))
+        
+        # 整列順で加算してから元の粒子順に戻す
+        epsilon_squared = softening_length ** 2
+        sorted_accelerations = np.zeros((n, 3), dtype=np.float64)
+        self._accumulate_multipoles(
+            sorted_accelerations, multipole_pairs, sorted_positions, epsilon_squared
+        )
+        self._accumulate_direct(
+            sorted_accelerations, direct_pairs, sorted_positions, sorted_gm, epsilon_squared
+        )
+        
+        accelerations = np.empty((n, 3), dtype=np.float64)
+        accelerations[self._order] = sorted_accelerations
+        return accelerations
+    
+    def _build(self, positions: np.ndarray) -> None:
+        """モートン符号で粒子を並べ替えて八分木を構築"""
+        n = positions.shape[0]
+        lower = positions.min(axis=0)
+        upper = positions.max(axis=0)
+        
+        # 前回の境界立方体に収まっていれば再利用（符号と順序が安定する）
+        incremental = (
+            self._order is not None and self._order.size == n and
+            np.all(lower >= self._cube_origin) and
+            np.all(upper <= self._cube_origin + self._cube_size)
+        )
+        if not incremental:
+            extent = float(np.max(upper - lower))
+            if extent == 0.0:
+                extent = 1.0
+            # 粒子の移動で頻繁に作り直さないよう余裕を持たせる
+            self._cube_size = extent * 1.05
+            self._cube_origin = (lower + upper) / 2 - self._cube_size / 2
+            self._order = np.arange(n)
+        else:
+            self.incremental_builds += 1
+        self.build_count += 1
+        
+        # 前回の順序で並べた符号はほぼ整列済みなので安定ソートが速い
+        keys = self._morton_keys(positions[self._order])
+        permutation = np.argsort(keys, kind='stable')
+        self._order = self._order[permutation]
+        keys = keys[permutation]
+        
+        self._build_nodes(keys)
+    
+    def _morton_keys(self, positions: np.ndarray) -> np.ndarray:
+        """位置からモートン符号を計算"""
+        resolution = (1 << _MORTON_BITS) - 1
+        cells = (positions - self._cube_origin) * (resolution / self._cube_size)
+        cells = np.clip(cells, 0, resolution).astype(np.uint64)
+        return (
+            (_spread_bits(cells[:, 0]) << np.uint64(2)) |
+            (_spread_bits(cells[:, 1]) << np.uint64(1)) |
+            _spread_bits(cells[:, 2])
+        )
+    
+    def _build_nodes(self, keys: np.ndarray) -> None:
+        """整列済みのモートン符号から階層ごとにノードを作成"""
+        n = keys.size
+        
+        # 各階層のノード（粒子範囲は整列順の [start, start + count)）
+        starts = [np.array([0])]
+        counts = [np.array([n])]
+        child_starts = []
+        child_counts = []
+        level_offsets = [0, 1]
+        
+        level = 0
+        while True:
+            split = (counts[-1] > self.leaf_size) & (level < _MORTON_BITS)
+            if not np.any(split):
+                child_starts.append(np.zeros(counts[-1].size, dtype=np.int64))
+                child_counts.append(np.zeros(counts[-1].size, dtype=np.int64))
+                break
+            
+            # 分割するノードに属する粒子の添字（整列順）
+            lengths = counts[-1][split]
+            offsets = starts[-1][split] - (np.cumsum(lengths) - lengths)
+            active = np.arange(lengths.sum()) + np.repeat(offsets, lengths)
+            
+            # 次の階層の接頭辞が変わる位置が子ノードの境界
+            level += 1
+            prefixes = keys[active] >> np.uint64(3 * (_MORTON_BITS - level))
+            first = np.concatenate(([0], np.flatnonzero(prefixes[1:] != prefixes[:-1]) + 1))
+            child_start = active[first]
+            child_count = np.diff(np.concatenate((first, [active.size])))
+            
+            # 子ノードは親の粒子範囲内で連続して並ぶ
+            parent_start = starts[-1]
+            first_child = np.searchsorted(child_start, parent_start)
+            last_child = np.searchsorted(child_start, parent_start + counts[-1])
+            child_starts.append(np.where(split, level_offsets[-1] + first_child, 0))
+            child_counts.append(np.where(split, last_child - first_child, 0))
+            
+            starts.append(child_start)
+            counts.append(child_count)
+            level_offsets.append(level_offsets[-1] + child_start.size)
+        
+        self._level_offsets = level_offsets
+        self._node_start = np.concatenate(starts)
+        self._node_count = np.concatenate(counts)
+        self._child_start = np.concatenate(child_starts)
+        self._child_count = np.concatenate(child_counts)
+        self._node_size = self._cube_size / 2.0 ** np.concatenate([
+            np.full(level_starts.size, level) for level, level_starts in enumerate(starts)
+        ])
+        self.node_count = self._node_start.size
+        
+        # リーフバケット（粒子範囲の順に並べる）
+        leaf_nodes = np.flatnonzero(self._child_count == 0)
+        leaf_nodes = leaf_nodes[np.argsort(self._node_start[leaf_nodes])]
+        self._leaf_nodes = leaf_nodes
+        self._leaf_id = np.full(self.node_count, -1)
+        self._leaf_id[leaf_nodes] = np.arange(leaf_nodes.size)
+        self._leaf_count_of = self._node_count[leaf_nodes]
+        self.leaf_count = leaf_nodes.size
+    
+    def _compute_moments(self, sorted_positions: np.ndarray, sorted_gm: np.ndarray) -> None:
+        """各ノードの質量と質量中心を葉から根へ集計"""
+        node_gm = np.zeros(self.node_count, dtype=np.float64)
+        node_moment = np.zeros((self.node_count, 3), dtype=np.float64)
+        
+        leaf_start = self._node_start[self._leaf_nodes]
+        node_gm[self._leaf_nodes] = np.add.reduceat(sorted_gm, leaf_start)
+        node_moment[self._leaf_nodes] = np.add.reduceat(
+            sorted_gm[:, np.newaxis] * sorted_positions, leaf_start, axis=0
+        )
+        
+        # 各階層の子ノードはその階層のノード列を隙間なく覆う
+        for level in range(len(self._level_offsets) - 3, -1, -1):
+            level_start, level_end, child_end = self._level_offsets[level:level + 3]
+            parents = np.arange(level_start, level_end)
+            parents = parents[self._child_count[parents] > 0]
+            if parents.size == 0:
+                continue
+            child_offsets = self._child_start[parents] - level_end
+            node_gm[parents] = np.add.reduceat(node_gm[level_end:child_end], child_offsets)
+            node_moment[parents] = np.add.reduceat(
+                node_moment[level_end:child_end], child_offsets, axis=0
+            )
+        
+        # 質量のないノードは走査で除外するので質量中心は任意
+        nonzero = node_gm != 0
+        node_center = np.zeros((self.node_count, 3), dtype=np.float64)
+        node_center[nonzero] = node_moment[nonzero] / node_gm[nonzero, np.newaxis]
+        
+        self._node_gm = node_gm
+        self._node_center = node_center
+    
+    def _walk(self, sorted_positions: np.ndarray) -> Tuple[Tuple[np.ndarray, np.ndarray],
+                                                           Tuple[np.ndarray, np.ndarray]]:
+        """
+        全リーフバケットについて同時に木を走査
+        
+        Returns:
+            ((リーフ, 単極子近似するノード) の組, (リーフ, 直接和で計算するリーフ) の組)
+        """
+        # リーフバケットの境界箱
+        leaf_start = self._node_start[self._leaf_nodes]
+        leaf_lower = np.minimum.reduceat(sorted_positions, leaf_start, axis=0)
+        leaf_upper = np.maximum.reduceat(sorted_positions, leaf_start, axis=0)
+        node_lower, node_upper = self._node_bounds(leaf_lower, leaf_upper)
+        
+        multipole_targets, multipole_nodes = [], []
+        direct_targets, direct_sources = [], []
+        
+        targets = np.arange(self.leaf_count)
+        nodes = np.zeros(self.leaf_count, dtype=np.int64)
+        while targets.size:
+            massive = self._node_gm[nodes] != 0
+            targets, nodes = targets[massive], nodes[massive]
+            
+            # 質量中心からバケットの境界箱までの距離で開口判定
+            centers = self._node_center[nodes]
+            closest = np.clip(centers, leaf_lower[targets], leaf_upper[targets])
+            distance = np.sqrt(np.einsum('ij,ij->i', centers - closest, centers - closest))
+            accept = self._node_size[nodes] < self.opening_angle * distance
+            
+            # 境界箱がバケットと重なるノード（バケット自身を含む祖先など）は
+            # 開口角が大きくても単極子近似しない
+            overlap = np.all((node_lower[nodes] <= leaf_upper[targets]) &
+                             (node_upper[nodes] >= leaf_lower[targets]), axis=1)
+            accept &= ~overlap
+            multipole_targets.append(targets[accept])
+            multipole_nodes.append(nodes[accept])
+            
+            opened = ~accept
+            is_leaf = self._child_count[nodes] == 0
+            direct = opened & is_leaf
+            direct_targets.append(targets[direct])
+            direct_sources.append(self._leaf_id[nodes[direct]])
+            
+            # 開いたノードを子ノードに置き換える
+            expand = opened & ~is_leaf
+            child_count = self._child_count[nodes[expand]]
+            offsets = np.arange(child_count.sum()) - np.repeat(np.cumsum(child_count) - child_count, child_count)
+            targets = np.repeat(targets[expand], child_count)
+            nodes = np.repeat(self._child_start[nodes[expand]], child_count) + offsets
+        
+        return ((np.concatenate(multipole_targets), np.concatenate(multipole_nodes)),
+                (np.concatenate(direct_targets), np.concatenate(direct_sources)))
+    
+    def _node_bounds(self, leaf_lower: np.ndarray, leaf_upper: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """各ノードに含まれる粒子の境界箱をリーフバケットの境界箱から根へ集計"""
+        node_lower = np.zeros((self.node_count, 3), dtype=np.float64)
+        node_upper = np.zeros((self.node_count, 3), dtype=np.float64)
+        node_lower[self._leaf_nodes] = leaf_lower
+        node_upper[self._leaf_nodes] = leaf_upper
+        
+        for level in range(len(self._level_offsets) - 3, -1, -1):
+            level_start, level_end, child_end = self._level_offsets[level:level + 3]
+            parents = np.arange(level_start, level_end)
+            parents = parents[self._child_count[parents] > 0]
+            if parents.size == 0:
+                continue
+            child_offsets = self._child_start[parents] - level_end
+            node_lower[parents] = np.minimum.reduceat(node_lower[level_end:child_end], child_offsets, axis=0)
+            node_upper[parents] = np.maximum.reduceat(node_upper[level_end:child_end], child_offsets, axis=0)
+        
+        return node_lower, node_upper
+    
+    def _blocks(self, pair_sizes: np.ndarray):
+        """相互作用の総数が BLOCK_PAIRS 程度になるよう組を分割"""
+        ends = np.cumsum(pair_sizes)
+        start = 0
+        while start < pair_sizes.size:
+            limit = (ends[start - 1] if start > 0 else 0) + self.BLOCK_PAIRS
+            stop = max(start + 1, int(np.searchsorted(ends, limit, side='right')))
+            yield start, stop
+            start = stop
+    
+    @staticmethod
+    def _expand(sizes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """組ごとの要素数から (組の添字, 組内の通し番号) を作成"""
+        pair_index = np.repeat(np.arange(sizes.size), sizes)
+        local = np.arange(pair_index.size) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        return pair_index, local
+    
+    @staticmethod
+    def _add_to_targets(accelerations: np.ndarray,
+                        targets: np.ndarray,
+                        weights: np.ndarray,
+                        displacement: np.ndarray) -> None:
+        """粒子ごとに寄与を合計して加算"""
+        n = accelerations.shape[0]
+        for axis in range(3):
+            accelerations[:, axis] += np.bincount(
+                targets, weights=weights * displacement[:, axis], minlength=n
+            )
+    
+    def _accumulate_multipoles(self,
+                               accelerations: np.ndarray,
+                               pairs: Tuple[np.ndarray, np.ndarray],
+                               sorted_positions: np.ndarray,
+                               epsilon_squared: float) -> None:
+        """単極子近似の寄与を加算"""
+        targets, nodes = pairs
+        leaf_start = self._node_start[self._leaf_nodes]
+        sizes = self._leaf_count_of[targets]
+        
+        for start, stop in self._blocks(sizes):
+            # (粒子, ノード) の組に展開
+            pair_index, local = self._expand(sizes[start:stop])
+            particles = leaf_start[targets[start:stop]][pair_index] + local
+            block_nodes = nodes[start:stop][pair_index]
+            
+            displacement = self._node_center[block_nodes] - sorted_positions[particles]
+            distance_squared = np.einsum('ij,ij->i', displacement, displacement) + epsilon_squared
+            inverse_distance = 1.0 / np.sqrt(distance_squared)
+            weights = self._node_gm[block_nodes] * inverse_distance ** 3
+            self._add_to_targets(accelerations, particles, weights, displacement)
+    
+    def _accumulate_direct(self,
+                           accelerations: np.ndarray,
+                           pairs: Tuple[np.ndarray, np.ndarray],
+                           sorted_positions: np.ndarray,
+                           sorted_gm: np.ndarray,
+                           epsilon_squared: float) -> None:
+        """リーフ間の直接和の寄与を加算"""
+        targets, sources = pairs
+        leaf_start = self._node_start[self._leaf_nodes]
+        target_counts = self._leaf_count_of[targets]
+        source_counts = self._leaf_count_of[sources]
+        sizes = target_counts * source_counts
+        
+        for start, stop in self._blocks(sizes):
+            # (ターゲット粒子, ソース粒子) の組に展開
+            pair_index, local = self._expand(sizes[start:stop])
+            block_source_counts = source_counts[start:stop][pair_index]
+            particles = leaf_start[targets[start:stop]][pair_index] + local // block_source_counts
+            partners = leaf_start[sources[start:stop]][pair_index] + local % block_source_counts
+            
+            displacement = sorted_positions[partners] - sorted_positions[particles]
+            distance_squared = np.einsum('ij,ij->i', displacement, displacement)
+            
+            # 自分自身との組を除外
+            distance_squared[particles == partners] = np.inf
+            
+            if epsilon_squared > 0:
+                distance_squared += epsilon_squared
+            elif np.any(distance_squared == 0):
+                raise ValueError("天体間の距離がゼロでは重力計算できません")
+            
+            inverse_distance = 1.0 / np.sqrt(distance_squared)
+            weights = sorted_gm[partners] * inverse_distance ** 3
+            self._add_to_targets(accelerations, particles, weights, displacement)
+    
+    def get_build_state(self) -> Optional[Tuple[np.ndarray, np.ndarray, float]]:
+        """
+        差分再構築に使う前回の構築結果を取得
+        
+        Returns:
+            (粒子の順序, 境界立方体の原点 (km), 境界立方体の一辺 (km))、未構築の場合はNone
+        """
+        if self._order is None:
+            return None
+        return self._order.copy(), self._cube_origin.copy(), self._cube_size
+    
+    def restore_build_state(self, order: np.ndarray, cube_origin: np.ndarray, cube_size: float) -> None:
+        """
+        前回の構築結果を復元（再開後も同じ木を構築するため）
+        
+        Args:
+            order: 粒子の順序
+            cube_origin: 境界立方体の原点 (km)
+            cube_size: 境界立方体の一辺 (km)
+        """
+        self._order = np.asarray(order, dtype=np.int64).copy()
+        self._cube_origin = np.asarray(cube_origin, dtype=np.float64).copy()
+        self._cube_size = float(cube_size)
+    
+    def get_stats(self) -> dict:
+        """
+        直近の計算の統計を取得
+        
+        Returns:
+            ノード数、リーフ数、相互作用数、差分再構築回数の辞書
+        """
+        return {
+            'node_count': self.node_count,
+            'leaf_count': self.leaf_count,
+            'multipole_interactions': self.multipole_interactions,
+            'direct_interactions': self.direct_interactions,
+            'build_count': self.build_count,
+            'incremental_builds': self.incremental_builds
+        }
+    
+    def __str__(self) -> str:
+        """文字列表現"""
+        return f"BarnesHutTree (開口角: {self.opening_angle}, リーフサイズ: {self.leaf_size})"
\ No newline at end of file
@@ -0,0 +1,397 @@
+"""
+積分状態のチェックポイント
+
+位置・速度・質量の配列、ユリウス日、ステップ数、積分器の設定と内部状態、
+試験粒子を1つのバイナリファイル（NumPy の npz 形式）に保存します。
+復元した状態から積分を続けると、中断しなかった場合とビット単位で一致します。
+"""
+
+import os
+import time
+import numpy as np
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from src.domain.massless_particles import MasslessParticleSet
+from src.domain.system_diagnostics import pack_bodies
+from .physics_engine import PhysicsEngine
+
+
+# チェックポイントの形式のバージョン
+CHECKPOINT_VERSION = 1
+
+# 積分器の状態を格納するキーの接頭辞
+_ENGINE_PREFIX = 'engine_'
+
+
+@dataclass
+class Checkpoint:
+    """読み込んだチェックポイント"""
+    positions: np.ndarray         # 位置配列 (N, 3) (km)
+    velocities: np.ndarray        # 速度配列 (N, 3) (km/s)
+    masses: np.ndarray            # 質量配列 (N,) (kg)
+    julian_date: float            # ユリウス日
+    step: int                     # 通算ステップ数
+    names: List[str] = field(default_factory=list)                # 天体名（保存時に指定した場合）
+    engine_state: Dict[str, np.ndarray] = field(default_factory=dict)
+    particle_positions: Optional[np.ndarray] = None               # 試験粒子の位置 (M, 3) (km)
+    particle_velocities: Optional[np.ndarray] = None              # 試験粒子の速度 (M, 3) (km/s)
+    particle_accelerations: Optional[np.ndarray] = None           # 試験粒子の加速度 (M, 3) (km/s²)
+    particle_ids: Optional[np.ndarray] = None                     # 試験粒子のID (M,)
+    particle_next_id: int = 0
+    particle_source: Optional[tuple] = None                       # 試験粒子の加速度を計算した重力源
+    
+    @property
+    def integration_method(self) -> str:
+        """保存時の積分法"""
+        return str(self.engine_state.get('integration_method', ''))
+    
+    def restore_engine(self, physics_engine: PhysicsEngine) -> None:
+        """
+        物理エンジンに積分器の設定と内部状態を復元
+        
+        Args:
+            physics_engine: 復元先の物理エンジン
+        """
+        physics_engine.set_integrator_state(self.engine_state)
+    
+    def restore_test_particles(self, test_particles: MasslessParticleSet) -> None:
+        """
+        試験粒子群に粒子の状態を復元（既存の粒子は削除）
+        
+        Args:
+            test_particles: 復元先の試験粒子群
+        """
+        if self.particle_positions is None:
+            test_particles.clear()
+            return
+        test_particles.restore(self.particle_positions, self.particle_velocities, self.particle_ids,
+                               self.particle_accelerations, self.particle_next_id)
+        test_particles.acceleration_source = self.particle_source
+    
+    def apply_to_solar_system(self, solar_system) -> None:
+        """
+        太陽系の天体・日付・試験粒子に状態を反映
+        
+        天体は名前で対応付けます（名前を保存していない場合は get_all_bodies() の順）。
+        反映した位置はチェックポイントのユリウス日で計算済みとして扱い、
+        同じ日時の update_all_positions で軌道要素による位置に上書きされません。
+        
+        Args:
+            solar_system: 反映先の太陽系
+        
+        Raises:
+            ValueError: 天体の数または名前が一致しない場合
+        """
+        bodies = solar_system.get_all_bodies()
+        if len(bodies) != len(self.masses):
+            raise ValueError(
+                f"天体の数が一致しません: チェックポイント {len(self.masses)}, 太陽系 {len(bodies)}"
+            )
+        if self.names:
+            by_name = {body.name: body for body in bodies}
+            missing = [name for name in self.names if name not in by_name]
+            if missing:
+                raise ValueError(f"太陽系に存在しない天体があります: {missing}")
+            bodies = [by_name[name] for name in self.names]
+        
+        for i, body in enumerate(bodies):
+            body.position = self.positions[i].copy()
+            body.velocity = self.velocities[i].copy()
+        solar_system.mark_positions_computed(self.julian_date)
+        self.restore_test_particles(solar_system.test_particles)
+
+
+def save_checkpoint(path: Union[str, Path],
+                    physics_engine: PhysicsEngine,
+                    positions: np.ndarray,
+                    velocities: np.ndarray,
+                    masses: np.ndarray,
+                    julian_date: float,
+                    step: int = 0,
+                    names: Optional[List[str]] = None,
+                    test_particles: Optional[MasslessParticleSet] = None) -> Path:
+    """
+    積分状態をチェックポイントファイルに保存
+    
+    一時ファイルに書き込んでから置き換えるため、書き込み中に中断しても
+    既存のファイルは壊れません。
+    
+    Args:
+        path: 保存先のパス
+        physics_engine: 積分に使用している物理エンジン
+        positions: 位置配列 (N, 3) (km)
+        velocities: 速度配列 (N, 3) (km/s)
+        masses: 質量配列 (N,) (kg)
+        julian_date: 現在のユリウス日
+        step: 通算ステップ数
+        names: 天体名のリスト
+        test_particles: 試験粒子群
+    
+    Returns:
+        保存したファイルのパス
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    arrays = {
+        'version': np.array(CHECKPOINT_VERSION),
+        'positions': np.asarray(positions, dtype=np.float64),
+        'velocities': np.asarray(velocities, dtype=np.float64),
+        'masses': np.asarray(masses, dtype=np.float64),
+        'julian_date': np.array(julian_date, dtype=np.float64),
+        'step': np.array(step, dtype=np.int64),
+        'names': np.array(list(names) if names is not None else [], dtype=str)
+    }
+    for key, value in physics_engine.get_integrator_state().items():
+        arrays[_ENGINE_PREFIX + key] = np.asarray(value)
+    
+    if test_particles is not None and len(test_particles):
+        arrays['particle_positions'] = test_particles.get_positions()
+        arrays['particle_velocities'] = test_particles.get_velocities()
+        arrays['particle_accelerations'] = test_particles.get_accelerations()
+        arrays['particle_ids'] = test_particles.get_ids()
+        arrays['particle_next_id'] = np.array(test_particles.next_id, dtype=np.int64)
+        if test_particles.acceleration_source is not None:
+            arrays['particle_source_positions'], arrays['particle_source_masses'] = (
+                test_particles.acceleration_source
+            )
+    
+    temporary = path.with_name(path.name + '.tmp')
+    with open(temporary, 'wb') as file:
+        np.savez(file, **arrays)
+    os.replace(temporary, path)
+    return path
+
+
+def save_solar_system_checkpoint(path: Union[str, Path],
+                                 physics_engine: PhysicsEngine,
+                                 solar_system,
+                                 step: int = 0) -> Path:
+    """
+    太陽系の現在の状態をチェックポイントファイルに保存
+    
+    Args:
+        path: 保存先のパス
+        physics_engine: 積分に使用している物理エンジン
+        solar_system: 太陽系
+        step: 通算ステップ数
+    
+    Returns:
+        保存したファイルのパス
+    """
+    bodies = solar_system.get_all_bodies()
+    positions, velocities, masses = pack_bodies(bodies)
+    return save_checkpoint(path, physics_engine, positions, velocities, masses,
+                           solar_system.current_date, step,
+                           names=[body.name for body in bodies],
+                           test_particles=solar_system.test_particles)
+
+
+def load_checkpoint(path: Union[str, Path]) -> Checkpoint:
+    """
+    チェックポイントファイルを読み込み
+    
+    Args:
+        path: チェックポイントファイルのパス
+    
+    Returns:
+        読み込んだチェックポイント
+    
+    Raises:
+        FileNotFoundError: ファイルが存在しない場合
+        ValueError: 形式のバージョンが対応していない場合
+    """
+    with np.load(Path(path), allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files}
+    
+    version = int(arrays.get('version', -1))
+    if version != CHECKPOINT_VERSION:
+        raise ValueError(
+            f"対応していないチェックポイントの形式です: {version}. 有効な値: [{CHECKPOINT_VERSION}]"
+        )
+    
+    checkpoint = Checkpoint(
+        positions=arrays['positions'],
+        velocities=arrays['velocities'],
+        masses=arrays['masses'],
+        julian_date=float(arrays['julian_date']),
+        step=int(arrays['step']),
+        names=[str(name) for name in arrays['names']],
+        engine_state={key[len(_ENGINE_PREFIX):]: value for key, value in arrays.items()
+                      if key.startswith(_ENGINE_PREFIX)}
+    )
+    
+    if 'particle_positions' in arrays:
+        checkpoint.particle_positions = arrays['particle_positions']
+        checkpoint.particle_velocities = arrays['particle_velocities']
+        checkpoint.particle_accelerations = arrays['particle_accelerations']
+        checkpoint.particle_ids = arrays['particle_ids']
+        checkpoint.particle_next_id = int(arrays['particle_next_id'])
+        if 'particle_source_positions' in arrays:
+            checkpoint.particle_source = (arrays['particle_source_positions'],
+                                          arrays['particle_source_masses'])
+    
+    return checkpoint
+
+
+def find_latest_checkpoint(directory: Union[str, Path], prefix: str = 'checkpoint') -> Optional[Path]:
+    """
+    ディレクトリ内の最新（ステップ数が最大）のチェックポイントを探す
+    
+    Args:
+        directory: 検索するディレクトリ
+        prefix: ファイル名の接頭辞
+    
+    Returns:
+        最新のチェックポイントのパス、存在しない場合はNone
+    """
+    paths = sorted(Path(directory).glob(f"{prefix}_*.npz"))
+    return paths[-1] if paths else None
+
+
+class AutoCheckpointer:
+    """
+    定期的な自動チェックポイント
+    
+    積分ループから毎ステップ maybe_save() を呼び出すと、指定したステップ数または
+    経過時間（実時間）ごとにチェックポイントを保存し、古いファイルを削除します。
+    ファイル名はステップ数を含むため、find_latest_checkpoint() で最新のものを探せます。
+    """
+    
+    def __init__(self,
+                 directory: Union[str, Path],
+                 physics_engine: PhysicsEngine,
+                 interval_steps: Optional[int] = 1000,
+                 interval_seconds: Optional[float] = None,
+                 keep: int = 3,
+                 prefix: str = 'checkpoint'):
+        """
+        自動チェックポイントの初期化
+        
+        Args:
+            directory: 保存先のディレクトリ
+            physics_engine: 積分に使用している物理エンジン
+            interval_steps: 保存するステップ間隔、Noneの場合はステップ数では保存しない
+            interval_seconds: 保存する実時間の間隔 (秒)、Noneの場合は時間では保存しない
+            keep: 保持するファイル数
+            prefix: ファイル名の接頭辞
+        
+        Raises:
+            ValueError: 間隔または保持数が不正な場合
+        """
+        if interval_steps is None and interval_seconds is None:
+            raise ValueError("ステップ間隔と時間間隔のどちらかを指定する必要があります")
+        if interval_steps is not None and interval_steps < 1:
+            raise ValueError(f"ステップ間隔は1以上である必要があります: {interval_steps}")
+        if interval_seconds is not None and interval_seconds <= 0:
+            raise ValueError(f"時間間隔は正である必要があります: {interval_seconds}")
+        if keep < 1:
+            raise ValueError(f"保持するファイル数は1以上である必要があります: {keep}")
+        
+        self.directory = Path(directory)
+        self.physics_engine = physics_engine
+        self.interval_steps = interval_steps
+        self.interval_seconds = interval_seconds
+        self.keep = keep
+        self.prefix = prefix
+        
+        self.save_count = 0
+        self.last_saved_step: Optional[int] = None
+        self.last_path: Optional[Path] = None
+        self._last_saved_time = time.monotonic()
+    
+    def is_due(self, step: int) -> bool:
+        """
+        保存する時期かどうか
+        
+        Args:
+            step: 通算ステップ数
+        
+        Returns:
+            ステップ間隔または時間間隔に達していればTrue
+        """
+        if step == self.last_saved_step:
+            return False
+        if self.interval_steps is not None and step % self.interval_steps == 0:
+            return True
+        return (self.interval_seconds is not None and
+                time.monotonic() - self._last_saved_time >= self.interval_seconds)
+    
+    def maybe_save(self,
+                   step: int,
+                   positions: np.ndarray,
+                   velocities: np.ndarray,
+                   masses: np.ndarray,
+                   julian_date: float,
+                   names: Optional[List[str]] = None,
+                   test_particles: Optional[MasslessParticleSet] = None) -> Optional[Path]:
+        """
+        保存する時期であればチェックポイントを保存
+        
+        Args:
+            step: 通算ステップ数
+            positions: 位置配列 (N, 3) (km)
+            velocities: 速度配列 (N, 3) (km/s)
+            masses: 質量配列 (N,) (kg)
+            julian_date: 現在のユリウス日
+            names: 天体名のリスト
+            test_particles: 試験粒子群
+        
+        Returns:
+            保存した場合はファイルのパス、それ以外はNone
+        """
+        if not self.is_due(step):
+            return None
+        return self.save(step, positions, velocities, masses, julian_date, names, test_particles)
+    
+    def save(self,
+             step: int,
+             positions: np.ndarray,
+             velocities: np.ndarray,
+             masses: np.ndarray,
+             julian_date: float,
+             names: Optional[List[str]] = None,
+             test_particles: Optional[MasslessParticleSet] = None) -> Path:
+        """
+        チェックポイントを保存して古いファイルを削除
+        
+        Args:
+            step: 通算ステップ数
+            positions: 位置配列 (N, 3) (km)
+            velocities: 速度配列 (N, 3) (km/s)
+            masses: 質量配列 (N,) (kg)
+            julian_date: 現在のユリウス日
+            names: 天体名のリスト
+            test_particles: 試験粒子群
+        
+        Returns:
+            保存したファイルのパス
+        """
+        path = self.directory / f"{self.prefix}_{step:012d}.npz"
+        save_checkpoint(path, self.physics_engine, positions, velocities, masses,
+                        julian_date, step, names, test_particles)
+        
+        self.save_count += 1
+        self.last_saved_step = step
+        self.last_path = path
+        self._last_saved_time = time.monotonic()
+        
+        for old in sorted(self.directory.glob(f"{self.prefix}_*.npz"))[:-self.keep]:
+            old.unlink()
+        return path
+    
+    def latest(self) -> Optional[Path]:
+        """
+        保存先ディレクトリ内の最新のチェックポイントを取得
+        
+        Returns:
+            最新のチェックポイントのパス、存在しない場合はNone
+        """
+        return find_latest_checkpoint(self.directory, self.prefix)
+    
+    def __str__(self) -> str:
+        """文字列表現"""
+        return (f"AutoCheckpointer ({self.directory}, 間隔: {self.interval_steps}ステップ, "
+                f"保存回数: {self.save_count})")
\ No newline at end of file
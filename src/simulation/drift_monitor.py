@@ -0,0 +1,235 @@
+"""
+保存量のドリフト監視
+
+積分中の全エネルギー・角運動量・運動量・質量中心を K ステップごとに
+計算し、基準値からの誤差を固定長のリングバッファに記録します。
+診断計算の時間が積分時間の一定割合を超えないよう、
+必要に応じてサンプリング間隔を自動で広げます。
+"""
+
+import math
+import time
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from src.domain.system_diagnostics import (
+    GRAVITATIONAL_CONSTANT, total_energy_array, linear_momentum_array,
+    angular_momentum_array, center_of_mass_array
+)
+
+
+@dataclass
+class DriftSample:
+    """1回分のサンプル"""
+    step: int                      # 通算ステップ数
+    time: float                    # 基準からの経過時間 (秒)
+    energy: float                  # 全エネルギー (J)
+    energy_drift: float            # 相対エネルギー誤差 (E - E0) / |E0|
+    angular_momentum_drift: float  # 相対角運動量誤差 |L - L0| / |L0|
+    momentum_drift: float          # 運動量の変化 |P - P0| (kg⋅m/s)
+    center_of_mass_drift: float    # 等速運動を除いた質量中心のずれ (km)
+
+
+class DriftMonitor:
+    """
+    保存量のストリーミング監視
+    
+    observe() を毎ステップ呼び出すと、sample_interval ステップごとに
+    保存量を計算します。max_overhead を指定した場合は、診断計算の時間が
+    積分時間のその割合を超えないようサンプリング間隔を広げます。
+    """
+    
+    # 記録を保持するサンプル数
+    HISTORY_SIZE = 1024
+    
+    def __init__(self,
+                 sample_interval: int = 10,
+                 max_overhead: Optional[float] = 0.05,
+                 history_size: Optional[int] = None,
+                 gravitational_constant: float = GRAVITATIONAL_CONSTANT):
+        """
+        監視の初期化
+        
+        Args:
+            sample_interval: サンプリング間隔の最小値 (ステップ)
+            max_overhead: 積分時間に対する診断時間の上限の割合、Noneの場合は間隔を固定
+            history_size: 保持するサンプル数、Noneの場合は HISTORY_SIZE
+            gravitational_constant: 重力定数 (m³ kg⁻¹ s⁻²)
+        
+        Raises:
+            ValueError: サンプリング間隔または保持数が1未満の場合
+        """
+        history_size = self.HISTORY_SIZE if history_size is None else history_size
+        if sample_interval < 1:
+            raise ValueError(f"サンプリング間隔は1以上である必要があります: {sample_interval}")
+        if history_size < 1:
+            raise ValueError(f"保持するサンプル数は1以上である必要があります: {history_size}")
+        
+        self.min_sample_interval = sample_interval
+        self.sample_interval = sample_interval
+        self.max_overhead = max_overhead
+        self.gravitational_constant = gravitational_constant
+        
+        # リングバッファ（列: ステップ, 時間, E, dE/E, dL/L, dP, dCOM）
+        self._history = np.zeros((history_size, 7), dtype=np.float64)
+        self._history_count = 0
+        self._history_next = 0
+        
+        self.reset()
+    
+    def reset(self) -> None:
+        """基準値と記録を破棄（次の observe() で基準値を取り直す）"""
+        self.step_count = 0
+        self.elapsed_time = 0.0
+        self._steps_since_sample = 0
+        self._reference: Optional[Dict[str, np.ndarray]] = None
+        self._history_count = 0
+        self._history_next = 0
+        self.max_energy_drift = 0.0
+        self.latest: Optional[DriftSample] = None
+        
+        # サンプリング間隔の調整用の時間計測 (秒)
+        self._integration_started = time.perf_counter()
+        self.diagnostic_time = 0.0
+    
+    @property
+    def has_reference(self) -> bool:
+        """基準値が設定済みかどうか"""
+        return self._reference is not None
+    
+    def observe(self,
+                positions: np.ndarray,
+                velocities: np.ndarray,
+                masses: np.ndarray,
+                dt: float = 0.0) -> Optional[DriftSample]:
+        """
+        1ステップ分の状態を通知
+        
+        Args:
+            positions: 位置配列 (N, 3) (km)
+            velocities: 速度配列 (N, 3) (km/s)
+            masses: 質量配列 (N,) (kg)
+            dt: このステップの時間 (秒)
+        
+        Returns:
+            サンプリングした場合はサンプル、それ以外はNone
+        """
+        if self._reference is None:
+            self._set_reference(positions, velocities, masses)
+            return self.latest
+        
+        self.step_count += 1
+        self.elapsed_time += dt
+        self._steps_since_sample += 1
+        if self._steps_since_sample < self.sample_interval:
+            return None
+        
+        integration_time = time.perf_counter() - self._integration_started
+        start = time.perf_counter()
+        sample = self._sample(positions, velocities, masses)
+        sample_time = time.perf_counter() - start
+        self.diagnostic_time += sample_time
+        self._adjust_interval(sample_time, integration_time)
+        
+        self._steps_since_sample = 0
+        self._integration_started = time.perf_counter()
+        return sample
+    
+    def _set_reference(self, positions: np.ndarray, velocities: np.ndarray, masses: np.ndarray) -> None:
+        """基準値を設定"""
+        self._reference = {
+            'energy': total_energy_array(positions, velocities, masses, self.gravitational_constant),
+            'angular_momentum': angular_momentum_array(positions, velocities, masses),
+            'momentum': linear_momentum_array(velocities, masses),
+            'center_of_mass': center_of_mass_array(positions, masses),
+            'mass': float(np.sum(masses))
+        }
+        self._record(DriftSample(0, 0.0, float(self._reference['energy']), 0.0, 0.0, 0.0, 0.0))
+        self._integration_started = time.perf_counter()
+    
+    def _sample(self, positions: np.ndarray, velocities: np.ndarray, masses: np.ndarray) -> DriftSample:
+        """保存量を計算して記録"""
+        reference = self._reference
+        energy = total_energy_array(positions, velocities, masses, self.gravitational_constant)
+        angular_momentum = angular_momentum_array(positions, velocities, masses)
+        momentum = linear_momentum_array(velocities, masses)
+        center_of_mass = center_of_mass_array(positions, masses)
+        
+        reference_energy = reference['energy']
+        energy_drift = ((energy - reference_energy) / abs(reference_energy)
+                        if reference_energy != 0 else energy)
+        reference_l = np.linalg.norm(reference['angular_momentum'])
+        angular_momentum_drift = np.linalg.norm(angular_momentum - reference['angular_momentum'])
+        if reference_l != 0:
+            angular_momentum_drift /= reference_l
+        
+        # 質量中心は初期運動量による等速運動を差し引く (kg⋅m/s -> km/s)
+        if reference['mass'] != 0:
+            expected_center = (reference['center_of_mass'] +
+                               reference['momentum'] / reference['mass'] / 1000 * self.elapsed_time)
+        else:
+            expected_center = center_of_mass
+        
+        sample = DriftSample(
+            step=self.step_count,
+            time=self.elapsed_time,
+            energy=float(energy),
+            energy_drift=float(energy_drift),
+            angular_momentum_drift=float(angular_momentum_drift),
+            momentum_drift=float(np.linalg.norm(momentum - reference['momentum'])),
+            center_of_mass_drift=float(np.linalg.norm(center_of_mass - expected_center))
+        )
+        self._record(sample)
+        return sample
+    
+    def _record(self, sample: DriftSample) -> None:
+        """サンプルをリングバッファに記録"""
+        self._history[self._history_next] = (
+            sample.step, sample.time, sample.energy, sample.energy_drift,
+            sample.angular_momentum_drift, sample.momentum_drift, sample.center_of_mass_drift
+        )
+        self._history_next = (self._history_next + 1) % self._history.shape[0]
+        self._history_count = min(self._history_count + 1, self._history.shape[0])
+        self.max_energy_drift = max(self.max_energy_drift, abs(sample.energy_drift))
+        self.latest = sample
+    
+    def _adjust_interval(self, sample_time: float, integration_time: float) -> None:
+        """診断時間の割合が上限を超えないようサンプリング間隔を調整"""
+        if self.max_overhead is None or self._steps_since_sample == 0:
+            return
+        
+        step_time = integration_time / self._steps_since_sample
+        if step_time <= 0:
+            return
+        required = math.ceil(sample_time / (self.max_overhead * step_time))
+        self.sample_interval = max(self.min_sample_interval, required)
+    
+    def get_history(self) -> Dict[str, np.ndarray]:
+        """
+        記録されたサンプルを古い順に取得
+        
+        Returns:
+            列名から配列への辞書（step, time, energy, energy_drift,
+            angular_momentum_drift, momentum_drift, center_of_mass_drift）
+        """
+        size = self._history.shape[0]
+        if self._history_count < size:
+            rows = self._history[:self._history_count]
+        else:
+            rows = np.roll(self._history, -self._history_next, axis=0)
+        
+        names = ('step', 'time', 'energy', 'energy_drift',
+                 'angular_momentum_drift', 'momentum_drift', 'center_of_mass_drift')
+        history = {name: rows[:, i].copy() for i, name in enumerate(names)}
+        history['step'] = history['step'].astype(np.int64)
+        return history
+    
+    def __len__(self) -> int:
+        """記録されているサンプル数を返す"""
+        return self._history_count
+    
+    def __str__(self) -> str:
+        """文字列表現"""
+        return (f"DriftMonitor (間隔: {self.sample_interval}ステップ, "
+                f"最大エネルギー誤差: {self.max_energy_drift:.3e})")
\ No newline at end of file
@@ -0,0 +1,302 @@
+"""
+Encke法による摂動軌道の伝播
+
+中心天体のまわりの解析的なケプラー軌道（OrbitCalculator）を参照軌道とし、
+惑星の摂動による参照軌道からのずれ δ のみを数値積分します。
+δ が大きくなった場合は、その時点の接触軌道要素で参照軌道を取り直します（整流）。
+ずれが小さく滑らかなため、運動全体を積分するよりも大きな時間ステップで積分できます。
+"""
+
+import numpy as np
+from typing import Optional, Sequence, Tuple, Union
+
+from src.domain.orbital_elements import OrbitalElements
+from src.domain.orbital_elements_table import OrbitalElementsTable
+from .orbit_calculator import OrbitCalculator
+
+
+# 1日の秒数
+SECONDS_PER_DAY = 86400.0
+
+
+def _battin_f(q: np.ndarray) -> np.ndarray:
+    """(1 + q)^(3/2) - 1 を桁落ちなく計算（Battin の f(q)）"""
+    return q * (3.0 + 3.0 * q + q * q) / (1.0 + (1.0 + q) ** 1.5)
+
+
+class EnckePropagator:
+    """
+    Encke法による質量を無視できる小天体の軌道伝播
+    
+    各小天体の位置・速度を参照軌道の状態とずれ (δ, δv) の和で表し、
+        
+        δ'' = -μ/r³ (δ - f(q) ρ) + a_perturb(r, t)
+    
+    を4次ルンゲ・クッタ法で積分します（ρ: 参照軌道の位置、r = ρ + δ、
+    q = δ·(2ρ + δ)/ρ²）。
+    摂動は摂動天体（惑星）の直接項と、中心天体が受ける加速度による間接項です。
+    摂動天体の位置も OrbitCalculator の解析解から求めます。
+    """
+    
+    # 整流するずれの大きさ（参照軌道の距離に対する比）
+    RECTIFICATION_THRESHOLD = 1e-2
+    
+    def __init__(self,
+                 orbit_calculator: Optional[OrbitCalculator] = None,
+                 central_mass: Optional[float] = None,
+                 perturber_elements: Optional[Union[OrbitalElementsTable,
+                                                    Sequence[OrbitalElements],
+                                                    np.ndarray]] = None,
+                 perturber_masses: Optional[np.ndarray] = None,
+                 rectification_threshold: Optional[float] = None):
+        """
+        伝播器の初期化
+        
+        Args:
+            orbit_calculator: 参照軌道の計算に用いる軌道計算機、Noneの場合は新規作成
+            central_mass: 中心天体の質量 (kg)、Noneの場合は太陽質量
+            perturber_elements: 摂動天体の軌道要素（テーブル、シーケンスまたは (P, 7) 配列）
+            perturber_masses: 摂動天体の質量 (P,) (kg)
+            rectification_threshold: 整流するずれの比、Noneの場合は RECTIFICATION_THRESHOLD
+        
+        Raises:
+            ValueError: 摂動天体の軌道要素と質量の数が一致しない場合、
+                または整流の閾値が正でない場合
+        """
+        self.orbit_calculator = orbit_calculator if orbit_calculator is not None else OrbitCalculator()
+        self.central_mass = (self.orbit_calculator.solar_mass
+                             if central_mass is None else float(central_mass))
+        self.rectification_threshold = (self.RECTIFICATION_THRESHOLD
+                                        if rectification_threshold is None
+                                        else rectification_threshold)
+        if not self.rectification_threshold > 0:
+            raise ValueError(f"整流の閾値は正である必要があります: {self.rectification_threshold}")
+        
+        # 重力パラメータ (km³/s²)
+        G = self.orbit_calculator.gravitational_constant * 1e-9
+        self.mu = G * self.central_mass
+        
+        if perturber_elements is None:
+            self._perturber_elements = np.empty((0, 7))
+            self._perturber_gm = np.empty(0)
+        else:
+            if isinstance(perturber_elements, OrbitalElementsTable):
+                self._perturber_elements = perturber_elements.as_array()
+            elif isinstance(perturber_elements, np.ndarray):
+                self._perturber_elements = np.asarray(perturber_elements, dtype=np.float64).reshape(-1, 7)
+            else:
+                self._perturber_elements = np.array([
+                    (elements.semi_major_axis, elements.eccentricity, elements.inclination,
+                     elements.longitude_of_ascending_node, elements.argument_of_perihelion,
+                     elements.mean_anomaly_at_epoch, elements.epoch)
+                    for elements in perturber_elements
+                ], dtype=np.float64).reshape(-1, 7)
+            masses = np.asarray(perturber_masses, dtype=np.float64).reshape(-1)
+            if masses.size != self._perturber_elements.shape[0]:
+                raise ValueError(
+                    f"摂動天体の軌道要素と質量の数が一致しません: "
+                    f"{self._perturber_elements.shape[0]} != {masses.size}"
+                )
+            self._perturber_gm = G * masses
+        
+        # 小天体ごとの参照軌道要素 (M, 7) とずれ
+        self._reference_elements = np.empty((0, 7))
+        self.deviations = np.empty((0, 3))            # δ (km)
+        self.deviation_velocities = np.empty((0, 3))  # δv (km/s)
+        self.julian_date = 0.0
+        
+        # 統計
+        self.step_count = 0
+        self.rectification_count = 0
+        self.force_evaluations = 0
+    
+    @classmethod
+    def from_solar_system(cls, solar_system, **kwargs) -> 'EnckePropagator':
+        """
+        太陽系の惑星を摂動天体とする伝播器を作成
+        
+        Args:
+            solar_system: 太陽系（太陽を中心天体とする）
+            **kwargs: コンストラクタに渡す追加の引数
+        
+        Returns:
+            伝播器
+        """
+        planets = solar_system.get_planets_list()
+        central_mass = solar_system.sun.mass if solar_system.has_sun() else None
+        return cls(
+            central_mass=central_mass,
+            perturber_elements=[planet.orbital_elements for planet in planets],
+            perturber_masses=np.array([planet.mass for planet in planets], dtype=np.float64),
+            **kwargs
+        )
+    
+    def initialize(self, positions: np.ndarray, velocities: np.ndarray, julian_date: float) -> None:
+        """
+        小天体の初期状態を設定（接触軌道要素を参照軌道とする）
+        
+        Args:
+            positions: 中心天体からの位置配列 (M, 3) (km)
+            velocities: 中心天体に対する速度配列 (M, 3) (km/s)
+            julian_date: ユリウス日
+        
+        Raises:
+            ValueError: 中心天体に束縛されていない軌道がある場合
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        velocities = np.asarray(velocities, dtype=np.float64).reshape(-1, 3)
+        count = positions.shape[0]
+        
+        self.julian_date = float(julian_date)
+        self._reference_elements = np.zeros((count, 7))
+        self.deviations = np.zeros((count, 3))
+        self.deviation_velocities = np.zeros((count, 3))
+        self._rectify(np.arange(count), positions, velocities)
+    
+    def get_state(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        現在の位置・速度を取得
+        
+        Returns:
+            (中心天体からの位置配列 (M, 3) (km), 速度配列 (M, 3) (km/s))
+        """
+        reference_positions, reference_velocities = self._reference_state(self.julian_date)
+        return reference_positions + self.deviations, reference_velocities + self.deviation_velocities
+    
+    def propagate(self, julian_date: float, step_days: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        指定した時刻まで伝播
+        
+        Args:
+            julian_date: 伝播先のユリウス日
+            step_days: 時間ステップ (日)、最後のステップは終了時刻に合わせて短くなる
+        
+        Returns:
+            (中心天体からの位置配列 (M, 3) (km), 速度配列 (M, 3) (km/s))
+        
+        Raises:
+            ValueError: 時間ステップが正でない場合
+        """
+        if not step_days > 0:
+            raise ValueError(f"時間ステップは正である必要があります: {step_days}")
+        
+        direction = 1.0 if julian_date >= self.julian_date else -1.0
+        while direction * (julian_date - self.julian_date) > 0:
+            remaining = abs(julian_date - self.julian_date)
+            if remaining <= step_days * 1e-12:
+                break
+            self.step(direction * min(step_days, remaining))
+        return self.get_state()
+    
+    def step(self, dt_days: float) -> None:
+        """
+        4次ルンゲ・クッタ法でずれを1ステップ積分し、必要に応じて整流
+        
+        Args:
+            dt_days: 時間ステップ (日、負の場合は過去向き)
+        """
+        if not len(self.deviations):
+            self.julian_date += dt_days
+            return
+        
+        h = dt_days * SECONDS_PER_DAY
+        t0 = self.julian_date
+        d0, w0 = self.deviations, self.deviation_velocities
+        
+        k1_d, k1_w = w0, self._deviation_acceleration(d0, t0)
+        k2_d = w0 + 0.5 * h * k1_w
+        k2_w = self._deviation_acceleration(d0 + 0.5 * h * k1_d, t0 + 0.5 * dt_days)
+        k3_d = w0 + 0.5 * h * k2_w
+        k3_w = self._deviation_acceleration(d0 + 0.5 * h * k2_d, t0 + 0.5 * dt_days)
+        k4_d = w0 + h * k3_w
+        k4_w = self._deviation_acceleration(d0 + h * k3_d, t0 + dt_days)
+        
+        self.deviations = d0 + (h / 6) * (k1_d + 2 * k2_d + 2 * k3_d + k4_d)
+        self.deviation_velocities = w0 + (h / 6) * (k1_w + 2 * k2_w + 2 * k3_w + k4_w)
+        self.julian_date = t0 + dt_days
+        self.step_count += 1
+        
+        # ずれが参照軌道の距離に対して大きくなった小天体を整流
+        reference_positions, reference_velocities = self._reference_state(self.julian_date)
+        ratio = (np.linalg.norm(self.deviations, axis=1) /
+                 np.linalg.norm(reference_positions, axis=1))
+        drifted = np.flatnonzero(ratio > self.rectification_threshold)
+        if drifted.size:
+            self._rectify(drifted,
+                          reference_positions[drifted] + self.deviations[drifted],
+                          reference_velocities[drifted] + self.deviation_velocities[drifted])
+    
+    def _reference_state(self, julian_date: float) -> Tuple[np.ndarray, np.ndarray]:
+        """参照軌道の位置 (M, 3) (km) と速度 (M, 3) (km/s)"""
+        positions, velocities = self.orbit_calculator.calculate_positions_batch(
+            self._reference_elements, julian_date, self.central_mass
+        )
+        return positions[:, 0], velocities[:, 0]
+    
+    def _deviation_acceleration(self, deviations: np.ndarray, julian_date: float) -> np.ndarray:
+        """ずれの加速度 δ'' (M, 3) (km/s²)"""
+        self.force_evaluations += 1
+        reference_positions, _ = self._reference_state(julian_date)
+        positions = reference_positions + deviations
+        
+        # 参照軌道との重力の差（f(q) で桁落ちを避ける）
+        rho_squared = np.einsum('ij,ij->i', reference_positions, reference_positions)
+        q = np.einsum('ij,ij->i', deviations, 2.0 * reference_positions + deviations) / rho_squared
+        r_cubed = (rho_squared * (1.0 + q)) ** 1.5
+        accelerations = -(self.mu / r_cubed)[:, np.newaxis] * (
+            deviations - _battin_f(q)[:, np.newaxis] * reference_positions
+        )
+        
+        if self._perturber_gm.size:
+            accelerations += self._perturbation(positions, julian_date)
+        return accelerations
+    
+    def _perturbation(self, positions: np.ndarray, julian_date: float) -> np.ndarray:
+        """摂動天体による直接項と間接項の加速度 (M, 3) (km/s²)"""
+        perturber_positions, _ = self.orbit_calculator.calculate_positions_batch(
+            self._perturber_elements, julian_date, self.central_mass
+        )
+        perturber_positions = perturber_positions[:, 0]
+        
+        # 直接項: 小天体から摂動天体へ
+        displacement = perturber_positions[np.newaxis, :, :] - positions[:, np.newaxis, :]
+        distance_cubed = np.einsum('ijk,ijk->ij', displacement, displacement) ** 1.5
+        direct = np.einsum('j,ij,ijk->ik', self._perturber_gm, 1.0 / distance_cubed, displacement)
+        
+        # 間接項: 中心天体が摂動天体から受ける加速度を差し引く
+        perturber_distance_cubed = np.einsum('ij,ij->i', perturber_positions, perturber_positions) ** 1.5
+        indirect = (self._perturber_gm / perturber_distance_cubed) @ perturber_positions
+        
+        return direct - indirect
+    
+    def _rectify(self, indices: np.ndarray, positions: np.ndarray, velocities: np.ndarray) -> None:
+        """
+        指定した小天体の参照軌道を現在の接触軌道要素で取り直す
+        
+        軌道要素への変換誤差は新しいずれの初期値に含めるため、状態は変化しません。
+        """
+        for k, index in enumerate(indices):
+            elements = self.orbit_calculator.calculate_orbital_elements_from_state(
+                positions[k], velocities[k], self.central_mass
+            )
+            self._reference_elements[index] = (
+                elements.semi_major_axis, elements.eccentricity, elements.inclination,
+                elements.longitude_of_ascending_node, elements.argument_of_perihelion,
+                elements.mean_anomaly_at_epoch, self.julian_date
+            )
+        
+        reference_positions, reference_velocities = self.orbit_calculator.calculate_positions_batch(
+            self._reference_elements[indices], self.julian_date, self.central_mass
+        )
+        self.deviations[indices] = positions - reference_positions[:, 0]
+        self.deviation_velocities[indices] = velocities - reference_velocities[:, 0]
+        self.rectification_count += len(indices)
+    
+    def __len__(self) -> int:
+        """小天体の数を返す"""
+        return len(self.deviations)
+    
+    def __str__(self) -> str:
+        """文字列表現"""
+        return (f"EnckePropagator ({len(self)}天体, 摂動天体: {self._perturber_gm.size}個, "
+                f"整流: {self.rectification_count}回)")
\ No newline at end of file
@@ -0,0 +1,380 @@
+"""
+近接遭遇・衝突の検出
+
+各ステップの開始・終了位置から、一様な空間ハッシュで近くにある天体の組だけを
+候補として取り出し、ステップ中の最接近距離を調べます。全ての組を調べる O(N²) の
+計算を避け、1ステップあたりほぼ O(N log N) の計算量で検出できます。
+移動量が他より極端に大きい少数の天体は空間ハッシュに入れず、移動範囲の
+バウンディングボックスが重なる天体とだけ組にします。
+"""
+
+import math
+import numpy as np
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+
+@dataclass
+class EncounterEvent:
+    """近接遭遇イベント"""
+    time: float              # 最接近の時刻（検出開始からの経過時間, 秒）
+    pair: Tuple[int, int]    # 天体の組のインデックス (i < j)
+    minimum_distance: float  # 最接近距離 (km)
+    collision: bool = False  # 最接近距離が半径の和以下かどうか
+
+
+# 空間ハッシュのキーで各軸に割り当てるビット数
+_AXIS_BITS = 21
+_AXIS_MASK = (1 << _AXIS_BITS) - 1
+
+# 自身のセルと、重複なく組を数えるための半分の隣接セル（13個）
+_HALF_NEIGHBOURS = np.array(
+    [(0, 0, 0)] +
+    [(dx, dy, dz)
+     for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+     if (dx, dy, dz) > (0, 0, 0)],
+    dtype=np.int64
+)
+
+
+def _cell_keys(cells: np.ndarray) -> np.ndarray:
+    """整数セル座標 (N, 3) を1つの整数キーにまとめる（範囲外は折り返す）"""
+    return (((cells[:, 0] & _AXIS_MASK) << (2 * _AXIS_BITS)) |
+            ((cells[:, 1] & _AXIS_MASK) << _AXIS_BITS) |
+            (cells[:, 2] & _AXIS_MASK))
+
+
+def candidate_pairs(points: np.ndarray, cell_size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    一様な空間ハッシュで距離 cell_size 以内にある可能性のある組を列挙
+    
+    距離 cell_size 以内の組は必ず含まれます。キーの折り返しにより
+    離れた組が含まれることもあるため、呼び出し側で距離を確認してください。
+    
+    Args:
+        points: 位置配列 (N, 3) (km)
+        cell_size: セルの一辺の長さ (km)
+    
+    Returns:
+        (組の一方のインデックス配列, もう一方のインデックス配列)
+    
+    Raises:
+        ValueError: セルの大きさが正でない場合
+    """
+    if not cell_size > 0:
+        raise ValueError(f"セルの大きさは正である必要があります: {cell_size}")
+    
+    n = points.shape[0]
+    if n < 2:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    
+    cells = np.floor(points / cell_size).astype(np.int64)
+    keys = _cell_keys(cells)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    
+    # キー順に並べた天体から問い合わせると二分探索のメモリアクセスが局所的になる
+    sorted_cells = cells[order]
+    
+    first_list = []
+    second_list = []
+    for offset in _HALF_NEIGHBOURS:
+        neighbour_keys = _cell_keys(sorted_cells + offset)
+        left = np.searchsorted(sorted_keys, neighbour_keys, side='left')
+        counts = np.searchsorted(sorted_keys, neighbour_keys, side='right') - left
+        total = int(counts.sum())
+        if total == 0:
+            continue
+        
+        # 各天体について隣接セル内の天体を展開
+        starts = np.cumsum(counts) - counts
+        slots = np.arange(total) - np.repeat(starts - left, counts)
+        first = np.repeat(order, counts)
+        second = order[slots]
+        
+        if not offset.any():
+            keep = first < second
+            first, second = first[keep], second[keep]
+        first_list.append(first)
+        second_list.append(second)
+    
+    if not first_list:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(first_list), np.concatenate(second_list)
+
+
+class EncounterDetector:
+    """
+    空間ハッシュによる近接遭遇検出器
+    
+    observe() にステップの開始・終了位置を渡すと、ステップ中の相対運動を
+    直線で近似して最接近距離を求め、しきい値以内の組を遭遇中として追跡します。
+    遭遇が終わった（しきい値の外に出た）時点で、遭遇中の最接近の時刻・距離を
+    持つ EncounterEvent を記録し、コールバックに通知します。
+    
+    組のしきい値は encounter_distance + radii[i] + radii[j] です。
+    refinement_substeps が2以上の場合、PhysicsEngine は遭遇を含むステップを
+    その数の小ステップに分けて積分し直します。
+    """
+    
+    # 記録を保持するイベント数
+    HISTORY_SIZE = 10000
+    
+    # 移動量が中央値のこの倍数を超える天体は空間ハッシュのセルの大きさに含めない
+    FAST_MOVER_FACTOR = 4.0
+    
+    def __init__(self,
+                 encounter_distance: float,
+                 radii: Optional[Union[float, np.ndarray]] = None,
+                 refinement_substeps: int = 1,
+                 history_size: Optional[int] = None):
+        """
+        検出器の初期化
+        
+        Args:
+            encounter_distance: 遭遇とみなす表面間の距離 (km)
+            radii: 天体の半径 (km)、スカラーまたは (N,) 配列、Noneの場合は0
+            refinement_substeps: 遭遇を含むステップの分割数、1の場合は分割しない
+            history_size: 保持するイベント数、Noneの場合は HISTORY_SIZE
+        
+        Raises:
+            ValueError: 距離・半径が負、または分割数が1未満の場合
+        """
+        if encounter_distance < 0:
+            raise ValueError(f"遭遇距離は0以上である必要があります: {encounter_distance}")
+        if radii is not None and np.any(np.asarray(radii) < 0):
+            raise ValueError("天体の半径は0以上である必要があります")
+        if refinement_substeps < 1:
+            raise ValueError(f"ステップの分割数は1以上である必要があります: {refinement_substeps}")
+        
+        self.encounter_distance = float(encounter_distance)
+        self.radii = None if radii is None else np.asarray(radii, dtype=np.float64)
+        self.refinement_substeps = refinement_substeps
+        self.events = deque(maxlen=self.HISTORY_SIZE if history_size is None else history_size)
+        self._callbacks: List[Callable[[EncounterEvent], None]] = []
+        
+        self.reset()
+    
+    def reset(self) -> None:
+        """経過時間・遭遇中の組・記録を破棄"""
+        self.elapsed_time = 0.0
+        self.step_count = 0
+        self.candidate_count = 0
+        self.active: Dict[Tuple[int, int], EncounterEvent] = {}
+        self.events.clear()
+    
+    def add_event_callback(self, callback: Callable[[EncounterEvent], None]) -> None:
+        """
+        遭遇イベントのコールバックを追加
+        
+        Args:
+            callback: 遭遇が終わったときに呼び出される関数（引数: EncounterEvent）
+        """
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
+    
+    def remove_event_callback(self, callback: Callable[[EncounterEvent], None]) -> None:
+        """
+        遭遇イベントのコールバックを削除
+        
+        Args:
+            callback: 削除する関数
+        """
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+    
+    def detect(self,
+               start_positions: np.ndarray,
+               end_positions: np.ndarray,
+               dt: float,
+               start_time: Optional[float] = None) -> List[EncounterEvent]:
+        """
+        1ステップ中にしきい値以内に近づいた組を検出（状態は変更しない）
+        
+        Args:
+            start_positions: ステップ開始時の位置配列 (N, 3) (km)
+            end_positions: ステップ終了時の位置配列 (N, 3) (km)
+            dt: 時間ステップ (秒)
+            start_time: ステップ開始時刻 (秒)、Noneの場合は現在の経過時間
+        
+        Returns:
+            ステップ中の最接近を表すイベントのリスト
+        """
+        if start_time is None:
+            start_time = self.elapsed_time
+        start_positions = np.asarray(start_positions, dtype=np.float64)
+        end_positions = np.asarray(end_positions, dtype=np.float64)
+        n = start_positions.shape[0]
+        
+        radii = np.zeros(n) if self.radii is None else np.broadcast_to(self.radii, (n,))
+        max_threshold = self.encounter_distance + 2 * (radii.max() if n else 0.0)
+        
+        displacement = end_positions - start_positions
+        if n < 2:
+            return []
+        step_lengths = np.sqrt(np.einsum('ij,ij->i', displacement, displacement))
+        fast = self._fast_movers(step_lengths)
+        slow = np.ones(n, dtype=bool)
+        slow[fast] = False
+        
+        # 中点から各天体までの距離は移動量の半分以下なので、中点を
+        # しきい値 + 最大移動量のセルで分割すれば取りこぼさない（高速な天体は除く）
+        slow_indices = np.flatnonzero(slow)
+        cell_size = max_threshold + (step_lengths[slow_indices].max() if len(slow_indices) else 0.0)
+        if cell_size > 0:
+            first, second = candidate_pairs(start_positions[slow_indices] + 0.5 * displacement[slow_indices],
+                                            cell_size)
+            first, second = slow_indices[first], slow_indices[second]
+        else:
+            first = second = np.empty(0, dtype=np.int64)
+        if len(fast):
+            fast_first, fast_second = self._fast_mover_pairs(start_positions, end_positions, fast,
+                                                             slow, max_threshold)
+            first = np.concatenate([first, fast_first])
+            second = np.concatenate([second, fast_second])
+        
+        self.candidate_count = len(first)
+        if not len(first):
+            return []
+        
+        # 相対運動を直線で近似した最接近
+        relative_start = start_positions[second] - start_positions[first]
+        relative_motion = displacement[second] - displacement[first]
+        motion_squared = np.einsum('ij,ij->i', relative_motion, relative_motion)
+        fraction = np.divide(-np.einsum('ij,ij->i', relative_start, relative_motion), motion_squared,
+                             out=np.zeros_like(motion_squared), where=motion_squared > 0)
+        fraction = np.clip(fraction, 0.0, 1.0)
+        closest = relative_start + fraction[:, np.newaxis] * relative_motion
+        distance = np.sqrt(np.einsum('ij,ij->i', closest, closest))
+        
+        contact = radii[first] + radii[second]
+        hits = np.flatnonzero(distance <= self.encounter_distance + contact)
+        if not len(hits):
+            return []
+        
+        # キーの折り返しで重複した組を除く
+        low = np.minimum(first[hits], second[hits])
+        high = np.maximum(first[hits], second[hits])
+        _, unique = np.unique(low * n + high, return_index=True)
+        hits, low, high = hits[unique], low[unique], high[unique]
+        
+        return [
+            EncounterEvent(
+                time=start_time + float(fraction[k]) * dt,
+                pair=(int(i), int(j)),
+                minimum_distance=float(distance[k]),
+                collision=self.radii is not None and bool(distance[k] <= contact[k])
+            )
+            for k, i, j in zip(hits, low, high)
+        ]
+    
+    def _fast_movers(self, step_lengths: np.ndarray) -> np.ndarray:
+        """
+        空間ハッシュから除く高速な天体のインデックス配列
+        
+        移動量が中央値の FAST_MOVER_FACTOR 倍を超える天体のうち、
+        移動量の大きい順に最大 √N 個までを返します。
+        """
+        n = len(step_lengths)
+        fast = np.flatnonzero(step_lengths > self.FAST_MOVER_FACTOR * np.median(step_lengths))
+        limit = math.isqrt(n)
+        if len(fast) > limit:
+            fast = fast[np.argsort(step_lengths[fast], kind='stable')[len(fast) - limit:]]
+        return fast
+    
+    @staticmethod
+    def _fast_mover_pairs(start_positions: np.ndarray,
+                          end_positions: np.ndarray,
+                          fast: np.ndarray,
+                          slow: np.ndarray,
+                          max_threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        高速な天体と、移動範囲のボックスがしきい値以内に重なる天体の組を列挙
+        
+        ステップ中の移動を直線で近似すると各天体は始点と終点のボックス内にあるため、
+        ボックスをしきい値だけ広げて重ならない組は遭遇しません。
+        高速な天体の1個あたり O(N) の計算量です。
+        """
+        lower = np.minimum(start_positions, end_positions)
+        upper = np.maximum(start_positions, end_positions)
+        
+        first_list = []
+        second_list = []
+        for index in fast:
+            overlap = np.all((lower <= upper[index] + max_threshold) &
+                             (upper >= lower[index] - max_threshold), axis=1)
+            # 高速な天体どうしの組は小さい方のインデックスからのみ数える
+            overlap &= slow | (np.arange(len(slow)) > index)
+            partners = np.flatnonzero(overlap)
+            first_list.append(np.full(len(partners), index, dtype=np.int64))
+            second_list.append(partners)
+        return np.concatenate(first_list), np.concatenate(second_list)
+    
+    def observe(self,
+                start_positions: np.ndarray,
+                end_positions: np.ndarray,
+                dt: float) -> List[EncounterEvent]:
+        """
+        1ステップ分の位置を通知して遭遇を追跡
+        
+        Args:
+            start_positions: ステップ開始時の位置配列 (N, 3) (km)
+            end_positions: ステップ終了時の位置配列 (N, 3) (km)
+            dt: 時間ステップ (秒)
+        
+        Returns:
+            このステップで終わった遭遇のイベントのリスト
+        """
+        detected = self.detect(start_positions, end_positions, dt)
+        self.elapsed_time += dt
+        self.step_count += 1
+        
+        current = {}
+        for event in detected:
+            previous = self.active.get(event.pair)
+            if previous is not None and previous.minimum_distance <= event.minimum_distance:
+                event = previous
+            elif previous is not None:
+                event.collision = event.collision or previous.collision
+            current[event.pair] = event
+        
+        finished = [event for pair, event in self.active.items() if pair not in current]
+        self.active = current
+        for event in finished:
+            self._emit(event)
+        return finished
+    
+    def flush(self) -> List[EncounterEvent]:
+        """
+        遭遇中の組を全て終了として記録
+        
+        Returns:
+            終了させた遭遇のイベントのリスト
+        """
+        finished = list(self.active.values())
+        self.active = {}
+        for event in finished:
+            self._emit(event)
+        return finished
+    
+    def _emit(self, event: EncounterEvent) -> None:
+        """イベントを記録してコールバックを呼び出す"""
+        self.events.append(event)
+        for callback in self._callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                # コールバックエラーは無視して続行
+                print(f"遭遇イベントコールバックエラー: {e}")
+    
+    def __len__(self) -> int:
+        """記録されているイベント数を返す"""
+        return len(self.events)
+    
+    def __str__(self) -> str:
+        """文字列表現"""
+        return (f"EncounterDetector (遭遇距離: {self.encounter_distance} km, "
+                f"遭遇中: {len(self.active)}組, 記録: {len(self.events)}件)")
\ No newline at end of file
@@ -0,0 +1,231 @@
+"""
+アンサンブル積分
+
+初期条件に摂動を与えた M 個の系を (M, N, 3) の配列にまとめ、
+PhysicsEngine の加速度計算と積分法で同時に時間発展させます。
+各ステップでメンバー間の平均・ばらつき・エネルギーの統計を記録します。
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from src.domain.system_diagnostics import total_energy_ensemble
+from .physics_engine import PhysicsEngine
+
+
+@dataclass
+class EnsembleStatistics:
+    """1ステップ分のアンサンブル統計"""
+    step: int                    # 通算ステップ数
+    time: float                  # 開始からの経過時間 (秒)
+    mean_positions: np.ndarray   # メンバー平均の位置 (N, 3) (km)
+    position_spread: np.ndarray  # 平均位置からの二乗平均平方根距離 (N,) (km)
+    velocity_spread: np.ndarray  # 平均速度からの二乗平均平方根速度差 (N,) (km/s)
+    energy_mean: float           # 全エネルギーのメンバー平均 (J)、未計算の場合はNaN
+    energy_std: float            # 全エネルギーのメンバー間標準偏差 (J)、未計算の場合はNaN
+
+
+def perturb_initial_conditions(positions: np.ndarray,
+                               velocities: np.ndarray,
+                               members: int,
+                               position_sigma: float = 0.0,
+                               velocity_sigma: float = 0.0,
+                               seed: Optional[int] = None,
+                               include_nominal: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    正規分布の摂動を加えたアンサンブルの初期条件を生成
+    
+    Args:
+        positions: 基準の位置配列 (N, 3) (km)
+        velocities: 基準の速度配列 (N, 3) (km/s)
+        members: メンバー数 M
+        position_sigma: 位置の各成分の標準偏差 (km)
+        velocity_sigma: 速度の各成分の標準偏差 (km/s)
+        seed: 乱数シード
+        include_nominal: 先頭のメンバーを摂動なしの基準状態にするかどうか
+    
+    Returns:
+        (位置配列 (M, N, 3) (km), 速度配列 (M, N, 3) (km/s))
+    
+    Raises:
+        ValueError: メンバー数が1未満の場合
+    """
+    if members < 1:
+        raise ValueError(f"メンバー数は1以上である必要があります: {members}")
+    
+    positions = np.asarray(positions, dtype=np.float64)
+    velocities = np.asarray(velocities, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    
+    shape = (members,) + positions.shape
+    ensemble_positions = positions + rng.normal(0.0, position_sigma, shape)
+    ensemble_velocities = velocities + rng.normal(0.0, velocity_sigma, shape)
+    if include_nominal:
+        ensemble_positions[0] = positions
+        ensemble_velocities[0] = velocities
+    
+    return ensemble_positions, ensemble_velocities
+
+
+class EnsembleIntegrator:
+    """
+    アンサンブルの一括積分器
+    
+    PhysicsEngine.integrate_ensemble_arrays() で全メンバーを同時に進め、
+    record_interval ステップごとに EnsembleStatistics を記録します。
+    """
+    
+    def __init__(self,
+                 physics_engine: Optional[PhysicsEngine] = None,
+                 track_energy: bool = True,
+                 record_interval: int = 1):
+        """
+        積分器の初期化
+        
+        Args:
+            physics_engine: 使用する物理エンジン、Noneの場合は新規作成
+            track_energy: 統計に全エネルギーを含めるかどうか
+            record_interval: 統計を記録する間隔 (ステップ)
+        
+        Raises:
+            ValueError: 記録間隔が1未満の場合
+        """
+        if record_interval < 1:
+            raise ValueError(f"記録間隔は1以上である必要があります: {record_interval}")
+        
+        self.physics_engine = physics_engine if physics_engine is not None else PhysicsEngine()
+        self.track_energy = track_energy
+        self.record_interval = record_interval
+        self.statistics: List[EnsembleStatistics] = []
+        self.step_count = 0
+        self.elapsed_time = 0.0
+    
+    def reset(self) -> None:
+        """記録とステップ数を破棄"""
+        self.statistics.clear()
+        self.step_count = 0
+        self.elapsed_time = 0.0
+    
+    def compute_statistics(self,
+                           positions: np.ndarray,
+                           velocities: np.ndarray,
+                           masses: np.ndarray) -> EnsembleStatistics:
+        """
+        現在の状態のアンサンブル統計を計算
+        
+        Args:
+            positions: 位置配列 (M, N, 3) (km)
+            velocities: 速度配列 (M, N, 3) (km/s)
+            masses: 質量配列 (N,) または (M, N) (kg)
+        
+        Returns:
+            アンサンブル統計
+        """
+        mean_positions = positions.mean(axis=0)
+        mean_velocities = velocities.mean(axis=0)
+        position_offset = positions - mean_positions
+        velocity_offset = velocities - mean_velocities
+        position_spread = np.sqrt(np.einsum('mij,mij->i', position_offset, position_offset)
+                                  / positions.shape[0])
+        velocity_spread = np.sqrt(np.einsum('mij,mij->i', velocity_offset, velocity_offset)
+                                  / velocities.shape[0])
+        
+        energy_mean = energy_std = float('nan')
+        if self.track_energy:
+            energies = total_energy_ensemble(positions, velocities, masses,
+                                             self.physics_engine.gravitational_constant)
+            energy_mean = float(energies.mean())
+            energy_std = float(energies.std())
+        
+        return EnsembleStatistics(
+            step=self.step_count,
+            time=self.elapsed_time,
+            mean_positions=mean_positions,
+            position_spread=position_spread,
+            velocity_spread=velocity_spread,
+            energy_mean=energy_mean,
+            energy_std=energy_std
+        )
+    
+    def step(self,
+             positions: np.ndarray,
+             velocities: np.ndarray,
+             masses: np.ndarray,
+             dt: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        全メンバーを1ステップ積分
+        
+        Args:
+            positions: 位置配列 (M, N, 3) (km)
+            velocities: 速度配列 (M, N, 3) (km/s)
+            masses: 質量配列 (N,) または (M, N) (kg)
+            dt: 時間ステップ (秒)
+        
+        Returns:
+            (新しい位置配列 (M, N, 3) (km), 新しい速度配列 (M, N, 3) (km/s))
+        """
+        positions, velocities = self.physics_engine.integrate_ensemble_arrays(
+            positions, velocities, masses, dt
+        )
+        self.step_count += 1
+        self.elapsed_time += dt
+        
+        if self.step_count % self.record_interval == 0:
+            self.statistics.append(self.compute_statistics(positions, velocities, masses))
+        return positions, velocities
+    
+    def run(self,
+            positions: np.ndarray,
+            velocities: np.ndarray,
+            masses: np.ndarray,
+            dt: float,
+            steps: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        全メンバーを指定ステップ数だけ積分
+        
+        Args:
+            positions: 位置配列 (M, N, 3) (km)
+            velocities: 速度配列 (M, N, 3) (km/s)
+            masses: 質量配列 (N,) または (M, N) (kg)
+            dt: 時間ステップ (秒)
+            steps: ステップ数
+        
+        Returns:
+            (最終位置配列 (M, N, 3) (km), 最終速度配列 (M, N, 3) (km/s))
+        
+        Raises:
+            ValueError: 状態配列が (M, N, 3) でない場合
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        velocities = np.asarray(velocities, dtype=np.float64)
+        if positions.ndim != 3 or positions.shape != velocities.shape:
+            raise ValueError(
+                f"状態配列は同じ形状の (M, N, 3) である必要があります: "
+                f"{positions.shape}, {velocities.shape}"
+            )
+        
+        if self.step_count == 0 and not self.statistics:
+            self.statistics.append(self.compute_statistics(positions, velocities, masses))
+        
+        for _ in range(steps):
+            positions, velocities = self.step(positions, velocities, masses, dt)
+        return positions, velocities
+    
+    def get_spread_history(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        記録された位置のばらつきの推移を取得
+        
+        Returns:
+            (経過時間の配列 (K,) (秒), 位置のばらつきの配列 (K, N) (km))
+        """
+        if not self.statistics:
+            return np.empty(0), np.empty((0, 0))
+        times = np.array([stats.time for stats in self.statistics])
+        spreads = np.stack([stats.position_spread for stats in self.statistics])
+        return times, spreads
+    
+    def __str__(self) -> str:
+        """文字列表現"""
+        return (f"EnsembleIntegrator ({self.step_count}ステップ, "
+                f"記録: {len(self.statistics)}件)")
\ No newline at end of file
@@ -0,0 +1,422 @@
+"""
+チェビシェフ暦キャッシュの実装
+
+天体の位置を時間区間ごとのチェビシェフ多項式で近似して保持し、
+任意のユリウス日の位置・速度を多項式の評価のみで求めます。
+近似係数はコンパクトなバイナリファイルに保存し、
+メモリマップで読み戻すことができます。
+"""
+
+import json
+import struct
+import numpy as np
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+from src.domain.orbital_elements import OrbitalElements
+
+
+# 位置関数: ユリウス日配列 (T,) -> 位置配列 (N_bodies, T, 3) [km]
+PositionFunction = Callable[[np.ndarray], np.ndarray]
+
+
+class ChebyshevEphemeris:
+    """
+    区間分割チェビシェフ暦
+    
+    天体ごと・区間ごとに3軸分のチェビシェフ係数を保持し、
+    位置 (km) と速度 (km/s) を評価します。
+    """
+    
+    # バイナリファイルの識別子
+    FILE_MAGIC = b'ASEPHEM1'
+    
+    # 係数データの先頭位置のアライメント（バイト）
+    DATA_ALIGNMENT = 64
+    
+    # evaluate() で区間ごとにまとめて評価する区間数の上限
+    SEGMENT_GROUP_LIMIT = 64
+    
+    # 区間が多い場合に evaluate() で一度に評価する時刻数
+    EVALUATION_CHUNK = 1024
+    
+    def __init__(self,
+                 body_names: Sequence[str],
+                 start_jd: float,
+                 segment_days: float,
+                 coefficients: np.ndarray):
+        """
+        チェビシェフ暦の初期化
+        
+        Args:
+            body_names: 天体名のリスト（係数の第1軸の順序）
+            start_jd: 最初の区間の開始ユリウス日
+            segment_days: 区間の長さ（日）
+            coefficients: 係数配列 (N_bodies, N_segments, 3, degree + 1)
+        """
+        if coefficients.ndim != 4 or coefficients.shape[2] != 3:
+            raise ValueError("係数配列は (N_bodies, N_segments, 3, degree + 1) の形状である必要があります")
+        if coefficients.shape[0] != len(body_names):
+            raise ValueError("天体名の数と係数配列の天体数が一致しません")
+        if segment_days <= 0:
+            raise ValueError("区間の長さは正の値である必要があります")
+        
+        self.body_names: List[str] = list(body_names)
+        self.start_jd = float(start_jd)
+        self.segment_days = float(segment_days)
+        self.coefficients = coefficients
+        
+        self._body_index: Dict[str, int] = {
+            name: index for index, name in enumerate(self.body_names)
+        }
+    
+    @property
+    def segment_count(self) -> int:
+        """区間数"""
+        return self.coefficients.shape[1]
+    
+    @property
+    def degree(self) -> int:
+        """多項式の次数"""
+        return self.coefficients.shape[3] - 1
+    
+    @property
+    def end_jd(self) -> float:
+        """最後の区間の終了ユリウス日"""
+        return self.start_jd + self.segment_count * self.segment_days
+    
+    def covers(self, julian_date: float) -> bool:
+        """
+        指定したユリウス日が暦の範囲内かどうか
+        
+        Args:
+            julian_date: ユリウス日
+        
+        Returns:
+            範囲内の場合True
+        """
+        return self.start_jd <= julian_date <= self.end_jd
+    
+    def evaluate(self,
+                 julian_dates: Union[float, Sequence[float], np.ndarray],
+                 body_names: Optional[Sequence[str]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        位置と速度を評価
+        
+        Args:
+            julian_dates: ユリウス日（スカラーまたは1次元配列）
+            body_names: 評価する天体名（Noneの場合は全天体）
+        
+        Returns:
+            (位置配列(km), 速度配列(km/s))、いずれも形状 (N_bodies, N_times, 3)
+        
+        Raises:
+            ValueError: 暦の範囲外のユリウス日が含まれる場合
+        """
+        times = np.atleast_1d(np.asarray(julian_dates, dtype=np.float64))
+        if times.ndim != 1:
+            raise ValueError("julian_dates はスカラーまたは1次元配列である必要があります")
+        if np.any(times < self.start_jd) or np.any(times > self.end_jd):
+            raise ValueError(
+                f"暦の範囲外です: {self.start_jd} - {self.end_jd} (JD)"
+            )
+        
+        if body_names is None:
+            bodies = np.arange(len(self.body_names))
+        else:
+            bodies = np.array([self._get_body_index(name) for name in body_names], dtype=np.int64)
+        
+        # 区間番号と区間内の正規化時刻 tau ∈ [-1, 1]
+        offset = (times - self.start_jd) / self.segment_days
+        segments = np.minimum(offset.astype(np.int64), self.segment_count - 1)
+        tau = 2.0 * (offset - segments) - 1.0
+        
+        basis, derivative_basis = self._chebyshev_basis(tau, self.degree)
+        
+        positions = np.empty((len(bodies), len(times), 3), dtype=np.float64)
+        velocities = np.empty((len(bodies), len(times), 3), dtype=np.float64)
+        
+        # 時刻を区間ごとにまとめ、区間の係数 (N_bodies, 3, degree + 1) をそのまま使う
+        order = np.argsort(segments, kind='stable')
+        unique_segments, group_starts = np.unique(segments[order], return_index=True)
+        if len(unique_segments) <= self.SEGMENT_GROUP_LIMIT:
+            group_ends = np.append(group_starts[1:], len(order))
+            for segment, start, end in zip(unique_segments, group_starts, group_ends):
+                block = order[start:end]
+                segment_coefficients = self.coefficients[bodies, segment]
+                positions[:, block] = np.einsum('ncd,td->ntc', segment_coefficients, basis[block])
+                velocities[:, block] = np.einsum('ncd,td->ntc', segment_coefficients, derivative_basis[block])
+        else:
+            # 区間が多い場合は、取り出す係数が EVALUATION_CHUNK 時刻分を超えないよう分割
+            for start in range(0, len(order), self.EVALUATION_CHUNK):
+                block = order[start:start + self.EVALUATION_CHUNK]
+                segment_coefficients = self.coefficients[bodies[:, np.newaxis], segments[block]]
+                positions[:, block] = np.einsum('ntcd,td->ntc', segment_coefficients, basis[block])
+                velocities[:, block] = np.einsum('ntcd,td->ntc', segment_coefficients, derivative_basis[block])
+        
+        # d/dt = (2 / segment_days) d/dtau、km/day -> km/s
+        velocities *= 2.0 / (self.segment_days * 86400.0)
+        
+        return positions, velocities
+    
+    def get_position(self, body_name: str, julian_date: float) -> np.ndarray:
+        """
+        1天体の位置を取得
+        
+        Args:
+            body_name: 天体名
+            julian_date: ユリウス日
+        
+        Returns:
+            位置ベクトル (km)
+        """
+        positions, _ = self.evaluate(julian_date, [body_name])
+        return positions[0, 0]
+    
+    def get_position_velocity(self, body_name: str, julian_date: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        1天体の位置と速度を取得
+        
+        Args:
+            body_name: 天体名
+            julian_date: ユリウス日
+        
+        Returns:
+            (位置ベクトル(km), 速度ベクトル(km/s))
+        """
+        positions, velocities = self.evaluate(julian_date, [body_name])
+        return positions[0, 0], velocities[0, 0]
+    
+    def _get_body_index(self, body_name: str) -> int:
+        """天体名から係数のインデックスを取得"""
+        if body_name not in self._body_index:
+            raise KeyError(f"暦に含まれない天体です: {body_name}")
+        return self._body_index[body_name]
+    
+    @staticmethod
+    def _chebyshev_basis(tau: np.ndarray, degree: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        チェビシェフ多項式 T_k(tau) とその導関数を漸化式で計算
+        
+        Args:
+            tau: 正規化時刻 (T,)
+            degree: 次数
+        
+        Returns:
+            (T_k(tau) (T, degree + 1), dT_k/dtau (T, degree + 1))
+        """
+        count = tau.shape[0]
+        basis = np.empty((count, degree + 1), dtype=np.float64)
+        derivative = np.empty((count, degree + 1), dtype=np.float64)
+        
+        basis[:, 0] = 1.0
+        derivative[:, 0] = 0.0
+        if degree >= 1:
+            basis[:, 1] = tau
+            derivative[:, 1] = 1.0
+        
+        # T_k = 2 tau T_{k-1} - T_{k-2}
+        # T'_k = 2 T_{k-1} + 2 tau T'_{k-1} - T'_{k-2}
+        for k in range(2, degree + 1):
+            basis[:, k] = 2.0 * tau * basis[:, k - 1] - basis[:, k - 2]
+            derivative[:, k] = (
+                2.0 * basis[:, k - 1] + 2.0 * tau * derivative[:, k - 1] - derivative[:, k - 2]
+            )
+        
+        return basis, derivative
+    
+    def save(self, file_path: Union[str, Path]) -> None:
+        """
+        係数をバイナリファイルに保存
+        
+        形式: 識別子(8バイト) + ヘッダ長(uint32) + JSONヘッダ +
+        パディング + float64係数（C順、リトルエンディアン）
+        
+        Args:
+            file_path: 保存先パス
+        """
+        file_path = Path(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        coefficients = np.ascontiguousarray(self.coefficients, dtype='<f8')
+        header = json.dumps({
+            'body_names': self.body_names,
+            'start_jd': self.start_jd,
+            'segment_days': self.segment_days,
+            'shape': list(coefficients.shape)
+        }, ensure_ascii=False).encode('utf-8')
+        
+        prefix_length = len(self.FILE_MAGIC) + 4 + len(header)
+        padding = (-prefix_length) % self.DATA_ALIGNMENT
+        
+        with open(file_path, 'wb') as file:
+            file.write(self.FILE_MAGIC)
+            file.write(struct.pack('<I', len(header)))
+            file.write(header)
+            file.write(b'\0' * padding)
+            file.write(coefficients.tobytes())
+    
+    @classmethod
+    def load(cls, file_path: Union[str, Path], memory_map: bool = True) -> 'ChebyshevEphemeris':
+        """
+        バイナリファイルから暦を読み込み
+        
+        Args:
+            file_path: 読み込むファイルのパス
+            memory_map: Trueの場合は係数をメモリマップで読み込む（読み取り専用）
+        
+        Returns:
+            チェビシェフ暦
+        
+        Raises:
+            ValueError: ファイル形式が不正な場合
+        """
+        file_path = Path(file_path)
+        
+        with open(file_path, 'rb') as file:
+            magic = file.read(len(cls.FILE_MAGIC))
+            if magic != cls.FILE_MAGIC:
+                raise ValueError(f"チェビシェフ暦ファイルではありません: {file_path}")
+            
+            (header_length,) = struct.unpack('<I', file.read(4))
+            header = json.loads(file.read(header_length).decode('utf-8'))
+        
+        prefix_length = len(cls.FILE_MAGIC) + 4 + header_length
+        data_offset = prefix_length + (-prefix_length) % cls.DATA_ALIGNMENT
+        shape = tuple(header['shape'])
+        
+        if memory_map:
+            coefficients = np.memmap(file_path, dtype='<f8', mode='r',
+                                     offset=data_offset, shape=shape)
+        else:
+            with open(file_path, 'rb') as file:
+                file.seek(data_offset)
+                coefficients = np.fromfile(file, dtype='<f8',
+                                           count=int(np.prod(shape))).reshape(shape)
+        
+        return cls(header['body_names'], header['start_jd'],
+                   header['segment_days'], coefficients)
+    
+    def __str__(self) -> str:
+        """文字列表現"""
+        return (f"ChebyshevEphemeris ({len(self.body_names)}天体, {self.segment_count}区間, "
+                f"次数{self.degree}, JD {self.start_jd:.1f} - {self.end_jd:.1f})")
+
+
+class EphemerisCompiler:
+    """
+    チェビシェフ暦の作成クラス
+    
+    位置関数（軌道計算やN体積分の結果）を各区間のチェビシェフ節点で
+    サンプリングし、最小二乗法で係数を求めます。
+    """
+    
+    def __init__(self,
+                 segment_days: float = 8.0,
+                 degree: int = 12,
+                 samples_per_segment: Optional[int] = None):
+        """
+        暦作成クラスの初期化
+        
+        Args:
+            segment_days: 区間の長さ（日）
+            degree: 多項式の次数
+            samples_per_segment: 区間あたりのサンプル数（Noneの場合は 2 * (degree + 1)）
+        """
+        if segment_days <= 0:
+            raise ValueError("区間の長さは正の値である必要があります")
+        if degree < 1:
+            raise ValueError("多項式の次数は1以上である必要があります")
+        
+        self.segment_days = segment_days
+        self.degree = degree
+        self.samples_per_segment = samples_per_segment or 2 * (degree + 1)
+        
+        if self.samples_per_segment <= degree:
+            raise ValueError("区間あたりのサンプル数は次数より大きい必要があります")
+    
+    def compile(self,
+                body_names: Sequence[str],
+                position_function: PositionFunction,
+                start_jd: float,
+                end_jd: float) -> ChebyshevEphemeris:
+        """
+        位置関数からチェビシェフ暦を作成
+        
+        Args:
+            body_names: 天体名のリスト
+            position_function: ユリウス日配列 (T,) を受け取り
+                位置配列 (N_bodies, T, 3) [km] を返す関数
+            start_jd: 開始ユリウス日
+            end_jd: 終了ユリウス日
+        
+        Returns:
+            チェビシェフ暦
+        """
+        if end_jd <= start_jd:
+            raise ValueError("終了日は開始日より後である必要があります")
+        
+        segment_count = int(np.ceil((end_jd - start_jd) / self.segment_days))
+        
+        # チェビシェフ節点（第1種）: 区間端での誤差の偏りを抑える
+        k = np.arange(self.samples_per_segment)
+        nodes = np.cos(np.pi * (k + 0.5) / self.samples_per_segment)[::-1]
+        
+        segment_starts = start_jd + np.arange(segment_count) * self.segment_days
+        sample_times = (
+            segment_starts[:, np.newaxis] +
+            (nodes[np.newaxis, :] + 1.0) * 0.5 * self.segment_days
+        ).ravel()
+        
+        samples = np.asarray(position_function(sample_times), dtype=np.float64)
+        body_count = len(body_names)
+        if samples.shape != (body_count, sample_times.size, 3):
+            raise ValueError(
+                f"位置関数の戻り値の形状が不正です: {samples.shape} "
+                f"(期待値: {(body_count, sample_times.size, 3)})"
+            )
+        
+        # 全天体・全区間・全軸を1回の最小二乗で解く
+        # (N, K, S, 3) -> (S, N * K * 3)
+        samples = samples.reshape(body_count, segment_count, self.samples_per_segment, 3)
+        right_hand_side = samples.transpose(2, 0, 1, 3).reshape(self.samples_per_segment, -1)
+        
+        vandermonde = np.polynomial.chebyshev.chebvander(nodes, self.degree)
+        solution, _, _, _ = np.linalg.lstsq(vandermonde, right_hand_side, rcond=None)
+        
+        # (D, N * K * 3) -> (N, K, 3, D)
+        coefficients = np.ascontiguousarray(
+            solution.reshape(self.degree + 1, body_count, segment_count, 3).transpose(1, 2, 3, 0)
+        )
+        
+        return ChebyshevEphemeris(body_names, start_jd, self.segment_days, coefficients)
+    
+    def compile_from_elements(self,
+                              orbit_calculator,
+                              elements_by_name: Dict[str, OrbitalElements],
+                              start_jd: float,
+                              end_jd: float) -> ChebyshevEphemeris:
+        """
+        軌道要素から（OrbitCalculatorの一括計算を用いて）チェビシェフ暦を作成
+        
+        Args:
+            orbit_calculator: 軌道計算機
+            elements_by_name: 天体名 -> 軌道要素
+            start_jd: 開始ユリウス日
+            end_jd: 終了ユリウス日
+        
+        Returns:
+            チェビシェフ暦
+        """
+        body_names = list(elements_by_name.keys())
+        elements_list = [elements_by_name[name] for name in body_names]
+        
+        def position_function(julian_dates: np.ndarray) -> np.ndarray:
+            positions, _ = orbit_calculator.calculate_positions_batch(elements_list, julian_dates)
+            return positions
+        
+        return self.compile(body_names, position_function, start_jd, end_jd)
+    
+    def __str__(self) -> str:
+        """文字列表現"""
+        return (f"EphemerisCompiler (区間: {self.segment_days}日, 次数: {self.degree}, "
+                f"サンプル数: {self.samples_per_segment})")
\ No newline at end of file
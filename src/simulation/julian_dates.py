@@ -0,0 +1,168 @@
+"""
+datetime64 配列とユリウス日の一括変換
+
+TimeManager.datetime_to_julian / julian_to_datetime と同じ規約の変換を、
+要素ごとの Python の処理なしに numpy.datetime64 / float64 配列で行います。
+ユリウス日は (整数の日, 日の端数) の2つの配列でも表せます。
+float64 のユリウス日（約 2.4e6）の分解能は約 40 マイクロ秒ですが、
+2つに分けると端数側はマイクロ秒未満の精度を保つため、小さな時間ステップを
+積み重ねても精度が落ちません。
+
+規約（スカラー版と同一）:
+    datetime → ユリウス日: UTC 00:00 を整数のユリウス日とする（J2000.0 の 00:00 が 2451545.0）
+    ユリウス日 → datetime: 標準の定義（整数のユリウス日が UTC 12:00）
+"""
+
+import numpy as np
+from typing import Tuple, Union
+
+
+# 1日のマイクロ秒数
+MICROSECONDS_PER_DAY = 86400 * 1000000
+
+# UNIX エポック（1970-01-01T00:00 UTC）に対応するユリウス日
+# datetime → ユリウス日（TimeManager.datetime_to_julian の規約）
+UNIX_EPOCH_JULIAN_DAY = 2440588
+# ユリウス日 → datetime（標準の定義）
+UNIX_EPOCH_JULIAN_DATE = 2440587.5
+
+ArrayLike = Union[np.ndarray, float]
+
+
+def normalize_julian_parts(day: ArrayLike, fraction: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (日, 端数) を整数の日と [0, 1) の端数に正規化
+    
+    Args:
+        day: 日の配列（端数を含んでもよい）
+        fraction: 日の端数の配列
+    
+    Returns:
+        (整数値の日の配列, [0, 1) の端数の配列)
+    """
+    day = np.asarray(day, dtype=np.float64)
+    fraction = np.asarray(fraction, dtype=np.float64)
+    
+    whole = np.floor(day)
+    fraction = (day - whole) + fraction
+    carry = np.floor(fraction)
+    return whole + carry, fraction - carry
+
+
+def split_julian_date(julian_date: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    ユリウス日を (整数の日, 端数) に分割
+    
+    Args:
+        julian_date: ユリウス日の配列
+    
+    Returns:
+        (整数値の日の配列, [0, 1) の端数の配列)
+    """
+    return normalize_julian_parts(julian_date, 0.0)
+
+
+def add_days_to_julian_parts(day: ArrayLike,
+                             fraction: ArrayLike,
+                             days: ArrayLike) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (日, 端数) に日数を加算（整数部分と端数部分を別々に加算して精度を保つ）
+    
+    Args:
+        day: 整数値の日の配列
+        fraction: 端数の配列
+        days: 加算する日数
+    
+    Returns:
+        正規化した (日, 端数)
+    """
+    whole, part = split_julian_date(days)
+    return normalize_julian_parts(np.asarray(day, dtype=np.float64) + whole,
+                                  np.asarray(fraction, dtype=np.float64) + part)
+
+
+def julian_parts_difference(day: ArrayLike,
+                            fraction: ArrayLike,
+                            other_day: ArrayLike,
+                            other_fraction: ArrayLike) -> np.ndarray:
+    """
+    2つの (日, 端数) の差を日数で計算
+    
+    Args:
+        day: 整数値の日の配列
+        fraction: 端数の配列
+        other_day: 引く側の整数値の日の配列
+        other_fraction: 引く側の端数の配列
+    
+    Returns:
+        差の日数の配列
+    """
+    return ((np.asarray(day, dtype=np.float64) - np.asarray(other_day, dtype=np.float64)) +
+            (np.asarray(fraction, dtype=np.float64) - np.asarray(other_fraction, dtype=np.float64)))
+
+
+def datetime64_to_julian_parts(times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    datetime64 配列を (整数の日, 端数) に変換（マイクロ秒単位の整数演算）
+    
+    Args:
+        times: UTC の datetime64 配列（任意の単位、マイクロ秒未満は切り捨て）
+    
+    Returns:
+        (整数値の日の配列, [0, 1) の端数の配列)
+    """
+    microseconds = np.asarray(times, dtype='datetime64[us]').astype(np.int64)
+    days, remainder = np.divmod(microseconds, MICROSECONDS_PER_DAY)
+    return ((days + UNIX_EPOCH_JULIAN_DAY).astype(np.float64),
+            remainder.astype(np.float64) / MICROSECONDS_PER_DAY)
+
+
+def datetime64_to_julian(times: np.ndarray) -> np.ndarray:
+    """
+    datetime64 配列をユリウス日の配列に変換
+    
+    TimeManager.datetime_to_julian と同じ規約（UTC 00:00 が整数のユリウス日）です。
+    
+    Args:
+        times: UTC の datetime64 配列
+    
+    Returns:
+        ユリウス日の配列 (float64)
+    """
+    day, fraction = datetime64_to_julian_parts(times)
+    return day + fraction
+
+
+def julian_parts_to_datetime64(day: ArrayLike, fraction: ArrayLike = 0.0) -> np.ndarray:
+    """
+    (日, 端数) を datetime64[us] 配列に変換
+    
+    TimeManager.julian_to_datetime と同じ規約（整数のユリウス日が UTC 12:00）で、
+    マイクロ秒に丸めます。
+    
+    Args:
+        day: 日の配列
+        fraction: 日の端数の配列
+    
+    Returns:
+        UTC の datetime64[us] 配列
+    """
+    day, fraction = normalize_julian_parts(day, fraction)
+    day, fraction = normalize_julian_parts(day - np.floor(UNIX_EPOCH_JULIAN_DATE),
+                                           fraction - (UNIX_EPOCH_JULIAN_DATE % 1))
+    microseconds = (day.astype(np.int64) * MICROSECONDS_PER_DAY +
+                    np.rint(fraction * MICROSECONDS_PER_DAY).astype(np.int64))
+    return microseconds.astype('datetime64[us]')
+
+
+def julian_to_datetime64(julian_date: ArrayLike) -> np.ndarray:
+    """
+    ユリウス日の配列を datetime64[us] 配列に変換
+    
+    Args:
+        julian_date: ユリウス日の配列
+    
+    Returns:
+        UTC の datetime64[us] 配列
+    """
+    return julian_parts_to_datetime64(julian_date, 0.0)
\ No newline at end of file
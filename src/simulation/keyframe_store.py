@@ -0,0 +1,371 @@
+"""
+N体計算のタイムライン移動（キーフレーム）
+
+前向きの積分中に一定ステップごとの状態をキーフレームとして記録し、
+過去の時刻へ移動する場合は直前のキーフレームから残りだけを積分し直します。
+記録の間隔はメモリ予算に応じて広がり、予算を超えると中間のキーフレームを
+間引きます（間隔を2倍にして、その倍数のステップ以外を破棄）。
+キーフレームの数は常に予算の半分から予算までに収まるため、
+積分した期間の長さによらず、移動で積分し直すステップ数は一定以下になります。
+"""
+
+import bisect
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .physics_engine import PhysicsEngine
+from .orbit_calculator import OrbitCalculator
+
+
+# 1日の秒数
+SECONDS_PER_DAY = 86400.0
+
+
+@dataclass
+class Keyframe:
+    """タイムライン上の1ステップの状態"""
+    step: int                               # タイムラインの開始からのステップ数
+    julian_date: float                      # ユリウス日
+    positions: np.ndarray                   # 位置配列 (N, 3) (km)
+    velocities: np.ndarray                  # 速度配列 (N, 3) (km/s)
+    integrator_state: Dict[str, np.ndarray]  # PhysicsEngine.get_integrator_state()
+    
+    # 配列以外に1キーフレームあたりに見込むメモリ (バイト)
+    OVERHEAD_BYTES = 512
+    
+    @property
+    def nbytes(self) -> int:
+        """キーフレームのおおよそのメモリ使用量 (バイト)"""
+        return (self.positions.nbytes + self.velocities.nbytes + self.OVERHEAD_BYTES +
+                sum(np.asarray(value).nbytes for value in self.integrator_state.values()))
+
+
+class KeyframeStore:
+    """
+    ユリウス日順のキーフレームの集合
+    
+    interval_steps の倍数のステップだけを記録し、メモリ使用量が
+    memory_budget を超えると interval_steps を2倍にして間引きます。
+    先頭（ステップ0）と最新のキーフレームは間引きません。
+    """
+    
+    # 既定のメモリ予算 (バイト)
+    DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+    
+    def __init__(self, memory_budget: Optional[int] = None, interval_steps: int = 1):
+        """
+        ストアの初期化
+        
+        Args:
+            memory_budget: キーフレームに使うメモリの上限 (バイト)、Noneの場合は DEFAULT_MEMORY_BUDGET
+            interval_steps: 記録する最初のステップ間隔
+        
+        Raises:
+            ValueError: メモリ予算が正でない、またはステップ間隔が1未満の場合
+        """
+        self.memory_budget = self.DEFAULT_MEMORY_BUDGET if memory_budget is None else int(memory_budget)
+        if self.memory_budget <= 0:
+            raise ValueError(f"メモリ予算は正である必要があります: {self.memory_budget}")
+        if interval_steps < 1:
+            raise ValueError(f"ステップ間隔は1以上である必要があります: {interval_steps}")
+        
+        self.interval_steps = interval_steps
+        self._keyframes: List[Keyframe] = []
+        self._julian_dates: List[float] = []
+        self.memory_usage = 0
+        self.evicted_count = 0
+    
+    def wants(self, step: int) -> bool:
+        """
+        ステップを記録する必要があるかどうか
+        
+        Args:
+            step: タイムラインの開始からのステップ数
+        
+        Returns:
+            現在の間隔の倍数で、最新のキーフレームより後の場合は True
+        """
+        if step % self.interval_steps:
+            return False
+        return not self._keyframes or step > self._keyframes[-1].step
+    
+    def record(self, keyframe: Keyframe) -> bool:
+        """
+        キーフレームを記録（必要なら間引く）
+        
+        Args:
+            keyframe: 記録するキーフレーム
+        
+        Returns:
+            記録した場合は True
+        """
+        if not self.wants(keyframe.step):
+            return False
+        
+        self._keyframes.append(keyframe)
+        self._julian_dates.append(keyframe.julian_date)
+        self.memory_usage += keyframe.nbytes
+        
+        while self.memory_usage > self.memory_budget and len(self._keyframes) > 2:
+            self._thin()
+        return True
+    
+    def _thin(self) -> None:
+        """間隔を2倍にして、その倍数以外の中間のキーフレームを破棄"""
+        self.interval_steps *= 2
+        last = self._keyframes[-1]
+        kept = [keyframe for keyframe in self._keyframes[:-1]
+                if keyframe.step % self.interval_steps == 0]
+        kept.append(last)
+        
+        self.evicted_count += len(self._keyframes) - len(kept)
+        self._keyframes = kept
+        self._julian_dates = [keyframe.julian_date for keyframe in kept]
+        self.memory_usage = sum(keyframe.nbytes for keyframe in kept)
+    
+    def nearest_before(self, julian_date: float) -> Optional[Keyframe]:
+        """
+        指定した時刻以前で最も新しいキーフレームを取得
+        
+        Args:
+            julian_date: ユリウス日
+        
+        Returns:
+            キーフレーム、存在しない場合は None
+        """
+        index = bisect.bisect_right(self._julian_dates, julian_date)
+        return self._keyframes[index - 1] if index else None
+    
+    def clear(self) -> None:
+        """全てのキーフレームを破棄"""
+        self._keyframes.clear()
+        self._julian_dates.clear()
+        self.memory_usage = 0
+    
+    @property
+    def latest(self) -> Optional[Keyframe]:
+        """最新のキーフレーム"""
+        return self._keyframes[-1] if self._keyframes else None
+    
+    def __len__(self) -> int:
+        """キーフレーム数を返す"""
+        return len(self._keyframes)
+    
+    def __str__(self) -> str:
+        """文字列表現"""
+        return (f"KeyframeStore ({len(self)}件, 間隔: {self.interval_steps}ステップ, "
+                f"{self.memory_usage / 1024:.1f}/{self.memory_budget / 1024:.1f} KB)")
+
+
+class NBodyTimeline:
+    """
+    キーフレームによる時刻の移動に対応したN体計算
+    
+    開始時刻から step_days ごとの格子上で積分し、格子上の状態をキーフレームとして
+    記録します。seek() では、現在の格子上の状態と直前のキーフレームのうち
+    目標に近い方から積分し、格子の間の端数は1回の短いステップで積分します。
+    格子上の状態は移動の経路によらずビット単位で同じになります。
+    物理エンジンの drift_monitor・encounter_detector には、各格子のステップを
+    初めて積分したときだけ通知します（再計算と端数のステップは通知しない）。
+    """
+    
+    def __init__(self,
+                 physics_engine: PhysicsEngine,
+                 positions: np.ndarray,
+                 velocities: np.ndarray,
+                 masses: np.ndarray,
+                 julian_date: float,
+                 step_days: float = 1.0,
+                 store: Optional[KeyframeStore] = None,
+                 solar_system=None):
+        """
+        タイムラインの初期化（開始時刻の状態をキーフレームとして記録）
+        
+        Args:
+            physics_engine: 積分に用いる物理エンジン
+            positions: 開始時刻の位置配列 (N, 3) (km)
+            velocities: 開始時刻の速度配列 (N, 3) (km/s)
+            masses: 質量配列 (N,) (kg)
+            julian_date: 開始時刻のユリウス日
+            step_days: 積分の時間ステップ (日)
+            store: キーフレームの記録先、Noneの場合は新規作成
+            solar_system: 移動後の状態を書き込む太陽系（天体の順は get_all_bodies()）
+        
+        Raises:
+            ValueError: 時間ステップが正でない場合
+        """
+        if not step_days > 0:
+            raise ValueError(f"時間ステップは正である必要があります: {step_days}")
+        
+        self.physics_engine = physics_engine
+        self.masses = np.asarray(masses, dtype=np.float64)
+        self.origin_julian_date = float(julian_date)
+        self.step_days = float(step_days)
+        self.store = store if store is not None else KeyframeStore()
+        self.solar_system = solar_system
+        
+        # 格子上の状態
+        self._grid_step = 0
+        self._grid_positions = np.array(positions, dtype=np.float64)
+        self._grid_velocities = np.array(velocities, dtype=np.float64)
+        
+        # 監視・検出に通知済みの最も先の格子のステップ（それ以前は再計算）
+        self._observed_step = 0
+        
+        # 現在の（端数を含む）時刻の状態
+        self.julian_date = self.origin_julian_date
+        self.positions = self._grid_positions
+        self.velocities = self._grid_velocities
+        
+        # 統計
+        self.integrated_steps = 0
+        self.restore_count = 0
+        
+        self.store.clear()
+        self._record()
+    
+    @classmethod
+    def from_solar_system(cls,
+                          solar_system,
+                          physics_engine: PhysicsEngine,
+                          step_days: float = 1.0,
+                          store: Optional[KeyframeStore] = None,
+                          kepler_velocities: bool = True) -> 'NBodyTimeline':
+        """
+        太陽系の現在の状態から開始するタイムラインを作成
+        
+        update_all_positions は位置のみを更新するため、kepler_velocities が True の場合は
+        惑星の速度を開始時刻の軌道要素による太陽中心の速度とします。
+        
+        Args:
+            solar_system: 太陽系（current_date を開始時刻とする）
+            physics_engine: 積分に用いる物理エンジン
+            step_days: 積分の時間ステップ (日)
+            store: キーフレームの記録先
+            kepler_velocities: Trueの場合は惑星の速度を軌道要素から計算、
+                Falseの場合は天体の velocity をそのまま使用
+        
+        Returns:
+            タイムライン
+        """
+        bodies = solar_system.get_all_bodies()
+        velocities = np.array([body.velocity for body in bodies], dtype=np.float64).reshape(-1, 3)
+        
+        planets = solar_system.get_planets_list()
+        if kepler_velocities and planets:
+            _, planet_velocities = OrbitCalculator().calculate_positions_batch(
+                [planet.orbital_elements for planet in planets], solar_system.current_date
+            )
+            rows = {id(body): i for i, body in enumerate(bodies)}
+            for planet, velocity in zip(planets, planet_velocities[:, 0]):
+                velocities[rows[id(planet)]] = velocity
+        
+        return cls(
+            physics_engine,
+            np.array([body.position for body in bodies], dtype=np.float64),
+            velocities,
+            np.array([body.mass for body in bodies], dtype=np.float64),
+            solar_system.current_date,
+            step_days=step_days,
+            store=store,
+            solar_system=solar_system
+        )
+    
+    def grid_julian_date(self, step: int) -> float:
+        """格子のステップのユリウス日"""
+        return self.origin_julian_date + step * self.step_days
+    
+    def seek(self, julian_date: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        指定した時刻の状態に移動
+        
+        Args:
+            julian_date: 移動先のユリウス日
+        
+        Returns:
+            (位置配列 (N, 3) (km), 速度配列 (N, 3) (km/s))
+        
+        Raises:
+            ValueError: タイムラインの開始より前の時刻の場合
+        """
+        if julian_date < self.origin_julian_date:
+            raise ValueError(
+                f"タイムラインの開始より前には移動できません: {julian_date} < {self.origin_julian_date}"
+            )
+        
+        # 目標以前で最も近い格子のステップ（丸め誤差で1ステップ手前にならないよう補正）
+        target_step = math.floor((julian_date - self.origin_julian_date) / self.step_days + 1e-9)
+        
+        # 現在の格子上の状態より近いキーフレームがあればそこから再開
+        keyframe = self.store.nearest_before(self.grid_julian_date(target_step))
+        if keyframe is not None and (self._grid_step > target_step or keyframe.step > self._grid_step):
+            self._restore(keyframe)
+        
+        dt = self.step_days * SECONDS_PER_DAY
+        while self._grid_step < target_step:
+            # 積分済みのステップの再計算は drift_monitor・encounter_detector に二重に通知しない
+            observe = self._grid_step >= self._observed_step
+            self._grid_positions, self._grid_velocities = self.physics_engine.integrate_arrays(
+                self._grid_positions, self._grid_velocities, self.masses, dt, observe=observe
+            )
+            self._grid_step += 1
+            self._observed_step = max(self._observed_step, self._grid_step)
+            self.integrated_steps += 1
+            if self.store.wants(self._grid_step):
+                self._record()
+        
+        # 格子の間の端数（監視・検出には通知せず、積分器の内部状態は格子上の状態に戻す）
+        remainder = julian_date - self.grid_julian_date(self._grid_step)
+        if remainder * SECONDS_PER_DAY > 1e-6:
+            state = self.physics_engine.get_integrator_state()
+            self.positions, self.velocities = self.physics_engine.integrate_arrays(
+                self._grid_positions, self._grid_velocities, self.masses, remainder * SECONDS_PER_DAY,
+                observe=False
+            )
+            self.physics_engine.set_integrator_state(state)
+        else:
+            self.positions, self.velocities = self._grid_positions, self._grid_velocities
+        self.julian_date = float(julian_date)
+        
+        self._apply_to_solar_system()
+        return self.positions, self.velocities
+    
+    def _record(self) -> None:
+        """現在の格子上の状態をキーフレームとして記録"""
+        positions = self._grid_positions.copy()
+        velocities = self._grid_velocities.copy()
+        positions.setflags(write=False)
+        velocities.setflags(write=False)
+        self.store.record(Keyframe(
+            step=self._grid_step,
+            julian_date=self.grid_julian_date(self._grid_step),
+            positions=positions,
+            velocities=velocities,
+            integrator_state=self.physics_engine.get_integrator_state()
+        ))
+    
+    def _restore(self, keyframe: Keyframe) -> None:
+        """キーフレームの状態を格子上の状態として復元"""
+        self._grid_step = keyframe.step
+        self._grid_positions = keyframe.positions.copy()
+        self._grid_velocities = keyframe.velocities.copy()
+        self.physics_engine.set_integrator_state(keyframe.integrator_state)
+        self.restore_count += 1
+    
+    def _apply_to_solar_system(self) -> None:
+        """現在の状態を太陽系の天体に書き込み、その時刻で計算済みとして扱う"""
+        if self.solar_system is None:
+            return
+        for i, body in enumerate(self.solar_system.get_all_bodies()):
+            body.position = self.positions[i].copy()
+            body.velocity = self.velocities[i].copy()
+        # 同じ時刻の update_all_positions で軌道要素による位置に上書きされない
+        self.solar_system.mark_positions_computed(self.julian_date)
+    
+    def __str__(self) -> str:
+        """文字列表現"""
+        return (f"NBodyTimeline (JD {self.julian_date:.3f}, ステップ: {self._grid_step}, "
+                f"{self.store})")
\ No newline at end of file
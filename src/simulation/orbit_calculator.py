@@ -5,10 +5,17 @@
 軌道の性質を分析する機能を提供します。
 """
 
+import math
+import time
 import numpy as np
-import hashlib
-from typing import Tuple, Dict, Optional, List
+from collections import OrderedDict
+from typing import Tuple, Dict, Optional, List, Sequence, Union
 from src.domain.orbital_elements import OrbitalElements
+from src.domain.orbital_elements_table import OrbitalElementsTable
+from src.domain.kepler import (
+    solve_kepler_equation_array, true_anomaly_array, perifocal_rotation_matrix,
+    solve_kepler_equation_scalar, kepler_warm_start_guess
+)
 from src.domain.celestial_body import CelestialBody
 
 
@@ -20,8 +27,17 @@ class OrbitCalculator:
     軌道の分析、軌道要素の相互変換などを行います。
     """
     
-    def __init__(self):
-        """軌道計算機の初期化"""
+    # キャッシュエントリ1件あたりの管理オーバーヘッド概算（バイト）
+    CACHE_ENTRY_OVERHEAD_BYTES = 512
+    
+    def __init__(self, config_manager=None):
+        """
+        軌道計算機の初期化
+        
+        Args:
+            config_manager: 設定管理オブジェクト（オプション、
+                data.cache_enabled / data.cache_size_mb を参照）
+        """
         self.gravitational_constant = 6.67430e-11  # m³ kg⁻¹ s⁻²
         self.au_to_km = 149597870.7  # 天文単位 -> km
         self.solar_mass = 1.989e30  # 太陽質量 (kg)
@@ -30,12 +46,32 @@ class OrbitCalculator:
         self.convergence_tolerance = 1e-12
         self.max_iterations = 50
         
-        # 軌道計算キャッシュ
-        self.position_cache: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        # 軌道計算キャッシュ（LRU順: 先頭が最も古い）
+        # キー -> (軌道要素, (位置, 速度))
+        self.position_cache: OrderedDict = OrderedDict()
+        self.cache_enabled = True
         self.cache_hit_count = 0
         self.cache_miss_count = 0
-        self.cache_max_size = 10000  # 最大キャッシュサイズ
-        self.cache_time_tolerance = 0.01  # 時間の許容誤差（日）
+        self.cache_eviction_count = 0
+        self.cache_max_size = 10000  # 最大エントリ数
+        self.cache_max_bytes = 100 * 1024 * 1024  # 最大バイト数
+        self.cache_time_resolution = 1e-6  # 時間バケットの幅（日）
+        self._cache_bytes = 0
+        self._cache_hit_time_total = 0.0  # ヒット時の検索時間の累計（秒）
+        
+        # ケプラー方程式のウォームスタート用の前回解
+        # id(軌道要素) -> (改訂番号, 平均近点角, 離心近点角)
+        self._kepler_warm_start: Dict[int, Tuple[int, float, float]] = {}
+        self.kepler_solve_count = 0
+        self.kepler_iteration_total = 0
+        self.kepler_warm_start_count = 0
+        self.last_kepler_iterations = 0
+        
+        if config_manager is not None:
+            self.configure_cache(
+                max_bytes=int(config_manager.get("data.cache_size_mb", 100) * 1024 * 1024),
+                enabled=config_manager.get("data.cache_enabled", True)
+            )
     
     def calculate_position_velocity(self, 
                                   orbital_elements: OrbitalElements,
@@ -55,16 +91,20 @@ class OrbitCalculator:
         if central_mass is None:
             central_mass = self.solar_mass
         
-        # キャッシュキーを生成
-        cache_key = self._generate_cache_key(orbital_elements, julian_date, central_mass)
-        
-        # キャッシュから検索
-        cached_result = self._get_from_cache(cache_key, julian_date)
-        if cached_result is not None:
-            self.cache_hit_count += 1
-            return cached_result
-        
-        self.cache_miss_count += 1
+        if self.cache_enabled:
+            lookup_start = time.perf_counter()
+            
+            # キャッシュキーを生成
+            cache_key = self._generate_cache_key(orbital_elements, julian_date, central_mass)
+            
+            # キャッシュから検索
+            cached_result = self._get_from_cache(cache_key)
+            if cached_result is not None:
+                self.cache_hit_count += 1
+                self._cache_hit_time_total += time.perf_counter() - lookup_start
+                return cached_result
+            
+            self.cache_miss_count += 1
         
         # 元期からの経過時間
         time_since_epoch = julian_date - orbital_elements.epoch
@@ -78,7 +118,7 @@ class OrbitCalculator:
         
         # 離心近点角の計算
         eccentric_anomaly = self._solve_kepler_equation(
-            mean_anomaly, orbital_elements.eccentricity
+            mean_anomaly, orbital_elements.eccentricity, orbital_elements
         )
         
         # 真近点角の計算
@@ -105,17 +145,136 @@ class OrbitCalculator:
         
         # 結果をキャッシュに保存
         result = (position, velocity)
-        self._store_in_cache(cache_key, result, julian_date)
+        if self.cache_enabled:
+            self._store_in_cache(cache_key, orbital_elements, result)
         
         return result
     
+    def calculate_positions_batch(self,
+                                  elements_table: Union[OrbitalElementsTable,
+                                                        Sequence[OrbitalElements],
+                                                        np.ndarray],
+                                  julian_dates: Union[float, Sequence[float], np.ndarray],
+                                  central_mass: float = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        複数の軌道要素・複数の時刻について位置と速度を一括計算
+        
+        calculate_position_velocity と同じ計算をNumPyの配列演算で
+        まとめて行います（キャッシュは使用しません）。
+        
+        Args:
+            elements_table: 軌道要素テーブル、軌道要素のシーケンス、または
+                (N, 7) 配列（OrbitalElementsのフィールド順）
+            julian_dates: ユリウス日（スカラーまたは1次元配列）
+            central_mass: 中心天体質量 (kg)、Noneの場合は太陽質量を使用
+        
+        Returns:
+            (位置配列(km), 速度配列(km/s))、いずれも形状 (N_bodies, N_times, 3)
+        """
+        if central_mass is None:
+            central_mass = self.solar_mass
+        
+        a, e, inclination, node, perihelion, mean_anomaly_at_epoch, epoch = (
+            self._elements_to_columns(elements_table)
+        )
+        
+        times = np.atleast_1d(np.asarray(julian_dates, dtype=np.float64))
+        if times.ndim != 1:
+            raise ValueError("julian_dates はスカラーまたは1次元配列である必要があります")
+        
+        # 各列を (N, 1) にしてN_timesへブロードキャスト
+        a = a[:, np.newaxis]
+        e = e[:, np.newaxis]
+        
+        # 平均近点角の計算
+        mu = self.gravitational_constant * central_mass
+        a_m = a * self.au_to_km * 1000  # AU -> m
+        mean_motion = np.sqrt(mu / (a_m ** 3)) * 86400  # rad/day
+        time_since_epoch = times[np.newaxis, :] - epoch[:, np.newaxis]
+        mean_anomaly = (
+            np.radians(mean_anomaly_at_epoch)[:, np.newaxis] +
+            mean_motion * time_since_epoch
+        ) % (2 * np.pi)
+        
+        # 離心近点角・真近点角の計算
+        eccentric_anomaly, iterations = solve_kepler_equation_array(
+            mean_anomaly, e, self.convergence_tolerance, self.max_iterations
+        )
+        self.last_kepler_iterations = iterations
+        true_anomaly = true_anomaly_array(eccentric_anomaly, e)
+        cos_nu = np.cos(true_anomaly)
+        sin_nu = np.sin(true_anomaly)
+        
+        # 軌道面での位置 (km)
+        orbital_radius = a * self.au_to_km * (1 - e**2) / (1 + e * cos_nu)
+        x_orb = orbital_radius * cos_nu
+        y_orb = orbital_radius * sin_nu
+        
+        # 軌道面での速度 (km/s)
+        h = np.sqrt(mu * a_m * (1 - e**2))
+        r_m = a_m * (1 - e**2) / (1 + e * cos_nu)
+        v_r = (mu / h) * e * sin_nu
+        v_theta = h / r_m
+        vx_orb = (v_r * cos_nu - v_theta * sin_nu) / 1000
+        vy_orb = (v_r * sin_nu + v_theta * cos_nu) / 1000
+        
+        # 回転行列の第1・第2列のみを (N, 1, 3) でブロードキャスト
+        rotation = perifocal_rotation_matrix(inclination, node, perihelion)
+        p_axis = rotation[:, np.newaxis, :, 0]
+        q_axis = rotation[:, np.newaxis, :, 1]
+        
+        positions = x_orb[..., np.newaxis] * p_axis + y_orb[..., np.newaxis] * q_axis
+        velocities = vx_orb[..., np.newaxis] * p_axis + vy_orb[..., np.newaxis] * q_axis
+        
+        return positions, velocities
+    
+    def _elements_to_columns(self,
+                             elements_table: Union[OrbitalElementsTable,
+                                                   Sequence[OrbitalElements],
+                                                   np.ndarray]
+                             ) -> Tuple[np.ndarray, ...]:
+        """
+        軌道要素の集合を列ごとのfloat64配列に変換
+        
+        Args:
+            elements_table: 軌道要素テーブル、軌道要素のシーケンスまたは (N, 7) 配列
+        
+        Returns:
+            (a, e, i, Ω, ω, M0, epoch) の各1次元配列
+        """
+        if isinstance(elements_table, OrbitalElementsTable):
+            return tuple(elements_table.column(name) for name in OrbitalElementsTable.COLUMNS)
+        
+        if isinstance(elements_table, np.ndarray):
+            table = np.asarray(elements_table, dtype=np.float64)
+            if table.ndim != 2 or table.shape[1] != 7:
+                raise ValueError("軌道要素配列は (N, 7) の形状である必要があります")
+        else:
+            table = np.array([
+                (
+                    elements.semi_major_axis,
+                    elements.eccentricity,
+                    elements.inclination,
+                    elements.longitude_of_ascending_node,
+                    elements.argument_of_perihelion,
+                    elements.mean_anomaly_at_epoch,
+                    elements.epoch
+                )
+                for elements in elements_table
+            ], dtype=np.float64).reshape(-1, 7)
+        
+        return tuple(np.ascontiguousarray(table[:, k]) for k in range(7))
+    
     def _generate_cache_key(self, 
                           orbital_elements: OrbitalElements, 
                           julian_date: float, 
-                          central_mass: float) -> str:
+                          central_mass: float) -> Tuple[int, int, int, float]:
         """
         キャッシュキーを生成
         
+        軌道要素オブジェクトの同一性とリビジョン、量子化したユリウス日の
+        バケット番号からなる数値タプルをキーとします。
+        
         Args:
             orbital_elements: 軌道要素
             julian_date: ユリウス日
@@ -124,90 +283,127 @@ class OrbitCalculator:
         Returns:
             キャッシュキー
         """
-        # 軌道要素のハッシュを生成
-        elements_str = (
-            f"{orbital_elements.semi_major_axis:.10f}_"
-            f"{orbital_elements.eccentricity:.10f}_"
-            f"{orbital_elements.inclination:.6f}_"
-            f"{orbital_elements.longitude_of_ascending_node:.6f}_"
-            f"{orbital_elements.argument_of_perihelion:.6f}_"
-            f"{orbital_elements.mean_anomaly_at_epoch:.6f}_"
-            f"{orbital_elements.epoch:.6f}_"
-            f"{central_mass:.3e}_"
-            f"{julian_date:.6f}"
-        )
-        
-        # MD5ハッシュでキーを短縮（セキュリティ用途ではない）
-        return hashlib.md5(elements_str.encode(), usedforsecurity=False).hexdigest()
+        time_bucket = math.floor(julian_date / self.cache_time_resolution + 0.5)
+        return (id(orbital_elements), orbital_elements.revision, time_bucket, central_mass)
     
-    def _get_from_cache(self, cache_key: str, julian_date: float) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    def _get_from_cache(self, cache_key: Tuple[int, int, int, float]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
         """
-        キャッシュから結果を取得
+        キャッシュから結果を取得（ヒット時は最近使用として記録）
         
         Args:
             cache_key: キャッシュキー
-            julian_date: ユリウス日
             
         Returns:
             キャッシュされた結果、なければNone
         """
-        if cache_key not in self.position_cache:
+        entry = self.position_cache.get(cache_key)
+        if entry is None:
             return None
         
-        cached_data = self.position_cache[cache_key]
-        cached_result, cached_time = cached_data['result'], cached_data['time']
-        
-        # 時間の許容誤差内かチェック
-        if abs(julian_date - cached_time) <= self.cache_time_tolerance:
-            return cached_result
-        
-        # 時間が許容誤差外なら削除
-        del self.position_cache[cache_key]
-        return None
+        self.position_cache.move_to_end(cache_key)
+        return entry[1]
     
     def _store_in_cache(self, 
-                       cache_key: str, 
-                       result: Tuple[np.ndarray, np.ndarray], 
-                       julian_date: float) -> None:
+                       cache_key: Tuple[int, int, int, float], 
+                       orbital_elements: OrbitalElements,
+                       result: Tuple[np.ndarray, np.ndarray]) -> None:
         """
         結果をキャッシュに保存
         
+        軌道要素への参照をエントリに保持することで、
+        エントリが存在する間はキーに使用したidが再利用されないようにします。
+        
         Args:
             cache_key: キャッシュキー
+            orbital_elements: 軌道要素
             result: 計算結果
-            julian_date: ユリウス日
         """
-        # キャッシュサイズ制限チェック
-        if len(self.position_cache) >= self.cache_max_size:
+        if cache_key in self.position_cache:
+            self.position_cache.move_to_end(cache_key)
+            return
+        
+        self.position_cache[cache_key] = (orbital_elements, result)
+        self._cache_bytes += self._estimate_entry_bytes(result)
+        
+        # 容量制限（エントリ数・バイト数）を超えた分を古い順に削除
+        while self.position_cache and (
+            len(self.position_cache) > self.cache_max_size or
+            self._cache_bytes > self.cache_max_bytes
+        ):
             self._evict_oldest_cache_entry()
+    
+    def _estimate_entry_bytes(self, result: Tuple[np.ndarray, np.ndarray]) -> int:
+        """
+        キャッシュエントリの使用メモリを概算
         
-        self.position_cache[cache_key] = {
-            'result': result,
-            'time': julian_date,
-            'access_count': 1
-        }
+        Args:
+            result: 計算結果
+        
+        Returns:
+            概算バイト数（配列データ + 辞書・キー等のオーバーヘッド）
+        """
+        position, velocity = result
+        return position.nbytes + velocity.nbytes + self.CACHE_ENTRY_OVERHEAD_BYTES
     
     def _evict_oldest_cache_entry(self) -> None:
         """
-        最も古いキャッシュエントリを削除
+        最も長く使用されていないキャッシュエントリを削除（O(1)）
         """
         if not self.position_cache:
             return
         
-        # 最も古いエントリを探す（アクセス数が最小のもの）
-        oldest_key = min(
-            self.position_cache.keys(),
-            key=lambda k: self.position_cache[k]['access_count']
-        )
-        del self.position_cache[oldest_key]
+        _, (_, result) = self.position_cache.popitem(last=False)
+        self._cache_bytes -= self._estimate_entry_bytes(result)
+        self.cache_eviction_count += 1
+    
+    def configure_cache(self,
+                        max_entries: Optional[int] = None,
+                        max_bytes: Optional[int] = None,
+                        enabled: Optional[bool] = None) -> None:
+        """
+        キャッシュ容量を設定
+        
+        Args:
+            max_entries: 最大エントリ数
+            max_bytes: 最大バイト数
+            enabled: キャッシュを有効にするかどうか
+        """
+        if max_entries is not None:
+            if max_entries < 0:
+                raise ValueError("最大エントリ数は0以上である必要があります")
+            self.cache_max_size = int(max_entries)
+        
+        if max_bytes is not None:
+            if max_bytes < 0:
+                raise ValueError("最大バイト数は0以上である必要があります")
+            self.cache_max_bytes = int(max_bytes)
+        
+        if enabled is not None:
+            self.cache_enabled = bool(enabled)
+            if not self.cache_enabled:
+                self.clear_cache()
+        
+        # 縮小された容量に合わせて削除
+        while self.position_cache and (
+            len(self.position_cache) > self.cache_max_size or
+            self._cache_bytes > self.cache_max_bytes
+        ):
+            self._evict_oldest_cache_entry()
     
     def clear_cache(self) -> None:
         """キャッシュをクリア"""
         self.position_cache.clear()
         self.cache_hit_count = 0
         self.cache_miss_count = 0
+        self.cache_eviction_count = 0
+        self._cache_bytes = 0
+        self._cache_hit_time_total = 0.0
+        self._kepler_warm_start.clear()
+        self.kepler_solve_count = 0
+        self.kepler_iteration_total = 0
+        self.kepler_warm_start_count = 0
     
-    def get_cache_stats(self) -> Dict[str, int]:
+    def get_cache_stats(self) -> Dict[str, float]:
         """
         キャッシュ統計を取得
         
@@ -216,13 +412,31 @@ class OrbitCalculator:
         """
         total_requests = self.cache_hit_count + self.cache_miss_count
         hit_rate = (self.cache_hit_count / total_requests * 100) if total_requests > 0 else 0
+        average_hit_latency_us = (
+            self._cache_hit_time_total / self.cache_hit_count * 1e6
+            if self.cache_hit_count > 0 else 0.0
+        )
+        average_kepler_iterations = (
+            self.kepler_iteration_total / self.kepler_solve_count
+            if self.kepler_solve_count > 0 else 0.0
+        )
         
         return {
             'cache_size': len(self.position_cache),
             'cache_hit_count': self.cache_hit_count,
             'cache_miss_count': self.cache_miss_count,
             'cache_hit_rate_percent': hit_rate,
-            'total_requests': total_requests
+            'total_requests': total_requests,
+            'cache_eviction_count': self.cache_eviction_count,
+            'cache_bytes': self._cache_bytes,
+            'cache_max_entries': self.cache_max_size,
+            'cache_max_bytes': self.cache_max_bytes,
+            'average_hit_latency_us': average_hit_latency_us,
+            'kepler_solve_count': self.kepler_solve_count,
+            'kepler_iteration_total': self.kepler_iteration_total,
+            'kepler_warm_start_count': self.kepler_warm_start_count,
+            'average_kepler_iterations': average_kepler_iterations,
+            'last_kepler_iterations': self.last_kepler_iterations
         }
     
     def _calculate_mean_motion(self, 
@@ -246,33 +460,49 @@ class OrbitCalculator:
         # rad/sec -> rad/day
         return mean_motion_rad_per_sec * 86400
     
-    def _solve_kepler_equation(self, mean_anomaly: float, eccentricity: float) -> float:
+    def _solve_kepler_equation(self, 
+                             mean_anomaly: float, 
+                             eccentricity: float,
+                             orbital_elements: Optional[OrbitalElements] = None) -> float:
         """
         ケプラー方程式を数値的に解く
         
+        軌道要素が指定され、同じ軌道要素での前回の解がある場合は
+        そこから外挿した値を初期推定値とします（ウォームスタート）。
+        
         Args:
             mean_anomaly: 平均近点角 (rad)
             eccentricity: 離心率
+            orbital_elements: ウォームスタートの識別に用いる軌道要素（オプション）
             
         Returns:
             離心近点角 (rad)
         """
-        # 初期推定値
-        E = mean_anomaly
+        initial_guess = None
+        if orbital_elements is not None:
+            state = self._kepler_warm_start.get(id(orbital_elements))
+            if state is not None and state[0] == orbital_elements.revision:
+                initial_guess = kepler_warm_start_guess(
+                    mean_anomaly, eccentricity, state[1], state[2]
+                )
+                self.kepler_warm_start_count += 1
+        
+        E, iterations, _ = solve_kepler_equation_scalar(
+            mean_anomaly, eccentricity,
+            self.convergence_tolerance, self.max_iterations, initial_guess
+        )
         
-        # ニュートン・ラフソン法
-        for _ in range(self.max_iterations):
-            f = E - eccentricity * np.sin(E) - mean_anomaly
-            f_prime = 1 - eccentricity * np.cos(E)
-            
-            if abs(f_prime) < 1e-15:
-                break
-            
-            delta_E = f / f_prime
-            E -= delta_E
-            
-            if abs(delta_E) < self.convergence_tolerance:
-                break
+        self.kepler_solve_count += 1
+        self.kepler_iteration_total += iterations
+        self.last_kepler_iterations = iterations
+        
+        if orbital_elements is not None:
+            if (id(orbital_elements) not in self._kepler_warm_start and
+                    len(self._kepler_warm_start) >= self.cache_max_size):
+                self._kepler_warm_start.clear()
+            self._kepler_warm_start[id(orbital_elements)] = (
+                orbital_elements.revision, mean_anomaly, E
+            )
         
         return E
     
@@ -379,42 +609,13 @@ class OrbitCalculator:
         Returns:
             太陽中心座標系での位置 (km)
         """
-        # 角度をラジアンに変換
-        i = np.radians(orbital_elements.inclination)
-        omega = np.radians(orbital_elements.longitude_of_ascending_node)
-        w = np.radians(orbital_elements.argument_of_perihelion)
-        
-        # 回転行列の要素
-        cos_omega = np.cos(omega)
-        sin_omega = np.sin(omega)
-        cos_i = np.cos(i)
-        sin_i = np.sin(i)
-        cos_w = np.cos(w)
-        sin_w = np.sin(w)
-        
-        # 3次元回転行列
-        R11 = cos_omega * cos_w - sin_omega * sin_w * cos_i
-        R12 = -cos_omega * sin_w - sin_omega * cos_w * cos_i
-        R13 = sin_omega * sin_i
-        
-        R21 = sin_omega * cos_w + cos_omega * sin_w * cos_i
-        R22 = -sin_omega * sin_w + cos_omega * cos_w * cos_i
-        R23 = -cos_omega * sin_i
-        
-        R31 = sin_w * sin_i
-        R32 = cos_w * sin_i
-        R33 = cos_i
-        
-        # 軌道面座標を3次元に拡張
-        x_orb, y_orb = orbital_position
-        z_orb = 0.0
+        # 軌道要素にキャッシュされた回転行列を使用
+        rotation = orbital_elements.rotation_matrix
         
-        # 座標変換
-        x = R11 * x_orb + R12 * y_orb + R13 * z_orb
-        y = R21 * x_orb + R22 * y_orb + R23 * z_orb
-        z = R31 * x_orb + R32 * y_orb + R33 * z_orb
+        # 軌道面座標（z=0）なので第1・第2列のみ寄与
+        x_orb, y_orb = orbital_position
         
-        return np.array([x, y, z])
+        return rotation[:, 0] * x_orb + rotation[:, 1] * y_orb
     
     def _transform_velocity_to_heliocentric(self, 
                                           orbital_velocity: np.ndarray,
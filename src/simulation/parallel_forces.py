@@ -0,0 +1,382 @@
+"""
+重力加速度のマルチプロセス計算
+
+位置・質量・加速度を multiprocessing.shared_memory 上の配列に置き、
+ワーカープロセスが担当する行の加速度を直接書き込みます。
+各ステップでプロセス間を行き来するのは小さな制御メッセージのみで、
+配列のpickle化は行いません。
+"""
+
+import logging
+import multiprocessing
+import weakref
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+def direct_accelerations(positions: np.ndarray,
+                         gm: np.ndarray,
+                         start: int,
+                         stop: int,
+                         epsilon_squared: float,
+                         block_pairs: int,
+                         out: np.ndarray) -> None:
+    """
+    直接和で start:stop 行の重力加速度を計算
+    
+    Args:
+        positions: 全天体の位置配列 (N, 3) (km)
+        gm: 重力定数と質量の積の配列 (N,) (km³/s²)
+        start: 計算する先頭行
+        stop: 計算する末尾行（含まない）
+        epsilon_squared: 軟化長の2乗 (km²)
+        block_pairs: 一時配列の組の数の上限
+        out: 加速度の書き込み先 (N, 3) (km/s²)
+    
+    Raises:
+        ValueError: 軟化なしで距離がゼロの天体の組がある場合
+    """
+    n = positions.shape[0]
+    
+    # (行ブロック, N, 3) の一時配列が大きくなりすぎないよう行方向に分割
+    block_size = max(1, block_pairs // max(n, 1))
+    for block_start in range(start, stop, block_size):
+        block_stop = min(block_start + block_size, stop)
+        
+        # 変位ベクトル r_j - r_i (ブロック, N, 3)
+        displacement = positions[np.newaxis, :, :] - positions[block_start:block_stop, np.newaxis, :]
+        distance_squared = np.einsum('ijk,ijk->ij', displacement, displacement)
+        
+        # 自分自身との組を除外
+        rows = np.arange(block_stop - block_start)
+        distance_squared[rows, rows + block_start] = np.inf
+        
+        if epsilon_squared > 0:
+            distance_squared += epsilon_squared
+        elif np.any(distance_squared == 0):
+            raise ValueError("天体間の距離がゼロでは重力計算できません")
+        
+        weight = gm[np.newaxis, :] * distance_squared ** -1.5
+        out[block_start:block_stop] = np.einsum('ij,ijk->ik', weight, displacement)
+
+
+def source_accelerations(targets: np.ndarray,
+                         sources: np.ndarray,
+                         gm: np.ndarray,
+                         epsilon_squared: float,
+                         block_pairs: int,
+                         out: np.ndarray) -> None:
+    """
+    重力源の天体から受ける加速度を計算（ターゲットは重力源にならない）
+    
+    Args:
+        targets: ターゲットの位置配列 (P, 3) (km)
+        sources: 重力源の位置配列 (N, 3) (km)
+        gm: 重力源の重力定数と質量の積の配列 (N,) (km³/s²)
+        epsilon_squared: 軟化長の2乗 (km²)
+        block_pairs: 一時配列の組の数の上限
+        out: 加速度の書き込み先 (P, 3) (km/s²)
+    
+    Raises:
+        ValueError: 軟化なしで重力源と同じ位置のターゲットがある場合
+    """
+    p = targets.shape[0]
+    
+    block_size = max(1, block_pairs // max(sources.shape[0], 1))
+    for start in range(0, p, block_size):
+        stop = min(start + block_size, p)
+        
+        # 変位ベクトル r_j - r_i (ブロック, N, 3)
+        displacement = sources[np.newaxis, :, :] - targets[start:stop, np.newaxis, :]
+        distance_squared = np.einsum('ijk,ijk->ij', displacement, displacement)
+        
+        if epsilon_squared > 0:
+            distance_squared += epsilon_squared
+        elif np.any(distance_squared == 0):
+            raise ValueError("天体間の距離がゼロでは重力計算できません")
+        
+        weight = gm[np.newaxis, :] * distance_squared ** -1.5
+        out[start:stop] = np.einsum('ij,ijk->ik', weight, displacement)
+
+
+# 共有配列の (列数)。列数0は1次元配列
+_BUFFER_COLUMNS: Dict[str, int] = {
+    'positions': 3,
+    'gm': 0,
+    'accelerations': 3,
+    'particles': 3,
+    'particle_accelerations': 3,
+}
+
+
+def _attach(name: str, rows: int, columns: int) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """共有メモリに接続して配列ビューを作成"""
+    memory = shared_memory.SharedMemory(name=name)
+    shape = (rows, columns) if columns else (rows,)
+    return memory, np.ndarray(shape, dtype=np.float64, buffer=memory.buf)
+
+
+def _worker_main(connection, block_pairs: int) -> None:
+    """
+    ワーカープロセスの処理ループ
+    
+    制御メッセージ:
+        ('attach', {配列名: (共有メモリ名, 行数)}) 共有配列に接続し直す
+        ('direct', N, 先頭行, 末尾行, ε²) 直接和で担当行を計算
+        ('particles', N, 先頭行, 末尾行, ε²) 試験粒子の担当行を計算
+        ('stop',) 終了
+    """
+    memories: Dict[str, shared_memory.SharedMemory] = {}
+    arrays: Dict[str, np.ndarray] = {}
+    
+    while True:
+        command = connection.recv()
+        kind = command[0]
+        if kind == 'stop':
+            break
+        
+        try:
+            if kind == 'attach':
+                for name, (memory_name, rows) in command[1].items():
+                    arrays.pop(name, None)
+                    if name in memories:
+                        memories.pop(name).close()
+                    memories[name], arrays[name] = _attach(memory_name, rows, _BUFFER_COLUMNS[name])
+            elif kind == 'direct':
+                _, n, start, stop, epsilon_squared = command
+                direct_accelerations(
+                    arrays['positions'][:n], arrays['gm'][:n], start, stop,
+                    epsilon_squared, block_pairs, arrays['accelerations']
+                )
+            elif kind == 'particles':
+                _, n, start, stop, epsilon_squared = command
+                source_accelerations(
+                    arrays['particles'][start:stop], arrays['positions'][:n], arrays['gm'][:n],
+                    epsilon_squared, block_pairs, arrays['particle_accelerations'][start:stop]
+                )
+            connection.send(('done',))
+        except Exception as e:
+            connection.send(('error', type(e).__name__, str(e)))
+    
+    arrays.clear()
+    for memory in memories.values():
+        memory.close()
+    connection.close()
+
+
+def _shutdown(processes: List,
+              connections: List,
+              memories: Dict[str, shared_memory.SharedMemory],
+              arrays: Dict[str, np.ndarray]) -> None:
+    """ワーカーを終了して共有メモリを解放"""
+    # 配列ビューが残っていると共有メモリを閉じられない
+    arrays.clear()
+    for connection in connections:
+        try:
+            connection.send(('stop',))
+        except (BrokenPipeError, OSError):
+            pass
+    for process in processes:
+        process.join(timeout=5.0)
+        if process.is_alive():
+            process.terminate()
+    for connection in connections:
+        connection.close()
+    for memory in memories.values():
+        memory.close()
+        memory.unlink()
+    processes.clear()
+    connections.clear()
+    memories.clear()
+
+
+class ForceWorkerPool:
+    """
+    共有メモリを使う加速度計算のプロセスプール
+    
+    計算する行を各ワーカーに均等に割り当てます。配列が大きくなった場合のみ
+    共有メモリを確保し直し、ワーカーに接続先を通知します。
+    """
+    
+    def __init__(self, worker_count: int, block_pairs: int = 1 << 20):
+        """
+        プロセスプールの初期化（ワーカーは最初の計算時に起動）
+        
+        Args:
+            worker_count: ワーカープロセス数
+            block_pairs: 各ワーカーの一時配列の組の数の上限
+        
+        Raises:
+            ValueError: ワーカー数が1未満の場合
+        """
+        if worker_count < 1:
+            raise ValueError(f"ワーカー数は1以上である必要があります: {worker_count}")
+        
+        self.worker_count = worker_count
+        self.block_pairs = block_pairs
+        
+        self._processes: List = []
+        self._connections: List = []
+        self._memories: Dict[str, shared_memory.SharedMemory] = {}
+        self._arrays: Dict[str, np.ndarray] = {}
+        
+        # 統計
+        self.dispatch_count = 0
+        
+        # ガベージコレクション時やインタプリタ終了時にも後始末する
+        self._finalizer = self._register_finalizer()
+    
+    def _register_finalizer(self) -> weakref.finalize:
+        """後始末の処理を登録"""
+        return weakref.finalize(
+            self, _shutdown, self._processes, self._connections, self._memories, self._arrays
+        )
+    
+    @property
+    def is_running(self) -> bool:
+        """ワーカーが起動しているかどうか"""
+        return bool(self._processes)
+    
+    def _start(self) -> None:
+        """ワーカープロセスを起動"""
+        # Qtなどのスレッドを持つ親プロセスを fork しないよう spawn を使用
+        context = multiprocessing.get_context('spawn')
+        for _ in range(self.worker_count):
+            parent_connection, child_connection = context.Pipe()
+            process = context.Process(
+                target=_worker_main, args=(child_connection, self.block_pairs), daemon=True
+            )
+            process.start()
+            child_connection.close()
+            self._processes.append(process)
+            self._connections.append(parent_connection)
+        logger.info(f"加速度計算ワーカーを{self.worker_count}個起動しました")
+    
+    def _reserve(self, rows: Dict[str, int]) -> None:
+        """共有配列の行数を確保（不足する場合のみ2倍に拡張して再接続）"""
+        changed = {}
+        for name, required in rows.items():
+            current = self._arrays.get(name)
+            if current is not None and current.shape[0] >= required:
+                continue
+            
+            capacity = max(required, 2 * current.shape[0] if current is not None else 0, 1)
+            columns = _BUFFER_COLUMNS[name]
+            size = capacity * max(columns, 1) * np.dtype(np.float64).itemsize
+            
+            self._arrays.pop(name, None)
+            if name in self._memories:
+                old = self._memories.pop(name)
+                old.close()
+                old.unlink()
+            memory = shared_memory.SharedMemory(create=True, size=size)
+            self._memories[name] = memory
+            shape = (capacity, columns) if columns else (capacity,)
+            self._arrays[name] = np.ndarray(shape, dtype=np.float64, buffer=memory.buf)
+            changed[name] = (memory.name, capacity)
+        
+        if changed:
+            self._dispatch([('attach', changed)] * len(self._connections))
+    
+    def _dispatch(self, commands: List[tuple]) -> None:
+        """
+        ワーカーに制御メッセージを送り、全員の完了を待つ
+        
+        Raises:
+            ValueError: ワーカーで計算エラーが発生した場合
+        """
+        for connection, command in zip(self._connections, commands):
+            connection.send(command)
+        
+        errors = []
+        for connection, _ in zip(self._connections, commands):
+            reply = connection.recv()
+            if reply[0] == 'error':
+                errors.append(reply)
+        self.dispatch_count += 1
+        
+        if errors:
+            _, error_type, message = errors[0]
+            if error_type == 'ValueError':
+                raise ValueError(message)
+            raise RuntimeError(f"加速度計算ワーカーでエラーが発生しました: {error_type}: {message}")
+    
+    def _row_ranges(self, rows: int) -> List[Tuple[int, int]]:
+        """行を各ワーカーに均等に割り当てる"""
+        bounds = np.linspace(0, rows, self.worker_count + 1).astype(int)
+        return [(int(bounds[i]), int(bounds[i + 1])) for i in range(self.worker_count)]
+    
+    def direct_accelerations(self,
+                             positions: np.ndarray,
+                             gm: np.ndarray,
+                             epsilon_squared: float) -> np.ndarray:
+        """
+        直接和の加速度を並列計算
+        
+        Args:
+            positions: 位置配列 (N, 3) (km)
+            gm: 重力定数と質量の積の配列 (N,) (km³/s²)
+            epsilon_squared: 軟化長の2乗 (km²)
+        
+        Returns:
+            加速度配列 (N, 3) (km/s²)
+        """
+        if not self.is_running:
+            self._start()
+        
+        n = positions.shape[0]
+        self._reserve({'positions': n, 'gm': n, 'accelerations': n})
+        self._arrays['positions'][:n] = positions
+        self._arrays['gm'][:n] = gm
+        
+        self._dispatch([
+            ('direct', n, start, stop, epsilon_squared) for start, stop in self._row_ranges(n)
+        ])
+        return self._arrays['accelerations'][:n].copy()
+    
+    def test_particle_accelerations(self,
+                                    particle_positions: np.ndarray,
+                                    massive_positions: np.ndarray,
+                                    gm: np.ndarray,
+                                    epsilon_squared: float) -> np.ndarray:
+        """
+        試験粒子の加速度を並列計算
+        
+        Args:
+            particle_positions: 試験粒子の位置配列 (P, 3) (km)
+            massive_positions: 重力源の位置配列 (N, 3) (km)
+            gm: 重力源の重力定数と質量の積の配列 (N,) (km³/s²)
+            epsilon_squared: 軟化長の2乗 (km²)
+        
+        Returns:
+            加速度配列 (P, 3) (km/s²)
+        """
+        if not self.is_running:
+            self._start()
+        
+        n = massive_positions.shape[0]
+        p = particle_positions.shape[0]
+        self._reserve({'positions': n, 'gm': n, 'particles': p, 'particle_accelerations': p})
+        self._arrays['positions'][:n] = massive_positions
+        self._arrays['gm'][:n] = gm
+        self._arrays['particles'][:p] = particle_positions
+        
+        self._dispatch([
+            ('particles', n, start, stop, epsilon_squared) for start, stop in self._row_ranges(p)
+        ])
+        return self._arrays['particle_accelerations'][:p].copy()
+    
+    def close(self) -> None:
+        """ワーカーを終了して共有メモリを解放（次の計算時に再起動）"""
+        self._finalizer()
+        self._finalizer = self._register_finalizer()
+    
+    def __str__(self) -> str:
+        """文字列表現"""
+        state = "起動中" if self.is_running else "停止中"
+        return f"ForceWorkerPool ({self.worker_count}ワーカー, {state})"
\ No newline at end of file
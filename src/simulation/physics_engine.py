@@ -5,9 +5,24 @@
 重力計算、運動方程式の積分、ケプラー方程式の解などを提供します。
 """
 
+import os
 import numpy as np
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from src.domain.celestial_body import CelestialBody
+from src.domain.massless_particles import MasslessParticleSet
+from src.domain.system_diagnostics import (
+    pack_bodies, total_energy_array, angular_momentum_array
+)
+from src.simulation.adaptive_integrator import DormandPrinceIntegrator, DenseOutput
+from src.simulation.barnes_hut import BarnesHutTree
+from src.simulation.drift_monitor import DriftMonitor
+from src.simulation.encounter_detector import EncounterDetector
+from src.simulation.parallel_forces import (
+    ForceWorkerPool, direct_accelerations, source_accelerations
+)
+from src.domain.kepler import (
+    kepler_warm_start_guess, solve_kepler_equation_scalar, solve_kepler_equation_array
+)
 
 
 class PhysicsEngine:
@@ -18,6 +33,19 @@ class PhysicsEngine:
     および関連する天体力学計算を担当します。
     """
     
+    # 加速度計算で一度に扱う天体の組の最大数（一時配列のサイズ上限）
+    ACCELERATION_BLOCK_PAIRS = 1 << 20
+    
+    # プロセスプールで並列計算する相互作用数（ターゲット × 重力源）の下限
+    PARALLEL_MIN_PAIRS = 1 << 22
+    
+    # 有効な積分法（"verlet" は速度ベルレ法 = KDKリープフロッグ法）
+    # "dopri5" は適応刻み幅（dt は刻み幅ではなく積分区間として扱う）
+    INTEGRATION_METHODS = ("rk4", "euler", "verlet", "leapfrog", "wisdom_holman", "dopri5")
+    
+    # 有効な重力計算法（"direct": 直接和 O(N²)、"barnes_hut": 八分木 O(N log N)）
+    GRAVITY_SOLVERS = ("direct", "barnes_hut")
+    
     def __init__(self):
         """物理エンジンの初期化"""
         self.gravitational_constant: float = 6.67430e-11  # m³ kg⁻¹ s⁻²
@@ -28,6 +56,41 @@ class PhysicsEngine:
         self.integration_method: str = "rk4"  # ルンゲ・クッタ4次
         self.convergence_tolerance: float = 1e-12
         self.max_iterations: int = 20
+        
+        # 重力の軟化長 (km)。0の場合は軟化なし
+        self.softening_length: float = 0.0
+        
+        # 重力計算法と Barnes–Hut 八分木
+        self.gravity_solver: str = "direct"
+        self.barnes_hut_tree = BarnesHutTree()
+        
+        # 直接和・試験粒子の加速度計算のプロセス並列化（0: 無効）
+        self.parallel_workers: int = 0
+        self.force_pool: Optional[ForceWorkerPool] = None
+        
+        # リープフロッグ法で再利用する前ステップ終了時の加速度
+        # (位置, 質量, 加速度)
+        self._leapfrog_cache: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        
+        # エネルギー誤差の基準値 (J)
+        self.reference_energy: Optional[float] = None
+        
+        # 積分中の保存量の監視（integrate_arrays の各ステップで通知）
+        self.drift_monitor: Optional[DriftMonitor] = None
+        
+        # 近接遭遇の検出（integrate_arrays の各ステップで通知）と分割積分したステップ数
+        self.encounter_detector: Optional[EncounterDetector] = None
+        self.refined_step_count: int = 0
+        
+        # 適応刻み幅積分器（Dormand–Prince 5(4)）
+        self.adaptive_integrator = DormandPrinceIntegrator(self)
+        
+        # ケプラー方程式のウォームスタート用の前回解
+        # 天体名 -> (離心率, 平均近点角, 離心近点角)
+        self._kepler_warm_start: Dict[str, Tuple[float, float, float]] = {}
+        self.kepler_solve_count: int = 0
+        self.kepler_iteration_total: int = 0
+        self.last_kepler_iterations: int = 0
     
     def calculate_gravitational_force(self, 
                                     body1: CelestialBody, 
@@ -82,82 +145,681 @@ class PhysicsEngine:
         
         return total_force
     
+    def calculate_accelerations(self, 
+                              positions: np.ndarray, 
+                              masses: np.ndarray,
+                              softening_length: Optional[float] = None) -> np.ndarray:
+        """
+        全天体の重力加速度を一括計算（O(N²)のブロードキャスト版）
+        
+        a_i = Σ_j G m_j (r_j - r_i) / (|r_j - r_i|² + ε²)^(3/2)
+        
+        gravity_solver が "barnes_hut" の場合は八分木で近似計算します。
+        先頭にアンサンブル軸を持つ (M, N, 3) の位置配列も受け付けます。
+        
+        Args:
+            positions: 位置配列 (N, 3) または (M, N, 3) (km)
+            masses: 質量配列 (N,) または (M, N) (kg)
+            softening_length: 軟化長 ε (km)、Noneの場合は softening_length 属性を使用
+        
+        Returns:
+            加速度配列 (N, 3) または (M, N, 3) (km/s²)
+        
+        Raises:
+            ValueError: 軟化なしで距離がゼロの天体の組がある場合
+        """
+        if softening_length is None:
+            softening_length = self.softening_length
+        
+        positions = np.asarray(positions, dtype=np.float64)
+        masses = np.asarray(masses, dtype=np.float64)
+        if positions.ndim == 3:
+            return self._calculate_ensemble_accelerations(positions, masses, softening_length)
+        n = positions.shape[0]
+        
+        # G を km³ kg⁻¹ s⁻² に換算
+        gm = self.gravitational_constant * 1e-9 * masses
+        if self.gravity_solver == "barnes_hut":
+            return self.barnes_hut_tree.calculate_accelerations(positions, gm, softening_length)
+        
+        epsilon_squared = softening_length ** 2
+        
+        force_pool = self._get_force_pool(n * n)
+        if force_pool is not None:
+            return force_pool.direct_accelerations(positions, gm, epsilon_squared)
+        
+        accelerations = np.empty((n, 3), dtype=np.float64)
+        direct_accelerations(
+            positions, gm, 0, n, epsilon_squared, self.ACCELERATION_BLOCK_PAIRS, accelerations
+        )
+        return accelerations
+    
+    def _calculate_ensemble_accelerations(self, 
+                                        positions: np.ndarray, 
+                                        masses: np.ndarray, 
+                                        softening_length: float) -> np.ndarray:
+        """
+        アンサンブルの全メンバーの重力加速度を一括計算
+        
+        Args:
+            positions: 位置配列 (M, N, 3) (km)
+            masses: 質量配列 (N,) または (M, N) (kg)
+            softening_length: 軟化長 ε (km)
+        
+        Returns:
+            加速度配列 (M, N, 3) (km/s²)
+        """
+        m, n = positions.shape[:2]
+        masses = np.broadcast_to(masses, (m, n))
+        accelerations = np.empty((m, n, 3), dtype=np.float64)
+        
+        # 1メンバーでも一時配列が大きい場合や八分木の場合はメンバーごとに計算
+        if n * n > self.ACCELERATION_BLOCK_PAIRS or self.gravity_solver == "barnes_hut":
+            for member in range(m):
+                accelerations[member] = self.calculate_accelerations(
+                    positions[member], masses[member], softening_length
+                )
+            return accelerations
+        
+        gm = self.gravitational_constant * 1e-9 * masses
+        epsilon_squared = softening_length ** 2
+        diagonal = np.arange(n)
+        
+        # (メンバーブロック, N, N, 3) の一時配列が大きくなりすぎないよう分割
+        block_size = max(1, self.ACCELERATION_BLOCK_PAIRS // (n * n))
+        for start in range(0, m, block_size):
+            stop = min(start + block_size, m)
+            
+            displacement = positions[start:stop, np.newaxis, :, :] - positions[start:stop, :, np.newaxis, :]
+            distance_squared = np.einsum('bijk,bijk->bij', displacement, displacement)
+            distance_squared[:, diagonal, diagonal] = np.inf
+            
+            if epsilon_squared > 0:
+                distance_squared += epsilon_squared
+            elif np.any(distance_squared == 0):
+                raise ValueError("天体間の距離がゼロでは重力計算できません")
+            
+            weight = gm[start:stop, np.newaxis, :] * distance_squared ** -1.5
+            accelerations[start:stop] = np.einsum('bij,bijk->bik', weight, displacement)
+        
+        return accelerations
+    
+    def configure_parallel(self, enabled: bool, worker_count: Optional[int] = None) -> int:
+        """
+        加速度計算のプロセス並列化を設定
+        
+        ワーカーは相互作用数が PARALLEL_MIN_PAIRS 以上の計算で初めて起動します。
+        
+        Args:
+            enabled: 並列化を有効にするかどうか
+            worker_count: ワーカー数、Noneまたは0以下の場合はCPUコア数
+        
+        Returns:
+            有効なワーカー数（並列化しない場合は0）
+        """
+        self.shutdown_parallel()
+        
+        if worker_count is None or worker_count <= 0:
+            worker_count = os.cpu_count() or 1
+        
+        # 1ワーカーでは並列化の利点がない
+        self.parallel_workers = worker_count if enabled and worker_count > 1 else 0
+        return self.parallel_workers
+    
+    def configure_parallel_from_config(self, config_manager) -> int:
+        """
+        設定から加速度計算のプロセス並列化を構成
+        
+        performance.multi_threading で並列化を、performance.worker_count で
+        ワーカー数（0の場合はCPUコア数）を設定します。
+        
+        Args:
+            config_manager: 設定管理オブジェクト
+        
+        Returns:
+            有効なワーカー数（並列化しない場合は0）
+        """
+        return self.configure_parallel(
+            enabled=config_manager.get("performance.multi_threading", False),
+            worker_count=config_manager.get("performance.worker_count", 0)
+        )
+    
+    def shutdown_parallel(self) -> None:
+        """加速度計算のワーカーを終了"""
+        if self.force_pool is not None:
+            self.force_pool.close()
+            self.force_pool = None
+    
+    def _get_force_pool(self, pair_count: int) -> Optional[ForceWorkerPool]:
+        """並列計算に使うプロセスプールを取得（並列化しない場合はNone）"""
+        if self.parallel_workers < 2 or pair_count < self.PARALLEL_MIN_PAIRS:
+            return None
+        if self.force_pool is None:
+            self.force_pool = ForceWorkerPool(self.parallel_workers, self.ACCELERATION_BLOCK_PAIRS)
+        return self.force_pool
+    
+    def calculate_test_particle_accelerations(self, 
+                                            particle_positions: np.ndarray, 
+                                            massive_positions: np.ndarray, 
+                                            masses: np.ndarray,
+                                            softening_length: Optional[float] = None) -> np.ndarray:
+        """
+        試験粒子が質量を持つ天体から受ける重力加速度を計算（O(N_massive × N_particles)）
+        
+        Args:
+            particle_positions: 試験粒子の位置配列 (P, 3) (km)
+            massive_positions: 質量を持つ天体の位置配列 (N, 3) (km)
+            masses: 質量配列 (N,) (kg)
+            softening_length: 軟化長 ε (km)、Noneの場合は softening_length 属性を使用
+        
+        Returns:
+            加速度配列 (P, 3) (km/s²)
+        
+        Raises:
+            ValueError: 軟化なしで天体と同じ位置の試験粒子がある場合
+        """
+        if softening_length is None:
+            softening_length = self.softening_length
+        
+        particle_positions = np.asarray(particle_positions, dtype=np.float64)
+        massive_positions = np.asarray(massive_positions, dtype=np.float64)
+        gm = self.gravitational_constant * 1e-9 * np.asarray(masses, dtype=np.float64)
+        epsilon_squared = softening_length ** 2
+        
+        p = particle_positions.shape[0]
+        force_pool = self._get_force_pool(p * massive_positions.shape[0])
+        if force_pool is not None:
+            return force_pool.test_particle_accelerations(
+                particle_positions, massive_positions, gm, epsilon_squared
+            )
+        
+        accelerations = np.empty((p, 3), dtype=np.float64)
+        source_accelerations(
+            particle_positions, massive_positions, gm, epsilon_squared,
+            self.ACCELERATION_BLOCK_PAIRS, accelerations
+        )
+        return accelerations
+    
+    def integrate_test_particles(self, 
+                               particles: MasslessParticleSet, 
+                               massive_positions_start: np.ndarray, 
+                               massive_positions_end: np.ndarray, 
+                               masses: np.ndarray, 
+                               dt: float) -> None:
+        """
+        試験粒子をKDKリープフロッグ法で1ステップ積分（チャンクごとにその場で更新）
+        
+        質量を持つ天体のステップ開始時と終了時の位置から加速度を計算します。
+        ステップ終了時の加速度はチャンクに保持し、重力源が変わらなければ
+        次ステップの開始時の加速度として再利用します。
+        
+        Args:
+            particles: 試験粒子群
+            massive_positions_start: ステップ開始時の天体の位置配列 (N, 3) (km)
+            massive_positions_end: ステップ終了時の天体の位置配列 (N, 3) (km)
+            masses: 天体の質量配列 (N,) (kg)
+            dt: 時間ステップ (秒)
+        """
+        masses = np.asarray(masses, dtype=np.float64)
+        source = particles.acceleration_source
+        reuse = (source is not None and
+                 np.array_equal(source[0], massive_positions_start) and
+                 np.array_equal(source[1], masses))
+        
+        for chunk in particles.chunks():
+            if not reuse:
+                chunk.accelerations[:] = self.calculate_test_particle_accelerations(
+                    chunk.positions, massive_positions_start, masses
+                )
+            chunk.velocities[:] += 0.5 * dt * chunk.accelerations
+            chunk.positions[:] += dt * chunk.velocities
+            chunk.accelerations[:] = self.calculate_test_particle_accelerations(
+                chunk.positions, massive_positions_end, masses
+            )
+            chunk.velocities[:] += 0.5 * dt * chunk.accelerations
+        
+        particles.acceleration_source = (np.array(massive_positions_end, dtype=np.float64), masses.copy())
+    
+    def integrate_rk4_arrays(self, 
+                           positions: np.ndarray, 
+                           velocities: np.ndarray, 
+                           masses: np.ndarray, 
+                           dt: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        4次ルンゲ・クッタ法で配列状態を1ステップ積分
+        
+        Args:
+            positions: 位置配列 (N, 3) (km)
+            velocities: 速度配列 (N, 3) (km/s)
+            masses: 質量配列 (N,) (kg)
+            dt: 時間ステップ (秒)
+        
+        Returns:
+            (新しい位置配列 (km), 新しい速度配列 (km/s))
+        """
+        k1_v = velocities
+        k1_a = self.calculate_accelerations(positions, masses)
+        
+        k2_v = velocities + 0.5 * dt * k1_a
+        k2_a = self.calculate_accelerations(positions + 0.5 * dt * k1_v, masses)
+        
+        k3_v = velocities + 0.5 * dt * k2_a
+        k3_a = self.calculate_accelerations(positions + 0.5 * dt * k2_v, masses)
+        
+        k4_v = velocities + dt * k3_a
+        k4_a = self.calculate_accelerations(positions + dt * k3_v, masses)
+        
+        new_positions = positions + (dt / 6) * (k1_v + 2*k2_v + 2*k3_v + k4_v)
+        new_velocities = velocities + (dt / 6) * (k1_a + 2*k2_a + 2*k3_a + k4_a)
+        
+        return new_positions, new_velocities
+    
     def integrate_motion_rk4(self, 
                            bodies: List[CelestialBody], 
                            dt: float) -> None:
         """
         4次ルンゲ・クッタ法による運動方程式の数値積分
         
+        天体の状態を (N, 3) 配列に集めて積分し、
+        最後に1回だけ各天体へ書き戻します。
+        
         Args:
             bodies: 天体のリスト
             dt: 時間ステップ (秒)
         """
-        n = len(bodies)
+        if not bodies:
+            return
         
-        # 現在の状態を保存
-        positions = np.array([body.position for body in bodies])  # km
-        velocities = np.array([body.velocity for body in bodies])  # km/s
+        positions = np.array([body.position for body in bodies], dtype=np.float64)  # km
+        velocities = np.array([body.velocity for body in bodies], dtype=np.float64)  # km/s
+        masses = np.array([body.mass for body in bodies], dtype=np.float64)  # kg
         
-        # k1の計算
-        k1_v = np.zeros((n, 3))
-        k1_a = np.zeros((n, 3))
+        new_positions, new_velocities = self.integrate_rk4_arrays(
+            positions, velocities, masses, dt
+        )
         
         for i, body in enumerate(bodies):
-            k1_v[i] = velocities[i]
-            k1_a[i] = self.calculate_total_force(body, bodies) / 1000  # m/s² -> km/s²
+            body.position = new_positions[i]
+            body.velocity = new_velocities[i]
+    
+    def integrate_euler_arrays(self, 
+                             positions: np.ndarray, 
+                             velocities: np.ndarray, 
+                             masses: np.ndarray, 
+                             dt: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        オイラー法で配列状態を1ステップ積分
         
-        # k2の計算
-        for i, body in enumerate(bodies):
-            body.position = positions[i] + 0.5 * dt * k1_v[i]
-            body.velocity = velocities[i] + 0.5 * dt * k1_a[i]
+        Args:
+            positions: 位置配列 (N, 3) (km)
+            velocities: 速度配列 (N, 3) (km/s)
+            masses: 質量配列 (N,) (kg)
+            dt: 時間ステップ (秒)
         
-        k2_v = np.zeros((n, 3))
-        k2_a = np.zeros((n, 3))
+        Returns:
+            (新しい位置配列 (km), 新しい速度配列 (km/s))
+        """
+        accelerations = self.calculate_accelerations(positions, masses)
+        return positions + dt * velocities, velocities + dt * accelerations
+    
+    def integrate_leapfrog_arrays(self, 
+                                positions: np.ndarray, 
+                                velocities: np.ndarray, 
+                                masses: np.ndarray, 
+                                dt: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        キック・ドリフト・キック型リープフロッグ法（速度ベルレ法）で1ステップ積分
         
-        for i, body in enumerate(bodies):
-            k2_v[i] = body.velocity
-            k2_a[i] = self.calculate_total_force(body, bodies) / 1000
+        シンプレクティック積分法のため、長時間積分でもエネルギー誤差が
+        蓄積せず有界に保たれます。前ステップ終了時の加速度を再利用するため、
+        連続したステップでは1ステップあたり1回の加速度計算で済みます。
         
-        # k3の計算
-        for i, body in enumerate(bodies):
-            body.position = positions[i] + 0.5 * dt * k2_v[i]
-            body.velocity = velocities[i] + 0.5 * dt * k2_a[i]
+        Args:
+            positions: 位置配列 (N, 3) (km)
+            velocities: 速度配列 (N, 3) (km/s)
+            masses: 質量配列 (N,) (kg)
+            dt: 時間ステップ (秒)
         
-        k3_v = np.zeros((n, 3))
-        k3_a = np.zeros((n, 3))
+        Returns:
+            (新しい位置配列 (km), 新しい速度配列 (km/s))
+        """
+        cache = self._leapfrog_cache
+        if (cache is not None and
+                np.array_equal(cache[0], positions) and np.array_equal(cache[1], masses)):
+            accelerations = cache[2]
+        else:
+            accelerations = self.calculate_accelerations(positions, masses)
         
-        for i, body in enumerate(bodies):
-            k3_v[i] = body.velocity
-            k3_a[i] = self.calculate_total_force(body, bodies) / 1000
+        half_velocities = velocities + 0.5 * dt * accelerations
+        new_positions = positions + dt * half_velocities
+        new_accelerations = self.calculate_accelerations(new_positions, masses)
+        new_velocities = half_velocities + 0.5 * dt * new_accelerations
         
-        # k4の計算
-        for i, body in enumerate(bodies):
-            body.position = positions[i] + dt * k3_v[i]
-            body.velocity = velocities[i] + dt * k3_a[i]
+        self._leapfrog_cache = (new_positions.copy(), np.array(masses, dtype=np.float64),
+                                new_accelerations)
+        return new_positions, new_velocities
+    
+    def integrate_wisdom_holman_arrays(self, 
+                                     positions: np.ndarray, 
+                                     velocities: np.ndarray, 
+                                     masses: np.ndarray, 
+                                     dt: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Wisdom–Holman法（民主的太陽中心座標）で1ステップ積分
         
-        k4_v = np.zeros((n, 3))
-        k4_a = np.zeros((n, 3))
+        最大質量の天体を中心天体とし、ハミルトニアンを
+        ケプラー運動・天体間相互作用・中心天体の移動（ジャンプ）に分割して
+        キック(dt/2) → ジャンプ(dt/2) → ケプラードリフト(dt) → ジャンプ(dt/2) → キック(dt/2)
+        の順に適用します。ケプラードリフトはケプラー方程式の解による
+        f・g関数で厳密に計算するため、中心天体が支配的な系では
+        RK4より大きな時間ステップを使用できます。
         
-        for i, body in enumerate(bodies):
-            k4_v[i] = body.velocity
-            k4_a[i] = self.calculate_total_force(body, bodies) / 1000
+        Args:
+            positions: 位置配列 (N, 3) (km)
+            velocities: 速度配列 (N, 3) (km/s)
+            masses: 質量配列 (N,) (kg)
+            dt: 時間ステップ (秒)
+        
+        Returns:
+            (新しい位置配列 (km), 新しい速度配列 (km/s))
+        
+        Raises:
+            ValueError: 中心天体に束縛されていない天体がある場合
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        velocities = np.asarray(velocities, dtype=np.float64)
+        masses = np.asarray(masses, dtype=np.float64)
+        
+        if positions.shape[0] < 2:
+            return positions + dt * velocities, velocities.copy()
+        
+        central = int(np.argmax(masses))
+        others = np.arange(positions.shape[0]) != central
+        total_mass = masses.sum()
+        central_mass = masses[central]
+        mu = self.gravitational_constant * 1e-9 * central_mass  # km³/s²
+        
+        # 重心の位置・速度（等速直線運動）
+        center_of_mass = masses @ positions / total_mass
+        center_of_mass_velocity = masses @ velocities / total_mass
+        
+        # 民主的太陽中心座標: 中心天体からの相対位置と重心系の速度
+        heliocentric = positions[others] - positions[central]
+        barycentric_velocities = velocities[others] - center_of_mass_velocity
+        planet_masses = masses[others]
+        
+        def interaction_kick(h: float) -> None:
+            # 中心天体以外の天体間の相互作用
+            barycentric_velocities[...] += h * self.calculate_accelerations(
+                heliocentric, planet_masses
+            )
+        
+        def jump(h: float) -> None:
+            # 中心天体の運動による座標のずれ
+            heliocentric[...] += h * (planet_masses @ barycentric_velocities) / central_mass
+        
+        interaction_kick(0.5 * dt)
+        jump(0.5 * dt)
+        heliocentric, barycentric_velocities = self._kepler_drift(
+            heliocentric, barycentric_velocities, mu, dt
+        )
+        jump(0.5 * dt)
+        interaction_kick(0.5 * dt)
+        
+        # 元の座標系に戻す
+        new_center_of_mass = center_of_mass + dt * center_of_mass_velocity
+        new_positions = np.empty_like(positions)
+        new_velocities = np.empty_like(velocities)
+        
+        new_positions[central] = new_center_of_mass - planet_masses @ heliocentric / total_mass
+        new_positions[others] = heliocentric + new_positions[central]
+        new_velocities[others] = barycentric_velocities + center_of_mass_velocity
+        new_velocities[central] = (
+            center_of_mass_velocity - planet_masses @ barycentric_velocities / central_mass
+        )
+        
+        return new_positions, new_velocities
+    
+    def _kepler_drift(self, 
+                      positions: np.ndarray, 
+                      velocities: np.ndarray, 
+                      mu: float, 
+                      dt: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        ケプラー運動による厳密なドリフト（f・g関数）
+        
+        位置・速度から離心近点角を求め、平均近点角を n*dt 進めた
+        ケプラー方程式を解いて、時間 dt 後の状態を計算します。
+        
+        Args:
+            positions: 中心天体からの相対位置 (M, 3) (km)
+            velocities: 速度 (M, 3) (km/s)
+            mu: 中心天体の重力パラメータ (km³/s²)
+            dt: 時間 (秒)
+        
+        Returns:
+            (新しい位置 (km), 新しい速度 (km/s))
+        
+        Raises:
+            ValueError: 束縛されていない（双曲線・放物線）軌道の場合
+        """
+        r0 = np.linalg.norm(positions, axis=1)
+        speed_squared = np.einsum('ij,ij->i', velocities, velocities)
+        sigma0 = np.einsum('ij,ij->i', positions, velocities)  # r·v
+        
+        inverse_a = 2.0 / r0 - speed_squared / mu
+        if np.any(inverse_a <= 0):
+            raise ValueError("Wisdom–Holman法は中心天体に束縛された軌道にのみ対応しています")
+        a = 1.0 / inverse_a
+        mean_motion = np.sqrt(mu * inverse_a ** 3)  # rad/s
+        
+        # 現在の離心近点角と平均近点角
+        e_cos_E0 = 1.0 - r0 * inverse_a
+        e_sin_E0 = sigma0 / np.sqrt(mu * a)
+        eccentricity = np.hypot(e_cos_E0, e_sin_E0)
+        E0 = np.arctan2(e_sin_E0, e_cos_E0)
+        M1 = E0 - e_sin_E0 + mean_motion * dt
+        
+        # dt 後の離心近点角（周回分は別に加算）
+        M1_wrapped = np.mod(M1, 2 * np.pi)
+        E1, _ = solve_kepler_equation_array(
+            M1_wrapped, eccentricity, self.convergence_tolerance, self.max_iterations
+        )
+        delta_E = E1 - E0 + (M1 - M1_wrapped)
+        
+        cos_delta = np.cos(delta_E)
+        sin_delta = np.sin(delta_E)
+        r1 = a * (1.0 - e_cos_E0 * cos_delta + e_sin_E0 * sin_delta)
+        
+        f = 1.0 - a / r0 * (1.0 - cos_delta)
+        g = dt - (delta_E - sin_delta) / mean_motion
+        f_dot = -np.sqrt(mu * a) * sin_delta / (r0 * r1)
+        g_dot = 1.0 - a / r1 * (1.0 - cos_delta)
+        
+        new_positions = f[:, np.newaxis] * positions + g[:, np.newaxis] * velocities
+        new_velocities = f_dot[:, np.newaxis] * positions + g_dot[:, np.newaxis] * velocities
+        
+        return new_positions, new_velocities
+    
+    def integrate_arrays(self, 
+                       positions: np.ndarray, 
+                       velocities: np.ndarray, 
+                       masses: np.ndarray, 
+                       dt: float,
+                       observe: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        設定された積分法で配列状態を1ステップ積分
+        
+        drift_monitor が設定されている場合は積分後の状態を通知します。
+        encounter_detector が設定されている場合はステップ中の近接遭遇を検出し、
+        遭遇があれば必要に応じてステップを分割して積分し直します。
+        
+        Args:
+            positions: 位置配列 (N, 3) (km)
+            velocities: 速度配列 (N, 3) (km/s)
+            masses: 質量配列 (N,) (kg)
+            dt: 時間ステップ (秒)
+            observe: Falseの場合は drift_monitor・encounter_detector に通知しない
+                （積分済みの区間の再計算用。遭遇を含むステップの分割は同じように行う）
+        
+        Returns:
+            (新しい位置配列 (km), 新しい速度配列 (km/s))
+        """
+        monitor = self.drift_monitor if observe else None
+        if monitor is not None and not monitor.has_reference:
+            monitor.observe(positions, velocities, masses)
+        
+        new_positions, new_velocities = self._step_arrays(positions, velocities, masses, dt)
+        
+        detector = self.encounter_detector
+        if detector is not None:
+            substeps = detector.refinement_substeps
+            if substeps > 1 and detector.detect(positions, new_positions, dt):
+                # 遭遇を含むステップは小ステップで積分し直して最接近を追跡
+                sub_dt = dt / substeps
+                new_positions, new_velocities = positions, velocities
+                for _ in range(substeps):
+                    sub_positions, new_velocities = self._step_arrays(
+                        new_positions, new_velocities, masses, sub_dt
+                    )
+                    if observe:
+                        detector.observe(new_positions, sub_positions, sub_dt)
+                    new_positions = sub_positions
+                self.refined_step_count += 1
+            elif observe:
+                detector.observe(positions, new_positions, dt)
+        
+        if monitor is not None:
+            monitor.observe(new_positions, new_velocities, masses, dt)
+        return new_positions, new_velocities
+    
+    def _step_arrays(self, 
+                     positions: np.ndarray, 
+                     velocities: np.ndarray, 
+                     masses: np.ndarray, 
+                     dt: float) -> Tuple[np.ndarray, np.ndarray]:
+        """設定された積分法で1ステップ積分（監視・検出は行わない）"""
+        if self.integration_method == "rk4":
+            return self.integrate_rk4_arrays(positions, velocities, masses, dt)
+        if self.integration_method == "euler":
+            return self.integrate_euler_arrays(positions, velocities, masses, dt)
+        if self.integration_method in ("leapfrog", "verlet"):
+            return self.integrate_leapfrog_arrays(positions, velocities, masses, dt)
+        if self.integration_method == "dopri5":
+            new_positions, new_velocities, _ = self.integrate_adaptive(
+                positions, velocities, masses, dt
+            )
+            return new_positions, new_velocities
+        return self.integrate_wisdom_holman_arrays(positions, velocities, masses, dt)
+    
+    def integrate_ensemble_arrays(self, 
+                                positions: np.ndarray, 
+                                velocities: np.ndarray, 
+                                masses: np.ndarray, 
+                                dt: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        アンサンブルの全メンバーを設定された積分法で1ステップ積分
+        
+        M 個の初期条件を先頭のアンサンブル軸にまとめ、
+        加速度計算と積分をメンバー間でベクトル化して同時に進めます。
+        
+        Args:
+            positions: 位置配列 (M, N, 3) (km)
+            velocities: 速度配列 (M, N, 3) (km/s)
+            masses: 質量配列 (N,) または (M, N) (kg)
+            dt: 時間ステップ (秒)
+        
+        Returns:
+            (新しい位置配列 (M, N, 3) (km), 新しい速度配列 (M, N, 3) (km/s))
+        
+        Raises:
+            ValueError: アンサンブルに対応していない積分法の場合
+        """
+        if self.integration_method == "rk4":
+            return self.integrate_rk4_arrays(positions, velocities, masses, dt)
+        if self.integration_method == "euler":
+            return self.integrate_euler_arrays(positions, velocities, masses, dt)
+        if self.integration_method in ("leapfrog", "verlet"):
+            return self.integrate_leapfrog_arrays(positions, velocities, masses, dt)
+        raise ValueError(
+            f"積分法 {self.integration_method} はアンサンブル積分に対応していません"
+        )
+    
+    def integrate_adaptive(self, 
+                         positions: np.ndarray, 
+                         velocities: np.ndarray, 
+                         masses: np.ndarray, 
+                         duration: float, 
+                         dense_output: bool = False) -> Tuple[np.ndarray, np.ndarray, Optional[DenseOutput]]:
+        """
+        Dormand–Prince 5(4) 法で指定時間だけ積分（適応刻み幅）
+        
+        刻み幅は adaptive_integrator の許容誤差から自動で選択され、
+        近接遭遇の前後でのみ細かくなります。密出力を要求した場合は
+        区間内の任意時刻の状態を追加の加速度計算なしに補間できます。
+        
+        Args:
+            positions: 位置配列 (N, 3) (km)
+            velocities: 速度配列 (N, 3) (km/s)
+            masses: 質量配列 (N,) (kg)
+            duration: 積分時間 (秒)
+            dense_output: 密出力を作成するかどうか
+        
+        Returns:
+            (新しい位置配列 (km), 新しい速度配列 (km/s), 密出力またはNone)
+        """
+        return self.adaptive_integrator.integrate(
+            positions, velocities, masses, duration, dense_output
+        )
+    
+    def integrate_motion(self, 
+                       bodies: List[CelestialBody], 
+                       dt: float,
+                       test_particles: Optional[MasslessParticleSet] = None) -> None:
+        """
+        設定された積分法による運動方程式の数値積分
+        
+        試験粒子を指定した場合は、天体を積分した後に
+        天体のステップ開始・終了時の位置を使って試験粒子を積分します。
+        
+        Args:
+            bodies: 質量を持つ天体のリスト
+            dt: 時間ステップ (秒)
+            test_particles: 試験粒子群（重力源にならない）
+        """
+        if not bodies:
+            return
+        
+        positions = np.array([body.position for body in bodies], dtype=np.float64)  # km
+        velocities = np.array([body.velocity for body in bodies], dtype=np.float64)  # km/s
+        masses = np.array([body.mass for body in bodies], dtype=np.float64)  # kg
+        
+        new_positions, new_velocities = self.integrate_arrays(
+            positions, velocities, masses, dt
+        )
+        
+        if test_particles is not None and len(test_particles):
+            self.integrate_test_particles(test_particles, positions, new_positions, masses, dt)
         
-        # 最終的な位置と速度の更新
         for i, body in enumerate(bodies):
-            body.position = positions[i] + (dt / 6) * (k1_v[i] + 2*k2_v[i] + 2*k3_v[i] + k4_v[i])
-            body.velocity = velocities[i] + (dt / 6) * (k1_a[i] + 2*k2_a[i] + 2*k3_a[i] + k4_a[i])
+            body.position = new_positions[i]
+            body.velocity = new_velocities[i]
     
     def solve_kepler_equation(self, 
                             mean_anomaly: float, 
-                            eccentricity: float) -> float:
+                            eccentricity: float,
+                            body_name: Optional[str] = None) -> float:
         """
         ケプラー方程式を数値的に解いて離心近点角を求める
         
         M = E - e*sin(E) をEについて解く
+        天体名が指定され、同じ天体・同じ離心率での前回の解がある場合は
+        そこから外挿した値を初期推定値とします（ウォームスタート）。
         
         Args:
             mean_anomaly: 平均近点角 (ラジアン)
             eccentricity: 離心率
+            body_name: ウォームスタートの識別に用いる天体名（オプション）
             
         Returns:
             離心近点角 (ラジアン)
@@ -168,25 +830,50 @@ class PhysicsEngine:
         if not (0 <= eccentricity < 1):
             raise ValueError("離心率は0以上1未満である必要があります")
         
-        # 初期推定値
-        E = mean_anomaly
+        # 初期推定値（前回の解があれば外挿）
+        initial_guess = None
+        if body_name is not None:
+            state = self._kepler_warm_start.get(body_name)
+            if state is not None and state[0] == eccentricity:
+                initial_guess = kepler_warm_start_guess(
+                    mean_anomaly, eccentricity, state[1], state[2]
+                )
         
-        # ニュートン・ラフソン法
-        for iteration in range(self.max_iterations):
-            f = E - eccentricity * np.sin(E) - mean_anomaly
-            f_prime = 1 - eccentricity * np.cos(E)
-            
-            if abs(f_prime) < 1e-15:
-                raise ValueError("ケプラー方程式の数値解法で発散しました")
-            
-            delta_E = f / f_prime
-            E -= delta_E
-            
-            # 収束判定
-            if abs(delta_E) < self.convergence_tolerance:
-                return E
+        E, iterations, converged = solve_kepler_equation_scalar(
+            mean_anomaly, eccentricity,
+            self.convergence_tolerance, self.max_iterations, initial_guess
+        )
+        
+        self.kepler_solve_count += 1
+        self.kepler_iteration_total += iterations
+        self.last_kepler_iterations = iterations
+        
+        if not converged:
+            raise ValueError(f"ケプラー方程式が{self.max_iterations}回の反復で収束しませんでした")
         
-        raise ValueError(f"ケプラー方程式が{self.max_iterations}回の反復で収束しませんでした")
+        if body_name is not None:
+            self._kepler_warm_start[body_name] = (eccentricity, mean_anomaly, E)
+        
+        return E
+    
+    def get_kepler_stats(self) -> Dict[str, float]:
+        """
+        ケプラー方程式の求解統計を取得
+        
+        Returns:
+            求解回数・反復回数の辞書
+        """
+        average_iterations = (
+            self.kepler_iteration_total / self.kepler_solve_count
+            if self.kepler_solve_count > 0 else 0.0
+        )
+        
+        return {
+            'kepler_solve_count': self.kepler_solve_count,
+            'kepler_iteration_total': self.kepler_iteration_total,
+            'average_kepler_iterations': average_iterations,
+            'last_kepler_iterations': self.last_kepler_iterations
+        }
     
     def calculate_orbital_velocity(self, 
                                  position: np.ndarray, 
@@ -308,22 +995,41 @@ class PhysicsEngine:
         Returns:
             全エネルギー (J)
         """
-        total_kinetic = 0.0
-        total_potential = 0.0
+        positions, velocities, masses = pack_bodies(bodies)
+        return total_energy_array(positions, velocities, masses, self.gravitational_constant)
+    
+    def reset_energy_reference(self, bodies: List[CelestialBody]) -> float:
+        """
+        エネルギー誤差の基準値を現在の全エネルギーに設定
         
-        # 運動エネルギー
-        for body in bodies:
-            total_kinetic += body.get_kinetic_energy()
+        Args:
+            bodies: 天体のリスト
         
-        # ポテンシャルエネルギー
-        for i, body1 in enumerate(bodies):
-            for body2 in bodies[i+1:]:
-                r = body1.distance_to(body2) * 1000  # km -> m
-                if r > 0:
-                    potential = -self.gravitational_constant * body1.mass * body2.mass / r
-                    total_potential += potential
+        Returns:
+            基準エネルギー (J)
+        """
+        self.reference_energy = self.get_system_total_energy(bodies)
+        return self.reference_energy
+    
+    def get_energy_drift(self, bodies: List[CelestialBody]) -> float:
+        """
+        基準値からの全エネルギーの相対誤差を計算
         
-        return total_kinetic + total_potential
+        基準値が未設定の場合は現在の全エネルギーを基準値とします。
+        
+        Args:
+            bodies: 天体のリスト
+        
+        Returns:
+            相対エネルギー誤差 (E - E0) / |E0|
+        """
+        if self.reference_energy is None:
+            self.reset_energy_reference(bodies)
+        
+        energy = self.get_system_total_energy(bodies)
+        if self.reference_energy == 0:
+            return energy
+        return (energy - self.reference_energy) / abs(self.reference_energy)
     
     def get_system_angular_momentum(self, bodies: List[CelestialBody]) -> np.ndarray:
         """
@@ -335,32 +1041,150 @@ class PhysicsEngine:
         Returns:
             全角運動量ベクトル (kg⋅m²/s)
         """
-        total_angular_momentum = np.zeros(3)
+        positions, velocities, masses = pack_bodies(bodies)
+        return angular_momentum_array(positions, velocities, masses)
+    
+    def attach_drift_monitor(self, monitor: Optional[DriftMonitor] = None) -> DriftMonitor:
+        """
+        保存量の監視を設定
         
-        for body in bodies:
-            # 位置と運動量ベクトル
-            r = body.position * 1000  # km -> m
-            p = body.get_momentum()
-            
-            # 角運動量 L = r × p
-            angular_momentum = np.cross(r, p)
-            total_angular_momentum += angular_momentum
+        基準値は次の integrate_arrays 呼び出し時の積分前の状態から取得します。
+        
+        Args:
+            monitor: 監視オブジェクト、Noneの場合は既定の設定で作成
+        
+        Returns:
+            設定した監視オブジェクト
+        """
+        if monitor is None:
+            monitor = DriftMonitor(gravitational_constant=self.gravitational_constant)
+        self.drift_monitor = monitor
+        return monitor
+    
+    def detach_drift_monitor(self) -> None:
+        """保存量の監視を解除"""
+        self.drift_monitor = None
+    
+    def attach_encounter_detector(self, detector: EncounterDetector) -> EncounterDetector:
+        """
+        近接遭遇の検出を設定
         
-        return total_angular_momentum
+        Args:
+            detector: 検出器
+        
+        Returns:
+            設定した検出器
+        """
+        self.encounter_detector = detector
+        self.refined_step_count = 0
+        return detector
+    
+    def detach_encounter_detector(self) -> None:
+        """近接遭遇の検出を解除"""
+        self.encounter_detector = None
+    
+    def get_integrator_state(self) -> Dict[str, np.ndarray]:
+        """
+        積分の再開に必要な設定と内部状態を取得
+        
+        積分法・重力計算法の設定に加え、リープフロッグ法の加速度キャッシュ、
+        適応刻み幅積分器の刻み幅、Barnes–Hut 八分木の前回の構築結果を含みます。
+        set_integrator_state() で復元すると、中断しなかった場合と
+        ビット単位で同じ結果が得られます。
+        
+        Returns:
+            名前から配列への辞書（スカラーは0次元配列）
+        """
+        step_size = self.adaptive_integrator.step_size
+        state = {
+            'integration_method': np.array(self.integration_method),
+            'gravity_solver': np.array(self.gravity_solver),
+            'softening_length': np.array(self.softening_length),
+            'opening_angle': np.array(self.barnes_hut_tree.opening_angle),
+            'leaf_size': np.array(self.barnes_hut_tree.leaf_size),
+            'adaptive_step_size': np.array(np.nan if step_size is None else step_size)
+        }
+        
+        if self._leapfrog_cache is not None:
+            state['leapfrog_positions'], state['leapfrog_masses'], state['leapfrog_accelerations'] = (
+                self._leapfrog_cache
+            )
+        
+        build_state = self.barnes_hut_tree.get_build_state()
+        if build_state is not None:
+            state['barnes_hut_order'], state['barnes_hut_origin'], cube_size = build_state
+            state['barnes_hut_size'] = np.array(cube_size)
+        
+        return state
+    
+    def set_integrator_state(self, state: Dict[str, np.ndarray]) -> None:
+        """
+        get_integrator_state() で取得した設定と内部状態を復元
+        
+        Args:
+            state: 名前から配列への辞書
+        
+        Raises:
+            ValueError: 積分法または重力計算法が無効な場合
+        """
+        self.set_integration_method(str(state['integration_method']))
+        self.set_gravity_solver(str(state['gravity_solver']),
+                                opening_angle=float(state['opening_angle']),
+                                leaf_size=int(state['leaf_size']))
+        self.softening_length = float(state['softening_length'])
+        
+        step_size = float(state['adaptive_step_size'])
+        self.adaptive_integrator.step_size = None if np.isnan(step_size) else step_size
+        
+        if 'leapfrog_positions' in state:
+            self._leapfrog_cache = (np.array(state['leapfrog_positions'], dtype=np.float64),
+                                    np.array(state['leapfrog_masses'], dtype=np.float64),
+                                    np.array(state['leapfrog_accelerations'], dtype=np.float64))
+        else:
+            self._leapfrog_cache = None
+        
+        if 'barnes_hut_order' in state:
+            self.barnes_hut_tree.restore_build_state(
+                state['barnes_hut_order'], state['barnes_hut_origin'], float(state['barnes_hut_size'])
+            )
     
     def set_integration_method(self, method: str) -> None:
         """
         数値積分法を設定
         
         Args:
-            method: 積分法 ("rk4", "euler", "verlet")
+            method: 積分法 ("rk4", "euler", "verlet", "leapfrog", "wisdom_holman", "dopri5")
         """
-        valid_methods = ["rk4", "euler", "verlet"]
+        valid_methods = list(self.INTEGRATION_METHODS)
         if method not in valid_methods:
             raise ValueError(f"無効な積分法です: {method}. 有効な値: {valid_methods}")
         
         self.integration_method = method
     
+    def set_gravity_solver(self, 
+                         solver: str, 
+                         opening_angle: Optional[float] = None, 
+                         leaf_size: Optional[int] = None) -> None:
+        """
+        重力計算法を設定
+        
+        Args:
+            solver: 重力計算法 ("direct", "barnes_hut")
+            opening_angle: Barnes–Hut の開口角 θ、Noneの場合は現在の値
+            leaf_size: Barnes–Hut のリーフバケットの最大粒子数、Noneの場合は現在の値
+        """
+        valid_solvers = list(self.GRAVITY_SOLVERS)
+        if solver not in valid_solvers:
+            raise ValueError(f"無効な重力計算法です: {solver}. 有効な値: {valid_solvers}")
+        
+        if opening_angle is not None or leaf_size is not None:
+            self.barnes_hut_tree = BarnesHutTree(
+                opening_angle=self.barnes_hut_tree.opening_angle if opening_angle is None else opening_angle,
+                leaf_size=self.barnes_hut_tree.leaf_size if leaf_size is None else leaf_size
+            )
+        
+        self.gravity_solver = solver
+    
     def __str__(self) -> str:
         """文字列表現"""
         return f"PhysicsEngine (積分法: {self.integration_method}, 許容誤差: {self.convergence_tolerance})"
\ No newline at end of file
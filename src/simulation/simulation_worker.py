@@ -0,0 +1,342 @@
+"""
+シミュレーションのワーカースレッド
+
+時間の進行と天体位置の計算を GUI スレッドから切り離し、ワーカースレッドで
+実行します。計算結果は変更不可能なスナップショットとして SnapshotBuffer に
+公開され、描画側はロックを取らずに最新の完成したスナップショットを読み出します。
+位置計算に1フレーム以上かかっても、GUI スレッドの入力処理は待たされません。
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StateSnapshot:
+    """ある時刻の太陽系の状態（読み取り専用）"""
+    sequence: int                  # 公開順の通し番号（1から）
+    julian_date: float             # ユリウス日
+    names: Tuple[str, ...]         # 惑星名（positions の行順）
+    positions: np.ndarray          # 惑星の位置配列 (N, 3) (km)、書き込み不可
+    compute_time: float = 0.0      # 作成にかかった時間 (秒)
+    
+    # 描画用の補間（直前に公開した状態と、描画するユリウス日）
+    previous_julian_date: Optional[float] = None
+    previous_positions: Optional[np.ndarray] = field(default=None, repr=False)
+    render_julian_date: Optional[float] = None
+    
+    _index: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """名前から行への索引を作成"""
+        if not self._index:
+            object.__setattr__(self, '_index', {name: i for i, name in enumerate(self.names)})
+    
+    @property
+    def display_julian_date(self) -> float:
+        """描画するユリウス日（補間しない場合は julian_date）"""
+        return self.julian_date if self.render_julian_date is None else self.render_julian_date
+    
+    def clamp_julian_date(self, julian_date: float) -> float:
+        """
+        ユリウス日を直前の状態から現在の状態までの範囲に制限
+        
+        Args:
+            julian_date: ユリウス日
+        
+        Returns:
+            [previous_julian_date, julian_date] に制限したユリウス日
+        """
+        earliest = self.julian_date if self.previous_julian_date is None else self.previous_julian_date
+        return min(max(julian_date, min(earliest, self.julian_date)), self.julian_date)
+    
+    def interpolated_positions(self, render_julian_date: Optional[float] = None) -> np.ndarray:
+        """
+        直前の状態と現在の状態を描画するユリウス日で線形補間した位置を取得
+        
+        Args:
+            render_julian_date: 描画するユリウス日、Noneの場合は公開時の render_julian_date
+        
+        Returns:
+            位置配列 (N, 3) (km)、補間できない場合は positions
+        """
+        if render_julian_date is None:
+            render_julian_date = self.render_julian_date
+        if (self.previous_positions is None or render_julian_date is None or
+                self.julian_date == self.previous_julian_date):
+            return self.positions
+        fraction = ((render_julian_date - self.previous_julian_date) /
+                    (self.julian_date - self.previous_julian_date))
+        fraction = min(max(fraction, 0.0), 1.0)
+        if fraction == 1.0:
+            return self.positions
+        return self.previous_positions + fraction * (self.positions - self.previous_positions)
+    
+    def position_of(self, name: str) -> Optional[np.ndarray]:
+        """
+        惑星の位置を取得
+        
+        Args:
+            name: 惑星名
+        
+        Returns:
+            位置ベクトル (km)、存在しない場合は None
+        """
+        row = self._index.get(name)
+        return None if row is None else self.positions[row]
+    
+    def __len__(self) -> int:
+        """惑星数を返す"""
+        return len(self.names)
+
+
+class SnapshotBuffer:
+    """
+    スナップショットのダブルバッファ
+    
+    書き込み側は新しい配列に状態をコピーして完成させてから、参照の1回の
+    代入で前面のスナップショットと差し替えます。参照の代入は不可分なので、
+    読み出し側はロックなしで常に完成したスナップショットを得られます。
+    公開済みの配列は書き換えないため、読み出し側が保持し続けても安全です。
+    """
+    
+    def __init__(self):
+        """バッファの初期化"""
+        self._front: Optional[StateSnapshot] = None
+        self.published_count = 0
+        self.consumed_count = 0
+        self.skipped_count = 0   # 読み出されずに次のスナップショットに置き換わった数
+    
+    @property
+    def latest(self) -> Optional[StateSnapshot]:
+        """最新の完成したスナップショット（未公開の場合は None）"""
+        return self._front
+    
+    def publish(self,
+                julian_date: float,
+                names: Tuple[str, ...],
+                positions: np.ndarray,
+                compute_time: float = 0.0,
+                render_julian_date: Optional[float] = None) -> StateSnapshot:
+        """
+        状態をコピーしてスナップショットとして公開（書き込み側のスレッドのみ）
+        
+        Args:
+            julian_date: ユリウス日
+            names: 惑星名
+            positions: 惑星の位置配列 (N, 3) (km)
+            compute_time: 状態の計算にかかった時間 (秒)
+            render_julian_date: 描画するユリウス日（直前の状態との補間に使用）
+        
+        Returns:
+            公開したスナップショット
+        """
+        back = np.array(positions, dtype=np.float64, copy=True).reshape(-1, 3)
+        back.setflags(write=False)
+        names = tuple(names)
+        
+        # 公開済みの配列は書き換えないので、直前の状態はコピーせずに参照する
+        front = self._front
+        previous = front if front is not None and front.names == names else None
+        snapshot = StateSnapshot(
+            sequence=self.published_count + 1,
+            julian_date=float(julian_date),
+            names=names,
+            positions=back,
+            compute_time=compute_time,
+            previous_julian_date=previous.julian_date if previous else None,
+            previous_positions=previous.positions if previous else None,
+            render_julian_date=render_julian_date
+        )
+        self._front = snapshot
+        self.published_count = snapshot.sequence
+        return snapshot
+    
+    def consume(self, last_sequence: int = 0) -> Optional[StateSnapshot]:
+        """
+        前回読み出した後に公開されたスナップショットを取得
+        
+        Args:
+            last_sequence: 前回読み出したスナップショットの通し番号
+        
+        Returns:
+            新しいスナップショット、更新がない場合は None
+        """
+        snapshot = self._front
+        if snapshot is None or snapshot.sequence <= last_sequence:
+            return None
+        self.consumed_count += 1
+        if last_sequence:
+            self.skipped_count += snapshot.sequence - last_sequence - 1
+        return snapshot
+
+
+class SimulationWorker:
+    """
+    時間の進行と位置計算を行うワーカースレッド
+    
+    interval 秒ごとに TimeManager.tick() で時間を固定ステップ単位で進め、
+    SolarSystem の位置を計算してスナップショットを公開します。位置が変わらなかったステップ
+    （一時停止中など）では公開しません。
+    GUI スレッドからシミュレーションの状態を変更する場合は lock を取得してください。
+    time_manager の時間変更コールバックはワーカースレッドから呼び出されます
+    （deferred=True で登録したものは flush_time_notifications() を呼んだスレッドから）。
+    """
+    
+    # 既定の更新間隔 (秒)
+    DEFAULT_INTERVAL = 1.0 / 60.0
+    
+    # 1ステップで進める実経過時間の上限 (秒)。スリープ復帰などで大きく飛ばない
+    MAX_STEP_SECONDS = 0.25
+    
+    def __init__(self,
+                 solar_system,
+                 time_manager,
+                 interval: Optional[float] = None,
+                 buffer: Optional[SnapshotBuffer] = None):
+        """
+        ワーカーの初期化
+        
+        Args:
+            solar_system: 位置を計算する太陽系
+            time_manager: 時間管理
+            interval: 更新間隔 (秒)、Noneの場合は DEFAULT_INTERVAL
+            buffer: 公開先のバッファ、Noneの場合は新規作成
+        
+        Raises:
+            ValueError: 更新間隔が正でない場合
+        """
+        self.interval = self.DEFAULT_INTERVAL if interval is None else float(interval)
+        if not self.interval > 0:
+            raise ValueError(f"更新間隔は正である必要があります: {self.interval}")
+        
+        self.solar_system = solar_system
+        self.time_manager = time_manager
+        self.buffer = buffer if buffer is not None else SnapshotBuffer()
+        self.lock = threading.RLock()
+        
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        
+        # 統計
+        self.step_count = 0
+        self.error_count = 0
+        self.last_step_time = 0.0
+    
+    @property
+    def is_running(self) -> bool:
+        """ワーカースレッドが動作中かどうか"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self) -> None:
+        """ワーカースレッドを開始（初期状態を公開してから開始）"""
+        if self.is_running:
+            return
+        if self.buffer.latest is None:
+            self.publish()
+        
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="SimulationWorker", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = 2.0) -> None:
+        """
+        ワーカースレッドを停止して終了を待つ
+        
+        Args:
+            timeout: 終了を待つ最大時間 (秒)
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def step(self, real_dt: Optional[float] = None) -> Optional[StateSnapshot]:
+        """
+        時間を進めて位置を計算し、変化があれば公開
+        
+        Args:
+            real_dt: 実経過時間 (秒)、Noneの場合は TimeManager.tick() で
+                単調増加時計の経過時間を固定ステップ単位で進める
+        
+        Returns:
+            公開したスナップショット、位置が変わらなかった場合は None
+        """
+        started = time.perf_counter()
+        with self.lock:
+            if real_dt is None:
+                self.time_manager.tick()
+            elif not self.time_manager.is_paused:
+                self.time_manager.update(min(real_dt, self.MAX_STEP_SECONDS))
+            
+            skipped = self.solar_system.skipped_update_count
+            self.solar_system.update_all_positions(self.time_manager.current_julian_date)
+            self.step_count += 1
+            
+            latest = self.buffer.latest
+            if (latest is not None and
+                    self.solar_system.skipped_update_count != skipped and
+                    latest.julian_date == self.solar_system.current_date):
+                return None
+            return self.publish(time.perf_counter() - started)
+    
+    def publish(self, compute_time: float = 0.0) -> StateSnapshot:
+        """
+        太陽系の現在の状態をスナップショットとして公開
+        
+        Args:
+            compute_time: 状態の計算にかかった時間 (秒)
+        
+        Returns:
+            公開したスナップショット
+        """
+        with self.lock:
+            planets = self.solar_system.get_planets_list()
+            if planets:
+                positions = np.array([planet.position for planet in planets], dtype=np.float64)
+            else:
+                positions = np.empty((0, 3))
+            return self.buffer.publish(
+                self.solar_system.current_date,
+                tuple(planet.name for planet in planets),
+                positions,
+                compute_time,
+                render_julian_date=self._render_julian_date()
+            )
+    
+    def _render_julian_date(self) -> Optional[float]:
+        """固定ステップの補間で描画するユリウス日（太陽系が現在時刻にない場合は None）"""
+        if self.time_manager.current_julian_date != self.solar_system.current_date:
+            return None
+        return self.time_manager.interpolated_julian_date
+    
+    def _run(self) -> None:
+        """ワーカースレッドの本体"""
+        with self.lock:
+            self.time_manager.tick()   # 固定ステップの時計を開始
+        
+        while not self._stop_event.is_set():
+            now = time.monotonic()
+            try:
+                self.step()
+            except Exception as e:
+                # エラーはログに記録して次のステップを続行
+                self.error_count += 1
+                logger.error(f"シミュレーションワーカーエラー: {e}")
+            
+            self.last_step_time = time.monotonic() - now
+            self._stop_event.wait(max(0.0, self.interval - self.last_step_time))
+    
+    def __str__(self) -> str:
+        """文字列表現"""
+        state = "動作中" if self.is_running else "停止中"
+        return (f"SimulationWorker ({state}, ステップ: {self.step_count}, "
+                f"公開: {self.buffer.published_count})")
\ No newline at end of file
@@ -7,7 +7,12 @@
 
 import time
 from datetime import datetime, timezone
-from typing import Optional, Callable
+from typing import Optional, Callable, Tuple
+
+import numpy as np
+
+from .julian_dates import datetime64_to_julian, julian_to_datetime64
+from .time_notifications import TimeChangeDispatcher
 
 
 class TimeManager:
@@ -16,8 +21,16 @@ class TimeManager:
     
     実時間とシミュレーション時間の対応、
     時間倍率制御、一時停止機能などを提供します。
+    
+    tick() は単調増加する時計で実経過時間を測り、固定の実時間ステップ単位で
+    時間を進めます（固定ステップのアキュムレータ）。描画側は
+    interpolation_alpha で直前と現在のステップの間を補間できます。
     """
     
+    # 固定ステップの既定値（1ステップの実時間 (秒)、1回の tick で進める最大ステップ数）
+    DEFAULT_FIXED_STEP_SECONDS = 1.0 / 60.0
+    DEFAULT_MAX_CATCH_UP_STEPS = 5
+    
     def __init__(self):
         """時間管理システムの初期化"""
         self.current_julian_date: float = 0.0
@@ -30,8 +43,25 @@ class TimeManager:
         self._accumulated_time: float = 0.0
         self._start_time: float = 0.0
         
-        # コールバック
-        self._time_change_callbacks: list[Callable[[float], None]] = []
+        # 固定ステップ（tick）の設定と状態
+        self.fixed_step_seconds: float = self.DEFAULT_FIXED_STEP_SECONDS  # 1ステップの実時間 (秒)
+        self.max_catch_up_steps: int = self.DEFAULT_MAX_CATCH_UP_STEPS
+        self.previous_julian_date: float = 0.0   # 直前の固定ステップのユリウス日
+        self.interpolation_alpha: float = 0.0    # 直前と現在のステップの間の位置 (0〜1)
+        self.fixed_step_count: int = 0
+        self.dropped_real_time: float = 0.0      # 追いつけずに捨てた実時間 (秒)
+        self._clock: Callable[[], float] = time.monotonic
+        self._last_tick_time: Optional[float] = None
+        self._step_accumulator: float = 0.0
+        # 描画時の補間用に tick の終了時点の (時計, アキュムレータ, 直前, 現在のユリウス日) を
+        # 1回の参照の代入で公開（他スレッドからロックなしで一貫した組を読める）
+        self._render_state: Tuple[Optional[float], float, float, float] = (None, 0.0, 0.0, 0.0)
+        
+        # コールバック（購読者ごとに間引き・合流して配信）
+        self._time_notifications = TimeChangeDispatcher(clock=time.monotonic)
+        
+        # N体計算のタイムライン（設定時は set_date / advance_by_days で移動）
+        self.timeline = None
         
         # 初期時刻設定（現在時刻）
         self.set_date(datetime.now(timezone.utc))
@@ -40,8 +70,13 @@ class TimeManager:
         """
         シミュレーション開始日時を設定
         
+        タイムラインが設定されている場合は、その時刻の状態に移動します。
+        
         Args:
             date: 設定する日時（UTCタイムゾーン推奨）
+        
+        Raises:
+            ValueError: タイムラインの開始より前の日時の場合（時刻は変更しない）
         """
         # タイムゾーン情報がない場合はUTCとして扱う
         if date.tzinfo is None:
@@ -50,7 +85,9 @@ class TimeManager:
         # UTCに変換
         utc_date = date.astimezone(timezone.utc)
         
-        self.current_julian_date = self.datetime_to_julian(utc_date)
+        julian_date = self.datetime_to_julian(utc_date)
+        self._seek_timeline(julian_date)
+        self.current_julian_date = julian_date
         self._reset_internal_timers()
         
         # コールバック呼び出し
@@ -123,6 +160,30 @@ class TimeManager:
         
         return datetime(year, month, day, hour, minute, second, microsecond, timezone.utc)
     
+    def datetime_to_julian_array(self, times: np.ndarray) -> np.ndarray:
+        """
+        datetime64 配列をユリウス日の配列に一括変換（datetime_to_julian の配列版）
+        
+        Args:
+            times: UTC の datetime64 配列
+        
+        Returns:
+            ユリウス日の配列 (float64)
+        """
+        return datetime64_to_julian(times)
+    
+    def julian_to_datetime_array(self, julian_dates: np.ndarray) -> np.ndarray:
+        """
+        ユリウス日の配列を datetime64 配列に一括変換（julian_to_datetime の配列版）
+        
+        Args:
+            julian_dates: ユリウス日の配列
+        
+        Returns:
+            UTC の datetime64[us] 配列
+        """
+        return julian_to_datetime64(julian_dates)
+    
     def update(self, real_dt: float) -> None:
         """
         時間を進める
@@ -137,21 +198,125 @@ class TimeManager:
         sim_dt_seconds = real_dt * self.time_scale
         sim_dt_days = sim_dt_seconds / (24 * 3600)  # 秒を日に変換
         
-        self.current_julian_date += sim_dt_days
+        julian_date = self.current_julian_date + sim_dt_days
+        self._seek_timeline(julian_date)
+        self.current_julian_date = julian_date
         self._accumulated_time += sim_dt_seconds
         
         # コールバック呼び出し
         self._notify_time_change()
     
+    def configure_fixed_step(self,
+                             step_seconds: Optional[float] = None,
+                             max_catch_up_steps: Optional[int] = None) -> None:
+        """
+        固定ステップの設定を変更
+        
+        Args:
+            step_seconds: 1ステップの実時間 (秒)、Noneの場合は変更しない
+            max_catch_up_steps: 1回の tick で進める最大ステップ数、Noneの場合は変更しない
+        
+        Raises:
+            ValueError: ステップが正でない、または最大ステップ数が1未満の場合
+        """
+        if step_seconds is not None:
+            if not step_seconds > 0:
+                raise ValueError(f"固定ステップは正である必要があります: {step_seconds}")
+            self.fixed_step_seconds = float(step_seconds)
+        if max_catch_up_steps is not None:
+            if max_catch_up_steps < 1:
+                raise ValueError(f"最大ステップ数は1以上である必要があります: {max_catch_up_steps}")
+            self.max_catch_up_steps = int(max_catch_up_steps)
+        self._reset_internal_timers()
+    
+    def tick(self, now: Optional[float] = None) -> int:
+        """
+        実経過時間をアキュムレータに加え、固定ステップ単位で時間を進める
+        
+        1回の呼び出しで進めるのは max_catch_up_steps ステップまでで、
+        それを超えて溜まった実時間は捨てます（dropped_real_time に加算）。
+        各ステップで update() と同じく時間変更コールバックを呼び出します。
+        
+        Args:
+            now: 現在の時計の値 (秒)、Noneの場合は単調増加時計から取得
+        
+        Returns:
+            進めたステップ数
+        """
+        if now is None:
+            now = self._clock()
+        last, self._last_tick_time = self._last_tick_time, now
+        if last is None or self.is_paused:
+            # 初回と一時停止中は経過時間を溜めない
+            self._step_accumulator = 0.0
+            self.interpolation_alpha = 1.0
+            self._render_state = (None, 0.0, self.current_julian_date, self.current_julian_date)
+            return 0
+        
+        self._step_accumulator += max(0.0, now - last)
+        
+        steps = 0
+        while self._step_accumulator >= self.fixed_step_seconds and steps < self.max_catch_up_steps:
+            self.previous_julian_date = self.current_julian_date
+            self.update(self.fixed_step_seconds)
+            self._step_accumulator -= self.fixed_step_seconds
+            steps += 1
+        self.fixed_step_count += steps
+        
+        if self._step_accumulator >= self.fixed_step_seconds:
+            # 追いつけない分は捨て、端数のみ次回に持ち越す
+            remainder = self._step_accumulator % self.fixed_step_seconds
+            self.dropped_real_time += self._step_accumulator - remainder
+            self._step_accumulator = remainder
+        
+        self.interpolation_alpha = self._step_accumulator / self.fixed_step_seconds
+        self._render_state = (now, self._step_accumulator, self.previous_julian_date, self.current_julian_date)
+        return steps
+    
+    @property
+    def interpolated_julian_date(self) -> float:
+        """直前と現在の固定ステップの間を interpolation_alpha（最後の tick の時点）で補間したユリウス日"""
+        return (self.previous_julian_date +
+                self.interpolation_alpha * (self.current_julian_date - self.previous_julian_date))
+    
+    def render_julian_date(self, now: Optional[float] = None) -> float:
+        """
+        描画する時点の補間したユリウス日
+        
+        最後の tick の後に経過した実時間もアキュムレータに加えて補間の位置を求めるため、
+        固定ステップより短い間隔で描画しても毎回異なる位置になります。
+        tick 以外で時刻が変更された場合と一時停止中は current_julian_date を返します。
+        
+        Args:
+            now: 現在の時計の値 (秒)、Noneの場合は単調増加時計から取得
+        
+        Returns:
+            ユリウス日
+        """
+        tick_time, accumulator, previous, current = self._render_state
+        if tick_time is None or self.is_paused or self.current_julian_date != current:
+            return self.current_julian_date
+        if now is None:
+            now = self._clock()
+        alpha = min(1.0, (accumulator + max(0.0, now - tick_time)) / self.fixed_step_seconds)
+        return previous + alpha * (current - previous)
+    
     def advance_by_days(self, days: float) -> None:
         """
         指定した日数だけ時間を進める
         
+        タイムラインが設定されている場合は、その時刻の状態に移動します。
+        
         Args:
             days: 進める日数
+        
+        Raises:
+            ValueError: タイムラインの開始より前に戻る場合（時刻は変更しない）
         """
         if not self.is_paused:
-            self.current_julian_date += days
+            julian_date = self.current_julian_date + days
+            self._seek_timeline(julian_date)
+            self.current_julian_date = julian_date
             self._notify_time_change()
     
     def advance_by_seconds(self, seconds: float) -> None:
@@ -266,15 +431,21 @@ class TimeManager:
         
         self.set_time_scale(presets[preset])
     
-    def add_time_change_callback(self, callback: Callable[[float], None]) -> None:
+    def add_time_change_callback(self,
+                                 callback: Callable[[float], None],
+                                 min_interval: float = 0.0,
+                                 deferred: bool = False) -> None:
         """
         時間変更時のコールバックを追加
         
+        最小間隔内の変更は最新の値にまとめ、間隔が過ぎてから配信します。
+        
         Args:
             callback: 時間変更時に呼び出される関数（引数: ユリウス日）
+            min_interval: 呼び出しの最小間隔 (秒)、0の場合は変更のたびに呼び出す
+            deferred: Trueの場合は flush_time_notifications() でのみ呼び出す
         """
-        if callback not in self._time_change_callbacks:
-            self._time_change_callbacks.append(callback)
+        self._time_notifications.subscribe(callback, min_interval, deferred)
     
     def remove_time_change_callback(self, callback: Callable[[float], None]) -> None:
         """
@@ -283,8 +454,45 @@ class TimeManager:
         Args:
             callback: 削除する関数
         """
-        if callback in self._time_change_callbacks:
-            self._time_change_callbacks.remove(callback)
+        self._time_notifications.unsubscribe(callback)
+    
+    def flush_time_notifications(self, force: bool = False) -> int:
+        """
+        まとめて保留中の時間変更を、最小間隔が過ぎたコールバックに配信
+        
+        Args:
+            force: Trueの場合は間隔に関係なく全て配信
+        
+        Returns:
+            呼び出したコールバック数
+        """
+        return self._time_notifications.flush(force)
+    
+    def attach_timeline(self, timeline):
+        """
+        N体計算のタイムラインを設定（現在時刻の状態に移動）
+        
+        Args:
+            timeline: seek(julian_date) を持つタイムライン（NBodyTimeline など）
+        
+        Returns:
+            設定したタイムライン
+        
+        Raises:
+            ValueError: 現在時刻がタイムラインの開始より前の場合
+        """
+        timeline.seek(self.current_julian_date)
+        self.timeline = timeline
+        return timeline
+    
+    def detach_timeline(self) -> None:
+        """N体計算のタイムラインの設定を解除"""
+        self.timeline = None
+    
+    def _seek_timeline(self, julian_date: float) -> None:
+        """タイムラインが設定されていれば指定した時刻に移動"""
+        if self.timeline is not None:
+            self.timeline.seek(julian_date)
     
     def _reset_internal_timers(self) -> None:
         """内部タイマーをリセット"""
@@ -292,15 +500,17 @@ class TimeManager:
         self._last_update_time = current_time
         self._start_time = current_time
         self._accumulated_time = 0.0
+        
+        # 固定ステップの状態（時刻を飛ばした直後は補間しない）
+        self._last_tick_time = None
+        self._step_accumulator = 0.0
+        self.previous_julian_date = self.current_julian_date
+        self.interpolation_alpha = 1.0
+        self._render_state = (None, 0.0, self.current_julian_date, self.current_julian_date)
     
     def _notify_time_change(self) -> None:
-        """時間変更コールバックを呼び出し"""
-        for callback in self._time_change_callbacks:
-            try:
-                callback(self.current_julian_date)
-            except Exception as e:
-                # コールバックエラーは無視して続行
-                print(f"時間変更コールバックエラー: {e}")
+        """時間変更コールバックを呼び出し（間隔内の購読者には保留）"""
+        self._time_notifications.notify(self.current_julian_date)
     
     def get_time_info(self) -> dict:
         """
@@ -0,0 +1,197 @@
+"""
+時間変更通知の配信
+
+TimeManager の時間変更を購読者ごとの最小間隔で間引いて配信します。
+間隔内に届いた途中の値は最新の値1つにまとめ（合流）、間隔が過ぎた時点で
+配信します。配信は平均処理時間の短い購読者から順に行うため、軽い購読者が
+重い購読者の後ろで待たされません。
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+
+@dataclass
+class _Subscription:
+    """購読者ごとの配信状態"""
+    callback: Callable[[float], None]
+    min_interval: float               # 配信の最小間隔 (秒)、0の場合は毎回
+    deferred: bool                    # flush() でのみ配信するかどうか
+    last_delivered: Optional[float] = None
+    pending: Optional[float] = None   # 未配信の最新のユリウス日
+    delivered_count: int = 0
+    coalesced_count: int = 0          # 配信せずに新しい値にまとめた数
+    average_cost: float = 0.0         # コールバックの平均処理時間 (秒、指数移動平均)
+
+
+class TimeChangeDispatcher:
+    """
+    購読者ごとに間引き・合流を行う時間変更通知の配信器
+    
+    deferred=True の購読者には notify() では配信せず、flush() を呼び出した
+    スレッドから配信します（ワーカースレッドの時間変更を GUI スレッドで受ける場合など）。
+    状態の更新はロックで保護しますが、コールバックはロックの外で呼び出します。
+    """
+    
+    # 平均処理時間の指数移動平均の重み
+    COST_SMOOTHING = 0.2
+    
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        配信器の初期化
+        
+        Args:
+            clock: 間隔の判定に用いる時計 (秒)
+        """
+        self._clock = clock
+        self._subscriptions: List[_Subscription] = []
+        self._lock = threading.Lock()
+    
+    def subscribe(self,
+                  callback: Callable[[float], None],
+                  min_interval: float = 0.0,
+                  deferred: bool = False) -> None:
+        """
+        購読者を追加（登録済みの場合は設定を更新）
+        
+        Args:
+            callback: 時間変更時に呼び出される関数（引数: ユリウス日）
+            min_interval: 配信の最小間隔 (秒)、0の場合は変更のたびに配信
+            deferred: Trueの場合は flush() でのみ配信
+        
+        Raises:
+            ValueError: 最小間隔が負の場合
+        """
+        if min_interval < 0:
+            raise ValueError(f"配信間隔は0以上である必要があります: {min_interval}")
+        
+        with self._lock:
+            subscription = self._find(callback)
+            if subscription is None:
+                self._subscriptions.append(_Subscription(callback, float(min_interval), deferred))
+            else:
+                subscription.min_interval = float(min_interval)
+                subscription.deferred = deferred
+    
+    def unsubscribe(self, callback: Callable[[float], None]) -> None:
+        """
+        購読者を削除
+        
+        Args:
+            callback: 削除する関数
+        """
+        with self._lock:
+            subscription = self._find(callback)
+            if subscription is not None:
+                self._subscriptions.remove(subscription)
+    
+    def notify(self, julian_date: float, now: Optional[float] = None) -> int:
+        """
+        時間変更を通知（間隔が過ぎた購読者に配信し、それ以外は合流）
+        
+        Args:
+            julian_date: 新しいユリウス日
+            now: 現在の時計の値 (秒)、Noneの場合は時計から取得
+        
+        Returns:
+            配信した購読者数
+        """
+        if now is None:
+            now = self._clock()
+        
+        with self._lock:
+            due = []
+            for subscription in self._subscriptions:
+                if subscription.pending is not None:
+                    subscription.coalesced_count += 1
+                subscription.pending = julian_date
+                if not subscription.deferred and self._is_due(subscription, now):
+                    due.append(self._take(subscription, now))
+        
+        return self._deliver(due)
+    
+    def flush(self, force: bool = False, now: Optional[float] = None) -> int:
+        """
+        合流して保留中の値を、間隔が過ぎた購読者に配信
+        
+        Args:
+            force: Trueの場合は間隔に関係なく全ての保留中の値を配信
+            now: 現在の時計の値 (秒)、Noneの場合は時計から取得
+        
+        Returns:
+            配信した購読者数
+        """
+        if now is None:
+            now = self._clock()
+        
+        with self._lock:
+            due = [self._take(subscription, now)
+                   for subscription in self._subscriptions
+                   if subscription.pending is not None and (force or self._is_due(subscription, now))]
+        
+        return self._deliver(due)
+    
+    def _find(self, callback: Callable[[float], None]) -> Optional[_Subscription]:
+        """コールバックの購読状態を検索"""
+        for subscription in self._subscriptions:
+            if subscription.callback == callback:
+                return subscription
+        return None
+    
+    @staticmethod
+    def _is_due(subscription: _Subscription, now: float) -> bool:
+        """最小間隔が過ぎているかどうか"""
+        return (subscription.last_delivered is None or
+                now - subscription.last_delivered >= subscription.min_interval)
+    
+    @staticmethod
+    def _take(subscription: _Subscription, now: float):
+        """保留中の値を取り出して配信済みとして記録"""
+        julian_date, subscription.pending = subscription.pending, None
+        subscription.last_delivered = now
+        subscription.delivered_count += 1
+        return subscription, julian_date
+    
+    def _deliver(self, due) -> int:
+        """平均処理時間の短い順にコールバックを呼び出す"""
+        due.sort(key=lambda item: item[0].average_cost)
+        for subscription, julian_date in due:
+            started = time.perf_counter()
+            try:
+                subscription.callback(julian_date)
+            except Exception as e:
+                # コールバックエラーは無視して続行
+                print(f"時間変更コールバックエラー: {e}")
+            cost = time.perf_counter() - started
+            subscription.average_cost += self.COST_SMOOTHING * (cost - subscription.average_cost)
+        return len(due)
+    
+    def get_statistics(self) -> List[dict]:
+        """
+        購読者ごとの配信統計を取得
+        
+        Returns:
+            購読者ごとの統計の辞書のリスト
+        """
+        with self._lock:
+            return [
+                {
+                    "callback": getattr(s.callback, '__qualname__', repr(s.callback)),
+                    "min_interval": s.min_interval,
+                    "deferred": s.deferred,
+                    "delivered": s.delivered_count,
+                    "coalesced": s.coalesced_count,
+                    "average_cost": s.average_cost
+                }
+                for s in self._subscriptions
+            ]
+    
+    def __contains__(self, callback) -> bool:
+        """購読者が登録されているかどうか"""
+        return self._find(callback) is not None
+    
+    def __len__(self) -> int:
+        """購読者数を返す"""
+        return len(self._subscriptions)
\ No newline at end of file
@@ -6,13 +6,14 @@ PyQt6を使用したアプリケーションのメインウィンドウ。
 """
 
 import sys
+from contextlib import nullcontext
 from typing import Optional, Dict, Any
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, 
     QSplitter, QMenuBar, QMenu, QToolBar, QStatusBar,
     QMessageBox, QFileDialog
 )
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QSize
+from PyQt6.QtCore import Qt, pyqtSignal, QSize
 from PyQt6.QtGui import QIcon, QKeySequence, QShortcut, QAction, QActionGroup
 
 from vispy import scene
@@ -56,6 +57,9 @@ class MainWindow(QMainWindow):
         # データ
         self.solar_system = solar_system
         
+        # 位置計算のワーカー（AstroSimApplication が設定、太陽系の変更時にロックを取得）
+        self.simulation_worker = None
+        
         # UIコンポーネント
         self.control_panel: Optional[ControlPanel] = None
         self.info_panel: Optional[InfoPanel] = None
@@ -67,13 +71,6 @@ class MainWindow(QMainWindow):
         self.main_splitter: Optional[QSplitter] = None
         self.side_splitter: Optional[QSplitter] = None
         
-        # アニメーションタイマー
-        self.animation_timer = QTimer()
-        self.animation_timer.timeout.connect(self._update_animation)
-        self.animation_fps = 60  # FPS
-        self.animation_interval = 1000 // self.animation_fps  # ミリ秒
-        self.animation_timer.setInterval(self.animation_interval)
-        
         # 状態管理
         self.is_fullscreen = False
         self.last_window_state = Qt.WindowState.WindowNoState
@@ -133,14 +130,20 @@ class MainWindow(QMainWindow):
             shortcut = QShortcut(key_sequence, self)
             shortcut.activated.connect(slot)
     
+    def _simulation_lock(self):
+        """太陽系を変更する間に取得するロック（ワーカーがない場合は何もしない）"""
+        return self.simulation_worker.lock if self.simulation_worker else nullcontext()
+    
     def _reset_simulation(self) -> None:
-        """シミュレーションをリセット"""
-        if self.time_manager:
-            self.time_manager.reset_to_epoch()
+        """シミュレーションをリセット（位置はワーカーがリセット後の時刻で計算）"""
+        with self._simulation_lock():
+            if self.time_manager:
+                # J2000.0エポックに戻す
+                self.time_manager.current_julian_date = 2451545.0
         if self.scene_manager:
-            self.scene_manager.reset_animation()
             self.scene_manager.camera_controller.reset_view()
         self.update_time_display()
+        self.status_bar.showMessage("シミュレーションをリセットしました")
     
     def _toggle_fullscreen(self) -> None:
         """フルスクリーン表示切り替え"""
@@ -162,22 +165,44 @@ class MainWindow(QMainWindow):
     
     def _toggle_animation(self) -> None:
         """アニメーション再生/一時停止切り替え"""
-        if self.animation_timer.isActive():
-            self._pause_animation()
-        else:
-            self._start_animation()
+        if self.time_manager:
+            self._set_playing(self.time_manager.is_paused)
     
     def _pause_animation(self) -> None:
         """アニメーション一時停止"""
-        self.animation_timer.stop()
-        if self.scene_manager:
-            self.scene_manager.pause_animation()
+        self._set_playing(False)
     
     def _start_animation(self) -> None:
         """アニメーション開始"""
-        self.animation_timer.start(self.animation_interval)
+        self._set_playing(True)
+    
+    def _set_playing(self, playing: bool) -> None:
+        """
+        時間の進行を再生/一時停止
+        
+        時間を進めて位置を計算するのはシミュレーションワーカーで、GUIは公開された
+        状態を描画するだけです。TimeManager はワーカーと共有するためロックを取得して変更します。
+        
+        Args:
+            playing: Trueの場合は再生、Falseの場合は一時停止
+        """
+        if not self.time_manager:
+            return
+        with self._simulation_lock():
+            if playing:
+                self.time_manager.resume()
+            else:
+                self.time_manager.pause()
+        
         if self.scene_manager:
-            self.scene_manager.play_animation()
+            if playing:
+                self.scene_manager.play_animation()
+            else:
+                self.scene_manager.pause_animation()
+        if self.control_panel:
+            self.control_panel.set_animation_state(playing)
+        self.status_bar.showMessage("シミュレーション再生中" if playing else "シミュレーション一時停止")
+        self.animation_toggled.emit(playing)
     
     def _show_help(self) -> None:
         """ヘルプを表示"""
@@ -446,33 +471,6 @@ class MainWindow(QMainWindow):
             self.scene_manager.load_solar_system(self.solar_system)
             self.status_bar.showMessage(f"太陽系データ読み込み完了 ({self.solar_system.get_planet_count()}惑星)")
     
-    def _update_animation(self) -> None:
-        """アニメーション更新"""
-        if self.scene_manager:
-            # 1フレームあたりの時間進行（日単位）
-            time_delta = 1.0 / self.animation_fps
-            self.scene_manager.animate_step(time_delta)
-    
-    def _toggle_animation(self) -> None:
-        """アニメーション再生/一時停止切り替え"""
-        if self.scene_manager:
-            if self.scene_manager.is_playing:
-                self.scene_manager.pause_animation()
-                self.animation_timer.stop()
-                self.status_bar.showMessage("シミュレーション一時停止")
-            else:
-                self.scene_manager.play_animation()
-                self.animation_timer.start()
-                self.status_bar.showMessage("シミュレーション再生中")
-            
-            self.animation_toggled.emit(self.scene_manager.is_playing)
-    
-    def _reset_simulation(self) -> None:
-        """シミュレーションリセット"""
-        if self.scene_manager:
-            self.scene_manager.reset_animation()
-            self.status_bar.showMessage("シミュレーションをリセットしました")
-    
     def _reset_view(self) -> None:
         """ビューリセット"""
         if self.scene_manager:
@@ -536,13 +534,10 @@ class MainWindow(QMainWindow):
     
     def _on_time_scale_changed(self, scale: float) -> None:
         """時間倍率変更処理"""
-        # TimeManagerに時間倍率を設定
+        # TimeManagerに時間倍率を設定（ワーカーと共有するためロックを取得）
         if self.time_manager:
-            self.time_manager.set_time_scale(scale)
-        
-        # SceneManagerにアニメーション速度を設定
-        if self.scene_manager:
-            self.scene_manager.set_animation_speed(scale)
+            with self._simulation_lock():
+                self.time_manager.set_time_scale(scale)
         
         # ステータスバーに表示
         if hasattr(self, 'status_bar') and self.status_bar:
@@ -570,20 +565,36 @@ class MainWindow(QMainWindow):
         if self.info_panel and self.solar_system:
             planet = self.solar_system.get_planet_by_name(planet_name)
             if planet:
-                planet_info = self._get_planet_info(planet)
+                planet_info = self._get_planet_info(planet, self._latest_snapshot())
                 self.info_panel.display_planet_info(planet_info)
                 self.status_bar.showMessage(f"{planet_name}を選択")
         self.planet_selected.emit(planet_name)
     
-    def _get_planet_info(self, planet) -> Dict[str, Any]:
-        """惑星情報を取得"""
+    def _latest_snapshot(self):
+        """ワーカーが公開した最新の StateSnapshot（ワーカーがない場合はNone）"""
+        return self.simulation_worker.buffer.latest if self.simulation_worker else None
+    
+    def _get_planet_info(self, planet, snapshot=None) -> Dict[str, Any]:
+        """
+        惑星情報を取得
+        
+        Args:
+            planet: 惑星
+            snapshot: 位置を読む StateSnapshot、Noneの場合はロックを取得して惑星の位置を読む
+        """
+        position = snapshot.position_of(planet.name) if snapshot is not None else None
+        if position is None:
+            # 惑星の位置はワーカーが書き換えるテーブルのビューなのでロック中に複製
+            with self._simulation_lock():
+                position = planet.position.copy()
+        
         # 実装は簡易版
         return {
             'name': planet.name,
             'mass': planet.mass,
             'radius': planet.radius,
             'orbital_period': planet.orbital_elements.get_orbital_period(),
-            'distance_from_sun': f"{(planet.position[0]**2 + planet.position[1]**2 + planet.position[2]**2)**0.5 / 149597870.7:.3f} AU"
+            'distance_from_sun': f"{(position[0]**2 + position[1]**2 + position[2]**2)**0.5 / 149597870.7:.3f} AU"
         }
     
     def _toggle_fullscreen(self) -> None:
@@ -658,17 +669,26 @@ AstroSim - 太陽系惑星シミュレーター
         """
         QMessageBox.about(self, "AstroSimについて", about_text.strip())
     
-    def update_3d_view(self) -> None:
-        """3D表示の更新（メインアプリケーションから呼び出し）"""
+    def update_3d_view(self, snapshot=None, render_julian_date=None) -> None:
+        """
+        3D表示の更新（メインアプリケーションから呼び出し）
+        
+        Args:
+            snapshot: シミュレーションワーカーが公開した StateSnapshot、
+                Noneの場合はワーカーの最新のスナップショット（ワーカーがない場合は太陽系の現在状態）
+            render_julian_date: 描画するユリウス日（スナップショットの補間に使用）
+        """
+        if snapshot is None:
+            snapshot = self._latest_snapshot()
         if self.scene_manager and self.solar_system:
-            # 太陽系の現在状態を3Dシーンに反映
-            self.scene_manager.update_celestial_bodies(self.solar_system)
+            # 太陽系の状態を3Dシーンに反映
+            self.scene_manager.update_celestial_bodies(self.solar_system, snapshot, render_julian_date)
             
             # 情報パネルの更新（選択された惑星がある場合）
             if hasattr(self, '_selected_planet') and self._selected_planet:
                 planet = self.solar_system.get_planet_by_name(self._selected_planet)
                 if planet and self.info_panel:
-                    planet_info = self._get_planet_info(planet)
+                    planet_info = self._get_planet_info(planet, snapshot)
                     self.info_panel.display_planet_info(planet_info)
     
     def update_time_display(self) -> None:
@@ -699,9 +719,6 @@ AstroSim - 太陽系惑星シミュレーター
     
     def closeEvent(self, event) -> None:
         """ウィンドウクローズイベント"""
-        # アニメーション停止
-        self.animation_timer.stop()
-        
         # シーンマネージャーのクリーンアップ
         if self.scene_manager:
             self.scene_manager.cleanup()
@@ -351,46 +351,30 @@ class Renderer3D:
         """
         # 軌道要素から軌道線の点を計算
         orbital_elements = planet.orbital_elements
-        points = []
-        
-        # 360度を細分化して軌道線を描画
-        for angle in np.linspace(0, 2 * np.pi, 360):
-            # 簡易的な楕円軌道計算
-            a = orbital_elements.semi_major_axis
-            e = orbital_elements.eccentricity
-            
-            # 極座標での半径
-            r = a * (1 - e**2) / (1 + e * np.cos(angle))
-            
-            # 軌道面での位置
-            x_orbit = r * np.cos(angle)
-            y_orbit = r * np.sin(angle)
-            
-            # 3次元座標に変換（簡易版）
-            i = np.radians(orbital_elements.inclination)
-            omega = np.radians(orbital_elements.longitude_of_ascending_node)
-            w = np.radians(orbital_elements.argument_of_perihelion)
-            
-            # 回転行列による変換
-            cos_omega = np.cos(omega)
-            sin_omega = np.sin(omega)
-            cos_i = np.cos(i)
-            sin_i = np.sin(i)
-            cos_w = np.cos(w)
-            sin_w = np.sin(w)
-            
-            x = (cos_omega * cos_w - sin_omega * sin_w * cos_i) * x_orbit + \
-                (-cos_omega * sin_w - sin_omega * cos_w * cos_i) * y_orbit
-            y = (sin_omega * cos_w + cos_omega * sin_w * cos_i) * x_orbit + \
-                (-sin_omega * sin_w + cos_omega * cos_w * cos_i) * y_orbit
-            z = sin_w * sin_i * x_orbit + cos_w * sin_i * y_orbit
-            
-            # スケール調整（km -> AU）
-            points.append([x / 149597870.7, y / 149597870.7, z / 149597870.7])
+        e = orbital_elements.eccentricity
+        
+        # 360度を細分化して軌道線を描画（全点を一括計算）
+        angles = np.linspace(0, 2 * np.pi, 360)
+        
+        # 極座標での半径
+        r = orbital_elements.semi_latus_rectum / (1 + e * np.cos(angles))
+        
+        # 軌道面での位置
+        x_orbit = r * np.cos(angles)
+        y_orbit = r * np.sin(angles)
+        
+        # 軌道要素にキャッシュされた回転行列で3次元座標に変換
+        rotation = orbital_elements.rotation_matrix
+        points = (
+            np.outer(x_orbit, rotation[:, 0]) + np.outer(y_orbit, rotation[:, 1])
+        )
+        
+        # スケール調整（km -> AU）
+        points = points / 149597870.7
         
         # 軌道線を作成
         orbit_line = scene.visuals.Line(
-            pos=np.array(points),
+            pos=points,
             color=(0.6, 0.9, 1.0, 1.0),  # 明るいシアン色、完全不透明
             width=1.5,  # 適度な太さ
             parent=self.view.scene
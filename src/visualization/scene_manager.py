@@ -180,40 +180,68 @@ class SceneManager:
             if target_planet:
                 self.camera_controller.update_tracking_position(target_planet.position)
     
-    def update_celestial_bodies(self, solar_system: SolarSystem) -> None:
+    def update_celestial_bodies(self,
+                                solar_system: SolarSystem,
+                                snapshot=None,
+                                render_julian_date: Optional[float] = None) -> None:
         """
         天体データの更新（メインアプリケーションから呼び出し）
         
         Args:
             solar_system: 更新された太陽系オブジェクト
+            snapshot: シミュレーションワーカーが公開した StateSnapshot、
+                指定した場合は太陽系の現在値ではなくスナップショットの位置を描画
+            render_julian_date: 描画するユリウス日（TimeManager.render_julian_date()）、
+                Noneの場合はスナップショットの公開時に決めたユリウス日
         """
         if self.solar_system is None:
             # 初回の場合は太陽系データを読み込み
             self.load_solar_system(solar_system)
             return
         
+        if snapshot is not None:
+            # ワーカースレッドが書き換え中の天体ではなく、完成した状態を読む
+            # （固定ステップの間は直前の状態との補間位置を描画）
+            if render_julian_date is None:
+                julian_date = snapshot.display_julian_date
+            else:
+                julian_date = snapshot.clamp_julian_date(render_julian_date)
+            positions = snapshot.interpolated_positions(julian_date)
+            bodies = [(solar_system.get_planet_by_name(name), positions[row])
+                      for row, name in enumerate(snapshot.names)]
+        else:
+            julian_date = solar_system.current_date
+            bodies = [(planet, planet.position) for planet in solar_system.get_planets_list()]
+        
         # 各惑星の描画位置を更新
-        for planet in solar_system.get_planets_list():
+        for planet, position in bodies:
+            if planet is None:
+                continue
+            
             # 位置の更新（kmからAUに変換）
-            position_au = planet.position / 149597870.7  # km to AU
+            position_au = position / 149597870.7  # km to AU
             self.renderer.update_planet_position(planet.name, position_au)
             
             # 自転角度の更新（簡易実装）
             # 現在のユリウス日から自転角度を計算
             if hasattr(planet, 'rotation_period') and planet.rotation_period > 0:
                 # 現在時刻からの自転角度計算（概算）
-                rotation_angle = (solar_system.current_date * 24.0 / abs(planet.rotation_period)) % 360.0
+                rotation_angle = (julian_date * 24.0 / abs(planet.rotation_period)) % 360.0
                 if planet.rotation_period < 0:  # 逆回転（金星など）
                     rotation_angle = -rotation_angle
                 self.renderer.update_planet_rotation(planet.name, rotation_angle)
         
         # 追跡中の惑星がある場合、カメラを更新
         if hasattr(self.camera_controller, 'tracking_target') and self.camera_controller.tracking_target:
-            target_planet = solar_system.get_planet_by_name(
-                self.camera_controller.tracking_target
-            )
-            if target_planet:
-                position_au = target_planet.position / 149597870.7
+            target = self.camera_controller.tracking_target
+            if snapshot is not None:
+                row = snapshot.names.index(target) if target in snapshot.names else None
+                target_position = None if row is None else positions[row]
+            else:
+                target_planet = solar_system.get_planet_by_name(target)
+                target_position = target_planet.position if target_planet else None
+            if target_position is not None:
+                position_au = target_position / 149597870.7
                 self.camera_controller.update_tracking_position(position_au)
     
     def animate_step(self, time_delta: float) -> None:
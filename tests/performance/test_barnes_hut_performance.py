@@ -0,0 +1,83 @@
+"""
+Barnes–Hut 八分木のパフォーマンステスト
+
+直接和に対する精度と処理時間を N = 1k, 10k, 100k で比較します。
+100k の直接和は時間がかかりすぎるため、一部の粒子で計算した時間から推定します。
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.simulation.barnes_hut import BarnesHutTree
+
+
+# 直接和で評価するターゲット粒子数の上限
+_SAMPLE_TARGETS = 1000
+
+
+def _direct_accelerations(positions: np.ndarray, gm: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """指定した粒子の加速度を直接和で計算"""
+    accelerations = np.empty((targets.size, 3))
+    for start in range(0, targets.size, 100):
+        rows = targets[start:start + 100]
+        displacement = positions[np.newaxis, :, :] - positions[rows, np.newaxis, :]
+        distance_squared = np.einsum('ijk,ijk->ij', displacement, displacement)
+        distance_squared[np.arange(rows.size), rows] = np.inf
+        accelerations[start:start + 100] = np.einsum(
+            'ij,ijk->ik', gm * distance_squared ** -1.5, displacement
+        )
+    return accelerations
+
+
+@pytest.mark.performance
+class TestBarnesHutPerformance:
+    """Barnes–Hut 八分木のパフォーマンステスト"""
+    
+    @pytest.mark.parametrize("count", [
+        1000,
+        10000,
+        pytest.param(100000, marks=pytest.mark.slow),
+    ])
+    def test_accuracy_and_speed_against_direct(self, count):
+        """直接和に対する精度と処理時間の比較"""
+        rng = np.random.default_rng(42)
+        # 小惑星帯を模した円環状の分布 (km)
+        radius = rng.uniform(2.1, 3.3, count) * 1.496e8
+        angle = rng.uniform(0, 2 * np.pi, count)
+        positions = np.column_stack([
+            radius * np.cos(angle), radius * np.sin(angle), rng.normal(0, 1e7, count)
+        ])
+        gm = rng.uniform(1e-6, 1e-3, count)
+        
+        targets = np.arange(count) if count <= _SAMPLE_TARGETS else rng.choice(
+            count, _SAMPLE_TARGETS, replace=False
+        )
+        start = time.perf_counter()
+        expected = _direct_accelerations(positions, gm, targets)
+        direct_time = (time.perf_counter() - start) * count / targets.size
+        
+        tree = BarnesHutTree(opening_angle=0.5)
+        start = time.perf_counter()
+        accelerations = tree.calculate_accelerations(positions, gm)
+        tree_time = time.perf_counter() - start
+        
+        # 差分再構築（粒子がわずかに動いた次のステップ）
+        start = time.perf_counter()
+        tree.calculate_accelerations(positions * (1 + 1e-6), gm)
+        rebuild_time = time.perf_counter() - start
+        
+        relative_error = (np.linalg.norm(accelerations[targets] - expected, axis=1) /
+                          np.linalg.norm(expected, axis=1))
+        
+        print(f"\nBarnes-Hut (N={count}): direct={direct_time:.2f}s"
+              f"{' (estimated)' if targets.size < count else ''}, "
+              f"tree={tree_time:.2f}s, rebuild={rebuild_time:.2f}s, "
+              f"speedup={direct_time / tree_time:.1f}x, "
+              f"median error={np.median(relative_error):.1e}, max error={np.max(relative_error):.1e}")
+        
+        assert np.median(relative_error) < 1e-2
+        assert tree.incremental_builds == 1
+        if count >= 10000:
+            assert tree_time < direct_time
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""
+近接遭遇検出のパフォーマンステスト
+
+一様に分布した N = 10k, 100k 個の粒子で1ステップあたりの検出時間を測定し、
+全ての組を調べる場合と比べてほぼ線形に増えることを確認します。
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.simulation.encounter_detector import EncounterDetector
+
+
+def _step_time(count: int, repeats: int = 3) -> float:
+    """1ステップ分の検出時間の最小値 (秒)"""
+    rng = np.random.default_rng(count)
+    positions = rng.uniform(-1e6, 1e6, (count, 3))
+    velocities = rng.normal(0.0, 1.0, (count, 3))
+    
+    # 平均粒子間距離の2割を遭遇距離とする
+    detector = EncounterDetector(encounter_distance=0.2 * 2e6 / count ** (1 / 3))
+    best = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        detector.observe(positions, positions + velocities * 100.0, 100.0)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.performance
+class TestEncounterDetectorPerformance:
+    """近接遭遇検出のパフォーマンステスト"""
+    
+    def test_near_linear_scaling(self):
+        """粒子数10倍で検出時間の増加が全組探索の100倍より十分小さいことを確認"""
+        small = _step_time(10000)
+        large = _step_time(100000)
+        
+        print(f"\nEncounter detection: N=10k {small*1000:.1f}ms, N=100k {large*1000:.1f}ms, "
+              f"ratio={large / small:.1f}x")
+        
+        assert large / small < 25
+        assert large < 2.0
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+JITバックエンドのパフォーマンステスト
+
+10万天体の位置伝播について、NumPy実装とJITカーネルの処理時間を比較します。
+"""
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from src.domain import kepler_jit
+from src.domain.orbital_elements import OrbitalElements
+from src.domain.orbital_elements_table import OrbitalElementsTable
+
+
+BODY_COUNT = 100_000
+
+
+def _build_table(count: int, seed: int = 42) -> OrbitalElementsTable:
+    """テスト用の軌道要素テーブルを作成"""
+    rng = np.random.default_rng(seed)
+    table = OrbitalElementsTable(capacity=count)
+    for _ in range(count):
+        table.append(OrbitalElements(
+            semi_major_axis=rng.uniform(0.4, 40.0),
+            eccentricity=rng.uniform(0.0, 0.95),
+            inclination=rng.uniform(0.0, 30.0),
+            longitude_of_ascending_node=rng.uniform(0.0, 360.0),
+            argument_of_perihelion=rng.uniform(0.0, 360.0),
+            mean_anomaly_at_epoch=rng.uniform(0.0, 360.0),
+            epoch=2451545.0
+        ))
+    return table
+
+
+def _time_propagation(table: OrbitalElementsTable, julian_dates, repeat: int = 3) -> float:
+    """各時刻の位置伝播にかかった合計時間を計測（repeat回の最小値）"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for julian_date in julian_dates:
+            table.compute_positions(julian_date)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.mark.performance
+class TestKeplerJitPerformance:
+    """JITバックエンドのパフォーマンステスト"""
+    
+    def test_jit_propagation_speedup(self):
+        """
+        JITカーネルによる10万天体の伝播がNumPy実装より高速であることを確認
+        
+        複数コアがある場合は並列カーネルを使用するため、
+        速度向上率はCPUコア数に依存します。
+        """
+        pytest.importorskip("numba")
+        
+        # 各実装で新しいテーブルを使用（ウォームスタートの条件を揃える）
+        julian_dates = 2451545.0 + np.arange(10) * 5.0
+        
+        try:
+            kepler_jit.configure_jit_backend(False)
+            numpy_table = _build_table(BODY_COUNT)
+            numpy_time = _time_propagation(numpy_table, julian_dates)
+            
+            kepler_jit.configure_jit_backend(True, parallel=(os.cpu_count() or 1) > 1)
+            _build_table(10).compute_positions(julian_dates[0])  # コンパイル/キャッシュ読み込み
+            jit_table = _build_table(BODY_COUNT)
+            jit_time = _time_propagation(jit_table, julian_dates)
+        finally:
+            kepler_jit.configure_jit_backend(False)
+        
+        print(f"\n100k-body propagation (10 steps): numpy={numpy_time*1000:.1f}ms, "
+              f"jit={jit_time*1000:.1f}ms, speedup={numpy_time / jit_time:.1f}x")
+        
+        np.testing.assert_allclose(jit_table.positions, numpy_table.positions,
+                                   rtol=1e-10, atol=1e-3)
+        assert jit_time < numpy_time
\ No newline at end of file
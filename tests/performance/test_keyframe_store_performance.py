@@ -0,0 +1,72 @@
+"""
+キーフレームによるタイムライン移動のパフォーマンステスト
+
+太陽と8惑星を1000年分（10日ステップ）積分した後、任意の時刻への移動が
+1秒を大きく下回ることと、キーフレームがメモリ予算内に収まることを確認します。
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.simulation.keyframe_store import KeyframeStore, NBodyTimeline
+from src.simulation.physics_engine import PhysicsEngine
+
+
+AU = 1.495978707e8  # km
+GM_SUN = 1.32712440018e11  # km³/s²
+
+# 太陽と8惑星の軌道長半径 (AU) と質量 (kg)
+_PLANETS = [
+    (0.387, 3.301e23), (0.723, 4.867e24), (1.000, 5.972e24), (1.524, 6.417e23),
+    (5.203, 1.898e27), (9.537, 5.683e26), (19.19, 8.681e25), (30.07, 1.024e26)
+]
+
+J2000 = 2451545.0
+YEARS = 1000
+
+
+def _solar_system_state():
+    """太陽と8惑星の円軌道の初期状態（惑星ごとに位相をずらす）"""
+    positions = [np.zeros(3)]
+    velocities = [np.zeros(3)]
+    masses = [1.989e30]
+    for i, (semi_major_axis, mass) in enumerate(_PLANETS):
+        radius = semi_major_axis * AU
+        speed = np.sqrt(GM_SUN / radius)
+        angle = 0.7 * i
+        positions.append(radius * np.array([np.cos(angle), np.sin(angle), 0.0]))
+        velocities.append(speed * np.array([-np.sin(angle), np.cos(angle), 0.0]))
+        masses.append(mass)
+    return np.array(positions), np.array(velocities), np.array(masses)
+
+
+@pytest.mark.performance
+class TestKeyframeStorePerformance:
+    """キーフレームによるタイムライン移動のパフォーマンステスト"""
+    
+    def test_seek_in_1000_year_run(self):
+        """1000年分の積分後の任意の時刻への移動時間のテスト"""
+        positions, velocities, masses = _solar_system_state()
+        store = KeyframeStore(memory_budget=4 * 1024 * 1024)
+        timeline = NBodyTimeline(PhysicsEngine(), positions, velocities, masses, J2000,
+                                 step_days=10.0, store=store)
+        end = J2000 + YEARS * 365.25
+        
+        start = time.perf_counter()
+        timeline.seek(end)
+        forward_time = time.perf_counter() - start
+        
+        rng = np.random.default_rng(0)
+        targets = J2000 + rng.uniform(0.0, YEARS * 365.25, 50)
+        worst = 0.0
+        for target in targets:
+            start = time.perf_counter()
+            timeline.seek(target)
+            worst = max(worst, time.perf_counter() - start)
+        
+        print(f"\n前向きの積分: {forward_time:.2f} 秒, 移動の最大: {worst * 1000:.1f} ms, {store}")
+        
+        assert store.memory_usage <= store.memory_budget
+        assert worst < 0.1
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""
+軌道計算のパフォーマンステスト
+
+スカラー計算の繰り返しと一括計算の処理時間を比較します。
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.domain.orbital_elements import OrbitalElements
+from src.simulation.orbit_calculator import OrbitCalculator
+
+
+def _random_elements(count: int, seed: int = 42):
+    """テスト用の軌道要素をランダムに生成"""
+    rng = np.random.default_rng(seed)
+    return [
+        OrbitalElements(
+            semi_major_axis=rng.uniform(0.4, 40.0),
+            eccentricity=rng.uniform(0.0, 0.9),
+            inclination=rng.uniform(0.0, 30.0),
+            longitude_of_ascending_node=rng.uniform(0.0, 360.0),
+            argument_of_perihelion=rng.uniform(0.0, 360.0),
+            mean_anomaly_at_epoch=rng.uniform(0.0, 360.0),
+            epoch=2451545.0
+        )
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.performance
+class TestOrbitCalculatorPerformance:
+    """軌道計算のパフォーマンステスト"""
+    
+    def test_batch_propagation_speedup(self):
+        """一括計算がスカラー計算の繰り返しより高速であることを確認"""
+        calculator = OrbitCalculator()
+        elements_list = _random_elements(50)
+        julian_dates = 2451545.0 + np.arange(100) * 3.7
+        
+        # スカラー計算（キャッシュの影響を避けるため毎回クリア）
+        calculator.clear_cache()
+        start = time.perf_counter()
+        scalar_positions = np.empty((len(elements_list), len(julian_dates), 3))
+        for i, elements in enumerate(elements_list):
+            for j, julian_date in enumerate(julian_dates):
+                scalar_positions[i, j], _ = calculator.calculate_position_velocity(
+                    elements, julian_date
+                )
+        scalar_time = time.perf_counter() - start
+        
+        # 一括計算
+        start = time.perf_counter()
+        batch_positions, _ = calculator.calculate_positions_batch(elements_list, julian_dates)
+        batch_time = time.perf_counter() - start
+        
+        print(f"\nBatch propagation: scalar={scalar_time*1000:.1f}ms, "
+              f"batch={batch_time*1000:.1f}ms, speedup={scalar_time / batch_time:.1f}x")
+        
+        assert np.allclose(batch_positions, scalar_positions, rtol=0,
+                           atol=1e-9 * calculator.au_to_km)
+        assert batch_time < scalar_time
\ No newline at end of file
@@ -0,0 +1,197 @@
+"""
+物理エンジンのパフォーマンステスト
+
+天体ごとの重力計算ループと一括加速度計算の処理時間を比較します。
+"""
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from src.domain.celestial_body import CelestialBody
+from src.domain.massless_particles import MasslessParticleSet
+from src.simulation.physics_engine import PhysicsEngine
+from src.simulation.drift_monitor import DriftMonitor
+from src.simulation.ensemble import perturb_initial_conditions
+
+
+class _Body(CelestialBody):
+    """テスト用天体クラス"""
+    
+    def update_position(self, julian_date: float) -> None:
+        pass
+    
+    def get_visual_properties(self) -> dict:
+        return {}
+
+
+def _random_bodies(count: int, seed: int = 42):
+    """テスト用の天体をランダムに生成"""
+    rng = np.random.default_rng(seed)
+    bodies = []
+    for i in range(count):
+        body = _Body(f"Body{i}", rng.uniform(1e20, 1e26), 1000.0)
+        body.position = rng.uniform(-5e8, 5e8, 3)
+        body.velocity = rng.uniform(-30.0, 30.0, 3)
+        bodies.append(body)
+    return bodies
+
+
+@pytest.mark.performance
+class TestPhysicsEnginePerformance:
+    """物理エンジンのパフォーマンステスト"""
+    
+    def test_vectorized_acceleration_speedup(self):
+        """一括加速度計算が天体ごとのループより高速であることを確認"""
+        engine = PhysicsEngine()
+        bodies = _random_bodies(100)
+        positions = np.array([body.position for body in bodies])
+        masses = np.array([body.mass for body in bodies])
+        
+        start = time.perf_counter()
+        loop_accelerations = np.array([
+            engine.calculate_total_force(body, bodies) / 1000 for body in bodies
+        ])
+        loop_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        accelerations = engine.calculate_accelerations(positions, masses)
+        vectorized_time = time.perf_counter() - start
+        
+        print(f"\nAcceleration (N=100): loop={loop_time*1000:.1f}ms, "
+              f"vectorized={vectorized_time*1000:.2f}ms, speedup={loop_time / vectorized_time:.0f}x")
+        
+        np.testing.assert_allclose(accelerations, loop_accelerations, rtol=1e-10)
+        assert vectorized_time < loop_time
+    
+    def test_rk4_step_scaling(self):
+        """1000天体のRK4ステップが実用的な時間で完了することを確認"""
+        engine = PhysicsEngine()
+        bodies = _random_bodies(1000)
+        
+        start = time.perf_counter()
+        engine.integrate_motion_rk4(bodies, 3600.0)
+        step_time = time.perf_counter() - start
+        
+        print(f"\nRK4 step (N=1000): {step_time*1000:.1f}ms")
+        
+        assert step_time < 5.0
+    
+    def test_test_particle_step_scaling(self):
+        """100万個の試験粒子のステップが天体数に比例したコストで完了することを確認"""
+        engine = PhysicsEngine()
+        engine.set_integration_method("leapfrog")
+        bodies = _random_bodies(9)
+        
+        rng = np.random.default_rng(0)
+        particles = MasslessParticleSet()
+        count = 1_000_000
+        particles.add_particles(rng.uniform(-8e8, 8e8, (count, 3)), rng.uniform(-20.0, 20.0, (count, 3)))
+        
+        # 1ステップ目は開始時の加速度も計算する
+        engine.integrate_motion(bodies, 86400.0, test_particles=particles)
+        
+        start = time.perf_counter()
+        engine.integrate_motion(bodies, 86400.0, test_particles=particles)
+        step_time = time.perf_counter() - start
+        
+        print(f"\nTest particle step (N_massive=9, N_particles={count}): {step_time*1000:.0f}ms, "
+              f"{particles.chunk_count} chunks")
+        
+        assert np.all(np.isfinite(particles.get_positions()))
+        assert step_time < 10.0
+    
+    def test_parallel_acceleration_scaling(self):
+        """加速度計算のプロセス並列化がコア数に応じて高速化することを確認"""
+        workers = os.cpu_count() or 1
+        if workers < 2:
+            pytest.skip("並列化の計測には2コア以上が必要です")
+        
+        rng = np.random.default_rng(1)
+        positions = rng.uniform(-5e8, 5e8, (8000, 3))
+        masses = rng.uniform(1e20, 1e26, 8000)
+        
+        serial = PhysicsEngine()
+        start = time.perf_counter()
+        expected = serial.calculate_accelerations(positions, masses)
+        serial_time = time.perf_counter() - start
+        
+        parallel = PhysicsEngine()
+        parallel.configure_parallel(True, worker_count=workers)
+        try:
+            parallel.calculate_accelerations(positions[:2048], masses[:2048])  # ワーカー起動
+            start = time.perf_counter()
+            accelerations = parallel.calculate_accelerations(positions, masses)
+            parallel_time = time.perf_counter() - start
+        finally:
+            parallel.shutdown_parallel()
+        
+        speedup = serial_time / parallel_time
+        print(f"\nParallel accelerations (N=8000, {workers} workers): serial={serial_time*1000:.0f}ms, "
+              f"parallel={parallel_time*1000:.0f}ms, speedup={speedup:.1f}x, "
+              f"efficiency={speedup / workers:.0%}")
+        
+        np.testing.assert_array_equal(accelerations, expected)
+        assert parallel_time < serial_time
+    
+    def test_drift_monitor_overhead(self):
+        """保存量の監視が積分のスループットをほとんど下げないことを確認"""
+        bodies = _random_bodies(300)
+        positions = np.array([body.position for body in bodies])
+        velocities = np.array([body.velocity for body in bodies])
+        masses = np.array([body.mass for body in bodies])
+        
+        def run(engine, steps=200):
+            state = (positions, velocities)
+            start = time.perf_counter()
+            for _ in range(steps):
+                state = engine.integrate_arrays(state[0], state[1], masses, 3600.0)
+            return time.perf_counter() - start
+        
+        engine = PhysicsEngine()
+        engine.set_integration_method("leapfrog")
+        baseline_time = run(engine)
+        
+        engine = PhysicsEngine()
+        engine.set_integration_method("leapfrog")
+        monitor = engine.attach_drift_monitor(DriftMonitor(sample_interval=1, max_overhead=0.05))
+        monitored_time = run(engine)
+        
+        print(f"\nDrift monitor (N=300, 200 steps): baseline={baseline_time*1000:.0f}ms, "
+              f"monitored={monitored_time*1000:.0f}ms, samples={len(monitor)}, "
+              f"interval={monitor.sample_interval}")
+        
+        assert len(monitor) > 1
+        assert monitored_time < 1.5 * baseline_time
+    
+    def test_ensemble_batch_speedup(self):
+        """アンサンブルの一括積分がメンバーごとの積分より高速であることを確認"""
+        bodies = _random_bodies(10)
+        positions = np.array([body.position for body in bodies])
+        velocities = np.array([body.velocity for body in bodies])
+        masses = np.array([body.mass for body in bodies])
+        members, steps = 256, 20
+        ensemble_positions, ensemble_velocities = perturb_initial_conditions(
+            positions, velocities, members, position_sigma=1e3, velocity_sigma=1e-3, seed=0
+        )
+        
+        engine = PhysicsEngine()
+        start = time.perf_counter()
+        for member in range(members):
+            state = (ensemble_positions[member], ensemble_velocities[member])
+            for _ in range(steps):
+                state = engine.integrate_rk4_arrays(state[0], state[1], masses, 3600.0)
+        serial_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        state = (ensemble_positions, ensemble_velocities)
+        for _ in range(steps):
+            state = engine.integrate_ensemble_arrays(state[0], state[1], masses, 3600.0)
+        batch_time = time.perf_counter() - start
+        
+        print(f"\nEnsemble RK4 (M={members}, N=10, {steps} steps): serial={serial_time*1000:.0f}ms, "
+              f"batched={batch_time*1000:.0f}ms, speedup={serial_time / batch_time:.1f}x")
+        
+        assert batch_time * 3 < serial_time
\ No newline at end of file
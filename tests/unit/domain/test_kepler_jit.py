@@ -0,0 +1,111 @@
+"""
+ケプラー運動カーネルのJITバックエンドのテスト
+"""
+
+import pytest
+import numpy as np
+from src.domain import kepler_jit
+from src.domain.kepler import solve_kepler_equation_scalar, solve_kepler_equation_array
+from src.domain.orbital_elements import OrbitalElements
+from src.domain.orbital_elements_table import OrbitalElementsTable
+
+
+class StubConfigManager:
+    """設定管理のスタブ"""
+    
+    def __init__(self, values):
+        self.values = values
+    
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+@pytest.fixture(autouse=True)
+def reset_backend():
+    """テストの前後でJITバックエンドを無効にする"""
+    kepler_jit.configure_jit_backend(False)
+    yield
+    kepler_jit.configure_jit_backend(False)
+
+
+def _random_elements(count, seed=7):
+    """テスト用の軌道要素をランダムに生成"""
+    rng = np.random.default_rng(seed)
+    return [
+        OrbitalElements(
+            semi_major_axis=rng.uniform(0.4, 40.0),
+            eccentricity=rng.uniform(0.0, 0.97),
+            inclination=rng.uniform(0.0, 30.0),
+            longitude_of_ascending_node=rng.uniform(0.0, 360.0),
+            argument_of_perihelion=rng.uniform(0.0, 360.0),
+            mean_anomaly_at_epoch=rng.uniform(0.0, 360.0),
+            epoch=2451545.0
+        )
+        for _ in range(count)
+    ]
+
+
+class TestKeplerJitBackend:
+    """JITバックエンドのテスト"""
+    
+    def test_disable(self):
+        """無効化のテスト"""
+        assert kepler_jit.configure_jit_backend(False) is False
+        assert not kepler_jit.is_jit_enabled()
+    
+    def test_fallback_without_numba(self, monkeypatch):
+        """numbaが無い場合はNumPy実装にフォールバックすることのテスト"""
+        monkeypatch.setattr(kepler_jit, 'NUMBA_AVAILABLE', False)
+        
+        assert kepler_jit.configure_jit_backend(True) is False
+        assert not kepler_jit.is_jit_enabled()
+        
+        E, iterations, converged = solve_kepler_equation_scalar(1.0, 0.5)
+        assert converged
+        assert abs(E - 0.5 * np.sin(E) - 1.0) < 1e-12
+    
+    def test_configure_from_config(self):
+        """設定からの構成テスト"""
+        pytest.importorskip("numba")
+        
+        config = StubConfigManager({
+            "performance.gpu_acceleration": True,
+            "performance.multi_threading": False
+        })
+        assert kepler_jit.configure_jit_backend_from_config(config) is True
+        assert kepler_jit.is_jit_enabled()
+        
+        config.values["performance.gpu_acceleration"] = False
+        assert kepler_jit.configure_jit_backend_from_config(config) is False
+    
+    def test_scalar_kernel_matches_numpy(self):
+        """スカラーカーネルがNumPy実装と一致することのテスト"""
+        pytest.importorskip("numba")
+        
+        cases = [(0.1, 0.0167), (3.0, 0.2056), (0.01, 0.967), (6.2, 0.99)]
+        expected = [solve_kepler_equation_scalar(M, e) for M, e in cases]
+        
+        kepler_jit.configure_jit_backend(True)
+        for (M, e), (E_expected, iterations_expected, _) in zip(cases, expected):
+            E, iterations, converged = solve_kepler_equation_scalar(M, e)
+            assert converged
+            assert iterations == iterations_expected
+            assert abs(E - E_expected) < 1e-14
+    
+    @pytest.mark.parametrize("parallel", [False, True])
+    def test_table_propagation_matches_numpy(self, parallel):
+        """一括伝播カーネルがNumPy実装と一致することのテスト"""
+        pytest.importorskip("numba")
+        
+        elements_list = _random_elements(200)
+        expected = OrbitalElementsTable.from_elements(elements_list).compute_positions(2451800.5).copy()
+        expected_E, _ = solve_kepler_equation_array(np.array([1.0, 2.0]), np.array([0.3, 0.9]))
+        
+        kepler_jit.configure_jit_backend(True, parallel=parallel)
+        table = OrbitalElementsTable.from_elements(elements_list)
+        positions = table.compute_positions(2451800.5)
+        E, _ = solve_kepler_equation_array(np.array([1.0, 2.0]), np.array([0.3, 0.9]))
+        
+        np.testing.assert_allclose(positions, expected, rtol=1e-12, atol=1e-6)
+        np.testing.assert_allclose(E, expected_E, rtol=0, atol=1e-14)
+        assert table.last_kepler_iterations > 0
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+試験粒子群クラスのテスト
+"""
+
+import pytest
+import numpy as np
+from src.domain.massless_particles import MasslessParticleSet
+
+
+class TestMasslessParticleSet:
+    """試験粒子群のテスト"""
+    
+    def test_add_particles_across_chunks(self):
+        """チャンクをまたいだ追加のテスト"""
+        particles = MasslessParticleSet(chunk_size=4)
+        positions = np.arange(30, dtype=np.float64).reshape(10, 3)
+        velocities = -positions
+        
+        ids = particles.add_particles(positions[:3], velocities[:3])
+        ids = np.concatenate([ids, particles.add_particles(positions[3:], velocities[3:])])
+        
+        assert len(particles) == 10
+        assert particles.chunk_count == 3
+        assert [chunk.count for chunk in particles.chunks()] == [4, 4, 2]
+        np.testing.assert_array_equal(ids, np.arange(10))
+        np.testing.assert_array_equal(particles.get_positions(), positions)
+        np.testing.assert_array_equal(particles.get_velocities(), velocities)
+        np.testing.assert_array_equal(particles.get_ids(), ids)
+    
+    def test_chunk_views_are_stable(self):
+        """追加してもチャンクの配列が再確保されないことのテスト"""
+        particles = MasslessParticleSet(chunk_size=4)
+        particles.add_particles(np.zeros((2, 3)), np.zeros((2, 3)))
+        first_chunk = next(particles.chunks())
+        buffer = first_chunk._positions
+        
+        particles.add_particles(np.ones((5, 3)), np.ones((5, 3)))
+        
+        assert first_chunk._positions is buffer
+        assert first_chunk.positions.base is buffer
+        assert first_chunk.positions.flags['C_CONTIGUOUS']
+        
+        # ビューへの書き込みが粒子群に反映される
+        first_chunk.positions[0] = [1.0, 2.0, 3.0]
+        np.testing.assert_array_equal(particles.get_positions()[0], [1.0, 2.0, 3.0])
+    
+    def test_invalid_input(self):
+        """不正な入力のテスト"""
+        particles = MasslessParticleSet()
+        with pytest.raises(ValueError):
+            particles.add_particles(np.zeros((3, 3)), np.zeros((2, 3)))
+        with pytest.raises(ValueError):
+            MasslessParticleSet(chunk_size=0)
+    
+    def test_clear(self):
+        """全粒子の削除テスト"""
+        particles = MasslessParticleSet()
+        particles.add_particles(np.zeros((3, 3)), np.zeros((3, 3)))
+        particles.clear()
+        
+        assert len(particles) == 0
+        assert particles.get_positions().shape == (0, 3)
+        assert "0個" in str(particles)
\ No newline at end of file
@@ -148,4 +148,37 @@ class TestOrbitalElements:
         elements = OrbitalElements.from_dict(sample_orbital_elements)
         
         assert elements.semi_major_axis == sample_orbital_elements["semi_major_axis"]
-        assert elements.eccentricity == sample_orbital_elements["eccentricity"]
\ No newline at end of file
+        assert elements.eccentricity == sample_orbital_elements["eccentricity"]
+    
+    def test_derived_quantities_are_cached(self, sample_orbital_elements):
+        """派生量が初回参照時に計算・保持されるかのテスト"""
+        elements = OrbitalElements(**sample_orbital_elements)
+        
+        rotation = elements.rotation_matrix
+        assert rotation.shape == (3, 3)
+        assert elements.rotation_matrix is rotation
+        assert not rotation.flags.writeable
+        
+        # 回転行列は直交行列
+        assert np.allclose(rotation @ rotation.T, np.eye(3), atol=1e-12)
+        
+        assert elements.mean_motion == pytest.approx(2 * np.pi / elements.get_orbital_period())
+        assert elements.semi_latus_rectum == pytest.approx(
+            elements.semi_major_axis * (1 - elements.eccentricity**2)
+        )
+    
+    def test_derived_quantities_invalidated_on_assignment(self, sample_orbital_elements):
+        """フィールド代入時に派生量が再計算されるかのテスト"""
+        elements = OrbitalElements(**sample_orbital_elements)
+        
+        rotation = elements.rotation_matrix
+        mean_motion = elements.mean_motion
+        revision = elements.revision
+        
+        elements.inclination = 45.0
+        elements.semi_major_axis = 4.0
+        
+        assert elements.revision > revision
+        assert elements.rotation_matrix is not rotation
+        assert elements.rotation_matrix[2, 2] == pytest.approx(np.cos(np.radians(45.0)))
+        assert elements.mean_motion < mean_motion
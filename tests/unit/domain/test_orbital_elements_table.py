@@ -0,0 +1,131 @@
+"""
+軌道要素テーブルのテスト
+"""
+
+import pytest
+import numpy as np
+from src.domain.orbital_elements import OrbitalElements
+from src.domain.orbital_elements_table import OrbitalElementsTable
+from src.domain.planet import Planet
+
+
+class TestOrbitalElementsTable:
+    """軌道要素テーブルのテスト"""
+    
+    @pytest.fixture
+    def elements_list(self, sample_orbital_elements, mars_data):
+        """テスト用の軌道要素リスト"""
+        return [
+            OrbitalElements(**sample_orbital_elements),
+            OrbitalElements(**mars_data["orbital_elements"]),
+            OrbitalElements(
+                semi_major_axis=2.77,
+                eccentricity=0.6,
+                inclination=34.8,
+                longitude_of_ascending_node=173.1,
+                argument_of_perihelion=310.0,
+                mean_anomaly_at_epoch=200.0,
+                epoch=2451000.5
+            )
+        ]
+    
+    def test_columns_are_contiguous(self, elements_list):
+        """列が連続したfloat64配列として保持されるかのテスト"""
+        table = OrbitalElementsTable.from_elements(elements_list)
+        
+        assert len(table) == 3
+        for name in OrbitalElementsTable.COLUMNS:
+            column = table.column(name)
+            assert column.dtype == np.float64
+            assert column.flags['C_CONTIGUOUS']
+            assert column.shape == (3,)
+        
+        assert table.column('eccentricity')[1] == elements_list[1].eccentricity
+        assert table.get_elements(2) == elements_list[2]
+        assert table.as_array().shape == (3, 7)
+    
+    def test_growth_preserves_rows(self, elements_list):
+        """容量拡張後も既存行が保持されるかのテスト"""
+        table = OrbitalElementsTable(capacity=1)
+        generation = table.buffer_generation
+        
+        for elements in elements_list:
+            table.append(elements)
+        
+        assert table.buffer_generation > generation
+        for row, elements in enumerate(elements_list):
+            assert table.get_elements(row) == elements
+    
+    def test_compute_positions_matches_planet(self, elements_list, j2000_epoch):
+        """一括計算がPlanet.update_positionと一致するかのテスト"""
+        table = OrbitalElementsTable.from_elements(elements_list)
+        julian_date = j2000_epoch + 1234.5
+        
+        positions = table.compute_positions(julian_date)
+        
+        assert positions.shape == (3, 3)
+        for row, elements in enumerate(elements_list):
+            planet = Planet("テスト", 1e23, 1000.0, elements, (1.0, 1.0, 1.0))
+            planet.update_position(julian_date)
+            assert np.allclose(positions[row], planet.position, rtol=0, atol=1e-3)
+    
+    def test_invalid_row_access(self, elements_list):
+        """範囲外アクセスのテスト"""
+        table = OrbitalElementsTable.from_elements(elements_list)
+        
+        with pytest.raises(IndexError):
+            table.get_elements(3)
+        with pytest.raises(IndexError):
+            table.position_view(-1)
+        with pytest.raises(KeyError):
+            table.column("unknown")
+    
+    def test_compute_positions_warm_start(self):
+        """ケプラー方程式のウォームスタートのテスト"""
+        elements = OrbitalElements(0.387, 0.2056, 7.0, 48.3, 29.1, 174.8, 2451545.0)
+        table = OrbitalElementsTable.from_elements([elements])
+        
+        table.compute_positions(2451545.0)
+        cold_iterations = table.last_kepler_iterations
+        
+        positions = table.compute_positions(2451545.01).copy()
+        assert table.last_kepler_iterations < cold_iterations
+        
+        fresh = OrbitalElementsTable.from_elements([elements])
+        np.testing.assert_allclose(positions, fresh.compute_positions(2451545.01), rtol=0, atol=1e-6)
+    
+    def test_compute_positions_after_large_time_jump(self):
+        """大きく時刻を戻した場合もウォームスタートで正しく収束することのテスト"""
+        rng = np.random.default_rng(3)
+        elements_list = [
+            OrbitalElements(rng.uniform(0.5, 30.0), rng.uniform(0.8, 0.97),
+                            rng.uniform(0.0, 30.0), rng.uniform(0.0, 360.0),
+                            rng.uniform(0.0, 360.0), rng.uniform(0.0, 360.0), 2451545.0)
+            for _ in range(2000)
+        ]
+        table = OrbitalElementsTable.from_elements(elements_list)
+        
+        table.compute_positions(2451590.0)
+        positions = table.compute_positions(2451545.0).copy()
+        
+        fresh = OrbitalElementsTable.from_elements(elements_list)
+        np.testing.assert_allclose(positions, fresh.compute_positions(2451545.0), rtol=0, atol=1e-3)
+    
+    def test_sync_rows_detects_edited_and_replaced_elements(self, elements_list):
+        """軌道要素の書き換え・差し替えを検出して行を書き込み直すかのテスト"""
+        table = OrbitalElementsTable.from_elements(elements_list)
+        version = table.version
+        
+        assert table.sync_rows(elements_list) == 0
+        assert table.version == version
+        
+        # その場での書き換え
+        elements_list[0].semi_major_axis = 2.0
+        # オブジェクトの差し替え
+        elements_list[2] = OrbitalElements(**{**elements_list[1].to_dict(), 'eccentricity': 0.3})
+        
+        assert table.sync_rows(elements_list) == 2
+        assert table.version > version
+        assert table.column('semi_major_axis')[0] == 2.0
+        assert table.get_elements(2) == elements_list[2]
+        assert table.sync_rows(elements_list) == 0
\ No newline at end of file
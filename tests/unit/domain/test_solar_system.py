@@ -369,4 +369,227 @@ class TestSolarSystem:
         
         assert len(restored_solar_system.planets) == 2
         assert "水星" in restored_solar_system.planets
-        assert "金星" in restored_solar_system.planets
\ No newline at end of file
+        assert "金星" in restored_solar_system.planets
+    
+    def test_planet_positions_are_table_views(self, test_solar_system_data, j2000_epoch):
+        """惑星の位置が軌道要素テーブルの位置配列のビューであるかのテスト"""
+        solar_system = SolarSystem()
+        
+        planets = []
+        for planet_data in test_solar_system_data["planets"]:
+            orbital_elements = OrbitalElements(**planet_data["orbital_elements"])
+            planet = Planet(
+                name=planet_data["name"],
+                mass=planet_data["mass"],
+                radius=planet_data["radius"],
+                orbital_elements=orbital_elements,
+                color=planet_data["color"]
+            )
+            solar_system.add_celestial_body(planet)
+            planets.append(planet)
+        
+        solar_system.update_all_positions(j2000_epoch + 50.0)
+        
+        positions = solar_system.elements_table.positions
+        assert positions.shape == (len(planets), 3)
+        for row, planet in enumerate(planets):
+            assert np.shares_memory(planet.position, positions)
+            assert np.array_equal(planet.position, positions[row])
+            assert planet.current_julian_date == j2000_epoch + 50.0
+            
+            # 個別計算の結果と一致すること
+            expected = planet.position.copy()
+            planet.update_position(j2000_epoch + 50.0)
+            assert np.allclose(planet.position, expected, rtol=0, atol=1e-3)
+    
+    def test_update_after_direct_planet_insertion(self, earth_data, j2000_epoch):
+        """planets辞書を直接変更した場合もテーブルが再構築されるかのテスト"""
+        solar_system = SolarSystem()
+        
+        orbital_elements = OrbitalElements(**earth_data["orbital_elements"])
+        earth = Planet(
+            name=earth_data["name"],
+            mass=earth_data["mass"],
+            radius=earth_data["radius"],
+            orbital_elements=orbital_elements,
+            color=earth_data["color"]
+        )
+        solar_system.planets[earth.name] = earth
+        
+        solar_system.update_all_positions(j2000_epoch)
+        
+        assert len(solar_system.elements_table) == 1
+        assert np.linalg.norm(earth.position) > 1e8
+    
+    def test_repeated_update_is_skipped(self, earth_data, j2000_epoch, mocker):
+        """同じユリウス日の再計算が省略されるかのテスト"""
+        solar_system = SolarSystem()
+        earth = Planet(
+            name=earth_data["name"],
+            mass=earth_data["mass"],
+            radius=earth_data["radius"],
+            orbital_elements=OrbitalElements(**earth_data["orbital_elements"]),
+            color=earth_data["color"]
+        )
+        solar_system.add_celestial_body(earth)
+        compute = mocker.spy(solar_system.elements_table, 'compute_positions')
+        
+        solar_system.update_all_positions(j2000_epoch)
+        solar_system.update_all_positions(j2000_epoch)
+        solar_system.update_all_positions(j2000_epoch)
+        
+        assert compute.call_count == 1
+        assert solar_system.skipped_update_count == 2
+        
+        # 時刻が変われば再計算
+        solar_system.update_all_positions(j2000_epoch + 1.0)
+        assert compute.call_count == 2
+        assert solar_system.skipped_update_count == 2
+    
+    def test_elements_change_invalidates_positions(self, earth_data, j2000_epoch):
+        """軌道要素の変更・無効化で再計算されるかのテスト"""
+        solar_system = SolarSystem()
+        earth = Planet(
+            name=earth_data["name"],
+            mass=earth_data["mass"],
+            radius=earth_data["radius"],
+            orbital_elements=OrbitalElements(**earth_data["orbital_elements"]),
+            color=earth_data["color"]
+        )
+        solar_system.add_celestial_body(earth)
+        solar_system.update_all_positions(j2000_epoch)
+        original = earth.position.copy()
+        
+        # 惑星の軌道要素を書き換えると行が書き込み直され、版が変わり再計算される
+        earth.orbital_elements.semi_major_axis *= 2
+        solar_system.update_all_positions(j2000_epoch)
+        assert np.allclose(earth.position, original * 2, rtol=1e-6)
+        
+        # 外部から位置を書き換えた場合は無効化フックで再計算
+        earth.position[:] = 0.0
+        solar_system.update_all_positions(j2000_epoch)
+        assert np.all(earth.position == 0.0)
+        solar_system.invalidate_positions()
+        solar_system.update_all_positions(j2000_epoch)
+        assert np.allclose(earth.position, original * 2, rtol=1e-6)
+        assert solar_system.skipped_update_count == 1
+    
+    def test_edited_planet_elements_are_used(self, earth_data, j2000_epoch):
+        """惑星の軌道要素を書き換え・差し替えた後の位置がPlanetの計算と一致するかのテスト"""
+        solar_system = SolarSystem()
+        earth = Planet(
+            name=earth_data["name"],
+            mass=earth_data["mass"],
+            radius=earth_data["radius"],
+            orbital_elements=OrbitalElements(**earth_data["orbital_elements"]),
+            color=earth_data["color"]
+        )
+        reference = Planet(
+            name=earth_data["name"],
+            mass=earth_data["mass"],
+            radius=earth_data["radius"],
+            orbital_elements=OrbitalElements(**earth_data["orbital_elements"]),
+            color=earth_data["color"]
+        )
+        solar_system.add_celestial_body(earth)
+        solar_system.update_all_positions(j2000_epoch)
+        
+        # その場での書き換え
+        earth.orbital_elements.semi_major_axis = 2.0
+        reference.orbital_elements.semi_major_axis = 2.0
+        solar_system.update_all_positions(j2000_epoch + 10.0)
+        reference.update_position(j2000_epoch + 10.0)
+        assert np.linalg.norm(earth.position) > 1.9 * 1.495978707e8
+        np.testing.assert_allclose(earth.position, reference.position, rtol=1e-9)
+        
+        # オブジェクトの差し替え
+        replaced = OrbitalElements(**{**earth_data["orbital_elements"], "semi_major_axis": 3.0})
+        earth.orbital_elements = replaced
+        reference.orbital_elements = OrbitalElements(**replaced.to_dict())
+        solar_system.update_all_positions(j2000_epoch + 20.0)
+        reference.update_position(j2000_epoch + 20.0)
+        np.testing.assert_allclose(earth.position, reference.position, rtol=1e-9)
+    
+    def test_same_date_update_after_elements_edit(self, earth_data, j2000_epoch):
+        """同じユリウス日でも軌道要素を書き換えた後は再計算されるかのテスト"""
+        solar_system = SolarSystem()
+        earth = Planet(
+            name=earth_data["name"],
+            mass=earth_data["mass"],
+            radius=earth_data["radius"],
+            orbital_elements=OrbitalElements(**earth_data["orbital_elements"]),
+            color=earth_data["color"]
+        )
+        solar_system.add_celestial_body(earth)
+        solar_system.update_all_positions(j2000_epoch)
+        original = earth.position.copy()
+        
+        earth.orbital_elements.semi_major_axis *= 2
+        solar_system.update_all_positions(j2000_epoch)
+        assert solar_system.skipped_update_count == 0
+        assert np.allclose(earth.position, original * 2, rtol=1e-6)
+        
+        # 無効化フックでもテーブルの行が書き込み直される
+        earth.orbital_elements.semi_major_axis *= 2
+        solar_system.invalidate_positions()
+        assert solar_system.elements_table.column('semi_major_axis')[0] == earth.orbital_elements.semi_major_axis
+        solar_system.update_all_positions(j2000_epoch)
+        assert np.allclose(earth.position, original * 4, rtol=1e-6)
+        
+        solar_system.update_all_positions(j2000_epoch)
+        assert solar_system.skipped_update_count == 1
+    
+    def test_positions_from_attached_ephemeris(self, earth_data, j2000_epoch):
+        """暦の範囲内では暦の位置を使い、範囲外・軌道要素の変更後は軌道要素から計算するかのテスト"""
+        from src.simulation.ephemeris_cache import EphemerisCompiler
+        from src.simulation.orbit_calculator import OrbitCalculator
+        
+        solar_system = SolarSystem()
+        earth = Planet(
+            name=earth_data["name"],
+            mass=earth_data["mass"],
+            radius=earth_data["radius"],
+            orbital_elements=OrbitalElements(**earth_data["orbital_elements"]),
+            color=earth_data["color"]
+        )
+        solar_system.add_celestial_body(earth)
+        ephemeris = EphemerisCompiler(segment_days=8.0, degree=12).compile_from_elements(
+            OrbitCalculator(), {earth.name: earth.orbital_elements}, j2000_epoch, j2000_epoch + 100.0
+        )
+        solar_system.attach_ephemeris(ephemeris)
+        
+        solar_system.update_all_positions(j2000_epoch + 50.5)
+        np.testing.assert_array_equal(earth.position, ephemeris.get_position(earth.name, j2000_epoch + 50.5))
+        kepler = Planet.from_dict(earth.to_dict())
+        kepler.update_position(j2000_epoch + 50.5)
+        assert np.linalg.norm(earth.position - kepler.position) < 1e-3 * np.linalg.norm(kepler.position)
+        
+        # 範囲外は軌道要素から計算
+        solar_system.update_all_positions(j2000_epoch + 200.0)
+        kepler.update_position(j2000_epoch + 200.0)
+        np.testing.assert_allclose(earth.position, kepler.position, rtol=1e-12)
+        
+        # 軌道要素を変更した後は古い暦を使わない
+        earth.orbital_elements.semi_major_axis *= 2
+        solar_system.update_all_positions(j2000_epoch + 50.5)
+        kepler = Planet.from_dict(earth.to_dict())
+        kepler.update_position(j2000_epoch + 50.5)
+        np.testing.assert_allclose(earth.position, kepler.position, rtol=1e-12)
+        
+        solar_system.attach_ephemeris(None)
+        assert solar_system.ephemeris is None
+    
+    def test_test_particles(self):
+        """試験粒子の追加とクリアのテスト"""
+        solar_system = SolarSystem()
+        
+        ids = solar_system.add_test_particles(np.ones((100, 3)) * 4e8, np.zeros((100, 3)))
+        
+        assert solar_system.get_test_particle_count() == 100
+        assert len(ids) == 100
+        # 試験粒子は天体として数えない
+        assert len(solar_system) == 0
+        assert len(solar_system.get_all_bodies()) == 0
+        
+        solar_system.clear()
+        assert solar_system.get_test_particle_count() == 0
@@ -0,0 +1,79 @@
+"""
+多体系の保存量の一括計算のテスト
+"""
+
+import pytest
+import numpy as np
+from src.domain.celestial_body import CelestialBody
+from src.domain.system_diagnostics import (
+    kinetic_energy_array, potential_energy_array, total_energy_array,
+    linear_momentum_array, angular_momentum_array, center_of_mass_array, pack_bodies
+)
+
+
+class _Body(CelestialBody):
+    """テスト用天体クラス"""
+    
+    def update_position(self, julian_date: float) -> None:
+        pass
+    
+    def get_visual_properties(self) -> dict:
+        return {}
+
+
+class TestSystemDiagnostics:
+    """保存量の一括計算のテスト"""
+    
+    @pytest.fixture
+    def bodies(self):
+        """ランダムな天体のリスト"""
+        rng = np.random.default_rng(9)
+        bodies = []
+        for i in range(40):
+            body = _Body(f"Body{i}", rng.uniform(1e20, 1e30), 1000.0)
+            body.position = rng.uniform(-1e9, 1e9, 3)
+            body.velocity = rng.uniform(-30.0, 30.0, 3)
+            bodies.append(body)
+        return bodies
+    
+    def test_matches_per_body_calculation(self, bodies):
+        """天体ごとの計算と一致することのテスト"""
+        positions, velocities, masses = pack_bodies(bodies)
+        
+        kinetic = sum(body.get_kinetic_energy() for body in bodies)
+        potential = 0.0
+        for i, body1 in enumerate(bodies):
+            for body2 in bodies[i+1:]:
+                potential -= 6.67430e-11 * body1.mass * body2.mass / (body1.distance_to(body2) * 1000)
+        momentum = sum(body.get_momentum() for body in bodies)
+        angular_momentum = sum(np.cross(body.position * 1000, body.get_momentum()) for body in bodies)
+        center = sum(body.mass * body.position for body in bodies) / masses.sum()
+        
+        assert kinetic_energy_array(velocities, masses) == pytest.approx(kinetic, rel=1e-12)
+        assert potential_energy_array(positions, masses) == pytest.approx(potential, rel=1e-12)
+        assert total_energy_array(positions, velocities, masses) == pytest.approx(kinetic + potential, rel=1e-12)
+        np.testing.assert_allclose(linear_momentum_array(velocities, masses), momentum, rtol=1e-12)
+        np.testing.assert_allclose(angular_momentum_array(positions, velocities, masses), angular_momentum, rtol=1e-12)
+        np.testing.assert_allclose(center_of_mass_array(positions, masses), center, rtol=1e-12)
+    
+    def test_blocked_potential(self, bodies, monkeypatch):
+        """行ブロックに分割してもポテンシャルエネルギーが変わらないことのテスト"""
+        from src.domain import system_diagnostics
+        positions, _, masses = pack_bodies(bodies)
+        expected = potential_energy_array(positions, masses)
+        
+        monkeypatch.setattr(system_diagnostics, 'POTENTIAL_BLOCK_PAIRS', 100)
+        
+        assert potential_energy_array(positions, masses) == pytest.approx(expected, rel=1e-12)
+    
+    def test_coincident_and_empty(self):
+        """同一位置の組と空の配列のテスト"""
+        positions = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+        masses = np.array([1.0, 1.0, 1.0])
+        
+        # 距離がゼロの組は除外される
+        assert potential_energy_array(positions, masses) == pytest.approx(-2 * 6.67430e-11 / 1000)
+        
+        empty_positions, empty_velocities, empty_masses = pack_bodies([])
+        assert total_energy_array(empty_positions, empty_velocities, empty_masses) == 0.0
+        np.testing.assert_array_equal(center_of_mass_array(empty_positions, empty_masses), np.zeros(3))
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+適応刻み幅積分器のテスト
+"""
+
+import pytest
+import numpy as np
+from src.simulation.physics_engine import PhysicsEngine
+from src.simulation.adaptive_integrator import DormandPrinceIntegrator
+
+
+class TestDormandPrinceIntegrator:
+    """Dormand–Prince 5(4) 積分器のテスト"""
+    
+    @pytest.fixture
+    def physics_engine(self):
+        """物理エンジンのフィクスチャ"""
+        return PhysicsEngine()
+    
+    @pytest.fixture
+    def eccentric_orbit(self):
+        """高離心率の2体系（太陽 + 試験天体）"""
+        positions = np.array([[0.0, 0.0, 0.0], [1.0e8, 0.0, 0.0]])
+        velocities = np.array([[0.0, 0.0, 0.0], [0.0, 50.0, 0.0]])
+        masses = np.array([1.989e30, 1.0])
+        return positions, velocities, masses
+    
+    def _kepler_reference(self, physics_engine, positions, velocities, masses, duration):
+        """ケプラー運動の厳密解（f・g関数）"""
+        mu = physics_engine.gravitational_constant * 1e-9 * masses[0]
+        return physics_engine._kepler_drift(positions[1:], velocities[1:], mu, duration)
+    
+    def test_matches_kepler_solution(self, physics_engine, eccentric_orbit):
+        """1周回後の位置がケプラー運動の厳密解と一致することのテスト"""
+        positions, velocities, masses = eccentric_orbit
+        duration = 200 * 86400.0
+        
+        new_positions, new_velocities, _ = physics_engine.integrate_adaptive(
+            positions, velocities, masses, duration
+        )
+        expected_positions, expected_velocities = self._kepler_reference(
+            physics_engine, positions, velocities, masses, duration
+        )
+        
+        np.testing.assert_allclose(new_positions[1], expected_positions[0], rtol=0, atol=10.0)
+        np.testing.assert_allclose(new_velocities[1], expected_velocities[0], rtol=0, atol=1e-6)
+    
+    def test_step_size_adapts_near_perihelion(self, physics_engine, eccentric_orbit):
+        """近日点付近で刻み幅が小さくなることのテスト"""
+        positions, velocities, masses = eccentric_orbit
+        
+        _, _, dense = physics_engine.integrate_adaptive(
+            positions, velocities, masses, 200 * 86400.0, dense_output=True
+        )
+        
+        step_sizes = np.array([step.t_end - step.t_start for step in dense.steps])
+        radii = np.array([
+            np.linalg.norm(dense.evaluate(step.t_start)[0][1]) for step in dense.steps
+        ])
+        
+        # 近日点付近（最小距離）のステップは遠日点付近より短い
+        assert step_sizes[np.argmin(radii)] < 0.2 * step_sizes[np.argmax(radii)]
+    
+    def test_dense_output_interpolation(self, physics_engine, eccentric_orbit):
+        """密出力が任意時刻で厳密解と一致することのテスト"""
+        positions, velocities, masses = eccentric_orbit
+        duration = 100 * 86400.0
+        
+        _, _, dense = physics_engine.integrate_adaptive(
+            positions, velocities, masses, duration, dense_output=True
+        )
+        evaluations = physics_engine.adaptive_integrator.force_evaluations
+        
+        for t in np.linspace(0.0, duration, 37):
+            interpolated_positions, interpolated_velocities = dense.evaluate(t)
+            expected_positions, expected_velocities = self._kepler_reference(
+                physics_engine, positions, velocities, masses, t
+            ) if t > 0 else (positions[1:], velocities[1:])
+            
+            np.testing.assert_allclose(interpolated_positions[1], expected_positions[0], rtol=0, atol=50.0)
+            np.testing.assert_allclose(interpolated_velocities[1], expected_velocities[0], rtol=0, atol=1e-5)
+        
+        # 補間で加速度計算は行われない
+        assert physics_engine.adaptive_integrator.force_evaluations == evaluations
+        
+        with pytest.raises(ValueError, match="範囲外"):
+            dense.evaluate(duration + 1.0)
+    
+    def test_backward_integration(self, physics_engine, eccentric_orbit):
+        """過去向きの積分で初期状態に戻ることのテスト"""
+        positions, velocities, masses = eccentric_orbit
+        
+        forward_positions, forward_velocities, _ = physics_engine.integrate_adaptive(
+            positions, velocities, masses, 50 * 86400.0
+        )
+        back_positions, _, dense = physics_engine.integrate_adaptive(
+            forward_positions, forward_velocities, masses, -50 * 86400.0, dense_output=True
+        )
+        
+        np.testing.assert_allclose(back_positions, positions, rtol=0, atol=10.0)
+        np.testing.assert_allclose(dense.evaluate(-50 * 86400.0)[0], positions, rtol=0, atol=10.0)
+    
+    def test_integration_method_dopri5(self, physics_engine, eccentric_orbit):
+        """積分法 "dopri5" でdtが積分区間として扱われることのテスト"""
+        positions, velocities, masses = eccentric_orbit
+        physics_engine.set_integration_method("dopri5")
+        
+        new_positions, _ = physics_engine.integrate_arrays(positions, velocities, masses, 30 * 86400.0)
+        
+        stats = physics_engine.adaptive_integrator.get_stats()
+        assert stats['accepted_steps'] > 1
+        assert stats['force_evaluations'] == 6 * (stats['accepted_steps'] + stats['rejected_steps']) + 1
+        expected_positions, _ = self._kepler_reference(
+            physics_engine, positions, velocities, masses, 30 * 86400.0
+        )
+        np.testing.assert_allclose(new_positions[1], expected_positions[0], rtol=0, atol=10.0)
+    
+    def test_step_size_carried_over(self, physics_engine, eccentric_orbit):
+        """刻み幅が次回の積分に引き継がれることのテスト"""
+        positions, velocities, masses = eccentric_orbit
+        integrator = DormandPrinceIntegrator(physics_engine)
+        
+        integrator.integrate(positions, velocities, masses, 10 * 86400.0)
+        first_evaluations = integrator.force_evaluations
+        assert integrator.step_size is not None
+        
+        # 初期刻み幅からの立ち上がりが不要なぶん加速度計算が減る
+        integrator.integrate(positions, velocities, masses, 10 * 86400.0)
+        assert integrator.force_evaluations - first_evaluations < first_evaluations
\ No newline at end of file
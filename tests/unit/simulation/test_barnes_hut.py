@@ -0,0 +1,127 @@
+"""
+Barnes–Hut 八分木重力ソルバーのテスト
+"""
+
+import pytest
+import numpy as np
+from src.simulation.barnes_hut import BarnesHutTree
+from src.simulation.physics_engine import PhysicsEngine
+
+
+class TestBarnesHutTree:
+    """Barnes–Hut 八分木のテスト"""
+    
+    @pytest.fixture
+    def physics_engine(self):
+        """物理エンジンのフィクスチャ"""
+        return PhysicsEngine()
+    
+    @pytest.fixture
+    def cluster(self):
+        """ランダムな粒子群 (位置 km, 質量 kg)"""
+        rng = np.random.default_rng(7)
+        positions = rng.normal(0.0, 1e8, (2000, 3))
+        masses = rng.uniform(1e20, 1e22, 2000)
+        return positions, masses
+    
+    def test_zero_opening_angle_matches_direct(self, physics_engine, cluster):
+        """開口角0で直接和と一致することのテスト"""
+        positions, masses = cluster
+        expected = physics_engine.calculate_accelerations(positions, masses)
+        
+        physics_engine.set_gravity_solver("barnes_hut", opening_angle=0.0)
+        accelerations = physics_engine.calculate_accelerations(positions, masses)
+        
+        np.testing.assert_allclose(accelerations, expected, rtol=1e-10)
+        assert physics_engine.barnes_hut_tree.multipole_interactions == 0
+    
+    def test_accuracy_and_interaction_count(self, physics_engine, cluster):
+        """開口角0.5での精度と相互作用数の削減のテスト"""
+        positions, masses = cluster
+        expected = physics_engine.calculate_accelerations(positions, masses)
+        
+        physics_engine.set_gravity_solver("barnes_hut", opening_angle=0.5)
+        accelerations = physics_engine.calculate_accelerations(positions, masses)
+        
+        relative_error = (np.linalg.norm(accelerations - expected, axis=1) /
+                          np.linalg.norm(expected, axis=1))
+        assert np.median(relative_error) < 5e-3
+        assert np.max(relative_error) < 5e-2
+        
+        stats = physics_engine.barnes_hut_tree.get_stats()
+        assert stats['multipole_interactions'] + stats['direct_interactions'] < 0.5 * 2000 ** 2
+        assert stats['leaf_count'] > 2000 // 16
+    
+    def test_large_opening_angle_accuracy(self, physics_engine):
+        """開口角1.0でもバケットを含むノードを単極子近似せず、直接和に近いことのテスト"""
+        rng = np.random.default_rng(3)
+        # 質量中心から離れた隅の、互いの引力が支配的な小さな粒子群
+        positions = np.vstack([rng.normal(0.0, 1e6, (200, 3)), 1e8 + rng.normal(0.0, 1e4, (10, 3))])
+        masses = np.concatenate([np.full(200, 1e24), np.full(10, 1e21)])
+        expected = physics_engine.calculate_accelerations(positions, masses)
+        
+        physics_engine.set_gravity_solver("barnes_hut", opening_angle=1.0)
+        accelerations = physics_engine.calculate_accelerations(positions, masses)
+        
+        relative_error = (np.linalg.norm(accelerations - expected, axis=1) /
+                          np.linalg.norm(expected, axis=1))
+        assert np.median(relative_error) < 2e-2
+        assert np.max(relative_error[200:]) < 1e-6
+    
+    def test_incremental_rebuild(self, physics_engine, cluster):
+        """粒子が境界立方体内で動いた場合に差分再構築されることのテスト"""
+        positions, masses = cluster
+        tree = BarnesHutTree(opening_angle=0.0)
+        gm = masses * 6.67430e-20
+        
+        tree.calculate_accelerations(positions, gm)
+        moved = positions * 0.999
+        accelerations = tree.calculate_accelerations(moved, gm)
+        
+        assert tree.incremental_builds == 1
+        np.testing.assert_allclose(
+            accelerations, physics_engine.calculate_accelerations(moved, masses), rtol=1e-10
+        )
+        
+        # 境界立方体の外へ出た場合は作り直す
+        tree.calculate_accelerations(positions * 2.0, gm)
+        assert tree.incremental_builds == 1
+        assert tree.build_count == 3
+    
+    def test_massless_particles(self, physics_engine, cluster):
+        """質量ゼロの粒子は力を受けるが及ぼさないことのテスト"""
+        positions, masses = cluster
+        masses = masses.copy()
+        masses[1000:] = 0.0
+        physics_engine.set_gravity_solver("barnes_hut", opening_angle=0.0)
+        
+        accelerations = physics_engine.calculate_accelerations(positions, masses)
+        massive_only = physics_engine.calculate_accelerations(positions[:1000], masses[:1000])
+        
+        np.testing.assert_allclose(accelerations[:1000], massive_only, rtol=1e-10)
+        assert np.all(np.linalg.norm(accelerations[1000:], axis=1) > 0)
+    
+    def test_coincident_particles(self, physics_engine):
+        """軟化なしで同一位置の粒子がある場合のエラーテスト"""
+        positions = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [1e6, 0.0, 0.0]])
+        masses = np.array([1e24, 1e24, 1e24])
+        physics_engine.set_gravity_solver("barnes_hut")
+        
+        with pytest.raises(ValueError, match="距離がゼロ"):
+            physics_engine.calculate_accelerations(positions, masses)
+        
+        accelerations = physics_engine.calculate_accelerations(positions, masses, softening_length=1e3)
+        assert np.all(np.isfinite(accelerations))
+    
+    def test_invalid_settings(self, physics_engine):
+        """無効な設定のテスト"""
+        with pytest.raises(ValueError):
+            physics_engine.set_gravity_solver("fmm")
+        with pytest.raises(ValueError):
+            BarnesHutTree(opening_angle=-0.1)
+        with pytest.raises(ValueError):
+            BarnesHutTree(leaf_size=0)
+        
+        physics_engine.set_gravity_solver("barnes_hut", leaf_size=8)
+        assert physics_engine.barnes_hut_tree.leaf_size == 8
+        assert physics_engine.barnes_hut_tree.opening_angle == 0.5
\ No newline at end of file
@@ -0,0 +1,231 @@
+"""
+積分状態のチェックポイントのテスト
+"""
+
+import pytest
+import numpy as np
+from src.domain.massless_particles import MasslessParticleSet
+from src.domain.orbital_elements import OrbitalElements
+from src.domain.planet import Planet
+from src.domain.solar_system import SolarSystem
+from src.domain.sun import Sun
+from src.simulation.checkpoint import (
+    AutoCheckpointer, find_latest_checkpoint, load_checkpoint,
+    save_checkpoint, save_solar_system_checkpoint
+)
+from src.simulation.physics_engine import PhysicsEngine
+
+
+@pytest.fixture
+def three_body():
+    """太陽・地球・木星の3体系"""
+    positions = np.array([[0.0, 0.0, 0.0],
+                          [149597870.7, 0.0, 0.0],
+                          [0.0, 778.5e6, 0.0]])
+    velocities = np.array([[0.0, 0.0, 0.0],
+                           [0.0, 29.78, 0.0],
+                           [-13.07, 0.0, 0.0]])
+    masses = np.array([1.989e30, 5.972e24, 1.898e27])
+    return positions, velocities, masses
+
+
+def _run(engine, positions, velocities, masses, steps, particles=None):
+    """指定ステップ数だけ積分（試験粒子も同時に積分）"""
+    for _ in range(steps):
+        new_positions, velocities = engine.integrate_arrays(positions, velocities, masses, 86400.0)
+        if particles is not None:
+            engine.integrate_test_particles(particles, positions, new_positions, masses, 86400.0)
+        positions = new_positions
+    return positions, velocities
+
+
+class TestCheckpoint:
+    """チェックポイントの保存と再開のテスト"""
+    
+    @pytest.mark.parametrize("method", ["rk4", "leapfrog", "wisdom_holman", "dopri5"])
+    def test_bit_exact_resume(self, tmp_path, three_body, method):
+        """再開した積分が中断しなかった場合とビット単位で一致することのテスト"""
+        positions, velocities, masses = three_body
+        
+        reference = PhysicsEngine()
+        reference.set_integration_method(method)
+        expected = _run(reference, positions, velocities, masses, 20)
+        
+        engine = PhysicsEngine()
+        engine.set_integration_method(method)
+        half = _run(engine, positions, velocities, masses, 10)
+        path = save_checkpoint(tmp_path / "run.npz", engine, half[0], half[1], masses,
+                               2451555.0, step=10)
+        
+        checkpoint = load_checkpoint(path)
+        resumed = PhysicsEngine()
+        checkpoint.restore_engine(resumed)
+        result = _run(resumed, checkpoint.positions, checkpoint.velocities, checkpoint.masses, 10)
+        
+        assert checkpoint.integration_method == method
+        assert checkpoint.step == 10
+        assert checkpoint.julian_date == 2451555.0
+        np.testing.assert_array_equal(result[0], expected[0])
+        np.testing.assert_array_equal(result[1], expected[1])
+    
+    def test_bit_exact_resume_with_barnes_hut_and_particles(self, tmp_path):
+        """八分木と試験粒子を含む積分の再開がビット単位で一致することのテスト"""
+        rng = np.random.default_rng(0)
+        positions = rng.normal(0.0, 1e6, (300, 3))
+        velocities = rng.normal(0.0, 0.1, (300, 3))
+        masses = rng.uniform(1e20, 1e22, 300)
+        
+        def make_engine():
+            engine = PhysicsEngine()
+            engine.set_integration_method("leapfrog")
+            engine.set_gravity_solver("barnes_hut", opening_angle=0.7, leaf_size=8)
+            engine.softening_length = 1e3
+            return engine
+        
+        def make_particles():
+            particles = MasslessParticleSet(chunk_size=32)
+            particles.add_particles(rng_particles.normal(0.0, 1e6, (50, 3)),
+                                    rng_particles.normal(0.0, 0.1, (50, 3)))
+            return particles
+        
+        rng_particles = np.random.default_rng(1)
+        reference_particles = make_particles()
+        expected = _run(make_engine(), positions, velocities, masses, 12, reference_particles)
+        
+        rng_particles = np.random.default_rng(1)
+        particles = make_particles()
+        engine = make_engine()
+        half = _run(engine, positions, velocities, masses, 6, particles)
+        path = save_checkpoint(tmp_path / "run.npz", engine, half[0], half[1], masses,
+                               0.0, step=6, test_particles=particles)
+        
+        checkpoint = load_checkpoint(path)
+        resumed = PhysicsEngine()
+        checkpoint.restore_engine(resumed)
+        resumed_particles = MasslessParticleSet(chunk_size=32)
+        checkpoint.restore_test_particles(resumed_particles)
+        result = _run(resumed, checkpoint.positions, checkpoint.velocities, checkpoint.masses, 6,
+                      resumed_particles)
+        
+        assert resumed.gravity_solver == "barnes_hut"
+        assert resumed.softening_length == 1e3
+        np.testing.assert_array_equal(result[0], expected[0])
+        np.testing.assert_array_equal(result[1], expected[1])
+        np.testing.assert_array_equal(resumed_particles.get_positions(),
+                                      reference_particles.get_positions())
+        np.testing.assert_array_equal(resumed_particles.get_velocities(),
+                                      reference_particles.get_velocities())
+        np.testing.assert_array_equal(resumed_particles.get_ids(), reference_particles.get_ids())
+    
+    def test_solar_system_round_trip(self, tmp_path, earth_data, j2000_epoch):
+        """太陽系の状態を保存して別の太陽系に反映することのテスト"""
+        def make_solar_system():
+            solar_system = SolarSystem()
+            solar_system.add_celestial_body(Sun(name="太陽", mass=1.989e30, radius=695700.0,
+                                                temperature=5778.0, luminosity=3.828e26))
+            solar_system.add_celestial_body(Planet(
+                name=earth_data["name"], mass=earth_data["mass"], radius=earth_data["radius"],
+                orbital_elements=OrbitalElements(**earth_data["orbital_elements"]),
+                color=earth_data["color"]
+            ))
+            return solar_system
+        
+        source = make_solar_system()
+        source.update_all_positions(j2000_epoch)
+        source.add_test_particles(np.ones((3, 3)), np.zeros((3, 3)))
+        path = save_solar_system_checkpoint(tmp_path / "system.npz", PhysicsEngine(), source, step=5)
+        
+        target = make_solar_system()
+        checkpoint = load_checkpoint(path)
+        checkpoint.apply_to_solar_system(target)
+        
+        assert target.current_date == j2000_epoch
+        assert checkpoint.names == [body.name for body in source.get_all_bodies()]
+        for body in source.get_all_bodies():
+            restored = next(b for b in target.get_all_bodies() if b.name == body.name)
+            np.testing.assert_array_equal(restored.position, body.position)
+            np.testing.assert_array_equal(restored.velocity, body.velocity)
+        assert target.get_test_particle_count() == 3
+        
+        with pytest.raises(ValueError):
+            checkpoint.apply_to_solar_system(SolarSystem())
+    
+    def test_applied_positions_survive_next_update(self, tmp_path, earth_data, j2000_epoch):
+        """反映した位置が同じ日時の update_all_positions で上書きされないことのテスト"""
+        solar_system = SolarSystem()
+        solar_system.add_celestial_body(Planet(
+            name=earth_data["name"], mass=earth_data["mass"], radius=earth_data["radius"],
+            orbital_elements=OrbitalElements(**earth_data["orbital_elements"]),
+            color=earth_data["color"]
+        ))
+        solar_system.update_all_positions(j2000_epoch)
+        earth = solar_system.get_planet_by_name(earth_data["name"])
+        
+        # 軌道要素による位置と異なる状態を保存
+        nbody_position = earth.position + 1.0e5
+        path = save_checkpoint(tmp_path / "nbody.npz", PhysicsEngine(), nbody_position[np.newaxis],
+                               np.zeros((1, 3)), np.array([earth.mass]), j2000_epoch + 3.0,
+                               names=[earth.name])
+        load_checkpoint(path).apply_to_solar_system(solar_system)
+        solar_system.update_all_positions(j2000_epoch + 3.0)
+        
+        np.testing.assert_array_equal(earth.position, nbody_position)
+        assert solar_system.skipped_update_count == 1
+    
+    def test_invalid_version(self, tmp_path, three_body):
+        """対応していない形式でエラーとなることのテスト"""
+        positions, velocities, masses = three_body
+        path = tmp_path / "old.npz"
+        np.savez(path, version=np.array(0), positions=positions)
+        
+        with pytest.raises(ValueError):
+            load_checkpoint(path)
+        with pytest.raises(FileNotFoundError):
+            load_checkpoint(tmp_path / "missing.npz")
+
+
+class TestAutoCheckpointer:
+    """自動チェックポイントのテスト"""
+    
+    def test_periodic_save_and_rotation(self, tmp_path, three_body):
+        """一定ステップごとに保存し古いファイルを削除することのテスト"""
+        positions, velocities, masses = three_body
+        engine = PhysicsEngine()
+        checkpointer = AutoCheckpointer(tmp_path, engine, interval_steps=5, keep=2)
+        
+        saved = []
+        for step in range(1, 21):
+            positions, velocities = engine.integrate_arrays(positions, velocities, masses, 3600.0)
+            path = checkpointer.maybe_save(step, positions, velocities, masses, 2451545.0 + step / 24)
+            if path is not None:
+                saved.append(step)
+        
+        assert saved == [5, 10, 15, 20]
+        assert checkpointer.save_count == 4
+        files = sorted(p.name for p in tmp_path.glob("*.npz"))
+        assert files == ["checkpoint_000000000015.npz", "checkpoint_000000000020.npz"]
+        assert checkpointer.latest() == find_latest_checkpoint(tmp_path) == checkpointer.last_path
+        
+        checkpoint = load_checkpoint(checkpointer.latest())
+        assert checkpoint.step == 20
+        np.testing.assert_array_equal(checkpoint.positions, positions)
+        
+        # 同じステップで二重に保存しない
+        assert checkpointer.maybe_save(20, positions, velocities, masses, 0.0) is None
+    
+    def test_time_interval_and_validation(self, tmp_path, three_body, mocker):
+        """実時間の間隔での保存と不正なパラメータのテスト"""
+        positions, velocities, masses = three_body
+        clock = mocker.patch("src.simulation.checkpoint.time.monotonic", return_value=100.0)
+        checkpointer = AutoCheckpointer(tmp_path, PhysicsEngine(), interval_steps=None,
+                                        interval_seconds=60.0)
+        
+        assert checkpointer.maybe_save(1, positions, velocities, masses, 0.0) is None
+        clock.return_value = 161.0
+        assert checkpointer.maybe_save(2, positions, velocities, masses, 0.0) is not None
+        assert checkpointer.maybe_save(3, positions, velocities, masses, 0.0) is None
+        
+        with pytest.raises(ValueError):
+            AutoCheckpointer(tmp_path, PhysicsEngine(), interval_steps=None, interval_seconds=None)
+        with pytest.raises(ValueError):
+            AutoCheckpointer(tmp_path, PhysicsEngine(), keep=0)
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""
+保存量のドリフト監視のテスト
+"""
+
+import pytest
+import numpy as np
+from src.simulation.drift_monitor import DriftMonitor
+from src.simulation.physics_engine import PhysicsEngine
+
+
+class TestDriftMonitor:
+    """ドリフト監視のテスト"""
+    
+    @pytest.fixture
+    def two_body(self):
+        """太陽と地球の2体系"""
+        positions = np.array([[0.0, 0.0, 0.0], [149597870.7, 0.0, 0.0]])
+        velocities = np.array([[0.0, -29.78 * 5.972e24 / 1.989e30, 0.0], [0.0, 29.78, 0.0]])
+        masses = np.array([1.989e30, 5.972e24])
+        return positions, velocities, masses
+    
+    def test_samples_every_k_steps(self, two_body):
+        """K ステップごとにサンプリングすることのテスト"""
+        positions, velocities, masses = two_body
+        engine = PhysicsEngine()
+        engine.set_integration_method("leapfrog")
+        monitor = engine.attach_drift_monitor(DriftMonitor(sample_interval=5, max_overhead=None))
+        
+        for _ in range(50):
+            positions, velocities = engine.integrate_arrays(positions, velocities, masses, 86400.0)
+        
+        history = monitor.get_history()
+        assert len(monitor) == 11  # 基準値 + 10サンプル
+        np.testing.assert_array_equal(history['step'], np.arange(0, 51, 5))
+        np.testing.assert_allclose(history['time'], history['step'] * 86400.0)
+        
+        # シンプレクティック積分でのエネルギー誤差は小さく、運動量・質量中心は保存
+        assert monitor.max_energy_drift < 1e-4
+        assert np.all(history['angular_momentum_drift'] < 1e-8)
+        assert monitor.latest.momentum_drift < 1e-8 * np.linalg.norm(masses[1] * 29.78e3)
+        assert monitor.latest.center_of_mass_drift < 1e-3
+    
+    def test_history_is_bounded(self, two_body):
+        """記録が固定長のリングバッファに収まることのテスト"""
+        positions, velocities, masses = two_body
+        monitor = DriftMonitor(sample_interval=1, max_overhead=None, history_size=4)
+        
+        monitor.observe(positions, velocities, masses)
+        for step in range(10):
+            monitor.observe(positions, velocities, masses, dt=1.0)
+        
+        history = monitor.get_history()
+        assert len(monitor) == 4
+        np.testing.assert_array_equal(history['step'], [7, 8, 9, 10])
+        np.testing.assert_array_equal(history['energy_drift'], 0.0)
+    
+    def test_interval_grows_with_overhead(self, two_body):
+        """診断時間の割合が上限を超える場合にサンプリング間隔を広げることのテスト"""
+        positions, velocities, masses = two_body
+        monitor = DriftMonitor(sample_interval=2, max_overhead=1e-9)
+        
+        monitor.observe(positions, velocities, masses)
+        monitor.observe(positions, velocities, masses, dt=1.0)
+        sample = monitor.observe(positions, velocities, masses, dt=1.0)
+        
+        assert sample is not None
+        assert monitor.sample_interval > 2
+        assert monitor.observe(positions, velocities, masses, dt=1.0) is None
+    
+    def test_reset_and_detach(self, two_body):
+        """基準値のリセットと監視解除のテスト"""
+        positions, velocities, masses = two_body
+        engine = PhysicsEngine()
+        monitor = engine.attach_drift_monitor()
+        
+        engine.integrate_arrays(positions, velocities, masses, 3600.0)
+        assert monitor.has_reference
+        
+        monitor.reset()
+        assert not monitor.has_reference
+        assert len(monitor) == 0
+        
+        engine.detach_drift_monitor()
+        engine.integrate_arrays(positions, velocities, masses, 3600.0)
+        assert not monitor.has_reference
+        
+        with pytest.raises(ValueError):
+            DriftMonitor(sample_interval=0)
\ No newline at end of file
@@ -0,0 +1,172 @@
+"""
+Encke法による軌道伝播のテスト
+"""
+
+import pytest
+import numpy as np
+from src.simulation.encke_propagator import EnckePropagator
+from src.simulation.orbit_calculator import OrbitCalculator
+
+
+AU = 149597870.7
+J2000 = 2451545.0
+
+# 木星の軌道要素 (a, e, i, Ω, ω, M0, epoch) と質量
+JUPITER_ELEMENTS = np.array([[5.2026, 0.0484, 1.303, 100.46, 273.87, 20.02, J2000]])
+JUPITER_MASS = np.array([1.898e27])
+
+
+def integrate_full(calculator, position, velocity, julian_date, days, step_days):
+    """太陽と木星の重力による運動全体を4次ルンゲ・クッタ法で積分"""
+    G = calculator.gravitational_constant * 1e-9
+    mu = G * calculator.solar_mass
+    
+    def acceleration(r, t):
+        jupiter, _ = calculator.calculate_positions_batch(JUPITER_ELEMENTS, t)
+        jupiter = jupiter[0, 0]
+        d = jupiter - r
+        return (-mu * r / np.linalg.norm(r) ** 3 +
+                G * JUPITER_MASS[0] * (d / np.linalg.norm(d) ** 3 - jupiter / np.linalg.norm(jupiter) ** 3))
+    
+    h = step_days * 86400
+    r, v = position.copy(), velocity.copy()
+    for i in range(int(round(days / step_days))):
+        t = julian_date + i * step_days
+        k1r, k1v = v, acceleration(r, t)
+        k2r, k2v = v + 0.5 * h * k1v, acceleration(r + 0.5 * h * k1r, t + step_days / 2)
+        k3r, k3v = v + 0.5 * h * k2v, acceleration(r + 0.5 * h * k2r, t + step_days / 2)
+        k4r, k4v = v + h * k3v, acceleration(r + h * k3r, t + step_days)
+        r = r + h / 6 * (k1r + 2 * k2r + 2 * k3r + k4r)
+        v = v + h / 6 * (k1v + 2 * k2v + 2 * k3v + k4v)
+    return r, v
+
+
+class TestEnckePropagator:
+    """EnckePropagatorクラスのテスト"""
+    
+    @pytest.fixture
+    def calculator(self):
+        """キャッシュを無効にした軌道計算機"""
+        calculator = OrbitCalculator()
+        calculator.cache_enabled = False
+        return calculator
+    
+    @pytest.fixture
+    def asteroid(self, calculator):
+        """2.5 AU の小惑星の初期状態"""
+        mu = calculator.gravitational_constant * 1e-9 * calculator.solar_mass
+        position = np.array([2.5 * AU, 0.0, 0.0])
+        velocity = np.array([0.0, np.sqrt(mu / (2.5 * AU)) * 1.02, 0.5])
+        return position, velocity
+    
+    def test_unperturbed_motion_follows_reference(self, calculator, asteroid):
+        """摂動がない場合にケプラー軌道と一致することのテスト"""
+        position, velocity = asteroid
+        propagator = EnckePropagator(orbit_calculator=calculator)
+        propagator.initialize(position[np.newaxis], velocity[np.newaxis], J2000)
+        
+        final_position, _ = propagator.propagate(J2000 + 1000, 50.0)
+        
+        elements = calculator.calculate_orbital_elements_from_state(position, velocity)
+        elements.epoch = J2000
+        expected, _ = calculator.calculate_position_velocity(elements, J2000 + 1000)
+        np.testing.assert_allclose(final_position[0], expected, atol=1e-3)
+        assert propagator.rectification_count == 1
+        assert np.all(np.abs(propagator.deviations) < 1e-6)
+    
+    def test_initial_state_is_preserved(self, calculator, asteroid):
+        """初期化直後の状態が入力と一致することのテスト"""
+        position, velocity = asteroid
+        propagator = EnckePropagator(orbit_calculator=calculator)
+        propagator.initialize(position[np.newaxis], velocity[np.newaxis], J2000)
+        
+        positions, velocities = propagator.get_state()
+        
+        np.testing.assert_allclose(positions[0], position, rtol=1e-12)
+        np.testing.assert_allclose(velocities[0], velocity, rtol=1e-12)
+    
+    def test_perturbed_accuracy_with_large_steps(self, calculator, asteroid):
+        """大きなステップでも運動全体の積分より高精度であることのテスト"""
+        position, velocity = asteroid
+        days = 3650
+        reference, _ = integrate_full(calculator, position, velocity, J2000, days, 0.5)
+        full, _ = integrate_full(calculator, position, velocity, J2000, days, 20.0)
+        
+        propagator = EnckePropagator(orbit_calculator=calculator,
+                                     perturber_elements=JUPITER_ELEMENTS,
+                                     perturber_masses=JUPITER_MASS)
+        propagator.initialize(position[np.newaxis], velocity[np.newaxis], J2000)
+        encke, _ = propagator.propagate(J2000 + days, 20.0)
+        
+        encke_error = np.linalg.norm(encke[0] - reference)
+        full_error = np.linalg.norm(full - reference)
+        assert encke_error < 1000.0
+        assert encke_error * 100 < full_error
+        assert propagator.julian_date == pytest.approx(J2000 + days)
+    
+    def test_rectification_with_small_threshold(self, calculator, asteroid):
+        """閾値を小さくすると整流が行われ、状態が連続することのテスト"""
+        position, velocity = asteroid
+        propagator = EnckePropagator(orbit_calculator=calculator,
+                                     perturber_elements=JUPITER_ELEMENTS,
+                                     perturber_masses=JUPITER_MASS,
+                                     rectification_threshold=1e-6)
+        propagator.initialize(position[np.newaxis], velocity[np.newaxis], J2000)
+        
+        loose = EnckePropagator(orbit_calculator=calculator,
+                                perturber_elements=JUPITER_ELEMENTS,
+                                perturber_masses=JUPITER_MASS)
+        loose.initialize(position[np.newaxis], velocity[np.newaxis], J2000)
+        
+        rectified, _ = propagator.propagate(J2000 + 1000, 10.0)
+        expected, _ = loose.propagate(J2000 + 1000, 10.0)
+        
+        assert propagator.rectification_count > 1
+        assert loose.rectification_count == 1
+        assert np.linalg.norm(rectified[0] - expected[0]) < 100.0
+    
+    def test_backward_propagation(self, calculator, asteroid):
+        """過去向きに伝播して元の状態に戻ることのテスト"""
+        position, velocity = asteroid
+        propagator = EnckePropagator(orbit_calculator=calculator,
+                                     perturber_elements=JUPITER_ELEMENTS,
+                                     perturber_masses=JUPITER_MASS)
+        propagator.initialize(position[np.newaxis], velocity[np.newaxis], J2000)
+        
+        propagator.propagate(J2000 + 500, 10.0)
+        returned, _ = propagator.propagate(J2000, 10.0)
+        
+        assert np.linalg.norm(returned[0] - position) < 10.0
+    
+    def test_multiple_bodies(self, calculator, asteroid):
+        """複数の小天体を一括で伝播しても個別の結果と一致することのテスト"""
+        position, velocity = asteroid
+        positions = np.array([position, position * 1.2])
+        velocities = np.array([velocity, velocity / np.sqrt(1.2)])
+        
+        batch = EnckePropagator(orbit_calculator=calculator,
+                                perturber_elements=JUPITER_ELEMENTS,
+                                perturber_masses=JUPITER_MASS)
+        batch.initialize(positions, velocities, J2000)
+        batch_positions, _ = batch.propagate(J2000 + 365, 10.0)
+        
+        for k in range(2):
+            single = EnckePropagator(orbit_calculator=calculator,
+                                     perturber_elements=JUPITER_ELEMENTS,
+                                     perturber_masses=JUPITER_MASS)
+            single.initialize(positions[k:k + 1], velocities[k:k + 1], J2000)
+            single_positions, _ = single.propagate(J2000 + 365, 10.0)
+            np.testing.assert_allclose(batch_positions[k], single_positions[0], rtol=1e-10)
+    
+    def test_invalid_arguments(self, calculator):
+        """不正な引数のテスト"""
+        with pytest.raises(ValueError):
+            EnckePropagator(orbit_calculator=calculator,
+                            perturber_elements=JUPITER_ELEMENTS,
+                            perturber_masses=np.array([1.0, 2.0]))
+        with pytest.raises(ValueError):
+            EnckePropagator(orbit_calculator=calculator, rectification_threshold=0.0)
+        
+        propagator = EnckePropagator(orbit_calculator=calculator)
+        with pytest.raises(ValueError):
+            propagator.propagate(J2000 + 10, 0.0)
\ No newline at end of file
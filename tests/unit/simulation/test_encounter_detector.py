@@ -0,0 +1,165 @@
+"""
+近接遭遇検出のテスト
+"""
+
+import pytest
+import numpy as np
+from src.simulation.encounter_detector import EncounterDetector, candidate_pairs
+from src.simulation.physics_engine import PhysicsEngine
+
+
+class TestCandidatePairs:
+    """空間ハッシュによる候補の組の列挙のテスト"""
+    
+    def test_contains_all_close_pairs(self):
+        """距離がセル以内の組を全て含むことのテスト"""
+        rng = np.random.default_rng(0)
+        points = rng.uniform(-100.0, 100.0, (500, 3))
+        cell_size = 10.0
+        
+        first, second = candidate_pairs(points, cell_size)
+        found = set(zip(np.minimum(first, second).tolist(), np.maximum(first, second).tolist()))
+        
+        distance = np.linalg.norm(points[:, np.newaxis] - points[np.newaxis], axis=2)
+        i, j = np.nonzero(np.triu(distance <= cell_size, k=1))
+        expected = set(zip(i.tolist(), j.tolist()))
+        
+        assert expected <= found
+        assert len(found) == len(first)  # 重複なし
+        assert len(first) < 500 * 499 // 2 // 10
+    
+    def test_edge_cases(self):
+        """天体数が少ない場合と不正なセルの大きさのテスト"""
+        first, second = candidate_pairs(np.zeros((1, 3)), 1.0)
+        assert len(first) == len(second) == 0
+        
+        first, second = candidate_pairs(np.zeros((3, 3)), 1.0)
+        assert sorted(zip(first.tolist(), second.tolist())) == [(0, 1), (0, 2), (1, 2)]
+        
+        with pytest.raises(ValueError):
+            candidate_pairs(np.zeros((2, 3)), 0.0)
+
+
+class TestEncounterDetector:
+    """近接遭遇検出器のテスト"""
+    
+    def test_detects_flyby_within_step(self):
+        """ステップ中にすれ違う組の最接近を検出することのテスト"""
+        detector = EncounterDetector(encounter_distance=5.0)
+        start = np.array([[-100.0, 1.0, 0.0], [100.0, -1.0, 0.0], [0.0, 1000.0, 0.0]])
+        end = np.array([[100.0, 1.0, 0.0], [-100.0, -1.0, 0.0], [0.0, 1000.0, 0.0]])
+        
+        events = detector.detect(start, end, 10.0, start_time=50.0)
+        
+        assert len(events) == 1
+        assert events[0].pair == (0, 1)
+        assert events[0].minimum_distance == pytest.approx(2.0)
+        assert events[0].time == pytest.approx(55.0)
+        assert not events[0].collision
+        assert detector.elapsed_time == 0.0
+    
+    def test_tracks_encounter_over_steps(self):
+        """複数ステップにわたる遭遇を1件のイベントとして記録することのテスト"""
+        detector = EncounterDetector(encounter_distance=10.0)
+        received = []
+        detector.add_event_callback(received.append)
+        
+        # 天体1が x 方向に 1 km/s で天体0の近く (y=3) を通過
+        times = np.arange(0.0, 41.0, 2.0)
+        trajectory = [np.array([[0.0, 0.0, 0.0], [t - 20.0, 3.0, 0.0]]) for t in times]
+        for start, end in zip(trajectory[:-1], trajectory[1:]):
+            finished = detector.observe(start, end, 2.0)
+            if detector.elapsed_time <= 20.0:
+                assert not finished
+        
+        assert len(detector) == 1
+        assert received == list(detector.events)
+        event = detector.events[0]
+        assert event.pair == (0, 1)
+        assert event.minimum_distance == pytest.approx(3.0)
+        assert event.time == pytest.approx(20.0)
+        assert not detector.active
+    
+    def test_collision_with_radii(self):
+        """半径の和以下に近づいた組を衝突とすることのテスト"""
+        detector = EncounterDetector(encounter_distance=1.0, radii=np.array([2.0, 2.0, 0.5]))
+        start = np.array([[0.0, 0.0, 0.0], [10.0, 0.0, 0.0], [0.0, 3.0, 0.0]])
+        end = np.array([[0.0, 0.0, 0.0], [3.5, 0.0, 0.0], [0.0, 3.0, 0.0]])
+        
+        detector.observe(start, end, 1.0)
+        assert set(detector.active) == {(0, 1), (0, 2)}
+        assert detector.active[(0, 1)].collision
+        assert not detector.active[(0, 2)].collision
+        
+        finished = detector.flush()
+        assert len(finished) == 2
+        assert not detector.active
+    
+    def test_fast_mover_does_not_inflate_candidates(self):
+        """1個だけ極端に速い天体があっても候補の組が増えすぎず、遭遇を取りこぼさないことのテスト"""
+        rng = np.random.default_rng(1)
+        count = 2000
+        start = rng.uniform(-1e6, 1e6, (count, 3))
+        end = start + rng.normal(0.0, 100.0, (count, 3))
+        # 天体0は1ステップで領域を横切り、天体1の近くを通過する
+        start[0] = [-2e6, 0.0, 0.0]
+        end[0] = [2e6, 0.0, 0.0]
+        start[1] = end[1] = [3e5, 500.0, 0.0]
+        
+        detector = EncounterDetector(encounter_distance=1000.0)
+        events = detector.detect(start, end, 100.0)
+        
+        assert detector.candidate_count < 10 * count
+        
+        # 全ての組を直線近似で調べた結果と一致する
+        relative_start = start[np.newaxis] - start[:, np.newaxis]
+        relative_motion = (end - start)[np.newaxis] - (end - start)[:, np.newaxis]
+        motion_squared = np.einsum('ijk,ijk->ij', relative_motion, relative_motion)
+        fraction = np.clip(np.divide(-np.einsum('ijk,ijk->ij', relative_start, relative_motion), motion_squared,
+                                     out=np.zeros_like(motion_squared), where=motion_squared > 0), 0.0, 1.0)
+        closest = relative_start + fraction[..., np.newaxis] * relative_motion
+        i, j = np.nonzero(np.triu(np.linalg.norm(closest, axis=2) <= 1000.0, k=1))
+        
+        assert {event.pair for event in events} == set(zip(i.tolist(), j.tolist()))
+        assert (0, 1) in {event.pair for event in events}
+    
+    def test_invalid_parameters(self):
+        """不正なパラメータでエラーとなることのテスト"""
+        with pytest.raises(ValueError):
+            EncounterDetector(encounter_distance=-1.0)
+        with pytest.raises(ValueError):
+            EncounterDetector(encounter_distance=1.0, radii=np.array([-1.0]))
+        with pytest.raises(ValueError):
+            EncounterDetector(encounter_distance=1.0, refinement_substeps=0)
+    
+    def test_engine_refines_encounter_steps(self):
+        """遭遇を含むステップを分割して積分することのテスト"""
+        positions = np.array([[0.0, 0.0, 0.0], [-2000.0, 50.0, 0.0], [1e8, 0.0, 0.0]])
+        velocities = np.array([[0.0, 0.0, 0.0], [10.0, 0.0, 0.0], [0.0, 0.0, 0.0]])
+        masses = np.array([1e20, 1e10, 1e10])
+        
+        coarse = PhysicsEngine()
+        coarse.attach_encounter_detector(EncounterDetector(encounter_distance=500.0))
+        refined = PhysicsEngine()
+        detector = refined.attach_encounter_detector(
+            EncounterDetector(encounter_distance=500.0, refinement_substeps=8)
+        )
+        
+        state = (positions, velocities)
+        coarse_state = (positions, velocities)
+        for _ in range(8):
+            state = refined.integrate_arrays(state[0], state[1], masses, 60.0)
+            coarse_state = coarse.integrate_arrays(coarse_state[0], coarse_state[1], masses, 60.0)
+        
+        assert refined.refined_step_count > 0
+        assert coarse.refined_step_count == 0
+        assert detector.step_count > 8
+        assert detector.elapsed_time == pytest.approx(480.0)
+        
+        detector.flush()
+        pairs = {event.pair for event in detector.events}
+        assert pairs == {(0, 1)}
+        assert min(event.minimum_distance for event in detector.events) < 100.0
+        
+        refined.detach_encounter_detector()
+        assert refined.encounter_detector is None
\ No newline at end of file
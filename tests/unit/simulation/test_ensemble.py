@@ -0,0 +1,201 @@
+"""
+アンサンブル積分のテスト
+"""
+
+import pytest
+import numpy as np
+from src.domain.system_diagnostics import total_energy_array, total_energy_ensemble
+from src.simulation.ensemble import EnsembleIntegrator, perturb_initial_conditions
+from src.simulation.physics_engine import PhysicsEngine
+
+
+class TestEnsembleIntegration:
+    """アンサンブル積分のテスト"""
+    
+    @pytest.fixture
+    def three_body(self):
+        """太陽・地球・木星の3体系"""
+        positions = np.array([[0.0, 0.0, 0.0],
+                              [149597870.7, 0.0, 0.0],
+                              [0.0, 778.5e6, 0.0]])
+        velocities = np.array([[0.0, 0.0, 0.0],
+                               [0.0, 29.78, 0.0],
+                               [-13.07, 0.0, 0.0]])
+        masses = np.array([1.989e30, 5.972e24, 1.898e27])
+        return positions, velocities, masses
+    
+    def test_ensemble_accelerations_match_members(self, three_body):
+        """一括計算した加速度がメンバーごとの計算と一致することのテスト"""
+        positions, velocities, masses = three_body
+        engine = PhysicsEngine()
+        ensemble_positions, _ = perturb_initial_conditions(
+            positions, velocities, 5, position_sigma=1e5, seed=1
+        )
+        
+        accelerations = engine.calculate_accelerations(ensemble_positions, masses)
+        
+        assert accelerations.shape == (5, 3, 3)
+        for member in range(5):
+            np.testing.assert_allclose(
+                accelerations[member],
+                engine.calculate_accelerations(ensemble_positions[member], masses),
+                rtol=1e-12, atol=0.0
+            )
+    
+    def test_ensemble_accelerations_in_blocks(self, three_body):
+        """メンバーを分割して計算しても結果が変わらないことのテスト"""
+        positions, velocities, masses = three_body
+        engine = PhysicsEngine()
+        ensemble_positions, _ = perturb_initial_conditions(
+            positions, velocities, 7, position_sigma=1e5, seed=2
+        )
+        expected = engine.calculate_accelerations(ensemble_positions, masses)
+        
+        engine.ACCELERATION_BLOCK_PAIRS = 2 * 9
+        np.testing.assert_allclose(engine.calculate_accelerations(ensemble_positions, masses),
+                                   expected, rtol=1e-14, atol=0.0)
+    
+    @pytest.mark.parametrize("method", ["rk4", "euler", "leapfrog"])
+    def test_ensemble_step_matches_members(self, three_body, method):
+        """一括積分の結果がメンバーごとの積分と一致することのテスト"""
+        positions, velocities, masses = three_body
+        ensemble_positions, ensemble_velocities = perturb_initial_conditions(
+            positions, velocities, 4, position_sigma=1e4, velocity_sigma=1e-3, seed=3
+        )
+        
+        engine = PhysicsEngine()
+        engine.set_integration_method(method)
+        batch_positions, batch_velocities = ensemble_positions, ensemble_velocities
+        for _ in range(10):
+            batch_positions, batch_velocities = engine.integrate_ensemble_arrays(
+                batch_positions, batch_velocities, masses, 3600.0
+            )
+        
+        for member in range(4):
+            member_engine = PhysicsEngine()
+            member_engine.set_integration_method(method)
+            member_positions = ensemble_positions[member]
+            member_velocities = ensemble_velocities[member]
+            for _ in range(10):
+                member_positions, member_velocities = member_engine.integrate_arrays(
+                    member_positions, member_velocities, masses, 3600.0
+                )
+            np.testing.assert_allclose(batch_positions[member], member_positions, rtol=1e-12)
+            np.testing.assert_allclose(batch_velocities[member], member_velocities, rtol=1e-12)
+    
+    def test_per_member_masses(self, three_body):
+        """メンバーごとに異なる質量を扱えることのテスト"""
+        positions, velocities, masses = three_body
+        ensemble_positions = np.stack([positions, positions])
+        ensemble_masses = np.stack([masses, masses * np.array([1.0, 1.0, 2.0])])
+        engine = PhysicsEngine()
+        
+        accelerations = engine.calculate_accelerations(ensemble_positions, ensemble_masses)
+        
+        np.testing.assert_allclose(accelerations[0],
+                                   engine.calculate_accelerations(positions, masses))
+        np.testing.assert_allclose(accelerations[1],
+                                   engine.calculate_accelerations(positions, ensemble_masses[1]))
+        assert accelerations[1, 0, 1] == pytest.approx(2 * accelerations[0, 0, 1])
+    
+    def test_unsupported_method(self, three_body):
+        """アンサンブルに対応していない積分法でエラーとなることのテスト"""
+        positions, velocities, masses = three_body
+        engine = PhysicsEngine()
+        engine.set_integration_method("wisdom_holman")
+        
+        with pytest.raises(ValueError):
+            engine.integrate_ensemble_arrays(positions[np.newaxis], velocities[np.newaxis],
+                                             masses, 3600.0)
+
+
+class TestEnsembleIntegrator:
+    """アンサンブル積分器と統計のテスト"""
+    
+    @pytest.fixture
+    def two_body(self):
+        """太陽と地球の2体系"""
+        positions = np.array([[0.0, 0.0, 0.0], [149597870.7, 0.0, 0.0]])
+        velocities = np.array([[0.0, 0.0, 0.0], [0.0, 29.78, 0.0]])
+        masses = np.array([1.989e30, 5.972e24])
+        return positions, velocities, masses
+    
+    def test_perturb_initial_conditions(self, two_body):
+        """摂動した初期条件の生成のテスト"""
+        positions, velocities, _ = two_body
+        ensemble_positions, ensemble_velocities = perturb_initial_conditions(
+            positions, velocities, 1000, position_sigma=10.0, velocity_sigma=0.1, seed=4
+        )
+        
+        assert ensemble_positions.shape == (1000, 2, 3)
+        np.testing.assert_array_equal(ensemble_positions[0], positions)
+        np.testing.assert_array_equal(ensemble_velocities[0], velocities)
+        assert np.std(ensemble_positions - positions) == pytest.approx(10.0, rel=0.05)
+        assert np.std(ensemble_velocities - velocities) == pytest.approx(0.1, rel=0.05)
+        
+        with pytest.raises(ValueError):
+            perturb_initial_conditions(positions, velocities, 0)
+    
+    def test_run_records_statistics(self, two_body):
+        """ステップごとに統計を記録することのテスト"""
+        positions, velocities, masses = two_body
+        ensemble_positions, ensemble_velocities = perturb_initial_conditions(
+            positions, velocities, 8, position_sigma=100.0, velocity_sigma=1e-3, seed=5
+        )
+        engine = PhysicsEngine()
+        engine.set_integration_method("leapfrog")
+        integrator = EnsembleIntegrator(engine, record_interval=2)
+        
+        final_positions, final_velocities = integrator.run(
+            ensemble_positions, ensemble_velocities, masses, 3600.0, 10
+        )
+        
+        assert integrator.step_count == 10
+        assert [stats.step for stats in integrator.statistics] == [0, 2, 4, 6, 8, 10]
+        
+        last = integrator.statistics[-1]
+        assert last.time == pytest.approx(36000.0)
+        np.testing.assert_allclose(last.mean_positions, final_positions.mean(axis=0))
+        expected_spread = np.sqrt(np.mean(
+            np.sum((final_positions - final_positions.mean(axis=0)) ** 2, axis=2), axis=0
+        ))
+        np.testing.assert_allclose(last.position_spread, expected_spread)
+        
+        energies = [total_energy_array(final_positions[k], final_velocities[k], masses)
+                    for k in range(8)]
+        assert last.energy_mean == pytest.approx(np.mean(energies), rel=1e-12)
+        assert last.energy_std == pytest.approx(np.std(energies), rel=1e-6)
+        
+        times, spreads = integrator.get_spread_history()
+        assert spreads.shape == (6, 2)
+        np.testing.assert_allclose(times, np.arange(0, 11, 2) * 3600.0)
+    
+    def test_energy_tracking_optional(self, two_body):
+        """エネルギーの統計を省略できることのテスト"""
+        positions, velocities, masses = two_body
+        integrator = EnsembleIntegrator(track_energy=False)
+        
+        integrator.run(positions[np.newaxis], velocities[np.newaxis], masses, 3600.0, 2)
+        
+        assert np.isnan(integrator.statistics[-1].energy_mean)
+        np.testing.assert_array_equal(integrator.statistics[-1].position_spread, 0.0)
+        
+        with pytest.raises(ValueError):
+            integrator.run(positions, velocities, masses, 3600.0, 1)
+        with pytest.raises(ValueError):
+            EnsembleIntegrator(record_interval=0)
+    
+    def test_total_energy_ensemble(self, two_body):
+        """アンサンブルのエネルギー計算が単体の計算と一致することのテスト"""
+        positions, velocities, masses = two_body
+        ensemble_positions, ensemble_velocities = perturb_initial_conditions(
+            positions, velocities, 3, position_sigma=1e3, velocity_sigma=0.1, seed=6
+        )
+        
+        energies = total_energy_ensemble(ensemble_positions, ensemble_velocities, masses)
+        
+        for member in range(3):
+            assert energies[member] == pytest.approx(
+                total_energy_array(ensemble_positions[member], ensemble_velocities[member], masses),
+                rel=1e-12
+            )
\ No newline at end of file
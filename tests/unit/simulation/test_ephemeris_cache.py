@@ -0,0 +1,144 @@
+"""
+チェビシェフ暦キャッシュのテスト
+"""
+
+import pytest
+import numpy as np
+from src.simulation.ephemeris_cache import ChebyshevEphemeris, EphemerisCompiler
+from src.simulation.orbit_calculator import OrbitCalculator
+from src.domain.orbital_elements import OrbitalElements
+
+
+class TestChebyshevEphemeris:
+    """チェビシェフ暦のテスト"""
+    
+    @pytest.fixture
+    def orbit_calculator(self):
+        """軌道計算機のフィクスチャ"""
+        return OrbitCalculator()
+    
+    @pytest.fixture
+    def elements_by_name(self):
+        """地球・水星の軌道要素"""
+        return {
+            '地球': OrbitalElements(
+                semi_major_axis=1.0,
+                eccentricity=0.0167,
+                inclination=0.0,
+                longitude_of_ascending_node=0.0,
+                argument_of_perihelion=102.9,
+                mean_anomaly_at_epoch=100.5,
+                epoch=2451545.0
+            ),
+            '水星': OrbitalElements(
+                semi_major_axis=0.387,
+                eccentricity=0.2056,
+                inclination=7.0,
+                longitude_of_ascending_node=48.3,
+                argument_of_perihelion=29.1,
+                mean_anomaly_at_epoch=174.8,
+                epoch=2451545.0
+            )
+        }
+    
+    @pytest.fixture
+    def ephemeris(self, orbit_calculator, elements_by_name):
+        """1年分のチェビシェフ暦"""
+        compiler = EphemerisCompiler(segment_days=8.0, degree=12)
+        return compiler.compile_from_elements(
+            orbit_calculator, elements_by_name, 2451545.0, 2451545.0 + 365.0
+        )
+    
+    def test_compile_shape(self, ephemeris):
+        """係数配列の形状テスト"""
+        assert ephemeris.body_names == ['地球', '水星']
+        assert ephemeris.segment_count == 46
+        assert ephemeris.degree == 12
+        assert ephemeris.coefficients.shape == (2, 46, 3, 13)
+        assert ephemeris.covers(2451545.0 + 365.0)
+    
+    def test_matches_orbit_calculator(self, ephemeris, orbit_calculator, elements_by_name):
+        """軌道計算との一致テスト"""
+        times = np.linspace(2451545.0, 2451545.0 + 365.0, 97)
+        expected_positions, expected_velocities = orbit_calculator.calculate_positions_batch(
+            list(elements_by_name.values()), times
+        )
+        
+        positions, velocities = ephemeris.evaluate(times)
+        
+        assert positions.shape == (2, 97, 3)
+        np.testing.assert_allclose(positions, expected_positions, rtol=0, atol=1.0)
+        np.testing.assert_allclose(velocities, expected_velocities, rtol=0, atol=1e-5)
+    
+    def test_single_body_lookup(self, ephemeris, orbit_calculator, elements_by_name):
+        """1天体の位置取得テスト"""
+        jd = 2451545.0 + 123.4
+        expected, _ = orbit_calculator.calculate_position_velocity(elements_by_name['水星'], jd)
+        
+        position = ephemeris.get_position('水星', jd)
+        
+        np.testing.assert_allclose(position, expected, rtol=0, atol=1.0)
+        
+        with pytest.raises(KeyError):
+            ephemeris.get_position('冥王星', jd)
+    
+    def test_grouped_and_chunked_evaluation_agree(self, ephemeris):
+        """区間ごとの評価と分割した評価が、順不同の時刻・天体の指定で一致するかのテスト"""
+        rng = np.random.default_rng(0)
+        times = rng.uniform(2451545.0, 2451545.0 + 365.0, 200)
+        
+        positions, velocities = ephemeris.evaluate(times, ['水星', '地球'])
+        
+        ephemeris.SEGMENT_GROUP_LIMIT = 0
+        ephemeris.EVALUATION_CHUNK = 7
+        chunked_positions, chunked_velocities = ephemeris.evaluate(times, ['水星', '地球'])
+        
+        assert positions.shape == (2, 200, 3)
+        np.testing.assert_allclose(chunked_positions, positions, rtol=1e-14, atol=1e-6)
+        np.testing.assert_allclose(chunked_velocities, velocities, rtol=1e-14, atol=1e-12)
+        for i, jd in enumerate(times[:5]):
+            np.testing.assert_allclose(positions[0, i], ephemeris.get_position('水星', jd), rtol=1e-14)
+    
+    def test_out_of_range(self, ephemeris):
+        """範囲外のユリウス日のテスト"""
+        with pytest.raises(ValueError):
+            ephemeris.evaluate(2451545.0 - 1.0)
+        with pytest.raises(ValueError):
+            ephemeris.evaluate([2451545.0, ephemeris.end_jd + 1.0])
+    
+    def test_save_and_memory_map(self, ephemeris, tmp_path):
+        """保存とメモリマップ読み込みのテスト"""
+        file_path = tmp_path / 'planets.eph'
+        ephemeris.save(file_path)
+        
+        loaded = ChebyshevEphemeris.load(file_path)
+        
+        assert isinstance(loaded.coefficients, np.memmap)
+        assert loaded.body_names == ephemeris.body_names
+        assert loaded.start_jd == ephemeris.start_jd
+        assert loaded.segment_days == ephemeris.segment_days
+        np.testing.assert_array_equal(loaded.coefficients, ephemeris.coefficients)
+        
+        times = np.array([2451545.0, 2451600.25, 2451800.0])
+        np.testing.assert_array_equal(loaded.evaluate(times)[0], ephemeris.evaluate(times)[0])
+    
+    def test_load_invalid_file(self, tmp_path):
+        """不正なファイルの読み込みテスト"""
+        file_path = tmp_path / 'invalid.eph'
+        file_path.write_bytes(b'not an ephemeris')
+        
+        with pytest.raises(ValueError):
+            ChebyshevEphemeris.load(file_path)
+    
+    def test_compile_from_function(self):
+        """任意の位置関数からの作成テスト"""
+        def position_function(julian_dates):
+            t = julian_dates - 2451545.0
+            return np.stack([t, t**2, np.zeros_like(t)], axis=-1)[np.newaxis]
+        
+        compiler = EphemerisCompiler(segment_days=10.0, degree=3)
+        ephemeris = compiler.compile(['test'], position_function, 2451545.0, 2451565.0)
+        
+        positions, velocities = ephemeris.evaluate([2451550.0])
+        np.testing.assert_allclose(positions[0, 0], [5.0, 25.0, 0.0], atol=1e-9)
+        np.testing.assert_allclose(velocities[0, 0], [1.0 / 86400.0, 10.0 / 86400.0, 0.0], atol=1e-12)
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+datetime64 配列とユリウス日の一括変換のテスト
+"""
+
+import pytest
+import numpy as np
+from datetime import datetime, timezone
+from src.simulation.julian_dates import (
+    datetime64_to_julian, datetime64_to_julian_parts, julian_to_datetime64,
+    julian_parts_to_datetime64, split_julian_date, add_days_to_julian_parts,
+    julian_parts_difference
+)
+from src.simulation.time_manager import TimeManager
+
+
+@pytest.fixture
+def time_manager():
+    """時間管理（スカラー版の変換）"""
+    return TimeManager()
+
+
+@pytest.fixture
+def random_times():
+    """1600年〜2400年のマイクロ秒単位のランダムな時刻"""
+    rng = np.random.default_rng(7)
+    start = np.datetime64('1600-01-01T00:00:00', 'us').astype(np.int64)
+    stop = np.datetime64('2400-01-01T00:00:00', 'us').astype(np.int64)
+    return rng.integers(start, stop, size=2000).astype('datetime64[us]')
+
+
+def to_datetime(time64: np.datetime64) -> datetime:
+    """datetime64 を UTC の datetime に変換"""
+    return time64.astype('datetime64[us]').item().replace(tzinfo=timezone.utc)
+
+
+class TestJulianDateArrays:
+    """ユリウス日の一括変換のテスト"""
+    
+    def test_datetime64_to_julian_matches_scalar(self, time_manager, random_times):
+        """datetime64 → ユリウス日がスカラー版と一致するかのテスト"""
+        julian_dates = datetime64_to_julian(random_times)
+        
+        expected = np.array([time_manager.datetime_to_julian(to_datetime(t)) for t in random_times])
+        np.testing.assert_allclose(julian_dates, expected, rtol=0, atol=1e-9)
+    
+    def test_julian_to_datetime64_matches_scalar(self, time_manager, random_times):
+        """ユリウス日 → datetime64 がスカラー版と一致するかのテスト"""
+        julian_dates = datetime64_to_julian(random_times)
+        
+        times = julian_to_datetime64(julian_dates)
+        
+        assert times.dtype == np.dtype('datetime64[us]')
+        expected = np.array([np.datetime64(time_manager.julian_to_datetime(jd).replace(tzinfo=None), 'us')
+                             for jd in julian_dates])
+        # float64 のユリウス日の分解能（約40マイクロ秒）以内で一致
+        difference = np.abs((times - expected).astype(np.int64))
+        assert difference.max() <= 50
+    
+    def test_known_epochs(self):
+        """既知のエポックの変換のテスト"""
+        times = np.array(['2000-01-01T00:00', '2000-01-01T12:00', '1999-12-31T12:00'],
+                         dtype='datetime64[m]')
+        
+        # datetime_to_julian と同じく UTC 00:00 が整数のユリウス日
+        np.testing.assert_array_equal(datetime64_to_julian(times), [2451545.0, 2451545.5, 2451544.5])
+        
+        # julian_to_datetime と同じく整数のユリウス日が UTC 12:00
+        np.testing.assert_array_equal(
+            julian_to_datetime64(np.array([2451545.0, 2451545.5])),
+            np.array(['2000-01-01T12:00', '2000-01-02T00:00'], dtype='datetime64[us]')
+        )
+    
+    def test_parts_round_trip_is_exact(self, random_times):
+        """(日, 端数) を経由した往復がマイクロ秒単位で一致するかのテスト"""
+        day, fraction = datetime64_to_julian_parts(random_times)
+        
+        assert np.all(day == np.floor(day))
+        assert np.all((fraction >= 0) & (fraction < 1))
+        
+        # datetime → ユリウス日の規約は標準より0.5日大きい
+        times = julian_parts_to_datetime64(day, fraction - 0.5)
+        np.testing.assert_array_equal(times, random_times)
+    
+    def test_small_steps_keep_precision(self):
+        """大きなユリウス日で小さなステップを積み重ねても精度が落ちないかのテスト"""
+        step = 1e-3 / 86400.0   # 1ミリ秒
+        day, fraction = split_julian_date(2451545.0)
+        single = 2451545.0
+        for _ in range(100000):
+            day, fraction = add_days_to_julian_parts(day, fraction, step)
+            single += step
+        
+        # 100秒ちょうど進んでいる
+        elapsed = julian_parts_difference(day, fraction, 2451545.0, 0.0) * 86400.0
+        assert elapsed == pytest.approx(100.0, abs=1e-6)
+        assert abs((single - 2451545.0) * 86400.0 - 100.0) > 1e-3
+    
+    def test_time_manager_array_methods(self, time_manager):
+        """TimeManager の配列版メソッドのテスト"""
+        times = np.arange('2024-01-01', '2024-01-03', dtype='datetime64[D]')
+        
+        julian_dates = time_manager.datetime_to_julian_array(times)
+        
+        np.testing.assert_array_equal(
+            julian_dates, [time_manager.datetime_to_julian(to_datetime(t)) for t in times]
+        )
+        assert time_manager.julian_to_datetime_array(julian_dates).shape == (2,)
\ No newline at end of file
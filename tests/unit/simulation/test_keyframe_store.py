@@ -0,0 +1,252 @@
+"""
+キーフレームによるN体計算のタイムライン移動のテスト
+"""
+
+import pytest
+import numpy as np
+from datetime import datetime, timezone
+from src.domain.solar_system import SolarSystem
+from src.domain.sun import Sun
+from src.domain.planet import Planet
+from src.domain.orbital_elements import OrbitalElements
+from src.simulation.drift_monitor import DriftMonitor
+from src.simulation.encounter_detector import EncounterDetector
+from src.simulation.keyframe_store import Keyframe, KeyframeStore, NBodyTimeline, SECONDS_PER_DAY
+from src.simulation.physics_engine import PhysicsEngine
+from src.simulation.simulation_worker import SimulationWorker
+from src.simulation.time_manager import TimeManager
+
+
+AU = 1.495978707e8  # km
+SUN_MASS = 1.989e30
+EARTH_MASS = 5.972e24
+MARS_MASS = 6.417e23
+
+
+def _initial_state():
+    """太陽・地球・火星の円軌道の初期状態"""
+    positions = np.array([[0.0, 0.0, 0.0], [AU, 0.0, 0.0], [0.0, 1.524 * AU, 0.0]])
+    velocities = np.array([[0.0, 0.0, 0.0], [0.0, 29.78, 0.0], [-24.07, 0.0, 0.0]])
+    masses = np.array([SUN_MASS, EARTH_MASS, MARS_MASS])
+    return positions, velocities, masses
+
+
+def _keyframe(step: int) -> Keyframe:
+    """テスト用のキーフレーム（ステップ = ユリウス日）"""
+    return Keyframe(step=step, julian_date=float(step),
+                    positions=np.zeros((3, 3)), velocities=np.zeros((3, 3)),
+                    integrator_state={})
+
+
+@pytest.fixture
+def solar_system(earth_data, j2000_epoch):
+    """J2000の軌道要素による位置に更新した太陽と地球の太陽系"""
+    solar_system = SolarSystem()
+    solar_system.add_celestial_body(Sun(name="太陽", mass=1.989e30, radius=695700.0,
+                                        temperature=5778.0, luminosity=3.828e26))
+    solar_system.add_celestial_body(Planet(
+        name=earth_data["name"], mass=earth_data["mass"], radius=earth_data["radius"],
+        orbital_elements=OrbitalElements(**earth_data["orbital_elements"]),
+        color=earth_data["color"]
+    ))
+    solar_system.update_all_positions(j2000_epoch)
+    return solar_system
+
+
+@pytest.fixture
+def timeline(j2000_epoch):
+    """J2000から1日ステップのタイムライン"""
+    positions, velocities, masses = _initial_state()
+    return NBodyTimeline(PhysicsEngine(), positions, velocities, masses, j2000_epoch)
+
+
+class TestKeyframeStore:
+    """KeyframeStoreクラスのテスト"""
+    
+    def test_nearest_before(self):
+        """指定した時刻以前で最も新しいキーフレームの検索のテスト"""
+        store = KeyframeStore()
+        for step in (0, 1, 2, 3):
+            assert store.record(_keyframe(step))
+        
+        assert store.nearest_before(-0.5) is None
+        assert store.nearest_before(0.0).step == 0
+        assert store.nearest_before(2.5).step == 2
+        assert store.nearest_before(100.0).step == 3
+        assert store.latest.step == 3
+    
+    def test_thinning_keeps_within_budget(self):
+        """メモリ予算を超えた場合に間隔を広げて間引くかのテスト"""
+        budget = 20 * _keyframe(0).nbytes
+        store = KeyframeStore(memory_budget=budget)
+        for step in range(1000):
+            store.record(_keyframe(step))
+        
+        assert store.memory_usage <= budget
+        assert len(store) > 10
+        assert store.interval_steps > 1
+        assert store.evicted_count > 0
+        
+        steps = [keyframe.step for keyframe in store._keyframes]
+        assert steps[0] == 0
+        assert steps[-1] > 999 - 2 * store.interval_steps
+        assert all(step % store.interval_steps == 0 for step in steps[:-1])
+        
+        # 間隔の倍数以外と記録済みのステップは記録しない
+        assert not store.wants(store.interval_steps + 1)
+        assert not store.wants(0)
+    
+    def test_invalid_parameters(self):
+        """不正なパラメータのテスト"""
+        with pytest.raises(ValueError):
+            KeyframeStore(memory_budget=0)
+        with pytest.raises(ValueError):
+            KeyframeStore(interval_steps=0)
+
+
+class TestNBodyTimeline:
+    """NBodyTimelineクラスのテスト"""
+    
+    def test_seek_matches_forward_integration(self, timeline, j2000_epoch):
+        """移動後の格子上の状態が前向きの積分とビット単位で一致するかのテスト"""
+        engine = PhysicsEngine()
+        positions, velocities, masses = _initial_state()
+        expected = {}
+        for day in range(1, 41):
+            positions, velocities = engine.integrate_arrays(positions, velocities, masses, SECONDS_PER_DAY)
+            expected[day] = (positions, velocities)
+        
+        timeline.seek(j2000_epoch + 40)
+        for day in (17, 3, 40, 25):
+            actual_positions, actual_velocities = timeline.seek(j2000_epoch + day)
+            np.testing.assert_array_equal(actual_positions, expected[day][0])
+            np.testing.assert_array_equal(actual_velocities, expected[day][1])
+        
+        assert timeline.restore_count > 0
+        assert timeline.integrated_steps == 40
+    
+    def test_seek_between_grid_points(self, timeline, j2000_epoch):
+        """格子の間の時刻への移動のテスト"""
+        positions, _ = timeline.seek(j2000_epoch + 10.5)
+        grid_positions, grid_velocities = timeline.seek(j2000_epoch + 10)
+        
+        # 直前の格子上の状態から端数だけ積分した状態と一致する
+        expected, _ = PhysicsEngine().integrate_arrays(grid_positions, grid_velocities,
+                                                       timeline.masses, 0.5 * SECONDS_PER_DAY)
+        np.testing.assert_allclose(positions, expected, rtol=1e-12)
+        assert timeline.julian_date == j2000_epoch + 10
+        
+        # 端数のステップは格子上の積分に影響しない
+        again, _ = timeline.seek(j2000_epoch + 10.5)
+        np.testing.assert_array_equal(again, positions)
+    
+    def test_seek_observes_each_step_once(self, j2000_epoch):
+        """前後への移動で監視・検出に各格子のステップが1回だけ通知されるかのテスト"""
+        engine = PhysicsEngine()
+        engine.integration_method = "leapfrog"
+        monitor = engine.attach_drift_monitor(DriftMonitor(sample_interval=1))
+        detector = engine.attach_encounter_detector(EncounterDetector(encounter_distance=1.0e6))
+        positions, velocities, masses = _initial_state()
+        timeline = NBodyTimeline(engine, positions[:2], velocities[:2], masses[:2], j2000_epoch)
+        
+        for day in (10.5, 3, 20):
+            timeline.seek(j2000_epoch + day)
+        
+        assert monitor.step_count == 20
+        assert monitor.elapsed_time == pytest.approx(20 * SECONDS_PER_DAY)
+        assert detector.step_count == 20
+        assert detector.elapsed_time == pytest.approx(20 * SECONDS_PER_DAY)
+    
+    def test_seek_before_origin(self, timeline, j2000_epoch):
+        """開始より前への移動のテスト"""
+        with pytest.raises(ValueError):
+            timeline.seek(j2000_epoch - 1.0)
+    
+    def test_seek_integrates_only_from_nearest_keyframe(self, j2000_epoch):
+        """移動で積分し直すのが直前のキーフレームからのステップのみかのテスト"""
+        positions, velocities, masses = _initial_state()
+        store = KeyframeStore(memory_budget=50 * 1024)
+        timeline = NBodyTimeline(PhysicsEngine(), positions, velocities, masses, j2000_epoch,
+                                 step_days=10.0, store=store)
+        timeline.seek(j2000_epoch + 20000)
+        
+        integrated = timeline.integrated_steps
+        timeline.seek(j2000_epoch + 7777)
+        
+        assert store.memory_usage <= store.memory_budget
+        assert timeline.integrated_steps - integrated < store.interval_steps
+    
+    def test_solar_system_is_updated(self, solar_system, j2000_epoch):
+        """移動後の状態が太陽系に書き込まれ、同じ時刻の更新で上書きされないかのテスト"""
+        timeline = NBodyTimeline.from_solar_system(solar_system, PhysicsEngine())
+        expected, _ = timeline.seek(j2000_epoch + 5)
+        
+        assert solar_system.current_date == j2000_epoch + 5
+        for body, position in zip(solar_system.get_all_bodies(), expected):
+            np.testing.assert_array_equal(body.position, position)
+        
+        # 書き込んだ位置は計算済みとして扱い、軌道要素による位置で上書きしない
+        solar_system.update_all_positions(j2000_epoch + 5)
+        assert solar_system.skipped_update_count == 1
+        for body, position in zip(solar_system.get_all_bodies(), expected):
+            np.testing.assert_array_equal(body.position, position)
+    
+    def test_initial_velocities_from_orbital_elements(self, solar_system, j2000_epoch):
+        """惑星の初速度が軌道要素から設定され、1年後も地球が約1 AUにあるかのテスト"""
+        timeline = NBodyTimeline.from_solar_system(solar_system, PhysicsEngine())
+        
+        assert np.linalg.norm(timeline.velocities[1]) > 29.0
+        positions, _ = timeline.seek(j2000_epoch + 365.25)
+        assert abs(np.linalg.norm(positions[1] - positions[0]) / AU - 1.0) < 0.05
+
+
+class TestTimeManagerTimeline:
+    """TimeManagerとタイムラインの連携のテスト"""
+    
+    def test_set_date_and_advance_seek(self, timeline, j2000_epoch):
+        """set_date / advance_by_days でタイムラインが移動するかのテスト"""
+        time_manager = TimeManager()
+        time_manager.current_julian_date = j2000_epoch
+        time_manager.attach_timeline(timeline)
+        
+        time_manager.advance_by_days(30.0)
+        assert timeline.julian_date == j2000_epoch + 30.0
+        
+        time_manager.set_date(datetime(2000, 1, 11, tzinfo=timezone.utc))
+        assert timeline.julian_date == time_manager.current_julian_date
+        
+        time_manager.detach_timeline()
+        time_manager.advance_by_days(1.0)
+        assert timeline.julian_date != time_manager.current_julian_date
+    
+    def test_seek_failure_keeps_date(self, timeline, j2000_epoch):
+        """移動できない日時を指定した場合に時刻が変わらないかのテスト"""
+        time_manager = TimeManager()
+        time_manager.current_julian_date = j2000_epoch
+        time_manager.attach_timeline(timeline)
+        
+        with pytest.raises(ValueError):
+            time_manager.set_date(datetime(1999, 1, 1, tzinfo=timezone.utc))
+        with pytest.raises(ValueError):
+            time_manager.advance_by_days(-10.0)
+        assert time_manager.current_julian_date == j2000_epoch
+    
+    def test_seek_survives_next_update_tick(self, solar_system, j2000_epoch):
+        """移動後の通常の更新ティックでN体計算の位置が保たれるかのテスト"""
+        time_manager = TimeManager()
+        time_manager.current_julian_date = j2000_epoch
+        time_manager.set_time_scale(86400.0)
+        timeline = time_manager.attach_timeline(NBodyTimeline.from_solar_system(solar_system, PhysicsEngine()))
+        worker = SimulationWorker(solar_system, time_manager)
+        
+        time_manager.advance_by_days(100.0)
+        snapshot = worker.step(0.1)
+        
+        assert snapshot.julian_date == pytest.approx(j2000_epoch + 100.1)
+        assert timeline.julian_date == snapshot.julian_date
+        np.testing.assert_array_equal(snapshot.position_of("地球"), timeline.positions[1])
+        
+        # 軌道要素による位置とは異なる（N体計算の位置が上書きされていない）
+        kepler = Planet.from_dict(solar_system.get_planet_by_name("地球").to_dict())
+        kepler.update_position(snapshot.julian_date)
+        assert not np.array_equal(kepler.position, timeline.positions[1])
\ No newline at end of file
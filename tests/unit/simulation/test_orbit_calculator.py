@@ -134,4 +134,163 @@ class TestOrbitCalculator:
         position_diff = np.linalg.norm(pos2 - pos1)
         orbit_radius = np.linalg.norm(pos1)
         
-        assert position_diff / orbit_radius < 0.1
\ No newline at end of file
+        assert position_diff / orbit_radius < 0.1
+    
+    def test_batch_matches_scalar(self, orbit_calculator, earth_elements):
+        """一括計算がスカラー計算と一致するかのテスト"""
+        elements_list = [
+            earth_elements,
+            OrbitalElements(
+                semi_major_axis=1.52371034,
+                eccentricity=0.0933941,
+                inclination=1.84969142,
+                longitude_of_ascending_node=49.55953891,
+                argument_of_perihelion=286.50210865,
+                mean_anomaly_at_epoch=19.39019754,
+                epoch=2451545.0
+            ),
+            OrbitalElements(
+                semi_major_axis=17.8,
+                eccentricity=0.967,
+                inclination=162.3,
+                longitude_of_ascending_node=58.4,
+                argument_of_perihelion=111.3,
+                mean_anomaly_at_epoch=38.4,
+                epoch=2446467.4
+            )
+        ]
+        julian_dates = np.linspace(2451545.0, 2451545.0 + 3650.0, 7)
+        
+        positions, velocities = orbit_calculator.calculate_positions_batch(
+            elements_list, julian_dates
+        )
+        
+        assert positions.shape == (3, 7, 3)
+        assert velocities.shape == (3, 7, 3)
+        
+        tolerance_km = 1e-9 * orbit_calculator.au_to_km
+        for body_index, elements in enumerate(elements_list):
+            for time_index, julian_date in enumerate(julian_dates):
+                position, velocity = orbit_calculator.calculate_position_velocity(
+                    elements, julian_date
+                )
+                assert np.allclose(positions[body_index, time_index], position,
+                                   rtol=0, atol=tolerance_km)
+                assert np.allclose(velocities[body_index, time_index], velocity,
+                                   rtol=1e-9, atol=1e-12)
+    
+    def test_batch_accepts_array_and_scalar_date(self, orbit_calculator, earth_elements):
+        """(N, 7) 配列とスカラー日付による一括計算テスト"""
+        table = np.array([list(earth_elements.to_dict().values())])
+        
+        positions, velocities = orbit_calculator.calculate_positions_batch(
+            table, 2451545.0
+        )
+        position, velocity = orbit_calculator.calculate_position_velocity(
+            earth_elements, 2451545.0
+        )
+        
+        assert positions.shape == (1, 1, 3)
+        assert np.allclose(positions[0, 0], position)
+        assert np.allclose(velocities[0, 0], velocity)
+        
+        with pytest.raises(ValueError):
+            orbit_calculator.calculate_positions_batch(np.zeros((2, 5)), 2451545.0)    
+    def test_cache_lru_eviction(self, orbit_calculator, earth_elements):
+        """LRUキャッシュが最も長く使われていないエントリを削除するかのテスト"""
+        orbit_calculator.configure_cache(max_entries=2)
+        
+        orbit_calculator.calculate_position_velocity(earth_elements, 2451545.0)
+        orbit_calculator.calculate_position_velocity(earth_elements, 2451546.0)
+        
+        # 最初のエントリを再利用して最近使用扱いにする
+        orbit_calculator.calculate_position_velocity(earth_elements, 2451545.0)
+        
+        # 3件目の追加で2件目が削除される
+        orbit_calculator.calculate_position_velocity(earth_elements, 2451547.0)
+        
+        stats = orbit_calculator.get_cache_stats()
+        assert stats["cache_size"] == 2
+        assert stats["cache_eviction_count"] == 1
+        
+        hits_before = orbit_calculator.cache_hit_count
+        orbit_calculator.calculate_position_velocity(earth_elements, 2451545.0)
+        assert orbit_calculator.cache_hit_count == hits_before + 1
+        
+        orbit_calculator.calculate_position_velocity(earth_elements, 2451546.0)
+        assert orbit_calculator.cache_hit_count == hits_before + 1
+    
+    def test_cache_byte_limit(self, orbit_calculator, earth_elements):
+        """バイト数上限によるキャッシュ削除のテスト"""
+        entry_bytes = 2 * 3 * 8 + OrbitCalculator.CACHE_ENTRY_OVERHEAD_BYTES
+        orbit_calculator.configure_cache(max_bytes=entry_bytes * 3)
+        
+        for day in range(10):
+            orbit_calculator.calculate_position_velocity(earth_elements, 2451545.0 + day)
+        
+        stats = orbit_calculator.get_cache_stats()
+        assert stats["cache_size"] == 3
+        assert stats["cache_bytes"] <= stats["cache_max_bytes"]
+        assert stats["cache_eviction_count"] == 7
+    
+    def test_cache_configured_from_config_manager(self, earth_elements):
+        """設定ファイルのキャッシュ設定が反映されるかのテスト"""
+        settings = {"data.cache_size_mb": 2, "data.cache_enabled": False}
+        
+        class StubConfigManager:
+            def get(self, key, default=None):
+                return settings.get(key, default)
+        
+        calculator = OrbitCalculator(config_manager=StubConfigManager())
+        assert calculator.cache_max_bytes == 2 * 1024 * 1024
+        assert calculator.cache_enabled is False
+        
+        calculator.calculate_position_velocity(earth_elements, 2451545.0)
+        calculator.calculate_position_velocity(earth_elements, 2451545.0)
+        assert calculator.get_cache_stats()["cache_size"] == 0
+    
+    def test_cache_hit_latency_stats(self, orbit_calculator, earth_elements):
+        """ヒット時の検索時間統計のテスト"""
+        orbit_calculator.calculate_position_velocity(earth_elements, 2451545.0)
+        for _ in range(5):
+            orbit_calculator.calculate_position_velocity(earth_elements, 2451545.0)
+        
+        stats = orbit_calculator.get_cache_stats()
+        assert stats["cache_hit_count"] == 5
+        assert stats["average_hit_latency_us"] > 0
+        
+        orbit_calculator.clear_cache()
+        stats = orbit_calculator.get_cache_stats()
+        assert stats["cache_eviction_count"] == 0
+        assert stats["average_hit_latency_us"] == 0.0    
+    def test_cache_invalidated_when_elements_change(self, orbit_calculator, earth_elements):
+        """軌道要素の変更後にキャッシュの古い結果が返されないかのテスト"""
+        position_before, _ = orbit_calculator.calculate_position_velocity(
+            earth_elements, 2451545.0
+        )
+        
+        earth_elements.inclination = 30.0
+        position_after, _ = orbit_calculator.calculate_position_velocity(
+            earth_elements, 2451545.0
+        )
+        
+        assert not np.allclose(position_before, position_after)
+        assert orbit_calculator.cache_miss_count == 2
+    
+    def test_kepler_warm_start_statistics(self, orbit_calculator, earth_elements):
+        """ケプラー方程式のウォームスタートと反復回数統計のテスト"""
+        orbit_calculator.cache_enabled = False
+        
+        for step in range(10):
+            orbit_calculator.calculate_position_velocity(earth_elements, 2451545.0 + step * 0.1)
+        
+        stats = orbit_calculator.get_cache_stats()
+        assert stats['kepler_solve_count'] == 10
+        assert stats['kepler_warm_start_count'] == 9
+        assert stats['kepler_iteration_total'] > 0
+        assert 0 < stats['average_kepler_iterations'] < 4
+        
+        # ウォームスタートの結果はコールドスタートと一致する
+        warm_position, _ = orbit_calculator.calculate_position_velocity(earth_elements, 2451545.95)
+        cold_position, _ = OrbitCalculator().calculate_position_velocity(earth_elements, 2451545.95)
+        np.testing.assert_allclose(warm_position, cold_position, rtol=0, atol=1e-6)
\ No newline at end of file
@@ -0,0 +1,127 @@
+"""
+加速度計算のマルチプロセス化のテスト
+"""
+
+import pytest
+import numpy as np
+from src.simulation.parallel_forces import ForceWorkerPool
+from src.simulation.physics_engine import PhysicsEngine
+
+
+@pytest.fixture(scope="module")
+def force_pool():
+    """2ワーカーのプロセスプール（起動に時間がかかるためモジュールで共有）"""
+    pool = ForceWorkerPool(2)
+    yield pool
+    pool.close()
+
+
+class TestForceWorkerPool:
+    """共有メモリを使うプロセスプールのテスト"""
+    
+    @pytest.fixture
+    def bodies(self):
+        """ランダムな天体群 (位置 km, 質量 kg)"""
+        rng = np.random.default_rng(11)
+        return rng.uniform(-1e8, 1e8, (301, 3)), rng.uniform(1e20, 1e26, 301)
+    
+    def test_direct_matches_serial(self, force_pool, bodies):
+        """並列計算の直接和が逐次計算と一致することのテスト"""
+        positions, masses = bodies
+        engine = PhysicsEngine()
+        gm = engine.gravitational_constant * 1e-9 * masses
+        
+        accelerations = force_pool.direct_accelerations(positions, gm, 0.0)
+        
+        np.testing.assert_array_equal(accelerations, engine.calculate_accelerations(positions, masses))
+        assert force_pool.is_running
+    
+    def test_test_particles_match_serial(self, force_pool, bodies):
+        """並列計算の試験粒子の加速度が逐次計算と一致することのテスト"""
+        positions, masses = bodies
+        engine = PhysicsEngine()
+        gm = engine.gravitational_constant * 1e-9 * masses[:9]
+        particles = np.random.default_rng(5).uniform(-1e8, 1e8, (1001, 3))
+        
+        accelerations = force_pool.test_particle_accelerations(particles, positions[:9], gm, 0.0)
+        
+        np.testing.assert_array_equal(
+            accelerations,
+            engine.calculate_test_particle_accelerations(particles, positions[:9], masses[:9])
+        )
+    
+    def test_buffers_grow(self, force_pool, bodies):
+        """天体数が増えた場合に共有メモリを確保し直すことのテスト"""
+        positions, masses = bodies
+        engine = PhysicsEngine()
+        
+        small = force_pool.direct_accelerations(positions[:10], masses[:10] * 6.67430e-20, 0.0)
+        large = force_pool.direct_accelerations(
+            np.tile(positions, (4, 1)) + np.repeat(np.arange(4), 301)[:, np.newaxis] * 1e3,
+            np.tile(masses, 4) * 6.67430e-20, 0.0
+        )
+        
+        assert large.shape == (1204, 3)
+        np.testing.assert_allclose(small, engine.calculate_accelerations(positions[:10], masses[:10]))
+    
+    def test_worker_error_propagates(self, force_pool):
+        """ワーカーでの計算エラーが呼び出し元に伝わることのテスト"""
+        positions = np.zeros((4, 3))
+        
+        with pytest.raises(ValueError, match="距離がゼロ"):
+            force_pool.direct_accelerations(positions, np.ones(4), 0.0)
+        
+        # エラー後も継続して使用できる
+        accelerations = force_pool.direct_accelerations(positions, np.ones(4), 1.0)
+        np.testing.assert_array_equal(accelerations, 0.0)
+
+
+class TestPhysicsEngineParallel:
+    """物理エンジンの並列化設定のテスト"""
+    
+    def test_configure_from_config(self, mocker):
+        """設定からの並列化構成のテスト"""
+        engine = PhysicsEngine()
+        config_manager = mocker.Mock()
+        config_manager.get.side_effect = lambda key, default=None: {
+            "performance.multi_threading": True,
+            "performance.worker_count": 3
+        }.get(key, default)
+        
+        assert engine.configure_parallel_from_config(config_manager) == 3
+        assert engine.force_pool is None  # 最初の大規模計算まで起動しない
+        
+        assert engine.configure_parallel(False) == 0
+        assert engine.configure_parallel(True, worker_count=1) == 0
+    
+    def test_small_systems_stay_serial(self, mocker):
+        """相互作用数が少ない場合はプロセスプールを使わないことのテスト"""
+        engine = PhysicsEngine()
+        engine.configure_parallel(True, worker_count=2)
+        
+        engine.calculate_accelerations(np.random.default_rng(0).uniform(-1e8, 1e8, (10, 3)), np.ones(10))
+        
+        assert engine.force_pool is None
+    
+    def test_integration_uses_pool(self):
+        """閾値以上の計算でプロセスプールを使い、逐次計算と同じ結果になることのテスト"""
+        rng = np.random.default_rng(2)
+        positions = rng.uniform(-1e8, 1e8, (64, 3))
+        velocities = rng.uniform(-10.0, 10.0, (64, 3))
+        masses = rng.uniform(1e20, 1e26, 64)
+        
+        serial = PhysicsEngine()
+        parallel = PhysicsEngine()
+        parallel.PARALLEL_MIN_PAIRS = 1
+        parallel.configure_parallel(True, worker_count=2)
+        try:
+            expected = serial.integrate_rk4_arrays(positions, velocities, masses, 3600.0)
+            result = parallel.integrate_rk4_arrays(positions, velocities, masses, 3600.0)
+            
+            assert parallel.force_pool.dispatch_count >= 4
+        finally:
+            parallel.shutdown_parallel()
+        
+        np.testing.assert_array_equal(result[0], expected[0])
+        np.testing.assert_array_equal(result[1], expected[1])
+        assert parallel.force_pool is None
\ No newline at end of file
@@ -6,6 +6,7 @@ import pytest
 import numpy as np
 from src.simulation.physics_engine import PhysicsEngine
 from src.domain.celestial_body import CelestialBody
+from src.domain.massless_particles import MasslessParticleSet
 
 
 class MockCelestialBody(CelestialBody):
@@ -117,6 +118,41 @@ class TestPhysicsEngine:
         with pytest.raises(ValueError, match="離心率"):
             physics_engine.solve_kepler_equation(mean_anomaly, -0.1)
     
+    def test_solve_kepler_equation_warm_start(self, physics_engine):
+        """前回の解からのウォームスタートのテスト"""
+        eccentricity = 0.2056
+        
+        physics_engine.solve_kepler_equation(1.0, eccentricity, body_name="水星")
+        cold_iterations = physics_engine.last_kepler_iterations
+        
+        eccentric_anomaly = physics_engine.solve_kepler_equation(1.001, eccentricity, body_name="水星")
+        
+        assert abs(eccentric_anomaly - eccentricity * np.sin(eccentric_anomaly) - 1.001) < 1e-12
+        assert physics_engine.last_kepler_iterations < cold_iterations
+        
+        stats = physics_engine.get_kepler_stats()
+        assert stats['kepler_solve_count'] == 2
+        assert stats['kepler_iteration_total'] == cold_iterations + physics_engine.last_kepler_iterations
+    
+    def test_solve_kepler_equation_warm_start_wraparound(self, physics_engine):
+        """平均近点角が2πで折り返す場合のウォームスタートのテスト"""
+        eccentricity = 0.5
+        
+        physics_engine.solve_kepler_equation(2 * np.pi - 0.001, eccentricity, body_name="test")
+        eccentric_anomaly = physics_engine.solve_kepler_equation(0.001, eccentricity, body_name="test")
+        
+        cold = physics_engine.solve_kepler_equation(0.001, eccentricity)
+        assert abs(eccentric_anomaly - cold) < 1e-12
+    
+    def test_solve_kepler_equation_high_eccentricity(self, physics_engine):
+        """高離心率（ハレー法）での収束テスト"""
+        eccentricity = 0.99
+        
+        for mean_anomaly in np.linspace(0.001, 2 * np.pi - 0.001, 50):
+            eccentric_anomaly = physics_engine.solve_kepler_equation(mean_anomaly, eccentricity)
+            residual = eccentric_anomaly - eccentricity * np.sin(eccentric_anomaly) - mean_anomaly
+            assert abs(residual) < 1e-10
+    
     def test_calculate_orbital_velocity(self, physics_engine):
         """軌道速度計算のテスト"""
         # 地球軌道での円軌道速度
@@ -173,6 +209,222 @@ class TestPhysicsEngine:
         position_change = np.linalg.norm(earth_mock.position - initial_position)
         assert position_change > 1.0  # 1km以上移動
     
+    def test_calculate_accelerations_matches_pairwise(self, physics_engine):
+        """一括加速度計算が天体ごとの重力計算と一致することのテスト"""
+        rng = np.random.default_rng(1)
+        bodies = []
+        for i in range(6):
+            body = MockCelestialBody(f"Body{i}", rng.uniform(1e22, 1e30), 1000.0)
+            body.position = rng.uniform(-3e8, 3e8, 3)
+            bodies.append(body)
+        
+        positions = np.array([body.position for body in bodies])
+        masses = np.array([body.mass for body in bodies])
+        accelerations = physics_engine.calculate_accelerations(positions, masses)
+        
+        for i, body in enumerate(bodies):
+            expected = physics_engine.calculate_total_force(body, bodies) / 1000  # m/s² -> km/s²
+            np.testing.assert_allclose(accelerations[i], expected, rtol=1e-12)
+    
+    def test_calculate_accelerations_block_split(self, physics_engine):
+        """行ブロック分割しても結果が変わらないことのテスト"""
+        rng = np.random.default_rng(2)
+        positions = rng.uniform(-1e8, 1e8, (50, 3))
+        masses = rng.uniform(1e20, 1e25, 50)
+        
+        expected = physics_engine.calculate_accelerations(positions, masses)
+        physics_engine.ACCELERATION_BLOCK_PAIRS = 120
+        np.testing.assert_allclose(
+            physics_engine.calculate_accelerations(positions, masses), expected, rtol=1e-13
+        )
+    
+    def test_calculate_accelerations_softening(self, physics_engine):
+        """軟化長による加速度の抑制とゼロ距離のテスト"""
+        positions = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [1000.0, 0.0, 0.0]])
+        masses = np.array([1e24, 1e24, 1e24])
+        
+        with pytest.raises(ValueError, match="距離がゼロ"):
+            physics_engine.calculate_accelerations(positions, masses)
+        
+        softened = physics_engine.calculate_accelerations(positions, masses, softening_length=100.0)
+        assert np.all(np.isfinite(softened))
+        
+        # 軟化長を属性で指定した場合も同じ結果
+        physics_engine.softening_length = 100.0
+        np.testing.assert_array_equal(
+            physics_engine.calculate_accelerations(positions, masses), softened
+        )
+    
+    def test_rk4_integration_circular_orbit(self, physics_engine, earth_mock, sun_mock):
+        """RK4積分で円軌道の半径が保たれることのテスト"""
+        bodies = [earth_mock, sun_mock]
+        
+        for _ in range(30):
+            physics_engine.integrate_motion_rk4(bodies, 86400.0)
+        
+        distance = np.linalg.norm(earth_mock.position - sun_mock.position)
+        assert abs(distance - 149597870.7) / 149597870.7 < 1e-3
+        
+        # 運動量は保存される
+        momentum = earth_mock.mass * earth_mock.velocity + sun_mock.mass * sun_mock.velocity
+        initial_momentum = earth_mock.mass * np.array([0.0, 29.78, 0.0])
+        np.testing.assert_allclose(momentum, initial_momentum, rtol=0,
+                                   atol=1e-9 * np.linalg.norm(initial_momentum))
+    
+    @staticmethod
+    def _jupiter_system():
+        """太陽・地球・木星の配列状態"""
+        positions = np.array([
+            [0.0, 0.0, 0.0],
+            [149597870.7, 0.0, 0.0],
+            [-778.57e6, 0.0, 0.0]
+        ])
+        velocities = np.array([
+            [0.0, 0.0, 0.0],
+            [0.0, 29.78, 0.0],
+            [0.0, -13.06, 0.0]
+        ])
+        masses = np.array([1.989e30, 5.972e24, 1.898e27])
+        return positions, velocities, masses
+    
+    @pytest.mark.parametrize("method", ["leapfrog", "wisdom_holman"])
+    def test_symplectic_energy_drift(self, physics_engine, method):
+        """シンプレクティック積分法のエネルギー誤差がRK4より小さいことのテスト"""
+        bodies = []
+        for name, position, velocity, mass in zip(["Sun", "Earth", "Jupiter"], *self._jupiter_system()):
+            body = MockCelestialBody(name, mass, 1000.0)
+            body.position = position
+            body.velocity = velocity
+            bodies.append(body)
+        
+        def energy_drift(integration_method):
+            engine = PhysicsEngine()
+            engine.set_integration_method(integration_method)
+            states = [(body.position.copy(), body.velocity.copy()) for body in bodies]
+            engine.reset_energy_reference(bodies)
+            
+            # 10日ステップで100年間（10ステップごとに誤差を記録）
+            max_drift = 0.0
+            for step in range(3652):
+                engine.integrate_motion(bodies, 10 * 86400.0)
+                if step % 10 == 0:
+                    max_drift = max(max_drift, abs(engine.get_energy_drift(bodies)))
+            
+            for body, (position, velocity) in zip(bodies, states):
+                body.position = position
+                body.velocity = velocity
+            return max_drift
+        
+        symplectic_drift = energy_drift(method)
+        rk4_drift = energy_drift("rk4")
+        
+        assert symplectic_drift < 1e-5
+        assert symplectic_drift < rk4_drift
+    
+    def test_wisdom_holman_two_body_exact(self, physics_engine):
+        """2体問題ではWisdom–Holman法がケプラー運動と一致することのテスト"""
+        positions = np.array([[0.0, 0.0, 0.0], [1.0e8, 0.0, 0.0]])
+        velocities = np.array([[0.0, 0.0, 0.0], [0.0, 40.0, 5.0]])
+        masses = np.array([1.989e30, 1.0])
+        
+        wh_positions, wh_velocities = positions, velocities
+        for _ in range(10):
+            wh_positions, wh_velocities = physics_engine.integrate_wisdom_holman_arrays(
+                wh_positions, wh_velocities, masses, 86400.0
+            )
+        
+        rk4_positions, rk4_velocities = positions, velocities
+        for _ in range(1000):
+            rk4_positions, rk4_velocities = physics_engine.integrate_rk4_arrays(
+                rk4_positions, rk4_velocities, masses, 864.0
+            )
+        
+        np.testing.assert_allclose(wh_positions[1], rk4_positions[1], rtol=0, atol=1.0)
+        np.testing.assert_allclose(wh_velocities[1], rk4_velocities[1], rtol=0, atol=1e-6)
+    
+    def test_wisdom_holman_unbound_orbit(self, physics_engine):
+        """束縛されていない軌道でのエラーテスト"""
+        positions = np.array([[0.0, 0.0, 0.0], [1.0e8, 0.0, 0.0]])
+        velocities = np.array([[0.0, 0.0, 0.0], [0.0, 100.0, 0.0]])
+        masses = np.array([1.989e30, 1.0])
+        
+        with pytest.raises(ValueError, match="束縛"):
+            physics_engine.integrate_wisdom_holman_arrays(positions, velocities, masses, 86400.0)
+    
+    def test_leapfrog_reuses_accelerations(self, physics_engine, mocker):
+        """リープフロッグ法が前ステップの加速度を再利用することのテスト"""
+        positions, velocities, masses = self._jupiter_system()
+        spy = mocker.spy(physics_engine, 'calculate_accelerations')
+        
+        for _ in range(5):
+            positions, velocities = physics_engine.integrate_leapfrog_arrays(
+                positions, velocities, masses, 86400.0
+            )
+        
+        assert spy.call_count == 6
+    
+    def test_test_particle_accelerations(self, physics_engine):
+        """試験粒子の加速度が質量ゼロの天体として計算した値と一致することのテスト"""
+        rng = np.random.default_rng(3)
+        massive_positions = rng.uniform(-1e8, 1e8, (5, 3))
+        masses = rng.uniform(1e24, 1e30, 5)
+        particle_positions = rng.uniform(-1e8, 1e8, (200, 3))
+        
+        accelerations = physics_engine.calculate_test_particle_accelerations(
+            particle_positions, massive_positions, masses
+        )
+        expected = physics_engine.calculate_accelerations(
+            np.vstack([massive_positions, particle_positions]),
+            np.concatenate([masses, np.zeros(200)])
+        )[5:]
+        
+        np.testing.assert_allclose(accelerations, expected, rtol=1e-12)
+        
+        with pytest.raises(ValueError, match="距離がゼロ"):
+            physics_engine.calculate_test_particle_accelerations(
+                massive_positions[:1], massive_positions, masses
+            )
+    
+    def test_integrate_motion_with_test_particles(self, physics_engine, sun_mock, earth_mock):
+        """試験粒子が天体の運動に影響せず円軌道を保つことのテスト"""
+        reference_sun = MockCelestialBody("Sun", sun_mock.mass, sun_mock.radius)
+        reference_earth = MockCelestialBody("Earth", earth_mock.mass, earth_mock.radius)
+        reference_earth.position = earth_mock.position.copy()
+        reference_earth.velocity = earth_mock.velocity.copy()
+        
+        # 2.5AUの円軌道の試験粒子（2チャンク）
+        radius = 2.5 * physics_engine.au_to_km
+        speed = np.sqrt(physics_engine.gravitational_constant * 1e-9 * sun_mock.mass / radius)
+        angles = np.linspace(0, 2 * np.pi, 10, endpoint=False)
+        particles = MasslessParticleSet(chunk_size=6)
+        particles.add_particles(
+            radius * np.column_stack([np.cos(angles), np.sin(angles), np.zeros(10)]),
+            speed * np.column_stack([-np.sin(angles), np.cos(angles), np.zeros(10)])
+        )
+        
+        for _ in range(100):
+            physics_engine.integrate_motion([sun_mock, earth_mock], 86400.0, test_particles=particles)
+            physics_engine.integrate_motion([reference_sun, reference_earth], 86400.0)
+        
+        np.testing.assert_array_equal(earth_mock.position, reference_earth.position)
+        radii = np.linalg.norm(particles.get_positions() - sun_mock.position, axis=1)
+        np.testing.assert_allclose(radii, radius, rtol=1e-3)
+    
+    def test_test_particle_accelerations_reused(self, physics_engine, sun_mock, mocker):
+        """ステップ終了時の加速度が次ステップで再利用されることのテスト"""
+        particles = MasslessParticleSet(chunk_size=4)
+        particles.add_particles(
+            np.array([[1.5e8 + 1e6 * i, 0.0, 0.0] for i in range(6)]),
+            np.tile([0.0, 29.0, 0.0], (6, 1))
+        )
+        spy = mocker.spy(physics_engine, 'calculate_test_particle_accelerations')
+        
+        for _ in range(5):
+            physics_engine.integrate_motion([sun_mock], 3600.0, test_particles=particles)
+        
+        # 初回のみ開始時と終了時、以降は終了時のみ（2チャンク）
+        assert spy.call_count == 2 * (2 + 4)
+    
     def test_set_integration_method(self, physics_engine):
         """積分法設定のテスト"""
         # 有効な積分法
@@ -182,6 +434,12 @@ class TestPhysicsEngine:
         physics_engine.set_integration_method("euler")
         assert physics_engine.integration_method == "euler"
         
+        physics_engine.set_integration_method("leapfrog")
+        assert physics_engine.integration_method == "leapfrog"
+        
+        physics_engine.set_integration_method("wisdom_holman")
+        assert physics_engine.integration_method == "wisdom_holman"
+        
         # 無効な積分法
         with pytest.raises(ValueError, match="無効な積分法"):
             physics_engine.set_integration_method("invalid")
@@ -0,0 +1,193 @@
+"""
+シミュレーションワーカーのテスト
+"""
+
+import time
+import pytest
+import numpy as np
+from src.domain.solar_system import SolarSystem
+from src.domain.planet import Planet
+from src.domain.orbital_elements import OrbitalElements
+from src.simulation.simulation_worker import SimulationWorker, SnapshotBuffer
+from src.simulation.time_manager import TimeManager
+
+
+@pytest.fixture
+def solar_system(earth_data, mars_data):
+    """地球と火星の太陽系"""
+    solar_system = SolarSystem()
+    for data in (earth_data, mars_data):
+        solar_system.add_celestial_body(Planet(
+            name=data["name"],
+            mass=data["mass"],
+            radius=data["radius"],
+            orbital_elements=OrbitalElements(**data["orbital_elements"]),
+            color=data["color"]
+        ))
+    return solar_system
+
+
+@pytest.fixture
+def time_manager(j2000_epoch):
+    """J2000に設定した時間管理（1秒で1日進む）"""
+    time_manager = TimeManager()
+    time_manager.current_julian_date = j2000_epoch
+    time_manager.set_time_scale(86400.0)
+    return time_manager
+
+
+class TestSnapshotBuffer:
+    """SnapshotBufferクラスのテスト"""
+    
+    def test_publish_and_consume(self):
+        """公開したスナップショットの読み出しのテスト"""
+        buffer = SnapshotBuffer()
+        assert buffer.latest is None
+        assert buffer.consume() is None
+        
+        positions = np.ones((2, 3))
+        snapshot = buffer.publish(2451545.0, ("a", "b"), positions)
+        positions[:] = 5.0
+        
+        assert buffer.latest is snapshot
+        assert snapshot.sequence == 1
+        assert np.all(snapshot.positions == 1.0)
+        assert not snapshot.positions.flags.writeable
+        np.testing.assert_array_equal(snapshot.position_of("b"), [1.0, 1.0, 1.0])
+        assert snapshot.position_of("c") is None
+        
+        assert buffer.consume() is snapshot
+        assert buffer.consume(snapshot.sequence) is None
+    
+    def test_skipped_snapshots_are_counted(self):
+        """読み出されなかったスナップショット数のテスト"""
+        buffer = SnapshotBuffer()
+        buffer.publish(0.0, (), np.empty((0, 3)))
+        first = buffer.consume()
+        for day in range(1, 4):
+            buffer.publish(float(day), (), np.empty((0, 3)))
+        
+        latest = buffer.consume(first.sequence)
+        
+        assert latest.julian_date == 3.0
+        assert buffer.skipped_count == 2
+        assert buffer.consumed_count == 2
+
+
+class TestSimulationWorker:
+    """SimulationWorkerクラスのテスト"""
+    
+    def test_step_advances_and_publishes(self, solar_system, time_manager, j2000_epoch):
+        """1ステップで時間を進めて位置を公開するかのテスト"""
+        worker = SimulationWorker(solar_system, time_manager)
+        
+        snapshot = worker.step(0.1)
+        
+        assert snapshot.julian_date == pytest.approx(j2000_epoch + 0.1)
+        assert snapshot.names == ("地球", "火星")
+        np.testing.assert_array_equal(snapshot.position_of("地球"),
+                                      solar_system.get_planet_by_name("地球").position)
+        
+        # 公開後に太陽系が更新されてもスナップショットは変わらない
+        published = snapshot.positions.copy()
+        worker.step(0.1)
+        np.testing.assert_array_equal(snapshot.positions, published)
+    
+    def test_paused_step_publishes_only_on_change(self, solar_system, time_manager, j2000_epoch):
+        """一時停止中は時刻が変わった場合のみ公開するかのテスト"""
+        worker = SimulationWorker(solar_system, time_manager)
+        worker.step(0.1)
+        time_manager.pause()
+        
+        assert worker.step(0.1) is None
+        assert worker.buffer.published_count == 1
+        
+        time_manager.current_julian_date = j2000_epoch + 10.0
+        snapshot = worker.step(0.1)
+        assert snapshot.julian_date == j2000_epoch + 10.0
+    
+    def test_large_real_time_gap_is_capped(self, solar_system, time_manager, j2000_epoch):
+        """実経過時間が大きい場合に進める時間が制限されるかのテスト"""
+        worker = SimulationWorker(solar_system, time_manager)
+        
+        snapshot = worker.step(30.0)
+        
+        assert snapshot.julian_date == pytest.approx(j2000_epoch + SimulationWorker.MAX_STEP_SECONDS)
+    
+    def test_thread_publishes_snapshots(self, solar_system, time_manager, j2000_epoch):
+        """ワーカースレッドが定期的に公開するかのテスト"""
+        worker = SimulationWorker(solar_system, time_manager, interval=0.005)
+        worker.start()
+        try:
+            assert worker.buffer.latest is not None
+            deadline = time.monotonic() + 5.0
+            while worker.buffer.published_count < 5 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            worker.stop()
+        
+        assert not worker.is_running
+        assert worker.buffer.published_count >= 5
+        assert worker.buffer.latest.julian_date > j2000_epoch
+        assert worker.error_count == 0
+    
+    def test_reading_does_not_wait_for_slow_step(self, solar_system, time_manager, mocker):
+        """位置計算が遅くても読み出しが待たされないかのテスト"""
+        original = solar_system.update_all_positions
+        
+        def slow_update(julian_date):
+            time.sleep(0.2)
+            original(julian_date)
+        
+        worker = SimulationWorker(solar_system, time_manager, interval=0.001)
+        worker.start()
+        mocker.patch.object(solar_system, 'update_all_positions', side_effect=slow_update)
+        try:
+            time.sleep(0.05)
+            started = time.perf_counter()
+            for _ in range(100):
+                snapshot = worker.buffer.latest
+            elapsed = time.perf_counter() - started
+        finally:
+            worker.stop()
+        
+        assert snapshot is not None
+        assert elapsed < 0.05
+    
+    def test_invalid_interval(self, solar_system, time_manager):
+        """不正な更新間隔のテスト"""
+        with pytest.raises(ValueError):
+            SimulationWorker(solar_system, time_manager, interval=0.0)
+    
+    def test_snapshot_interpolation(self):
+        """直前の状態との補間位置のテスト"""
+        buffer = SnapshotBuffer()
+        buffer.publish(10.0, ("a",), np.zeros((1, 3)))
+        snapshot = buffer.publish(11.0, ("a",), np.ones((1, 3)), render_julian_date=10.25)
+        
+        assert snapshot.previous_julian_date == 10.0
+        assert snapshot.display_julian_date == 10.25
+        np.testing.assert_allclose(snapshot.interpolated_positions(), [[0.25, 0.25, 0.25]])
+        
+        # 描画日時を指定しない場合は補間しない
+        latest = buffer.publish(12.0, ("a",), np.full((1, 3), 2.0))
+        assert latest.interpolated_positions() is latest.positions
+        
+        # 描画時に指定したユリウス日で補間（範囲外は制限）
+        np.testing.assert_allclose(latest.interpolated_positions(11.5), [[1.5, 1.5, 1.5]])
+        assert latest.clamp_julian_date(12.5) == 12.0
+        assert latest.clamp_julian_date(10.0) == 11.0
+    
+    def test_fixed_step_mode(self, solar_system, time_manager, j2000_epoch):
+        """TimeManager.tick() による固定ステップでの公開のテスト"""
+        clock = iter([100.0, 100.25])
+        time_manager._clock = lambda: next(clock)
+        time_manager.configure_fixed_step(0.1)
+        worker = SimulationWorker(solar_system, time_manager)
+        
+        # 最初の tick は時計を開始するだけで、初期状態を公開
+        assert worker.step().julian_date == j2000_epoch
+        snapshot = worker.step()
+        
+        assert snapshot.julian_date == pytest.approx(j2000_epoch + 0.2)
+        assert snapshot.display_julian_date == pytest.approx(j2000_epoch + 0.15)
\ No newline at end of file
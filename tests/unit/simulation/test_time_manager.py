@@ -317,4 +317,106 @@ class TestTimeManager:
         
         # より緩い精度要求（実装の制約により1日以内）
         time_diff = abs((converted_time - precise_time).total_seconds())
-        assert time_diff < 86400.0  # 1日以内
\ No newline at end of file
+        assert time_diff < 86400.0  # 1日以内
+
+class TestFixedStepClock:
+    """固定ステップの時計（tick）のテスト"""
+    
+    @pytest.fixture
+    def time_manager(self):
+        """J2000、1秒で1日進む、0.1秒ステップの時間管理"""
+        time_manager = TimeManager()
+        time_manager.current_julian_date = 2451545.0
+        time_manager.set_time_scale(86400.0)
+        time_manager.configure_fixed_step(0.1, max_catch_up_steps=3)
+        return time_manager
+    
+    def test_first_tick_starts_clock(self, time_manager):
+        """最初の tick では時間が進まないかのテスト"""
+        assert time_manager.tick(now=100.0) == 0
+        assert time_manager.current_julian_date == 2451545.0
+    
+    def test_advances_in_exact_steps(self, time_manager):
+        """実経過時間が固定ステップ単位で進むかのテスト"""
+        time_manager.tick(now=100.0)
+        
+        assert time_manager.tick(now=100.25) == 2
+        assert time_manager.current_julian_date == pytest.approx(2451545.2)
+        assert time_manager.previous_julian_date == pytest.approx(2451545.1)
+        assert time_manager.interpolation_alpha == pytest.approx(0.5)
+        assert time_manager.interpolated_julian_date == pytest.approx(2451545.15)
+        
+        # 端数は次回に持ち越される
+        assert time_manager.tick(now=100.31) == 1
+        assert time_manager.current_julian_date == pytest.approx(2451545.3)
+        assert time_manager.interpolation_alpha == pytest.approx(0.1)
+        assert time_manager.fixed_step_count == 3
+    
+    def test_irregular_frames_do_not_drift(self, time_manager):
+        """フレーム間隔が不規則でも経過時間どおりに進むかのテスト"""
+        now = 100.0
+        time_manager.tick(now=now)
+        for frame_time in [0.016, 0.033, 0.016, 0.05, 0.016, 0.2, 0.016] * 10:
+            now += frame_time
+            time_manager.tick(now=now)
+        
+        elapsed = now - 100.0
+        expected = 2451545.0 + elapsed - time_manager.interpolation_alpha * 0.1
+        assert time_manager.current_julian_date == pytest.approx(expected, abs=1e-7)
+        assert time_manager.dropped_real_time == 0.0
+    
+    def test_catch_up_is_capped(self, time_manager):
+        """長い停止後に進めるステップ数が制限されるかのテスト"""
+        time_manager.tick(now=100.0)
+        
+        assert time_manager.tick(now=105.05) == 3
+        assert time_manager.current_julian_date == pytest.approx(2451545.3)
+        assert time_manager.dropped_real_time == pytest.approx(4.7)
+        assert time_manager.interpolation_alpha == pytest.approx(0.5)
+    
+    def test_paused_tick_does_not_accumulate(self, time_manager):
+        """一時停止中に経過時間が溜まらないかのテスト"""
+        time_manager.tick(now=100.0)
+        time_manager.pause()
+        
+        assert time_manager.tick(now=110.0) == 0
+        time_manager.resume()
+        assert time_manager.tick(now=110.5) == 0
+        assert time_manager.tick(now=110.65) == 1
+        assert time_manager.current_julian_date == pytest.approx(2451545.1)
+    
+    def test_render_julian_date_between_ticks(self, time_manager):
+        """描画時点の経過時間で補間したユリウス日が毎回進むかのテスト"""
+        time_manager.tick(now=100.0)
+        assert time_manager.render_julian_date(now=100.05) == 2451545.0
+        
+        time_manager.tick(now=100.25)
+        
+        # tick の時点では interpolated_julian_date と一致し、その後の描画で進む
+        assert time_manager.render_julian_date(now=100.25) == pytest.approx(2451545.15)
+        renders = [time_manager.render_julian_date(now=100.25 + dt) for dt in (0.01, 0.02, 0.03, 0.04)]
+        assert renders == sorted(renders)
+        assert len(set(renders)) == 4
+        assert renders[-1] == pytest.approx(2451545.19)
+        
+        # 次の固定ステップを超えた分は現在のユリウス日で止まる
+        assert time_manager.render_julian_date(now=100.5) == pytest.approx(2451545.2)
+    
+    def test_render_julian_date_after_direct_change(self, time_manager):
+        """tick 以外で時刻を変更した場合と一時停止中は現在のユリウス日を描画するかのテスト"""
+        time_manager.tick(now=100.0)
+        time_manager.tick(now=100.25)
+        
+        time_manager.advance_by_days(10.0)
+        assert time_manager.render_julian_date(now=100.26) == time_manager.current_julian_date
+        
+        time_manager.tick(now=100.3)
+        time_manager.pause()
+        assert time_manager.render_julian_date(now=100.31) == time_manager.current_julian_date
+    
+    def test_invalid_fixed_step(self, time_manager):
+        """不正な固定ステップ設定のテスト"""
+        with pytest.raises(ValueError):
+            time_manager.configure_fixed_step(0.0)
+        with pytest.raises(ValueError):
+            time_manager.configure_fixed_step(0.1, max_catch_up_steps=0)
\ No newline at end of file
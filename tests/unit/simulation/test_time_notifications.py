@@ -0,0 +1,150 @@
+"""
+時間変更通知の配信のテスト
+"""
+
+import time
+import pytest
+from src.simulation.time_notifications import TimeChangeDispatcher
+from src.simulation.time_manager import TimeManager
+
+
+class TestTimeChangeDispatcher:
+    """TimeChangeDispatcherクラスのテスト"""
+    
+    def test_unlimited_subscriber_receives_every_change(self):
+        """最小間隔0の購読者には毎回配信されるかのテスト"""
+        dispatcher = TimeChangeDispatcher()
+        received = []
+        dispatcher.subscribe(received.append)
+        
+        for i in range(5):
+            dispatcher.notify(float(i), now=0.0)
+        
+        assert received == [0.0, 1.0, 2.0, 3.0, 4.0]
+    
+    def test_rate_limit_coalesces_intermediate_values(self):
+        """間隔内の値が最新の値にまとめられるかのテスト"""
+        dispatcher = TimeChangeDispatcher()
+        received = []
+        dispatcher.subscribe(received.append, min_interval=0.1)
+        
+        # 60Hz で1秒分の変更
+        for frame in range(60):
+            dispatcher.notify(float(frame), now=frame / 60.0)
+        dispatcher.flush(now=1.0)
+        
+        assert 10 <= len(received) <= 11
+        assert received[0] == 0.0
+        assert received[-1] == 59.0
+        assert received == sorted(received)
+        
+        statistics = dispatcher.get_statistics()[0]
+        assert statistics["delivered"] == len(received)
+        assert statistics["coalesced"] == 60 - len(received)
+    
+    def test_flush_respects_interval_unless_forced(self):
+        """flush() が間隔を守り、force で全て配信するかのテスト"""
+        dispatcher = TimeChangeDispatcher()
+        received = []
+        dispatcher.subscribe(received.append, min_interval=1.0)
+        
+        dispatcher.notify(1.0, now=0.0)
+        dispatcher.notify(2.0, now=0.5)
+        
+        assert dispatcher.flush(now=0.6) == 0
+        assert dispatcher.flush(force=True, now=0.6) == 1
+        assert received == [1.0, 2.0]
+        assert dispatcher.flush(force=True, now=0.7) == 0
+    
+    def test_deferred_subscriber_only_on_flush(self):
+        """deferred の購読者が flush() でのみ呼び出されるかのテスト"""
+        dispatcher = TimeChangeDispatcher()
+        received = []
+        dispatcher.subscribe(received.append, deferred=True)
+        
+        dispatcher.notify(1.0, now=0.0)
+        dispatcher.notify(2.0, now=0.1)
+        assert received == []
+        
+        dispatcher.flush(now=0.2)
+        assert received == [2.0]
+    
+    def test_cheap_subscribers_are_delivered_first(self):
+        """処理時間の短い購読者から配信されるかのテスト"""
+        dispatcher = TimeChangeDispatcher()
+        order = []
+        
+        def expensive(julian_date):
+            time.sleep(0.01)
+            order.append("expensive")
+        
+        def cheap(julian_date):
+            order.append("cheap")
+        
+        dispatcher.subscribe(expensive)
+        dispatcher.subscribe(cheap)
+        
+        dispatcher.notify(1.0, now=0.0)
+        order.clear()
+        dispatcher.notify(2.0, now=0.1)
+        
+        assert order == ["cheap", "expensive"]
+    
+    def test_callback_error_does_not_stop_delivery(self):
+        """コールバックの例外で他の購読者への配信が止まらないかのテスト"""
+        dispatcher = TimeChangeDispatcher()
+        received = []
+        
+        def failing(julian_date):
+            raise RuntimeError("失敗")
+        
+        dispatcher.subscribe(failing)
+        dispatcher.subscribe(received.append)
+        
+        assert dispatcher.notify(1.0, now=0.0) == 2
+        assert received == [1.0]
+    
+    def test_subscribe_and_unsubscribe(self):
+        """購読者の登録・更新・削除のテスト"""
+        dispatcher = TimeChangeDispatcher()
+        callback = lambda julian_date: None
+        
+        dispatcher.subscribe(callback)
+        dispatcher.subscribe(callback, min_interval=0.5)
+        assert len(dispatcher) == 1
+        assert dispatcher.get_statistics()[0]["min_interval"] == 0.5
+        
+        dispatcher.unsubscribe(callback)
+        assert callback not in dispatcher
+        
+        with pytest.raises(ValueError):
+            dispatcher.subscribe(callback, min_interval=-1.0)
+
+
+class TestTimeManagerNotifications:
+    """TimeManagerの時間変更通知のテスト"""
+    
+    def test_rate_limited_callback(self):
+        """TimeManager 経由で間引きと flush が働くかのテスト"""
+        time_manager = TimeManager()
+        fast, slow = [], []
+        time_manager.add_time_change_callback(fast.append)
+        time_manager.add_time_change_callback(slow.append, min_interval=60.0, deferred=True)
+        
+        for _ in range(10):
+            time_manager.update(1.0)
+        
+        assert len(fast) == 10
+        assert slow == []
+        
+        # 初回は間隔に関係なく配信され、以降は間隔内なので保留
+        assert time_manager.flush_time_notifications() == 1
+        assert slow == [time_manager.current_julian_date]
+        time_manager.update(1.0)
+        assert time_manager.flush_time_notifications() == 0
+        assert time_manager.flush_time_notifications(force=True) == 1
+        assert slow[-1] == time_manager.current_julian_date
+        
+        time_manager.remove_time_change_callback(slow.append)
+        time_manager.update(1.0)
+        assert time_manager.flush_time_notifications(force=True) == 0
\ No newline at end of file
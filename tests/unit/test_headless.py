@@ -0,0 +1,116 @@
+"""
+ヘッドレス実行（src.headless）の単体テスト
+
+GUIモジュールを読み込まないこと、軌道の書き出し、
+チェックポイントからの再開を検証します。
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.headless import HeadlessRunner, main
+
+
+project_root = Path(__file__).parent.parent.parent
+
+
+class TestHeadless:
+    """ヘッドレス実行のテスト"""
+    
+    def test_never_imports_gui_modules(self, tmp_path):
+        """実行してもPyQt6・Vispy・UI層を読み込まないことのテスト"""
+        script = (
+            "import sys\n"
+            "from src.headless import main\n"
+            f"code = main(['--output', {str(tmp_path)!r}, '--days', '2', '--mode', 'nbody'])\n"
+            "gui = [m for m in sys.modules if m.split('.')[0] in ('PyQt6', 'vispy') or\n"
+            "       m.startswith(('src.ui', 'src.visualization'))]\n"
+            "print(code, gui)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], cwd=project_root,
+                                capture_output=True, text=True, timeout=120)
+        
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "0 []"
+    
+    def test_kepler_trajectory_output(self, tmp_path):
+        """軌道要素モードの書き出しのテスト"""
+        runner = HeadlessRunner(tmp_path, days=10, step_days=1.0, output_interval=5)
+        
+        frames = runner.run()
+        
+        assert frames == 3
+        positions = np.load(tmp_path / "positions.npy")
+        julian_dates = np.load(tmp_path / "julian_dates.npy")
+        metadata = json.loads((tmp_path / "metadata.json").read_text(encoding='utf-8'))
+        
+        bodies = runner.solar_system.get_all_bodies()
+        assert positions.shape == (3, len(bodies), 3)
+        assert metadata['names'] == [body.name for body in bodies]
+        np.testing.assert_allclose(julian_dates, 2451545.0 + np.array([0.0, 5.0, 10.0]))
+        
+        # 最終フレームは最終時刻の軌道要素による位置
+        runner.solar_system.update_all_positions(julian_dates[-1])
+        np.testing.assert_allclose(positions[-1], [body.position for body in bodies], rtol=1e-12)
+    
+    def test_kepler_velocities_are_written(self, tmp_path):
+        """軌道要素モードで書き出す速度が軌道要素による速度であることのテスト"""
+        runner = HeadlessRunner(tmp_path, days=2, step_days=1.0)
+        runner.run()
+        
+        velocities = np.load(tmp_path / "velocities.npy")
+        names = json.loads((tmp_path / "metadata.json").read_text(encoding='utf-8'))['names']
+        earth_speed = np.linalg.norm(velocities[:, names.index("地球")], axis=1)
+        
+        # 地球の公転速度は約 29.3〜30.3 km/s
+        assert np.all((earth_speed > 29.0) & (earth_speed < 30.5))
+    
+    def test_nbody_orbits_stay_bound(self, tmp_path):
+        """N体計算で1年後も地球が約1 AUの軌道に留まることのテスト"""
+        runner = HeadlessRunner(tmp_path, days=365, step_days=1.0, mode="nbody", output_interval=5)
+        runner.run()
+        
+        positions = np.load(tmp_path / "positions.npy")
+        names = json.loads((tmp_path / "metadata.json").read_text(encoding='utf-8'))['names']
+        heliocentric = positions[:, names.index("地球")] - positions[:, names.index("太陽")]
+        distance_au = np.linalg.norm(heliocentric, axis=1) / 149597870.7
+        
+        assert np.all(np.abs(distance_au - 1.0) < 0.05)
+    
+    def test_nbody_resume_is_bit_exact(self, tmp_path):
+        """チェックポイントから再開した出力が中断なしの場合と一致することのテスト"""
+        reference_dir = tmp_path / "reference"
+        HeadlessRunner(reference_dir, days=20, mode="nbody").run()
+        
+        resumed_dir = tmp_path / "resumed"
+        HeadlessRunner(resumed_dir, days=20, mode="nbody", checkpoint_interval=5).run()
+        
+        # ステップ10の後で中断した状態を再現
+        for step in (15, 20):
+            (resumed_dir / "checkpoints" / f"checkpoint_{step:012d}.npz").unlink()
+        positions = np.load(resumed_dir / "positions.npy", mmap_mode='r+')
+        positions[11:] = 0.0
+        positions.flush()
+        del positions
+        
+        runner = HeadlessRunner(resumed_dir, days=20, mode="nbody", checkpoint_interval=5, resume=True)
+        runner.run()
+        
+        for name in ("positions.npy", "velocities.npy", "julian_dates.npy"):
+            np.testing.assert_array_equal(np.load(resumed_dir / name), np.load(reference_dir / name))
+        assert runner.solar_system.current_date == 2451565.0
+    
+    def test_invalid_arguments(self, tmp_path, capsys):
+        """不正なパラメータのテスト"""
+        with pytest.raises(ValueError):
+            HeadlessRunner(tmp_path, days=10, mode="gui")
+        with pytest.raises(ValueError):
+            HeadlessRunner(tmp_path, days=10, step_days=0.0)
+        
+        assert main(["--output", str(tmp_path), "--days", "1", "--step", "-1"]) == 1
+        assert "ヘッドレス実行エラー" in capsys.readouterr().out
\ No newline at end of file